@@ -3,11 +3,14 @@ Phase 3 API 엔드포인트
 저장 경로: /AI_Drive/counseling_ai/api/v3/endpoints.py
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from enum import Enum
+import tempfile
 
 # 라우터 생성
 router = APIRouter(prefix="/api/v3", tags=["Phase 3 API"])
@@ -81,6 +84,7 @@ class ResearchStudyRequest(BaseModel):
     arms: List[Dict[str, Any]]
     primary_outcome: str
     secondary_outcomes: List[str] = []
+    randomization_enabled: bool = True
 
 class ResearchStudyResponse(BaseModel):
     study_id: str
@@ -90,8 +94,17 @@ class ResearchStudyResponse(BaseModel):
     enrollment: Dict[str, int]
     created_at: str
 
+class IRBSubmissionRequest(BaseModel):
+    protocol_document: str
+    consent_form: str
+
+class IRBApprovalRequest(BaseModel):
+    irb_number: str
+    approval_date: Optional[datetime] = None
+
 class ParticipantEnrollRequest(BaseModel):
     study_id: str
+    user_id: str # 등록 시 익명화되어 participant_id 로 저장
     demographics: Dict[str, Any]
     consent_version: str
     consent_type: str = "full"
@@ -169,6 +182,8 @@ async def get_services():
 # =============================================================================
 # ... (imports)
 from services.counselor_agent import CounselorAgent
+from services.supervisor_queue import SupervisorJob, SupervisorWorkerPool
+from services.research_platform import DataExportFormat, ParticipantStatus, ResearchPlatformService, StudyType
 
 # ... (models)
 
@@ -186,12 +201,29 @@ def get_agent():
         _agent_instance = CounselorAgent()
     return _agent_instance
 
+_supervisor_pool = None
+
+def get_supervisor_pool():
+    global _supervisor_pool
+    if _supervisor_pool is None:
+        _supervisor_pool = SupervisorWorkerPool()
+    return _supervisor_pool
+
+_research_platform = None
+
+def get_research_platform():
+    global _research_platform
+    if _research_platform is None:
+        _research_platform = ResearchPlatformService()
+    return _research_platform
+
 @router.post("/chat/multilingual", response_model=MultilingualChatResponse)
 async def multilingual_chat(
     request: MultilingualChatRequest,
     background_tasks: BackgroundTasks,
     client: dict = Depends(verify_api_key),
-    agent: CounselorAgent = Depends(get_agent)  # Use real agent
+    agent: CounselorAgent = Depends(get_agent),  # Use real agent
+    pool: SupervisorWorkerPool = Depends(get_supervisor_pool)
 ):
     """
     다국어 심리상담 채팅 (Real AI Connected)
@@ -206,9 +238,27 @@ async def multilingual_chat(
     
     # 결과 매핑 (Safe Access)
     emotion_data = result.get("emotion", {})
+    session_id = result.get("session_id", request.session_id)
+    is_crisis = result.get("is_crisis", False)
+
+    # 슈퍼바이저 평가는 워커 풀에서 비동기로 수행 (응답 지연 없음)
+    previous_feedback = pool.get_latest_feedback(session_id) if session_id else None
+    supervisor_status = "skipped"
+    if session_id and "response" in result:
+        queued = analyze_session_quality(
+            pool,
+            session_id=session_id,
+            turn_id=result.get("turn_id") or f"turn_{result.get('turn_count', 0)}",
+            user_message=request.message,
+            ai_response=result["response"],
+            language=request.language.value,
+            is_crisis=is_crisis,
+            approach=result.get("approach")
+        )
+        supervisor_status = "queued" if queued else "sampled_out"
     
     response = MultilingualChatResponse(
-        session_id=result.get("session_id", request.session_id),
+        session_id=session_id,
         response_text=result.get("response", "잠시 문제가 발생했습니다."),
         detected_language=request.language.value,
         applied_approach=result.get("approach", "cbt"),
@@ -219,8 +269,13 @@ async def multilingual_chat(
         },
         cultural_adaptations=["존칭 사용", "공감적 경청"], 
         supervisor_feedback={
-            "quality_score": 0.95,
-            "intervention_needed": result.get("is_crisis", False)
+            "status": supervisor_status,
+            # 직전 턴까지의 평가 결과 (현재 턴은 처리 후 /supervisor/review 로 조회)
+            "quality_score": previous_feedback.overall_score if previous_feedback else None,
+            "intervention_needed": is_crisis or (
+                previous_feedback is not None
+                and previous_feedback.intervention_level.value in ("alert", "takeover")
+            )
         },
         personalization_applied=request.enable_personalization,
         suggested_techniques=result.get("suggested_techniques", []),
@@ -229,10 +284,27 @@ async def multilingual_chat(
     
     return response
 
-async def analyze_session_quality(session_id: str, user_message: str, ai_response: str):
-    """백그라운드 품질 분석"""
-    # 실제 구현에서는 AI 슈퍼바이저 호출
-    pass
+def analyze_session_quality(
+    pool: SupervisorWorkerPool,
+    session_id: str,
+    turn_id: str,
+    user_message: str,
+    ai_response: str,
+    language: str = "ko",
+    is_crisis: bool = False,
+    approach: Optional[str] = None
+) -> bool:
+    """백그라운드 품질 분석 작업 등록 (큐 등록만 수행, 대기 없음)"""
+    context = {"therapeutic_approach": approach.upper()} if approach else {}
+    return pool.submit(SupervisorJob(
+        session_id=session_id,
+        turn_id=turn_id,
+        user_message=user_message,
+        ai_response=ai_response,
+        context=context,
+        language=language,
+        is_crisis=is_crisis
+    ))
 
 @router.get("/chat/languages")
 async def get_supported_languages():
@@ -254,7 +326,8 @@ async def get_supported_languages():
 @router.post("/supervisor/review", response_model=SupervisorReviewResponse)
 async def review_session(
     request: SupervisorReviewRequest,
-    client: dict = Depends(verify_api_key)
+    client: dict = Depends(verify_api_key),
+    pool: SupervisorWorkerPool = Depends(get_supervisor_pool)
 ):
     """
     AI 슈퍼바이저 세션 리뷰
@@ -262,49 +335,50 @@ async def review_session(
     - 개입 권고
     - 코칭 포인트
     """
+    review = pool.get_session_review(request.session_id)
+    if review is None:
+        raise HTTPException(status_code=404, detail="No supervisor feedback for session")
+
     return SupervisorReviewResponse(
         session_id=request.session_id,
-        overall_quality=0.82,
-        quality_scores={
-            "empathy": 0.85,
-            "safety_compliance": 0.95,
-            "cultural_appropriateness": 0.80,
-            "therapeutic_alliance": 0.78,
-            "clinical_accuracy": 0.82
-        },
-        intervention_level="none",
-        coaching_points=[
-            "공감 표현 잘 유지됨",
-            "문화적 맥락 고려 개선 가능"
-        ],
-        recommendations=[
-            "사용자의 가족 관계 맥락 더 탐색",
-            "다음 세션에서 대처 기술 소개 고려"
-        ],
-        reviewed_at=datetime.now().isoformat()
+        overall_quality=review["overall_quality"],
+        quality_scores=review["quality_scores"] if request.include_quality_scores else {},
+        intervention_level=review["intervention_level"],
+        coaching_points=review["coaching_points"],
+        recommendations=review["recommendations"] if request.include_recommendations else [],
+        reviewed_at=review["last_reviewed_at"]
     )
 
 @router.get("/supervisor/alerts")
 async def get_supervisor_alerts(
     severity: Optional[str] = Query(None, enum=["low", "medium", "high", "critical"]),
     since: Optional[str] = None,
-    client: dict = Depends(verify_api_key)
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    client: dict = Depends(verify_api_key),
+    pool: SupervisorWorkerPool = Depends(get_supervisor_pool)
 ):
-    """슈퍼바이저 알림 조회"""
+    """슈퍼바이저 알림 조회 (세션별 반복 알림은 occurrences 로 병합)"""
+    since_dt = None
+    if since:
+        try:
+            since_dt = datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid 'since' timestamp (ISO 8601 expected)")
+
+    alerts = pool.get_alerts(severity=severity, since=since_dt, limit=limit)
     return {
-        "alerts": [
-            {
-                "alert_id": "ALERT_001",
-                "session_id": "SESSION_123",
-                "severity": "medium",
-                "type": "quality_concern",
-                "message": "공감 수준 저하 감지",
-                "timestamp": datetime.now().isoformat()
-            }
-        ],
-        "total": 1
+        "alerts": alerts,
+        "total": len(alerts)
     }
 
+@router.get("/supervisor/metrics")
+async def get_supervisor_metrics(
+    client: dict = Depends(verify_api_key),
+    pool: SupervisorWorkerPool = Depends(get_supervisor_pool)
+):
+    """슈퍼바이저 큐 지표 (대기 지연, 폐기/샘플링 건수)"""
+    return pool.get_metrics()
+
 # =============================================================================
 # 개인화 엔드포인트
 # =============================================================================
@@ -372,109 +446,269 @@ async def record_emotional_memory(
 # =============================================================================
 # 연구 플랫폼 엔드포인트
 # =============================================================================
+def _get_study(platform: ResearchPlatformService, study_id: str):
+    """연구 조회 (없으면 404)"""
+    study = platform.studies.get(study_id)
+    if study is None:
+        raise HTTPException(status_code=404, detail=f"Study not found: {study_id}")
+    return study
+
+def _study_response(study) -> ResearchStudyResponse:
+    return ResearchStudyResponse(
+        study_id=study.study_id,
+        title=study.title,
+        status=study.status.value,
+        irb_number=study.irb_number,
+        enrollment={"target": study.target_enrollment, "current": study.current_enrollment},
+        created_at=study.created_at.isoformat()
+    )
+
 @router.post("/research/studies", response_model=ResearchStudyResponse)
 async def create_research_study(
     request: ResearchStudyRequest,
-    client: dict = Depends(verify_api_key)
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
 ):
-    """연구 생성"""
-    return ResearchStudyResponse(
-        study_id=f"STUDY_{datetime.now().strftime('%Y%m%d')}_001",
-        title=request.title,
-        status="draft",
-        irb_number=None,
-        enrollment={"target": request.target_enrollment, "current": 0},
-        created_at=datetime.now().isoformat()
-    )
+    """연구 생성 (draft 상태)"""
+    try:
+        study_type = StudyType(request.study_type)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Unknown study type: {request.study_type}")
+    try:
+        study = await platform.create_study(
+            title=request.title,
+            study_type=study_type,
+            principal_investigator=request.principal_investigator,
+            institution=request.institution,
+            arms=request.arms,
+            target_enrollment=request.target_enrollment,
+            primary_outcome=request.primary_outcome,
+            secondary_outcomes=request.secondary_outcomes,
+            randomization_enabled=request.randomization_enabled
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"Study arm missing field: {e.args[0]}")
+    return _study_response(study)
 
 @router.get("/research/studies/{study_id}")
 async def get_research_study(
     study_id: str,
-    client: dict = Depends(verify_api_key)
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
 ):
     """연구 조회"""
+    study = _get_study(platform, study_id)
     return {
         "study_id": study_id,
-        "title": "AI 심리상담 효과성 RCT",
-        "status": "recruiting",
-        "enrollment": {"target": 300, "current": 45},
+        "title": study.title,
+        "status": study.status.value,
+        "enrollment": {"target": study.target_enrollment, "current": study.current_enrollment},
         "arms": [
-            {"name": "중재군", "current": 23},
-            {"name": "대조군", "current": 22}
+            {"arm_id": arm.arm_id, "name": arm.name, "current": arm.current_size}
+            for arm in study.arms
         ]
     }
 
+@router.post("/research/studies/{study_id}/irb")
+async def submit_study_for_irb(
+    study_id: str,
+    request: IRBSubmissionRequest,
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
+):
+    """IRB 제출"""
+    _get_study(platform, study_id)
+    return await platform.submit_for_irb(study_id, request.protocol_document, request.consent_form)
+
+@router.post("/research/studies/{study_id}/irb/approval", response_model=ResearchStudyResponse)
+async def approve_study_irb(
+    study_id: str,
+    request: IRBApprovalRequest,
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
+):
+    """IRB 승인 기록"""
+    _get_study(platform, study_id)
+    study = await platform.approve_irb(study_id, request.irb_number, request.approval_date or datetime.now())
+    return _study_response(study)
+
+@router.post("/research/studies/{study_id}/recruitment", response_model=ResearchStudyResponse)
+async def start_study_recruitment(
+    study_id: str,
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
+):
+    """모집 시작 (IRB 승인 필요)"""
+    _get_study(platform, study_id)
+    try:
+        study = await platform.start_recruitment(study_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _study_response(study)
+
 @router.post("/research/participants", response_model=ParticipantEnrollResponse)
 async def enroll_participant(
     request: ParticipantEnrollRequest,
-    client: dict = Depends(verify_api_key)
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
 ):
-    """참여자 등록"""
+    """참여자 등록 (모집 중인 연구만)"""
+    _get_study(platform, request.study_id)
+    try:
+        participant, arm_id = await platform.enroll_participant(
+            request.study_id,
+            request.user_id,
+            request.demographics,
+            {"version": request.consent_version, "type": request.consent_type}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return ParticipantEnrollResponse(
-        participant_id="PART_ABC123",
-        study_id=request.study_id,
-        arm_id="ARM_001",
-        status="enrolled",
-        enrolled_at=datetime.now().isoformat()
+        participant_id=participant.participant_id,
+        study_id=participant.study_id,
+        arm_id=arm_id,
+        status=participant.status.value,
+        enrolled_at=participant.enrollment_date.isoformat()
     )
 
 @router.post("/research/assessments", response_model=AssessmentResponse)
 async def record_assessment(
     request: AssessmentRequest,
-    client: dict = Depends(verify_api_key)
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
 ):
-    """평가 기록"""
-    total_score = sum(request.responses)
-    
-    # 심각도 결정 (PHQ-9 기준)
-    if total_score <= 4:
-        severity = "minimal"
-    elif total_score <= 9:
-        severity = "mild"
-    elif total_score <= 14:
-        severity = "moderate"
-    elif total_score <= 19:
-        severity = "moderately_severe"
-    else:
-        severity = "severe"
-        
+    """평가 기록 (점수 / 심각도는 도구별 기준으로 계산)"""
+    participant = platform.participants.get(request.participant_id)
+    if participant is None:
+        raise HTTPException(status_code=404, detail=f"Participant not found: {request.participant_id}")
+    try:
+        result = await platform.record_assessment(
+            request.participant_id, request.tool, request.timepoint, request.responses
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    record = participant.assessments[-1]
     return AssessmentResponse(
-        assessment_id=f"ASSESS_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        assessment_id=f"{participant.participant_id}_{len(participant.assessments):04d}",
         tool=request.tool,
-        total_score=total_score,
-        severity=severity,
-        recorded_at=datetime.now().isoformat()
+        total_score=result['total_score'],
+        severity=result['severity'],
+        recorded_at=record['recorded_at']
     )
 
 @router.get("/research/studies/{study_id}/report")
 async def get_study_report(
     study_id: str,
-    client: dict = Depends(verify_api_key)
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
 ):
-    """연구 보고서"""
+    """연구 보고서 (주요 결과: 첫 그룹 = 중재군, 둘째 그룹 = 대조군, p 값은 기준선 공변량 ANCOVA)"""
+    try:
+        report = await platform.generate_study_report(study_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    study = platform.studies[study_id]
+    statistics = report['statistics']
+    completed = platform.participant_index.count(study_id, status=ParticipantStatus.COMPLETED)
+    
+    # 주요 결과 도구: primary_outcome 문구에 포함된 도구, 없으면 PHQ-9
+    tools = statistics['tools']
+    measure = next((tool for tool in tools if tool in study.primary_outcome), "PHQ-9")
+    primary_outcome = {"measure": measure}
+    if measure in tools and len(study.arms) >= 2:
+        outcome = tools[measure]
+        for key, arm in (("intervention_group", study.arms[0]), ("control_group", study.arms[1])):
+            arm_stats = outcome['arms'][arm.arm_id]
+            primary_outcome[key] = {
+                "n": arm_stats['n'],
+                "baseline_mean": arm_stats['baseline_mean'],
+                "final_mean": arm_stats['final_mean'],
+                "change": arm_stats['mean_change'],
+                "reliably_improved": arm_stats['reliably_improved']
+            }
+        comparison = outcome['comparisons'][0]
+        primary_outcome.update({
+            "between_group_difference": comparison['mean_change_difference'],
+            "adjusted_difference": comparison['ancova']['adjusted_difference'],
+            "confidence_interval": comparison['ancova']['ci'],
+            "p_value": comparison['ancova']['p_value'],
+            "welch_p_value": comparison['welch_t']['p_value'],
+            "effect_size": comparison['hedges_g']
+        })
+    
     return {
         "study_id": study_id,
-        "title": "AI 심리상담 효과성 RCT",
-        "enrollment_rate": 15.0,
-        "completion_rate": 85.2,
-        "primary_outcome": {
-            "measure": "PHQ-9",
-            "intervention_group": {
-                "baseline_mean": 14.2,
-                "final_mean": 8.5,
-                "change": -5.7
-            },
-            "control_group": {
-                "baseline_mean": 14.5,
-                "final_mean": 12.1,
-                "change": -2.4
-            },
-            "between_group_difference": -3.3,
-            "p_value": 0.001
-        },
-        "generated_at": datetime.now().isoformat()
+        "title": study.title,
+        "enrollment_rate": report['enrollment']['percentage'],
+        "completion_rate": round(completed / study.current_enrollment * 100, 1) if study.current_enrollment > 0 else 0,
+        "primary_outcome": primary_outcome,
+        "statistics": statistics,
+        "generated_at": report['generated_at']
     }
 
+# 열 단위 내보내기 임시 파일: 이 크기까지 메모리, 넘으면 디스크
+_EXPORT_SPOOL_BYTES = 32 * 1024 * 1024
+_COLUMNAR_MEDIA_TYPES = {
+    DataExportFormat.PARQUET: "application/vnd.apache.parquet",
+    DataExportFormat.ARROW: "application/vnd.apache.arrow.file"
+}
+
+def _iter_file_chunks(file, chunk_size: int = 1 << 16):
+    """처음부터 청크 단위로 읽고 끝나면 닫음"""
+    try:
+        file.seek(0)
+        yield from iter(lambda: file.read(chunk_size), b"")
+    finally:
+        file.close()
+
+@router.get("/research/studies/{study_id}/export")
+async def export_study_data(
+    study_id: str,
+    format: str = Query("csv", enum=["csv", "json", "ndjson", "parquet", "arrow"]),
+    include_demographics: bool = True,
+    include_assessments: bool = True,
+    gzip: bool = False,
+    client: dict = Depends(verify_api_key),
+    platform: ResearchPlatformService = Depends(get_research_platform)
+):
+    """
+    연구 데이터 내보내기
+    - csv / json / ndjson: 레코드 청크 단위 스트리밍, 선택적 gzip
+    - parquet / arrow: 열 단위 파일 (자체 압축, gzip 무시), pyarrow 필요
+    """
+    export_format = DataExportFormat(format)
+    if export_format in _COLUMNAR_MEDIA_TYPES:
+        spool = tempfile.SpooledTemporaryFile(max_size=_EXPORT_SPOOL_BYTES)
+        try:
+            # 열 단위 파일 작성은 동기 CPU/IO 작업이므로 스레드 풀에서 실행
+            await run_in_threadpool(
+                platform.write_columnar_export,
+                study_id, spool, export_format, include_demographics, include_assessments
+            )
+        except ValueError as e:
+            spool.close()
+            raise HTTPException(status_code=404, detail=str(e))
+        except ImportError as e:
+            spool.close()
+            raise HTTPException(status_code=501, detail=str(e))
+        return StreamingResponse(
+            _iter_file_chunks(spool),
+            media_type=_COLUMNAR_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{study_id}.{export_format.value}"'}
+        )
+    try:
+        chunks = platform.stream_export(
+            study_id, export_format, include_demographics, include_assessments, compress=gzip
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    filename = f"{study_id}.{export_format.value}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else platform.export_media_type(export_format),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # =============================================================================
 # 국제화 엔드포인트
 # =============================================================================
@@ -5,12 +5,14 @@ Phase 3: 국제화 확장
 """
 import tensorflow as tf
 from tensorflow import keras
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import numpy as np
 import re
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 
 class SupportedLanguage(Enum):
     """지원 언어 목록"""
@@ -21,6 +23,9 @@ class SupportedLanguage(Enum):
     CHINESE_TRADITIONAL = "zh-TW"
     VIETNAMESE = "vi"
 
+# Enum 순회 비용을 줄이기 위한 캐시
+_SUPPORTED_LANGUAGES = tuple(SupportedLanguage)
+
 class CommunicationStyle(Enum):
     """문화별 커뮤니케이션 스타일"""
     HIGH_CONTEXT = "high_context" # 한국, 일본
@@ -28,6 +33,205 @@ class CommunicationStyle(Enum):
     INDIRECT = "indirect"         # 동아시아
     DIRECT = "direct"             # 서양
 
+# =============================================================================
+# 문자 체계 히스토그램 (단일 패스)
+# =============================================================================
+# 버킷 인덱스 - 히스토그램 배열의 열 순서
+_BUCKET_OTHER = 0
+_BUCKET_HANGUL = 1
+_BUCKET_HIRAGANA = 2
+_BUCKET_KATAKANA = 3
+_BUCKET_HANZI = 4
+_BUCKET_HANZI_SIMPLIFIED = 5
+_BUCKET_HANZI_TRADITIONAL = 6
+_BUCKET_LATIN = 7
+_BUCKET_VIETNAMESE = 8
+_BUCKET_VIETNAMESE_A = 9
+_NUM_BUCKETS = 10
+
+# 이 길이 이상이면 NumPy 벡터 경로 사용
+_VECTORIZE_MIN_LENGTH = 256
+
+# 간체/번체 구분 문자 및 베트남어 성조 문자
+_SIMPLIFIED_MARKERS = "们这那国学为会"
+_TRADITIONAL_MARKERS = "們這國學為會"
+_VIETNAMESE_A_CHARS = "àáảãạăằắẳẵặâầấẩẫậ"
+_VIETNAMESE_CHARS = "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđĐ"
+
+def _build_script_range_table() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """코드포인트 구간 테이블 생성 (시작, 끝, 버킷)"""
+    ranges = [
+        (0x0041, 0x005A, _BUCKET_LATIN),
+        (0x0061, 0x007A, _BUCKET_LATIN),
+        (0x3040, 0x309F, _BUCKET_HIRAGANA),
+        (0x30A0, 0x30FF, _BUCKET_KATAKANA),
+        (0xAC00, 0xD7A3, _BUCKET_HANGUL),
+    ]
+    # 단일 문자 구간 (한자 구간은 마커 문자를 기준으로 분할)
+    singles = [(ord(c), _BUCKET_HANZI_SIMPLIFIED) for c in _SIMPLIFIED_MARKERS]
+    singles += [(ord(c), _BUCKET_HANZI_TRADITIONAL) for c in _TRADITIONAL_MARKERS]
+    singles += [(ord(c), _BUCKET_VIETNAMESE_A) for c in _VIETNAMESE_A_CHARS]
+    singles += [
+        (ord(c), _BUCKET_VIETNAMESE) for c in _VIETNAMESE_CHARS if c not in _VIETNAMESE_A_CHARS
+    ]
+    ranges += [(cp, cp, bucket) for cp, bucket in singles]
+
+    hanzi_start = 0x4E00
+    for cp in sorted(cp for cp, bucket in singles if bucket in (_BUCKET_HANZI_SIMPLIFIED, _BUCKET_HANZI_TRADITIONAL)):
+        if cp > hanzi_start:
+            ranges.append((hanzi_start, cp - 1, _BUCKET_HANZI))
+        hanzi_start = cp + 1
+    ranges.append((hanzi_start, 0x9FFF, _BUCKET_HANZI))
+
+    ranges.sort()
+    starts = np.array([r[0] for r in ranges], dtype=np.uint32)
+    ends = np.array([r[1] for r in ranges], dtype=np.uint32)
+    buckets = np.array([r[2] for r in ranges], dtype=np.intp)
+    return starts, ends, buckets
+
+_RANGE_STARTS, _RANGE_ENDS, _RANGE_BUCKETS = _build_script_range_table()
+
+# 신경망 출력 인덱스 -> 언어 코드
+_MODEL_LANGUAGES = ("ko", "en", "ja", "zh", "zh-TW", "vi")
+
+# 동적 패딩 길이 버킷
+_LENGTH_BUCKETS = (16, 32, 64, 128, 256, 512)
+
+# 영어 기능어 패턴 (사전 컴파일)
+_ENGLISH_WORD_PATTERN = re.compile(r'\b(the|is|are|was|were|have|has|been|I|you|we|they|it|this|that)\b')
+
+@dataclass
+class ScriptHistogram:
+    """문자 체계별 문자 수"""
+    total: int
+    hangul: int
+    hiragana: int
+    katakana: int
+    hanzi: int # 간체/번체 마커 포함
+    simplified: int
+    traditional: int
+    latin: int # a-zA-Z
+    vietnamese: int # 성조 문자 전체
+    vietnamese_a: int # a 계열 성조 문자
+
+    @classmethod
+    def from_counts(cls, c: List[int]) -> "ScriptHistogram":
+        """버킷 카운트 목록에서 생성"""
+        return cls(
+            total=sum(c),
+            hangul=c[_BUCKET_HANGUL],
+            hiragana=c[_BUCKET_HIRAGANA],
+            katakana=c[_BUCKET_KATAKANA],
+            hanzi=c[_BUCKET_HANZI] + c[_BUCKET_HANZI_SIMPLIFIED] + c[_BUCKET_HANZI_TRADITIONAL],
+            simplified=c[_BUCKET_HANZI_SIMPLIFIED],
+            traditional=c[_BUCKET_HANZI_TRADITIONAL],
+            latin=c[_BUCKET_LATIN],
+            vietnamese=c[_BUCKET_VIETNAMESE] + c[_BUCKET_VIETNAMESE_A],
+            vietnamese_a=c[_BUCKET_VIETNAMESE_A]
+        )
+
+def _codepoints(text: str) -> np.ndarray:
+    """UTF-32 코드포인트 배열"""
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+
+def _bucketize(codepoints: np.ndarray) -> np.ndarray:
+    """코드포인트별 버킷 인덱스 (구간 테이블 이진 탐색)"""
+    idx = np.searchsorted(_RANGE_STARTS, codepoints, side='right') - 1
+    safe_idx = np.maximum(idx, 0)
+    in_range = (idx >= 0) & (codepoints <= _RANGE_ENDS[safe_idx])
+    return np.where(in_range, _RANGE_BUCKETS[safe_idx], _BUCKET_OTHER)
+
+@lru_cache(maxsize=65536)
+def _char_bucket(char: str) -> int:
+    """단일 문자의 버킷 인덱스"""
+    return int(_bucketize(_codepoints(char))[0])
+
+def _script_bucket_counts(text: str) -> List[int]:
+    """텍스트를 한 번만 순회하여 버킷별 문자 수 계산"""
+    if len(text) < _VECTORIZE_MIN_LENGTH:
+        # 짧은 메시지: NumPy 호출 비용보다 고유 문자 집계가 빠름
+        counts = [0] * _NUM_BUCKETS
+        for char, count in Counter(text).items():
+            counts[_char_bucket(char)] += count
+        return counts
+    return np.bincount(_bucketize(_codepoints(text)), minlength=_NUM_BUCKETS).tolist()
+
+def compute_script_histogram(text: str) -> ScriptHistogram:
+    """텍스트를 한 번만 순회하여 문자 체계 히스토그램 계산"""
+    return ScriptHistogram.from_counts(_script_bucket_counts(text))
+
+def compute_script_histograms(texts: Sequence[str]) -> np.ndarray:
+    """여러 텍스트의 히스토그램을 한 번에 계산 (텍스트 수 x 버킷 수)"""
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.intp, count=len(texts))
+    rows = np.repeat(np.arange(len(texts), dtype=np.intp), lengths)
+    flat = rows * _NUM_BUCKETS + _bucketize(_codepoints("".join(texts)))
+    counts = np.bincount(flat, minlength=len(texts) * _NUM_BUCKETS)
+    return counts.reshape(len(texts), _NUM_BUCKETS)
+
+# =============================================================================
+# 문화적 단서 마커 (단일 스캔)
+# =============================================================================
+_FORMALITY_MARKERS = {
+    "ko": (("습니다", "입니다", "세요", "시"), ("어", "야", "냐", "ㅋ", "ㅎ")),
+    "ja": (("です", "ます", "ございます"), ("だ", "よ", "ね")),
+}
+_EXPRESSIVE_MARKERS = ("!", "!!", "...", "ㅜㅜ", "ㅠㅠ", "😢", "😭")
+
+FORMALITY_LEVELS = ("formal", "informal", "mixed", "neutral")
+EMOTIONAL_STYLES = ("expressive", "reserved", "moderate")
+SCRIPT_TYPES = ("hangul", "hiragana", "katakana", "hanzi", "vietnamese_latin", "latin")
+
+def _build_marker_scanner() -> Tuple["re.Pattern", Dict[str, Tuple[str, ...]]]:
+    """전체 마커를 하나의 전방탐색 패턴으로 컴파일
+
+    각 위치에서 가장 긴 마커 하나만 매칭되므로, 같은 위치에서 시작하는
+    짧은 마커(접두사)는 접두사 테이블로 복원한다.
+    """
+    markers = set(_EXPRESSIVE_MARKERS)
+    for formal, informal in _FORMALITY_MARKERS.values():
+        markers.update(formal)
+        markers.update(informal)
+    ordered = sorted(markers, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(m) for m in ordered) + "))")
+    prefixes = {m: tuple(p for p in markers if m.startswith(p)) for m in markers}
+    return pattern, prefixes
+
+_MARKER_PATTERN, _MARKER_PREFIXES = _build_marker_scanner()
+
+def _scan_markers(text: str) -> Dict[str, int]:
+    """마커별 출현 위치 수 (텍스트 1회 스캔)"""
+    found = Counter(match.group(1) for match in _MARKER_PATTERN.finditer(text))
+    counts: Dict[str, int] = {}
+    for marker, n in found.items():
+        for prefix in _MARKER_PREFIXES[marker]:
+            counts[prefix] = counts.get(prefix, 0) + n
+    return counts
+
+def _classify_formality(counts: Dict[str, int], language: str) -> str:
+    """마커 카운트 기반 형식성 분류"""
+    if language not in _FORMALITY_MARKERS:
+        return "neutral"
+    formal_markers, informal_markers = _FORMALITY_MARKERS[language]
+    formal_count = sum(1 for m in formal_markers if counts.get(m))
+    informal_count = sum(1 for m in informal_markers if counts.get(m))
+    if formal_count > informal_count:
+        return "formal"
+    elif informal_count > formal_count:
+        return "informal"
+    else:
+        return "mixed"
+
+def _classify_emotional_style(counts: Dict[str, int], text_length: int) -> str:
+    """마커 카운트 기반 감정 표현 스타일 분류"""
+    reserved_indicators = text_length > 50 and counts.get("!", 0) < 2
+    expressive_count = sum(1 for m in _EXPRESSIVE_MARKERS if counts.get(m))
+    if expressive_count > 3:
+        return "expressive"
+    elif reserved_indicators:
+        return "reserved"
+    else:
+        return "moderate"
+
 @dataclass
 class LanguageDetectionResult:
     """언어 감지 결과"""
@@ -53,6 +257,143 @@ class CulturalContext:
     taboo_topics: List[str]
     preferred_honorifics: Dict[str, str]
 
+@dataclass
+class LanguageDetectionBatch:
+    """배치 언어 감지 결과 (배열 기반)
+
+    scores의 열 순서는 languages와 같고, primary/script_type은
+    각각 languages와 SCRIPT_TYPES의 인덱스다.
+    """
+    languages: Tuple[str, ...]
+    scores: np.ndarray # (n, 언어 수) float64
+    primary: np.ndarray # (n,) int8
+    confidence: np.ndarray # (n,) float64
+    script_type: np.ndarray # (n,) int8
+    is_mixed: np.ndarray # (n,) bool
+
+    def __len__(self) -> int:
+        return len(self.primary)
+
+    @property
+    def primary_languages(self) -> np.ndarray:
+        """행별 주 언어 코드"""
+        return np.asarray(self.languages)[self.primary]
+
+    def to_result(self, index: int) -> LanguageDetectionResult:
+        """단일 LanguageDetectionResult로 변환"""
+        row = self.scores[index].tolist()
+        order = sorted(range(len(row)), key=lambda j: row[j], reverse=True)
+        is_mixed = bool(self.is_mixed[index])
+        return LanguageDetectionResult(
+            primary_language=self.languages[order[0]],
+            confidence=row[order[0]],
+            secondary_languages=[(self.languages[j], row[j]) for j in order[1:] if row[j] > 0.05],
+            script_type=SCRIPT_TYPES[self.script_type[index]],
+            is_mixed=is_mixed,
+            code_switching_detected=is_mixed,
+            detected_phrases={code: [] for code in self.languages}
+        )
+
+    def to_results(self) -> List[LanguageDetectionResult]:
+        """전체 행을 LanguageDetectionResult 목록으로 변환"""
+        return [self.to_result(i) for i in range(len(self))]
+
+@dataclass
+class CulturalContextBatch:
+    """배치 문화 컨텍스트 분석 결과 (배열 기반)
+
+    formality/emotional_style은 FORMALITY_LEVELS, EMOTIONAL_STYLES의 인덱스다.
+    기본 문화 컨텍스트는 언어별로 공유되므로 행마다 복제하지 않는다.
+    """
+    languages: np.ndarray # (n,) 언어 코드
+    formality: np.ndarray # (n,) int8
+    emotional_style: np.ndarray # (n,) int8
+    base_contexts: Dict[str, CulturalContext] = field(repr=False, default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.languages)
+
+    def to_context(self, index: int) -> CulturalContext:
+        """단일 CulturalContext로 변환"""
+        language = str(self.languages[index])
+        base_context = self.base_contexts.get(language, self.base_contexts.get("en"))
+        return CulturalContext(
+            language=language,
+            communication_style=base_context.communication_style,
+            formality_level=FORMALITY_LEVELS[self.formality[index]],
+            emotional_expression_style=EMOTIONAL_STYLES[self.emotional_style[index]],
+            family_orientation=base_context.family_orientation,
+            stigma_sensitivity=base_context.stigma_sensitivity,
+            recommended_approach=base_context.recommended_approach,
+            cultural_considerations=base_context.cultural_considerations,
+            taboo_topics=base_context.taboo_topics,
+            preferred_honorifics=base_context.preferred_honorifics
+        )
+
+    def to_contexts(self) -> List[CulturalContext]:
+        """전체 행을 CulturalContext 목록으로 변환"""
+        return [self.to_context(i) for i in range(len(self))]
+
+# 세션 언어 상태에서 언어별로 인정하는 문자 버킷
+_LANGUAGE_SCRIPT_BUCKETS = {
+    "ko": (_BUCKET_HANGUL,),
+    "en": (_BUCKET_LATIN,),
+    "ja": (_BUCKET_HIRAGANA, _BUCKET_KATAKANA, _BUCKET_HANZI, _BUCKET_HANZI_SIMPLIFIED, _BUCKET_HANZI_TRADITIONAL),
+    "zh": (_BUCKET_HANZI, _BUCKET_HANZI_SIMPLIFIED, _BUCKET_HANZI_TRADITIONAL),
+    "zh-TW": (_BUCKET_HANZI, _BUCKET_HANZI_SIMPLIFIED, _BUCKET_HANZI_TRADITIONAL),
+    "vi": (_BUCKET_LATIN, _BUCKET_VIETNAMESE, _BUCKET_VIETNAMESE_A),
+}
+
+# 빠른 경로에 꼭 필요한 고유 문자 (한자만 / 기본 라틴 문자만으로는 ja / vi 로 볼 수 없음 → zh / en 일 수 있음)
+_LANGUAGE_DISTINCTIVE_BUCKETS = {
+    "ja": (_BUCKET_HIRAGANA, _BUCKET_KATAKANA),
+    "vi": (_BUCKET_VIETNAMESE, _BUCKET_VIETNAMESE_A),
+}
+
+def _has_distinctive_script(counts: List[int], language: str) -> bool:
+    """해당 언어 고유 문자가 있는지 (고유 문자 규칙이 없는 언어 / 문자가 없는 메시지는 True)"""
+    buckets = _LANGUAGE_DISTINCTIVE_BUCKETS.get(language)
+    if buckets is None or sum(counts) == counts[_BUCKET_OTHER]:
+        return True
+    return any(counts[b] for b in buckets)
+
+def _language_script_share(counts: List[int], language: str) -> float:
+    """문자(기타 제외) 중 해당 언어 문자 체계의 비율 (문자가 없으면 1.0)"""
+    letters = sum(counts) - counts[_BUCKET_OTHER]
+    if letters == 0:
+        return 1.0
+    # 간체/번체 마커가 세션 언어와 반대면 불일치
+    if language == "zh" and counts[_BUCKET_HANZI_TRADITIONAL] > counts[_BUCKET_HANZI_SIMPLIFIED]:
+        return 0.0
+    if language == "zh-TW" and counts[_BUCKET_HANZI_SIMPLIFIED] > counts[_BUCKET_HANZI_TRADITIONAL]:
+        return 0.0
+    return sum(counts[b] for b in _LANGUAGE_SCRIPT_BUCKETS.get(language, ())) / letters
+
+@dataclass
+class SessionLanguageState:
+    """세션별 언어 상태"""
+    language: Optional[str] = None
+    last_result: Optional[LanguageDetectionResult] = None
+    script_counts: np.ndarray = field(default_factory=lambda: np.zeros(_NUM_BUCKETS, dtype=np.int64))
+    stable_turns: int = 0 # 연속으로 같은 언어가 확인된 턴 수
+    turns: int = 0
+    fast_path_hits: int = 0
+
+    @property
+    def script_distribution(self) -> Dict[str, float]:
+        """누적 문자 체계 분포 (기타 제외)"""
+        h = ScriptHistogram.from_counts(self.script_counts.tolist())
+        letters = h.total - int(self.script_counts[_BUCKET_OTHER])
+        if letters == 0:
+            return {}
+        return {
+            "hangul": h.hangul / letters,
+            "kana": (h.hiragana + h.katakana) / letters,
+            "hanzi": h.hanzi / letters,
+            "latin": h.latin / letters,
+            "vietnamese": h.vietnamese / letters,
+        }
+
 class MultilingualLanguageDetector(keras.Model):
     """
     다국어 언어 감지 및 문화 분석 모델
@@ -277,7 +618,8 @@ class MultilingualLanguageDetector(keras.Model):
         Args:
             inputs: {
                 'input_ids': (batch, seq_len),
-                'char_ids': (batch, seq_len, char_len)
+                'char_ids': (batch, seq_len, char_len),
+                'attention_mask': (batch, seq_len) - 선택, 패딩 위치 0
             }
             training: 학습 모드 여부
         Returns:
@@ -285,21 +627,29 @@ class MultilingualLanguageDetector(keras.Model):
         """
         input_ids = inputs['input_ids']
         
+        # 패딩 마스크 (있으면 패딩 길이와 무관한 출력)
+        attention_mask = inputs.get('attention_mask')
+        mask = tf.cast(attention_mask, tf.bool) if attention_mask is not None else None
+        
         # 토큰 임베딩
         token_emb = self.token_embedding(input_ids)
         
         # BiLSTM 처리
-        lstm_out = self.bilstm(token_emb, training=training)
+        lstm_out = self.bilstm(token_emb, training=training, mask=mask)
         
         # 언어 분류
-        language_probs = self.language_classifier(lstm_out)
+        language_probs = self.language_classifier(lstm_out, mask=mask)
         
         # 코드 스위칭 감지
-        pooled = tf.reduce_mean(lstm_out, axis=1)
+        if mask is None:
+            pooled = tf.reduce_mean(lstm_out, axis=1)
+        else:
+            weights = tf.cast(mask, lstm_out.dtype)[:, :, tf.newaxis]
+            pooled = tf.reduce_sum(lstm_out * weights, axis=1) / tf.maximum(tf.reduce_sum(weights, axis=1), 1.0)
         code_switch_prob = self.code_switch_detector(pooled)
         
         # 형식성 분류
-        formality_probs = self.formality_classifier(lstm_out)
+        formality_probs = self.formality_classifier(lstm_out, mask=mask)
         
         return {
             'language_probs': language_probs,
@@ -330,44 +680,109 @@ class MultilingualLanguageDetector(keras.Model):
             
         return final_result
 
-    def _rule_based_detection(self, text: str) -> LanguageDetectionResult:
+    def detect_language_batch(self, texts: Sequence[str]) -> LanguageDetectionBatch:
+        """
+        배치 언어 감지 (규칙 기반)
+        전체 텍스트를 한 번의 코드포인트 패스로 히스토그램화한 뒤
+        점수를 행렬 연산으로 계산한다.
+        Args:
+            texts: 입력 텍스트 목록
+        Returns:
+            LanguageDetectionBatch
+        """
+        histograms = compute_script_histograms(texts)
+        return self._scores_from_histograms(texts, histograms)
+
+    def _scores_from_histograms(self, texts: Sequence[str], histograms: np.ndarray) -> LanguageDetectionBatch:
+        """히스토그램 행렬에서 _rule_based_detection과 동일한 점수 계산"""
+        h = histograms
+        total = h.sum(axis=1)
+        hanzi = h[:, _BUCKET_HANZI] + h[:, _BUCKET_HANZI_SIMPLIFIED] + h[:, _BUCKET_HANZI_TRADITIONAL]
+        kana = h[:, _BUCKET_HIRAGANA] + h[:, _BUCKET_KATAKANA]
+        vietnamese = h[:, _BUCKET_VIETNAMESE] + h[:, _BUCKET_VIETNAMESE_A]
+        latin = h[:, _BUCKET_LATIN]
+        safe_total = np.maximum(total, 1)
+
+        def ratio(count: np.ndarray, mask: np.ndarray) -> np.ndarray:
+            return np.where(mask, count / safe_total, 0.0)
+
+        ko = ratio(h[:, _BUCKET_HANGUL], h[:, _BUCKET_HANGUL] > 0)
+        ja = ratio(kana, kana > 0)
+        has_hanzi = (hanzi > 0) & (ko < 0.1) & (ja < 0.1)
+        simplified_wins = h[:, _BUCKET_HANZI_SIMPLIFIED] > h[:, _BUCKET_HANZI_TRADITIONAL]
+        zh = ratio(hanzi, has_hanzi & simplified_wins)
+        zh_tw = ratio(hanzi, has_hanzi & ~simplified_wins)
+        vi = ratio(vietnamese, vietnamese > 0)
+
+        # 영어 점수 - 합산 순서는 _rule_based_detection과 동일하게 유지
+        others = (((ko + ja) + zh) + zh_tw) + vi
+        en = np.zeros(len(texts))
+        for i in np.flatnonzero((latin > 0) & (others < 0.3)).tolist():
+            english_words = len(_ENGLISH_WORD_PATTERN.findall(texts[i].lower()))
+            en[i] = latin[i] / total[i] * 0.5 + min(english_words / 10, 0.5)
+
+        # 열 순서: SupportedLanguage 정의 순서
+        scores = np.stack([ko, en, ja, zh, zh_tw, vi], axis=1)
+        primary = np.argmax(scores, axis=1)
+        script_type = np.select(
+            [
+                h[:, _BUCKET_HANGUL] > 0,
+                h[:, _BUCKET_HIRAGANA] > 0,
+                h[:, _BUCKET_KATAKANA] > 0,
+                hanzi > 0,
+                h[:, _BUCKET_VIETNAMESE_A] > 0,
+            ],
+            [0, 1, 2, 3, 4],
+            default=5
+        )
+
+        return LanguageDetectionBatch(
+            languages=tuple(lang.value for lang in _SUPPORTED_LANGUAGES),
+            scores=scores,
+            primary=primary.astype(np.int8),
+            confidence=scores[np.arange(len(texts)), primary],
+            script_type=script_type.astype(np.int8),
+            is_mixed=(scores > 0.1).sum(axis=1) > 1
+        )
+
+    def _rule_based_detection(
+        self,
+        text: str,
+        histogram: Optional[ScriptHistogram] = None
+    ) -> LanguageDetectionResult:
         """규칙 기반 언어 감지"""
-        scores = {lang: 0.0 for lang in SupportedLanguage}
-        detected_phrases = {lang.value: [] for lang in SupportedLanguage}
+        if histogram is None:
+            histogram = compute_script_histogram(text)
+        scores = {lang: 0.0 for lang in _SUPPORTED_LANGUAGES}
+        detected_phrases = {lang.value: [] for lang in _SUPPORTED_LANGUAGES}
+        text_length = histogram.total
         
         # 한국어 감지
-        korean_chars = len(re.findall(r'[가-힣]', text))
-        if korean_chars > 0:
-            scores[SupportedLanguage.KOREAN] = korean_chars / len(text) if text else 0
+        if histogram.hangul > 0:
+            scores[SupportedLanguage.KOREAN] = histogram.hangul / text_length
             
         # 일본어 감지 (히라가나/카타카나)
-        hiragana = len(re.findall(r'[\u3040-\u309F]', text))
-        katakana = len(re.findall(r'[\u30A0-\u30FF]', text))
-        if hiragana + katakana > 0:
-            scores[SupportedLanguage.JAPANESE] = (hiragana + katakana) / len(text) if text else 0
+        kana = histogram.hiragana + histogram.katakana
+        if kana > 0:
+            scores[SupportedLanguage.JAPANESE] = kana / text_length
             
         # 중국어 감지 (한자)
-        chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
         # 한국어/일본어가 아닌 경우의 한자
-        if chinese_chars > 0 and scores[SupportedLanguage.KOREAN] < 0.1 and scores[SupportedLanguage.JAPANESE] < 0.1:
+        if histogram.hanzi > 0 and scores[SupportedLanguage.KOREAN] < 0.1 and scores[SupportedLanguage.JAPANESE] < 0.1:
             # 간체/번체 구분
-            simplified = len(re.findall(r'[们这那国学为会]', text))
-            traditional = len(re.findall(r'[們這國學為會]', text))
-            if simplified > traditional:
-                scores[SupportedLanguage.CHINESE_SIMPLIFIED] = chinese_chars / len(text) if text else 0
+            if histogram.simplified > histogram.traditional:
+                scores[SupportedLanguage.CHINESE_SIMPLIFIED] = histogram.hanzi / text_length
             else:
-                scores[SupportedLanguage.CHINESE_TRADITIONAL] = chinese_chars / len(text) if text else 0
+                scores[SupportedLanguage.CHINESE_TRADITIONAL] = histogram.hanzi / text_length
                 
         # 베트남어 감지
-        vietnamese_chars = len(re.findall(r'[àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđĐ]', text))
-        if vietnamese_chars > 0:
-            scores[SupportedLanguage.VIETNAMESE] = vietnamese_chars / len(text) if text else 0
+        if histogram.vietnamese > 0:
+            scores[SupportedLanguage.VIETNAMESE] = histogram.vietnamese / text_length
             
-        # 영어 감지
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
-        english_words = len(re.findall(r'\b(the|is|are|was|were|have|has|been|I|you|we|they|it|this|that)\b', text.lower()))
-        if english_chars > 0 and sum([scores[lang] for lang in scores if lang != SupportedLanguage.ENGLISH]) < 0.3:
-            scores[SupportedLanguage.ENGLISH] = (english_chars / len(text) * 0.5 + min(english_words / 10, 0.5)) if text else 0
+        # 영어 감지 (기능어 검색은 영어 점수가 필요한 경우에만 수행)
+        if histogram.latin > 0 and sum([scores[lang] for lang in scores if lang != SupportedLanguage.ENGLISH]) < 0.3:
+            english_words = len(_ENGLISH_WORD_PATTERN.findall(text.lower()))
+            scores[SupportedLanguage.ENGLISH] = histogram.latin / text_length * 0.5 + min(english_words / 10, 0.5)
             
         # 결과 정렬
         sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
@@ -381,7 +796,7 @@ class MultilingualLanguageDetector(keras.Model):
             primary_language=primary[0].value,
             confidence=primary[1],
             secondary_languages=[(lang.value, score) for lang, score in sorted_scores[1:] if score > 0.05],
-            script_type=self._detect_script_type(text),
+            script_type=self._detect_script_type(text, histogram),
             is_mixed=is_mixed,
             code_switching_detected=is_mixed,
             detected_phrases=detected_phrases
@@ -389,48 +804,103 @@ class MultilingualLanguageDetector(keras.Model):
 
     def _model_based_detection(self, text: str, tokenizer: Any) -> LanguageDetectionResult:
         """모델 기반 언어 감지"""
-        # 토큰화
+        return self._model_based_detection_batch([text], tokenizer)[0]
+
+    def _model_based_detection_batch(
+        self,
+        texts: Sequence[str],
+        tokenizer: Any,
+        batch_size: int = 64
+    ) -> List[LanguageDetectionResult]:
+        """모델 기반 배치 언어 감지"""
+        lang_probs, code_switch = self.predict_language_probs(texts, tokenizer, batch_size)
+        histograms = compute_script_histograms(texts)
+        
+        results = []
+        for i, text in enumerate(texts):
+            sorted_indices = np.argsort(lang_probs[i])[::-1]
+            primary_lang = _MODEL_LANGUAGES[sorted_indices[0]]
+            primary_conf = float(lang_probs[i][sorted_indices[0]])
+            
+            secondary = [
+                (_MODEL_LANGUAGES[idx], float(lang_probs[i][idx]))
+                for idx in sorted_indices[1:]
+                if lang_probs[i][idx] > 0.05
+            ]
+            
+            results.append(LanguageDetectionResult(
+                primary_language=primary_lang,
+                confidence=primary_conf,
+                secondary_languages=secondary,
+                script_type=self._detect_script_type(text, ScriptHistogram.from_counts(histograms[i].tolist())),
+                is_mixed=bool(code_switch[i] > 0.5),
+                code_switching_detected=bool(code_switch[i] > 0.5),
+                detected_phrases={}
+            ))
+        return results
+
+    def predict_language_probs(
+        self,
+        texts: Sequence[str],
+        tokenizer: Any,
+        batch_size: int = 64
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        신경망 언어 분류 헤드 배치 추론
+        max_length 고정 패딩 대신 길이 버킷별 동적 패딩을 사용한다.
+        Args:
+            texts: 입력 텍스트 목록
+            tokenizer: 토크나이저 (HuggingFace 호환 호출 규약)
+            batch_size: 추론 배치 크기
+        Returns:
+            (언어 확률 (n, num_languages), 코드 스위칭 확률 (n,))
+        """
+        lang_probs = np.zeros((len(texts), self.num_languages), dtype=np.float32)
+        code_switch = np.zeros(len(texts), dtype=np.float32)
+        if not texts:
+            return lang_probs, code_switch
+            
+        # 패딩 없이 토큰화
         encoded = tokenizer(
-            text,
+            list(texts),
             max_length=self.max_length,
-            padding='max_length',
-            truncation=True,
-            return_tensors='tf'
+            padding=False,
+            truncation=True
         )
+        token_ids = encoded['input_ids']
+        pad_id = getattr(tokenizer, 'pad_token_id', None) or 0
         
-        # 모델 추론
-        outputs = self({
-            'input_ids': encoded['input_ids']
-        }, training=False)
-        
-        # 언어 확률 추출
-        lang_probs = outputs['language_probs'][0].numpy()
-        code_switch = outputs['code_switch_prob'][0].numpy()[0]
-        
-        # 언어 매핑
-        lang_map = {
-            0: "ko", 1: "en", 2: "ja", 3: "zh", 4: "zh-TW", 5: "vi"
-        }
-        
-        sorted_indices = np.argsort(lang_probs)[::-1]
-        primary_lang = lang_map[sorted_indices[0]]
-        primary_conf = float(lang_probs[sorted_indices[0]])
-        
-        secondary = [
-            (lang_map[idx], float(lang_probs[idx]))
-            for idx in sorted_indices[1:]
-            if lang_probs[idx] > 0.05
-        ]
+        # 길이 버킷별 그룹화 (길이순 정렬 후 버킷 경계까지만 패딩)
+        lengths = np.array([max(1, len(ids)) for ids in token_ids])
+        buckets = np.array([self._length_bucket(length) for length in lengths])
+        order = np.lexsort((lengths, buckets))
         
-        return LanguageDetectionResult(
-            primary_language=primary_lang,
-            confidence=primary_conf,
-            secondary_languages=secondary,
-            script_type=self._detect_script_type(text),
-            is_mixed=code_switch > 0.5,
-            code_switching_detected=code_switch > 0.5,
-            detected_phrases={}
-        )
+        for bucket in np.unique(buckets):
+            bucket_indices = order[buckets[order] == bucket]
+            for start in range(0, len(bucket_indices), batch_size):
+                chunk = bucket_indices[start:start + batch_size]
+                input_ids = np.full((len(chunk), bucket), pad_id, dtype=np.int32)
+                attention_mask = np.zeros((len(chunk), bucket), dtype=np.int32)
+                for row, idx in enumerate(chunk):
+                    ids = token_ids[idx][:bucket]
+                    input_ids[row, :len(ids)] = ids
+                    attention_mask[row, :lengths[idx]] = 1
+                    
+                outputs = self({
+                    'input_ids': tf.constant(input_ids),
+                    'attention_mask': tf.constant(attention_mask)
+                }, training=False)
+                lang_probs[chunk] = outputs['language_probs'].numpy()
+                code_switch[chunk] = outputs['code_switch_prob'].numpy()[:, 0]
+                
+        return lang_probs, code_switch
+
+    def _length_bucket(self, length: int) -> int:
+        """토큰 길이에 해당하는 패딩 버킷 (2의 거듭제곱, 최대 max_length)"""
+        for boundary in _LENGTH_BUCKETS:
+            if length <= boundary:
+                return min(boundary, self.max_length)
+        return self.max_length
 
     def _ensemble_results(
         self,
@@ -464,17 +934,19 @@ class MultilingualLanguageDetector(keras.Model):
             else:
                 return model_based
 
-    def _detect_script_type(self, text: str) -> str:
+    def _detect_script_type(self, text: str, histogram: Optional[ScriptHistogram] = None) -> str:
         """문자 체계 감지"""
-        if re.search(r'[가-힣]', text):
+        if histogram is None:
+            histogram = compute_script_histogram(text)
+        if histogram.hangul:
             return "hangul"
-        elif re.search(r'[\u3040-\u309F]', text):
+        elif histogram.hiragana:
             return "hiragana"
-        elif re.search(r'[\u30A0-\u30FF]', text):
+        elif histogram.katakana:
             return "katakana"
-        elif re.search(r'[\u4e00-\u9fff]', text):
+        elif histogram.hanzi:
             return "hanzi"
-        elif re.search(r'[àáảãạăằắẳẵặâầấẩẫậ]', text):
+        elif histogram.vietnamese_a:
             return "vietnamese_latin"
         else:
             return "latin"
@@ -494,9 +966,10 @@ class MultilingualLanguageDetector(keras.Model):
             self.cultural_contexts["en"] # 기본값
         )
         
-        # 텍스트에서 추가 문화적 단서 분석
-        formality = self._analyze_formality(text, detected_language)
-        emotional_style = self._analyze_emotional_style(text, detected_language)
+        # 텍스트에서 추가 문화적 단서 분석 (마커 1회 스캔)
+        marker_counts = _scan_markers(text)
+        formality = _classify_formality(marker_counts, detected_language)
+        emotional_style = _classify_emotional_style(marker_counts, len(text))
         
         # 컨텍스트 업데이트
         return CulturalContext(
@@ -512,54 +985,48 @@ class MultilingualLanguageDetector(keras.Model):
             preferred_honorifics=base_context.preferred_honorifics
         )
 
+    def analyze_cultural_context_batch(
+        self,
+        texts: Sequence[str],
+        languages: Optional[Union[LanguageDetectionBatch, Sequence[str]]] = None
+    ) -> CulturalContextBatch:
+        """
+        배치 문화적 컨텍스트 분석
+        Args:
+            texts: 입력 텍스트 목록
+            languages: 감지된 언어 코드 목록 또는 LanguageDetectionBatch
+                       (None이면 detect_language_batch 결과 사용)
+        Returns:
+            CulturalContextBatch
+        """
+        if languages is None:
+            languages = self.detect_language_batch(texts)
+        if isinstance(languages, LanguageDetectionBatch):
+            language_codes = languages.primary_languages
+        else:
+            language_codes = np.asarray(languages, dtype=object)
+
+        formality = np.empty(len(texts), dtype=np.int8)
+        emotional_style = np.empty(len(texts), dtype=np.int8)
+        for i, text in enumerate(texts):
+            counts = _scan_markers(text)
+            formality[i] = FORMALITY_LEVELS.index(_classify_formality(counts, language_codes[i]))
+            emotional_style[i] = EMOTIONAL_STYLES.index(_classify_emotional_style(counts, len(text)))
+
+        return CulturalContextBatch(
+            languages=language_codes,
+            formality=formality,
+            emotional_style=emotional_style,
+            base_contexts=self.cultural_contexts
+        )
+
     def _analyze_formality(self, text: str, language: str) -> str:
         """형식성 분석"""
-        if language == "ko":
-            # 한국어 형식성
-            formal_markers = ["습니다", "입니다", "세요", "시"]
-            informal_markers = ["어", "야", "냐", "ㅋ", "ㅎ"]
-            
-            formal_count = sum(1 for m in formal_markers if m in text)
-            informal_count = sum(1 for m in informal_markers if m in text)
-            
-            if formal_count > informal_count:
-                return "formal"
-            elif informal_count > formal_count:
-                return "informal"
-            else:
-                return "mixed"
-                
-        elif language == "ja":
-            # 일본어 형식성
-            formal_markers = ["です", "ます", "ございます"]
-            informal_markers = ["だ", "よ", "ね"]
-            
-            formal_count = sum(1 for m in formal_markers if m in text)
-            informal_count = sum(1 for m in informal_markers if m in text)
-            
-            if formal_count > informal_count:
-                return "formal"
-            elif informal_count > formal_count:
-                return "informal"
-            else:
-                return "mixed"
-        else:
-            return "neutral"
+        return _classify_formality(_scan_markers(text), language)
 
     def _analyze_emotional_style(self, text: str, language: str) -> str:
         """감정 표현 스타일 분석"""
-        # 감정 표현 마커
-        expressive_markers = ["!", "!!", "...", "ㅜㅜ", "ㅠㅠ", "😢", "😭"]
-        reserved_indicators = len(text) > 50 and text.count("!") < 2
-        
-        expressive_count = sum(1 for m in expressive_markers if m in text)
-        
-        if expressive_count > 3:
-            return "expressive"
-        elif reserved_indicators:
-            return "reserved"
-        else:
-            return "moderate"
+        return _classify_emotional_style(_scan_markers(text), len(text))
 
     def get_therapeutic_recommendations(
         self,
@@ -619,6 +1086,128 @@ class MultilingualLanguageDetector(keras.Model):
             
         return recommendations
 
+class SessionLanguageTracker:
+    """
+    세션 단위 언어 상태 추적
+    세션 언어가 연속으로 확인된 뒤에는 새 메시지의 문자 체계 비율만 확인하고
+    전체 감지(규칙 점수 계산 / 모델 추론)를 생략한다.
+    혼합 문자나 코드 스위칭이 보이면 전체 감지로 되돌아간다.
+    """
+
+    def __init__(
+        self,
+        detector: MultilingualLanguageDetector,
+        min_stable_turns: int = 2,
+        min_script_share: float = 0.9,
+        min_confidence: float = 0.3
+    ):
+        self.detector = detector
+        self.min_stable_turns = min_stable_turns
+        self.min_script_share = min_script_share
+        self.min_confidence = min_confidence
+        self.sessions: Dict[str, SessionLanguageState] = {}
+        self.metrics: Dict[str, Any] = {
+            "turns": 0,
+            "fast_path_hits": 0,
+            "full_detections": 0,
+            "language_switches": 0,
+            "code_switch_events": 0,
+            "fallback_reasons": Counter()
+        }
+
+    def observe(
+        self,
+        session_id: str,
+        text: str,
+        tokenizer: Any = None
+    ) -> Tuple[LanguageDetectionResult, CulturalContext]:
+        """
+        세션 메시지 언어 감지 + 문화 컨텍스트 분석
+        Args:
+            session_id: 세션 ID
+            text: 사용자 메시지
+            tokenizer: 전체 감지 시 사용할 토크나이저 (None이면 규칙 기반)
+        Returns:
+            (LanguageDetectionResult, CulturalContext)
+        """
+        state = self.sessions.setdefault(session_id, SessionLanguageState())
+        counts = _script_bucket_counts(text)
+        state.script_counts += counts
+        state.turns += 1
+        self.metrics["turns"] += 1
+
+        fallback_reason = self._fast_path_blocker(state, counts)
+        if fallback_reason is None:
+            # 빠른 경로: 세션 언어 유지, 문자 체계만 갱신
+            state.fast_path_hits += 1
+            self.metrics["fast_path_hits"] += 1
+            result = replace(
+                state.last_result,
+                script_type=self.detector._detect_script_type(text, ScriptHistogram.from_counts(counts))
+            )
+        else:
+            self.metrics["full_detections"] += 1
+            self.metrics["fallback_reasons"][fallback_reason] += 1
+            if tokenizer is None:
+                result = self.detector._rule_based_detection(text, ScriptHistogram.from_counts(counts))
+            else:
+                result = self.detector.detect_language(text, tokenizer)
+            self._update_state(state, result)
+
+        context = self.detector.analyze_cultural_context(text, result.primary_language)
+        return result, context
+
+    def _fast_path_blocker(self, state: SessionLanguageState, counts: List[int]) -> Optional[str]:
+        """빠른 경로를 막는 사유 (None이면 빠른 경로 사용)"""
+        if state.language is None:
+            return "cold_start"
+        if state.stable_turns < self.min_stable_turns:
+            return "unstable"
+        if _language_script_share(counts, state.language) < self.min_script_share:
+            return "script_mismatch"
+        if not _has_distinctive_script(counts, state.language):
+            return "missing_distinctive_script"
+        return None
+
+    def _update_state(self, state: SessionLanguageState, result: LanguageDetectionResult):
+        """전체 감지 결과로 세션 상태 갱신"""
+        if result.code_switching_detected or result.is_mixed:
+            # 코드 스위칭: 다음 턴도 전체 감지
+            self.metrics["code_switch_events"] += 1
+            state.stable_turns = 0
+        elif result.confidence < self.min_confidence:
+            state.stable_turns = 0
+        elif result.primary_language == state.language:
+            state.stable_turns += 1
+        else:
+            if state.language is not None:
+                self.metrics["language_switches"] += 1
+            state.stable_turns = 1
+        state.language = result.primary_language
+        state.last_result = result
+
+    def get_state(self, session_id: str) -> Optional[SessionLanguageState]:
+        """세션 언어 상태 조회"""
+        return self.sessions.get(session_id)
+
+    def end_session(self, session_id: str):
+        """세션 상태 제거"""
+        self.sessions.pop(session_id, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """빠른 경로 적중률 등 지표"""
+        turns = self.metrics["turns"]
+        return {
+            "turns": turns,
+            "fast_path_hits": self.metrics["fast_path_hits"],
+            "full_detections": self.metrics["full_detections"],
+            "hit_rate": self.metrics["fast_path_hits"] / turns if turns else 0.0,
+            "language_switches": self.metrics["language_switches"],
+            "code_switch_events": self.metrics["code_switch_events"],
+            "fallback_reasons": dict(self.metrics["fallback_reasons"]),
+            "active_sessions": len(self.sessions)
+        }
+
 # 테스트 코드
 if __name__ == "__main__":
     # 모델 초기화
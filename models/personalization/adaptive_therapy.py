@@ -6,12 +6,20 @@ Phase 3: 고급 개인화 및 장기 기억
 import tensorflow as tf
 from tensorflow import keras
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from datetime import datetime, timedelta
 import numpy as np
 import json
-from collections import defaultdict
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+
+from models.personalization.memory_index import (
+    Embedder, FlatIndex, HashingEmbedder, IVFIndex, load_indexes, save_indexes
+)
+from models.personalization.persistent_store import LazyUserMap, PersonalizationStorage
+from models.personalization.time_series import SymptomSeries
 
 class TherapeuticApproach(Enum):
     """치료적 접근법"""
@@ -84,8 +92,8 @@ class TherapeuticProgress:
     therapeutic_alliance_score: float = 0.0
     
     # 증상 추적
-    symptom_trajectory: List[Dict[str, float]] = field(default_factory=list)
-    mood_trend: str = "stable"
+    symptom_trajectory: SymptomSeries = field(default_factory=SymptomSeries)
+    mood_trend: str = "stable" # improving / worsening / stable (최근 증상 수준 기울기)
     
     # 목표 달성
     goals_achieved: List[str] = field(default_factory=list)
@@ -106,21 +114,413 @@ class AdaptationRecommendation:
     pacing_recommendation: str
     focus_areas: List[str]
 
+def _copy_recommendation(recommendation: AdaptationRecommendation) -> AdaptationRecommendation:
+    """캐시된 권고의 목록을 호출자가 수정해도 캐시가 바뀌지 않도록 복사"""
+    return AdaptationRecommendation(
+        recommended_approach=recommendation.recommended_approach,
+        confidence=recommendation.confidence,
+        reasoning=recommendation.reasoning,
+        specific_techniques=list(recommendation.specific_techniques),
+        communication_adjustments=list(recommendation.communication_adjustments),
+        pacing_recommendation=recommendation.pacing_recommendation,
+        focus_areas=list(recommendation.focus_areas)
+    )
+
+# 기억 시각은 naive datetime 기준 마이크로초 정수로 저장 (timedelta.days 와 동일한 일수 계산)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+def _to_microseconds(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+# 영구 저장용 직렬화 (datetime -> ISO 문자열, Enum -> 값)
+def _document_from(obj: Any) -> Dict[str, Any]:
+    document = {}
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, SymptomSeries):
+            value = value.to_document()
+        document[f.name] = value
+    return document
+
+def _profile_from_document(document: Dict[str, Any]) -> UserProfile:
+    data = dict(document)
+    data['created_at'] = datetime.fromisoformat(data['created_at'])
+    if data.get('preferred_approach'):
+        data['preferred_approach'] = TherapeuticApproach(data['preferred_approach'])
+    return UserProfile(**data)
+
+def _progress_from_document(document: Dict[str, Any]) -> TherapeuticProgress:
+    data = dict(document)
+    data['start_date'] = datetime.fromisoformat(data['start_date'])
+    # 이전 형식 ({'date', 'level'} 목록) 도 읽음
+    data['symptom_trajectory'] = SymptomSeries.from_document(data.get('symptom_trajectory'))
+    return TherapeuticProgress(**data)
+
+def _memory_record(memory: EmotionalMemory) -> Dict[str, Any]:
+    return {
+        'timestamp': _to_microseconds(memory.timestamp),
+        'emotion': memory.emotion,
+        'intensity': memory.intensity,
+        'trigger': memory.trigger,
+        'context': memory.context,
+        'coping_used': memory.coping_used,
+        'effectiveness': memory.effectiveness,
+    }
+
+def _memory_from_record(record: Dict[str, Any]) -> EmotionalMemory:
+    return EmotionalMemory(
+        timestamp=_EPOCH + timedelta(microseconds=record['timestamp']),
+        emotion=record['emotion'],
+        intensity=record['intensity'],
+        trigger=record.get('trigger'),
+        context=record.get('context') or {},
+        coping_used=record.get('coping_used'),
+        effectiveness=record.get('effectiveness')
+    )
+
+class MemoryColumns:
+    """
+    사용자별 기억 열 저장소
+    관련성 계산에 쓰이는 필드를 NumPy 배열로 보관 (용량 2배씩 증가)
+    """
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.emotion_ids = np.zeros(capacity, dtype=np.int32)
+        self.intensities = np.zeros(capacity, dtype=np.float64)
+        self.trigger_ids = np.full(capacity, -1, dtype=np.int32) # -1: 트리거 없음
+        self.emotion_vocab: Dict[str, int] = {}
+        self.trigger_vocab: Dict[str, int] = {}
+
+    def append(self, memory: EmotionalMemory):
+        if self.size == len(self.timestamps):
+            self._grow()
+        i = self.size
+        self.timestamps[i] = _to_microseconds(memory.timestamp)
+        self.emotion_ids[i] = self.emotion_vocab.setdefault(memory.emotion, len(self.emotion_vocab))
+        self.intensities[i] = memory.intensity
+        self.trigger_ids[i] = (
+            self.trigger_vocab.setdefault(memory.trigger, len(self.trigger_vocab))
+            if memory.trigger else -1
+        )
+        self.size += 1
+
+    def _grow(self):
+        capacity = len(self.timestamps) * 2
+        for name, fill in (("timestamps", 0), ("emotion_ids", 0), ("intensities", 0), ("trigger_ids", -1)):
+            old = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=old.dtype)
+            grown[:self.size] = old[:self.size]
+            setattr(self, name, grown)
+
+    def relevance(
+        self,
+        context: Dict[str, Any],
+        now: Optional[datetime] = None,
+        indices: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """관련성 점수 (_calculate_relevance 와 같은 가중치/연산 순서, indices 지정 시 해당 기억만)"""
+        rows = slice(0, self.size) if indices is None else indices
+        n = self.size if indices is None else len(indices)
+        relevance = np.zeros(n)
+        
+        # 감정 일치
+        emotion_id = self.emotion_vocab.get(context.get('current_emotion'))
+        if emotion_id is not None:
+            relevance[self.emotion_ids[rows] == emotion_id] = 0.4
+            
+        # 최근성
+        now_us = _to_microseconds(now or datetime.now())
+        days_ago = (now_us - self.timestamps[rows]) // _MICROSECONDS_PER_DAY
+        relevance += np.maximum(0, 1 - (days_ago / 365)) * 0.3
+        
+        # 트리거 유사성 (사용자의 고유 트리거마다 1회만 문자열 검사)
+        if self.trigger_vocab:
+            triggers_text = str(context.get('triggers', []))
+            trigger_hits = np.array(
+                [trigger in triggers_text for trigger in self.trigger_vocab] + [False]
+            )
+            # -1(트리거 없음)은 마지막 False 로 매핑
+            relevance += trigger_hits[self.trigger_ids[rows]] * 0.3
+            
+        return relevance
+
+class PatternState:
+    """
+    사용자 감정 패턴 누적 상태
+    기억 추가 시 O(1) 갱신 (전체 기억 재스캔 없음)
+    half_life 지정 시 시간 감쇠 가중치 합계도 함께 유지
+    """
+    # 감쇠 가중치 지수가 이 값을 넘으면 기준 시각을 옮겨 overflow 방지
+    _MAX_EXPONENT = 512.0
+
+    def __init__(self, half_life: Optional[timedelta] = None):
+        self.count = 0
+        self.intensity_sum = 0.0
+        self.emotion_counts: Dict[str, int] = {}
+        self.trigger_counts: Dict[str, int] = {}
+        self.dominant_emotion: Optional[str] = None
+        self.updated_at: Optional[datetime] = None
+        self.version = 0
+        
+        # 시간 감쇠: 가중치 w = 2^((t - anchor) / half_life) 로 누적, 조회 시 현재 시각 기준으로 환산
+        self.half_life_seconds = half_life.total_seconds() if half_life else None
+        self.anchor: Optional[float] = None
+        self.decayed_total = 0.0
+        self.decayed_intensity = 0.0
+        self.decayed_emotions: Dict[str, float] = {}
+        self.decayed_triggers: Dict[str, float] = {}
+
+    def add(self, memory: EmotionalMemory):
+        """기억 1건 반영"""
+        self.count += 1
+        self.intensity_sum += memory.intensity
+        
+        # 감정 빈도 / 주요 감정 (동점이면 먼저 등장한 감정 = max(dict) 와 동일)
+        emotion = memory.emotion
+        count = self.emotion_counts.get(emotion, 0) + 1
+        self.emotion_counts[emotion] = count
+        dominant = self.dominant_emotion
+        if dominant is None or count > self.emotion_counts[dominant] or (
+            count == self.emotion_counts[dominant] and self._first_seen_before(emotion, dominant)
+        ):
+            self.dominant_emotion = emotion
+            
+        # 트리거 빈도
+        if memory.trigger:
+            self.trigger_counts[memory.trigger] = self.trigger_counts.get(memory.trigger, 0) + 1
+            
+        if self.half_life_seconds:
+            self._add_decayed(memory)
+            
+        self.updated_at = datetime.now()
+        self.version += 1
+
+    def _first_seen_before(self, a: str, b: str) -> bool:
+        """감정 a 가 b 보다 먼저 등장했는지 (동점 주요 감정 판정, 드묾)"""
+        for emotion in self.emotion_counts:
+            if emotion == a:
+                return True
+            if emotion == b:
+                return False
+        return False
+
+    def _add_decayed(self, memory: EmotionalMemory):
+        """감쇠 가중치 합계 갱신"""
+        t = memory.timestamp.timestamp()
+        if self.anchor is None:
+            self.anchor = t
+        exponent = (t - self.anchor) / self.half_life_seconds
+        if exponent > self._MAX_EXPONENT:
+            self._rebase(t)
+            exponent = 0.0
+        weight = 2.0 ** exponent
+        self.decayed_total += weight
+        self.decayed_intensity += weight * memory.intensity
+        self.decayed_emotions[memory.emotion] = self.decayed_emotions.get(memory.emotion, 0.0) + weight
+        if memory.trigger:
+            self.decayed_triggers[memory.trigger] = self.decayed_triggers.get(memory.trigger, 0.0) + weight
+
+    def _rebase(self, anchor: float):
+        """기준 시각 이동 (모든 감쇠 합계를 새 기준으로 환산)"""
+        scale = 2.0 ** (-(anchor - self.anchor) / self.half_life_seconds)
+        self.anchor = anchor
+        self.decayed_total *= scale
+        self.decayed_intensity *= scale
+        for key in self.decayed_emotions:
+            self.decayed_emotions[key] *= scale
+        for key in self.decayed_triggers:
+            self.decayed_triggers[key] *= scale
+
+    def snapshot(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """패턴 사전 (감쇠 값은 now 기준 유효 빈도)"""
+        patterns = {
+            'dominant_emotion': self.dominant_emotion,
+            'emotion_distribution': dict(self.emotion_counts),
+            'common_triggers': dict(self.trigger_counts),
+            'average_intensity': self.intensity_sum / self.count,
+            'updated_at': self.updated_at
+        }
+        if self.half_life_seconds and self.decayed_total > 0:
+            now_ts = (now or datetime.now()).timestamp()
+            scale = 2.0 ** (-(now_ts - self.anchor) / self.half_life_seconds)
+            decayed_emotions = {k: v * scale for k, v in self.decayed_emotions.items()}
+            patterns.update({
+                'decayed_dominant_emotion': max(decayed_emotions, key=decayed_emotions.get),
+                'decayed_emotion_distribution': decayed_emotions,
+                'decayed_common_triggers': {k: v * scale for k, v in self.decayed_triggers.items()},
+                'decayed_average_intensity': self.decayed_intensity / self.decayed_total,
+                'half_life_days': self.half_life_seconds / 86400
+            })
+        return patterns
+
+class CopingIndex:
+    """
+    사용자 대처 기법 효과 색인
+    - 기법별 사용 횟수 / 평가 횟수 / 평균 효과 / 최근성 가중 평균 효과를 O(1) 갱신
+    - 가중 평균은 모든 가중치가 시간에 따라 같은 비율로 줄어드므로 조회 시각과 무관,
+      따라서 순위는 해당 기법이 갱신될 때만 바뀜 -> 정렬 목록 유지, 상위 k개 조회 O(k)
+    """
+    _MAX_EXPONENT = 512.0
+
+    def __init__(self, half_life: timedelta = timedelta(days=90)):
+        self.half_life_seconds = half_life.total_seconds()
+        self.count = 0 # 반영한 기억 수
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.anchor: Optional[float] = None
+        # (-가중 평균 효과, -평가 횟수, 최초 등장 순서, 기법) 오름차순 = 순위
+        self._ranked: List[Tuple[float, int, int, str]] = []
+
+    def add(self, memory: EmotionalMemory):
+        """기억 1건 반영 (대처 기법이 없는 기억은 개수만 증가)"""
+        self.count += 1
+        name = memory.coping_used
+        if not name:
+            return
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = {
+                'order': len(self.stats), 'uses': 0, 'rated': 0, 'effectiveness_sum': 0.0,
+                'weight': 0.0, 'weighted_sum': 0.0, 'last_used': memory.timestamp
+            }
+            self.stats[name] = stats
+        stats['uses'] += 1
+        stats['last_used'] = max(stats['last_used'], memory.timestamp)
+        if memory.effectiveness is None:
+            return
+            
+        # 가중치 계산이 기준 시각 이동(순위 재구성)을 일으킬 수 있으므로 기존 순위 제거보다 먼저
+        weight = self._weight(memory.timestamp)
+        if stats['rated'] and stats['weight'] > 0:
+            del self._ranked[bisect_left(self._ranked, self._key(name, stats))]
+        stats['rated'] += 1
+        stats['effectiveness_sum'] += memory.effectiveness
+        stats['weight'] += weight
+        stats['weighted_sum'] += weight * memory.effectiveness
+        insort(self._ranked, self._key(name, stats))
+
+    @staticmethod
+    def _key(name: str, stats: Dict[str, Any]) -> Tuple[float, int, int, str]:
+        return (-stats['weighted_sum'] / stats['weight'], -stats['rated'], stats['order'], name)
+
+    def _weight(self, timestamp: datetime) -> float:
+        """최근성 가중치 2^((t - anchor) / half_life)"""
+        t = timestamp.timestamp()
+        if self.anchor is None:
+            self.anchor = t
+        exponent = (t - self.anchor) / self.half_life_seconds
+        if exponent > self._MAX_EXPONENT:
+            self._rebase(t)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rebase(self, anchor: float):
+        """기준 시각 이동 (가중치 재환산 후 순위 재구성)"""
+        scale = 2.0 ** (-(anchor - self.anchor) / self.half_life_seconds)
+        self.anchor = anchor
+        for stats in self.stats.values():
+            stats['weight'] *= scale
+            stats['weighted_sum'] *= scale
+        # 너무 오래된 평가는 가중치가 0 으로 소멸 -> 평균 없음, 순위에서 제외
+        self._ranked = sorted(
+            self._key(name, stats) for name, stats in self.stats.items() if stats['rated'] and stats['weight'] > 0
+        )
+
+    def top(self, k: int, min_effectiveness: float = 0.0) -> List[Dict[str, Any]]:
+        """최근성 가중 평균 효과 상위 k개 (min_effectiveness 초과만)"""
+        results = []
+        for neg_score, _, _, name in self._ranked:
+            if len(results) >= k or -neg_score <= min_effectiveness:
+                break
+            stats = self.stats[name]
+            results.append({
+                'name': name,
+                'effectiveness': -neg_score,
+                'mean_effectiveness': stats['effectiveness_sum'] / stats['rated'],
+                'uses': stats['uses'],
+                'rated': stats['rated'],
+                'last_used': stats['last_used']
+            })
+        return results
+
+# 기억/질의 임베딩에 쓰이는 맥락 텍스트 필드
+_MEMORY_TEXT_FIELDS = ('text', 'message', 'summary')
+_QUERY_TEXT_FIELDS = ('query', 'text', 'message')
+
+def _memory_text(memory: EmotionalMemory) -> str:
+    parts = [memory.emotion, memory.trigger or '', memory.coping_used or '']
+    parts.extend(str(memory.context[key]) for key in _MEMORY_TEXT_FIELDS if memory.context.get(key))
+    return ' '.join(part for part in parts if part)
+
 class LongTermMemoryStore:
     """
     장기 기억 저장소
     벡터 DB 기반 사용자 기억 관리
+    - 기억은 저장 시 임베딩되어 사용자별 벡터 인덱스(기본 IVF)에 추가
+    - 질의 텍스트가 있으면 의미 유사도를 감정/최근성/트리거 점수와 혼합
     """
-    def __init__(self, embedding_dim: int = 1536):
-        self.embedding_dim = embedding_dim
+    def __init__(
+        self,
+        embedding_dim: int = 1536,
+        pattern_half_life: Optional[timedelta] = None,
+        embedder: Optional[Embedder] = None,
+        coping_half_life: timedelta = timedelta(days=90),
+        index_factory: Optional[Any] = None,
+        semantic_weight: float = 0.5,
+        semantic_candidates: int = 50
+    ):
+        self.embedder = embedder or HashingEmbedder(embedding_dim)
+        self.embedding_dim = self.embedder.dim
+        self.index_factory = index_factory or IVFIndex # dim -> 인덱스
+        self.semantic_weight = semantic_weight
+        self.semantic_candidates = semantic_candidates # 혼합 점수를 계산할 의미 검색 후보 수
+        self.indexes: Dict[str, FlatIndex] = {}
+        self.pattern_half_life = pattern_half_life
+        self.coping_half_life = coping_half_life
+        self.coping_indexes: Dict[str, CopingIndex] = {}
         self.memories: Dict[str, List[EmotionalMemory]] = defaultdict(list)
+        self.columns: Dict[str, MemoryColumns] = {}
+        self.pattern_states: Dict[str, PatternState] = {}
         self.patterns: Dict[str, Dict[str, Any]] = {}
+        self._pattern_versions: Dict[str, int] = {} # patterns 캐시가 만들어진 상태 버전
 
     def store_memory(self, user_id: str, memory: EmotionalMemory):
         """기억 저장"""
         self.memories[user_id].append(memory)
-        # 패턴 업데이트
+        # 열 저장소 / 벡터 인덱스에 새 기억 반영
+        self._user_columns(user_id)
+        self._user_index(user_id)
+        # 패턴 / 대처 기법 색인 업데이트
         self._update_patterns(user_id)
+        self._update_coping(user_id)
+
+    def _user_columns(self, user_id: str) -> MemoryColumns:
+        """사용자 열 저장소 (기억 목록이 외부에서 바뀌었으면 재구성)"""
+        columns = self.columns.get(user_id)
+        user_memories = self.memories.get(user_id, [])
+        if columns is None or columns.size > len(user_memories):
+            columns = MemoryColumns()
+            self.columns[user_id] = columns
+        for memory in user_memories[columns.size:]:
+            columns.append(memory)
+        return columns
+
+    def _user_index(self, user_id: str) -> FlatIndex:
+        """사용자 벡터 인덱스 (아직 임베딩되지 않은 기억만 일괄 임베딩)"""
+        index = self.indexes.get(user_id)
+        user_memories = self.memories.get(user_id, [])
+        if index is None or index.size > len(user_memories):
+            index = self.index_factory(self.embedding_dim)
+            self.indexes[user_id] = index
+        if index.size < len(user_memories):
+            index.add(self.embedder.embed([_memory_text(m) for m in user_memories[index.size:]]))
+        return index
 
     def retrieve_relevant_memories(
         self,
@@ -128,23 +528,59 @@ class LongTermMemoryStore:
         current_context: Dict[str, Any],
         limit: int = 5
     ) -> List[EmotionalMemory]:
-        """관련 기억 검색"""
+        """
+        관련 기억 검색
+        - 질의 텍스트(query/text/message)가 없으면 벡터화 점수 + argpartition 상위 k개
+        - 있으면 벡터 인덱스 후보에 한해 의미 유사도 * semantic_weight 를 더해 재정렬
+        """
         user_memories = self.memories.get(user_id, [])
-        if not user_memories:
+        if not user_memories or limit <= 0:
             return []
             
-        # 관련성 점수 계산
-        scored_memories = []
-        for memory in user_memories:
-            relevance = self._calculate_relevance(memory, current_context)
-            scored_memories.append((memory, relevance))
+        # store_memory 에서 이미 동기화됨, 목록 직접 수정 시에만 추가 반영
+        columns = self._user_columns(user_id)
+        query = next((current_context[key] for key in _QUERY_TEXT_FIELDS if current_context.get(key)), None)
+        if query is None:
+            relevance = columns.relevance(current_context)
+            top = self._top_k(relevance, limit)
+            return [user_memories[i] for i in top]
             
-        # 정렬 및 반환
-        scored_memories.sort(key=lambda x: x[1], reverse=True)
-        return [m for m, _ in scored_memories[:limit]]
+        query_vector = self.embedder.embed([str(query)])[0]
+        candidates, similarity = self._user_index(user_id).search(
+            query_vector, max(limit, self.semantic_candidates)
+        )
+        relevance = columns.relevance(current_context, indices=candidates) + self.semantic_weight * similarity
+        top = candidates[self._top_k(relevance, limit)]
+        return [user_memories[i] for i in top]
+
+    def save_indexes(self, directory: str):
+        """사용자별 벡터 인덱스 저장"""
+        save_indexes(self.indexes, directory)
+
+    def load_indexes(self, directory: str):
+        """
+        저장된 벡터 인덱스 불러오기
+        기억 목록이 저장 시점과 같은 순서로 복원되었다고 가정, 차원이 다르거나 더 큰 인덱스는 버림
+        """
+        for user_id, index in load_indexes(directory).items():
+            if index.dim == self.embedding_dim and index.size <= len(self.memories.get(user_id, [])):
+                self.indexes[user_id] = index
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """점수 내림차순 상위 k개 인덱스 (동점은 먼저 저장된 기억 우선 = 안정 정렬과 동일)"""
+        n = len(scores)
+        if n > k:
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:k - len(above)]
+            candidates = np.concatenate([above, ties])
+        else:
+            candidates = np.arange(n)
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
 
     def _calculate_relevance(self, memory: EmotionalMemory, context: Dict[str, Any]) -> float:
-        """관련성 계산"""
+        """관련성 계산 (단일 기억)"""
         relevance = 0.0
         
         # 감정 일치
@@ -162,37 +598,53 @@ class LongTermMemoryStore:
             
         return relevance
 
-    def _update_patterns(self, user_id: str):
-        """패턴 업데이트"""
-        user_memories = self.memories[user_id]
-        if len(user_memories) < 5:
-            return
-            
-        # 감정 빈도 분석
-        emotion_counts = defaultdict(int)
-        for memory in user_memories:
-            emotion_counts[memory.emotion] += 1
-            
-        # 주요 패턴 식별
-        dominant_emotion = max(emotion_counts, key=emotion_counts.get)
-        
-        # 트리거 패턴
-        trigger_counts = defaultdict(int)
-        for memory in user_memories:
-            if memory.trigger:
-                trigger_counts[memory.trigger] += 1
-                
-        self.patterns[user_id] = {
-            'dominant_emotion': dominant_emotion,
-            'emotion_distribution': dict(emotion_counts),
-            'common_triggers': dict(trigger_counts),
-            'average_intensity': np.mean([m.intensity for m in user_memories]),
-            'updated_at': datetime.now()
-        }
+    def _update_patterns(self, user_id: str) -> PatternState:
+        """패턴 상태에 아직 반영되지 않은 기억만 누적 (기억 목록이 줄었으면 재구성)"""
+        user_memories = self.memories.get(user_id, [])
+        state = self.pattern_states.get(user_id)
+        if state is None or state.count > len(user_memories):
+            state = PatternState(self.pattern_half_life)
+            self.pattern_states[user_id] = state
+        for memory in user_memories[state.count:]:
+            state.add(memory)
+        return state
+
+    def _update_coping(self, user_id: str) -> CopingIndex:
+        """대처 기법 색인에 아직 반영되지 않은 기억만 누적 (기억 목록이 줄었으면 재구성)"""
+        user_memories = self.memories.get(user_id, [])
+        index = self.coping_indexes.get(user_id)
+        if index is None or index.count > len(user_memories):
+            index = CopingIndex(self.coping_half_life)
+            self.coping_indexes[user_id] = index
+        for memory in user_memories[index.count:]:
+            index.add(memory)
+        return index
+
+    def get_effective_coping(
+        self,
+        user_id: str,
+        limit: int = 3,
+        min_effectiveness: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """효과적이었던 대처 기법 (최근성 가중 평균 효과 내림차순)"""
+        if user_id not in self.memories:
+            return []
+        return self._update_coping(user_id).top(limit, min_effectiveness)
 
     def get_user_patterns(self, user_id: str) -> Dict[str, Any]:
-        """사용자 패턴 조회"""
-        return self.patterns.get(user_id, {})
+        """사용자 패턴 조회 (기억 5건 이상부터)"""
+        if user_id not in self.memories:
+            return {}
+        state = self._update_patterns(user_id)
+        if state.count < 5:
+            return {}
+        if state.half_life_seconds:
+            # 감쇠 값은 조회 시각에 따라 달라지므로 매번 계산
+            return state.snapshot()
+        if self._pattern_versions.get(user_id) != state.version:
+            self.patterns[user_id] = state.snapshot()
+            self._pattern_versions[user_id] = state.version
+        return self.patterns[user_id]
 
 class AdaptiveTherapyEngine:
     """
@@ -202,8 +654,20 @@ class AdaptiveTherapyEngine:
     - 개인화된 기법 선택
     - 진행 상황 기반 적응
     - 문화적 맥락 고려
+    - 영구 저장소 (storage 지정 시 사용자별 지연 로딩 + 쓰기 기록)
+    - 적응 권고 캐시 (프로파일/진행/패턴 버전 + 세션 상태 키, 변경 시 자동 무효화)
     """
-    def __init__(self):
+    # 사용자별로 보관하는 세션 상태 키 수
+    _MAX_SESSION_KEYS_PER_USER = 16
+    # mood_trend 판정에 쓰는 최근 증상 기록 수
+    _MOOD_TREND_POINTS = 8
+
+    def __init__(
+        self,
+        storage: Optional[PersonalizationStorage] = None,
+        recommendation_cache_size: int = 10000,
+        recommendation_verify_every: int = 0
+    ):
         # 장기 기억 저장소
         self.memory_store = LongTermMemoryStore()
         # 사용자 프로파일
@@ -211,10 +675,91 @@ class AdaptiveTherapyEngine:
         # 치료 진행 상황
         self.progress_tracking: Dict[str, TherapeuticProgress] = {}
         
+        # 영구 저장소: 사용자를 처음 조회할 때 프로파일/진행/기억을 한 번에 복원
+        self.storage = storage
+        if storage is not None:
+            self.user_profiles = LazyUserMap(self._load_user)
+            self.progress_tracking = LazyUserMap(self._load_user)
+            self.memory_store.memories = LazyUserMap(self._load_user, default_factory=list)
+        
+        # 적응 권고 캐시: user_id -> {세션 키: (버전 스탬프, 권고, 생성 시각)}, 사용자 단위 LRU
+        # recommendation_cache_size=0 이면 캐시 사용 안 함
+        # recommendation_verify_every=N 이면 N번째 적중마다 다시 계산해 낡은 값 여부 측정
+        self.recommendation_cache_size = recommendation_cache_size
+        self.recommendation_verify_every = recommendation_verify_every
+        self._recommendation_cache: "OrderedDict[str, Dict[Tuple, Tuple]]" = OrderedDict()
+        self._profile_versions: Dict[str, int] = defaultdict(int)
+        self._progress_versions: Dict[str, int] = defaultdict(int)
+        self._cache_metrics = {
+            'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0,
+            'verified': 0, 'stale': 0, 'served_age_total': 0.0, 'served_age_max': 0.0
+        }
+        
         # 접근법별 특성
         self.approach_characteristics = self._define_approach_characteristics()
         # 문화별 적응 규칙
         self.cultural_adaptations = self._define_cultural_adaptations()
+        # 접근법 적합성 특징 행렬 (위 두 규칙을 수정했다면 다시 호출)
+        self._compile_approach_features()
+
+    def _load_user(self, user_id: str):
+        """영구 저장소에서 사용자 데이터 복원 (LazyUserMap 로더)"""
+        record = self.storage.load_user(user_id)
+        documents = record.documents if record else {}
+        profile = documents.get('profile')
+        progress = documents.get('progress')
+        self.user_profiles.set_loaded(user_id, _profile_from_document(profile) if profile else None)
+        self.progress_tracking.set_loaded(user_id, _progress_from_document(progress) if progress else None)
+        memories = [_memory_from_record(m) for m in record.memories] if record and record.memories else None
+        self.memory_store.memories.set_loaded(user_id, memories)
+
+    def save_user(self, user_id: str):
+        """사용자 프로파일/진행 상황을 영구 저장소에 기록 (엔진 밖에서 객체를 직접 수정한 경우)"""
+        self._bump_versions(user_id, profile=True, progress=True)
+        if self.storage is None:
+            return
+        if user_id in self.user_profiles:
+            self.storage.put_document(user_id, 'profile', _document_from(self.user_profiles[user_id]))
+        if user_id in self.progress_tracking:
+            self.storage.put_document(user_id, 'progress', _document_from(self.progress_tracking[user_id]))
+
+    def flush(self):
+        """버퍼된 쓰기를 영구 저장소에 기록"""
+        if self.storage is not None:
+            self.storage.flush()
+
+    def close(self):
+        """종료 시 호출: 버퍼 기록 후 저장소 닫기"""
+        if self.storage is not None:
+            self.storage.close()
+
+    def _bump_versions(self, user_id: str, profile: bool = False, progress: bool = False):
+        """프로파일/진행 버전 증가 + 해당 사용자 캐시 항목 제거"""
+        if profile:
+            self._profile_versions[user_id] += 1
+        if progress:
+            self._progress_versions[user_id] += 1
+        self.invalidate_recommendations(user_id)
+
+    def invalidate_recommendations(self, user_id: Optional[str] = None):
+        """적응 권고 캐시 무효화 (user_id 가 없으면 전체)"""
+        if user_id is None:
+            dropped = sum(len(entries) for entries in self._recommendation_cache.values())
+            self._recommendation_cache.clear()
+        else:
+            dropped = len(self._recommendation_cache.pop(user_id, ()))
+        self._cache_metrics['invalidations'] += dropped
+
+    def get_recommendation_cache_metrics(self) -> Dict[str, Any]:
+        """적응 권고 캐시 지표 (적중률, 검증 시 낡은 값 비율, 반환 항목 나이)"""
+        metrics = dict(self._cache_metrics)
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_rate'] = metrics['hits'] / lookups if lookups else 0.0
+        metrics['stale_rate'] = metrics['stale'] / metrics['verified'] if metrics['verified'] else 0.0
+        metrics['mean_served_age'] = metrics['served_age_total'] / metrics['hits'] if metrics['hits'] else 0.0
+        metrics['entries'] = sum(len(entries) for entries in self._recommendation_cache.values())
+        metrics['users'] = len(self._recommendation_cache)
+        return metrics
 
     def _define_approach_characteristics(self) -> Dict[TherapeuticApproach, Dict[str, Any]]:
         """접근법별 특성 정의"""
@@ -356,6 +901,7 @@ class AdaptiveTherapyEngine:
             user_id=user_id,
             start_date=datetime.now()
         )
+        self.save_user(user_id)
         
         return profile
 
@@ -364,7 +910,78 @@ class AdaptiveTherapyEngine:
         user_id: str,
         current_session_data: Dict[str, Any]
     ) -> AdaptationRecommendation:
-        """적응 권고 생성"""
+        """
+        적응 권고 생성 (캐시 사용)
+        - 키: 프로파일/진행 버전, 패턴 상태 버전, 세션 상태 (현재 감정, 고강도 여부, 주제)
+        - update_progress / record_emotional_memory / save_user 호출 시 자동 무효화
+        - 엔진 밖에서 객체를 직접 수정하면 save_user 또는 invalidate_recommendations 호출 필요
+        """
+        if not self.recommendation_cache_size or not self.user_profiles.get(user_id):
+            return self._build_recommendation(user_id, current_session_data)
+        try:
+            session_key = (
+                current_session_data.get('current_emotion'),
+                current_session_data.get('emotion_intensity', 0.5) > 0.8,
+                current_session_data.get('current_topic')
+            )
+            hash(session_key)
+        except TypeError:
+            # 해시할 수 없는 세션 값은 캐시하지 않음
+            return self._build_recommendation(user_id, current_session_data)
+        
+        state = (
+            self.memory_store._update_patterns(user_id)
+            if user_id in self.memory_store.memories else None
+        )
+        stamp = (
+            self._profile_versions[user_id],
+            self._progress_versions[user_id],
+            state,
+            state.version if state is not None else 0
+        )
+        
+        metrics = self._cache_metrics
+        entries = self._recommendation_cache.get(user_id)
+        entry = entries.get(session_key) if entries is not None else None
+        if entry is not None and entry[0] == stamp:
+            self._recommendation_cache.move_to_end(user_id)
+            metrics['hits'] += 1
+            age = time.monotonic() - entry[2]
+            metrics['served_age_total'] += age
+            metrics['served_age_max'] = max(metrics['served_age_max'], age)
+            recommendation = entry[1]
+            if self.recommendation_verify_every and metrics['hits'] % self.recommendation_verify_every == 0:
+                fresh = self._build_recommendation(user_id, current_session_data)
+                metrics['verified'] += 1
+                if fresh != recommendation:
+                    metrics['stale'] += 1
+                    recommendation = fresh
+                    entries[session_key] = (stamp, fresh, time.monotonic())
+            return _copy_recommendation(recommendation)
+        
+        metrics['misses'] += 1
+        if entry is not None:
+            metrics['invalidations'] += 1
+        recommendation = self._build_recommendation(user_id, current_session_data)
+        if entries is None:
+            entries = self._recommendation_cache[user_id] = {}
+            if len(self._recommendation_cache) > self.recommendation_cache_size:
+                _, evicted = self._recommendation_cache.popitem(last=False)
+                metrics['evictions'] += len(evicted)
+        else:
+            self._recommendation_cache.move_to_end(user_id)
+            if session_key not in entries and len(entries) >= self._MAX_SESSION_KEYS_PER_USER:
+                del entries[next(iter(entries))]
+                metrics['evictions'] += 1
+        entries[session_key] = (stamp, recommendation, time.monotonic())
+        return _copy_recommendation(recommendation)
+
+    def _build_recommendation(
+        self,
+        user_id: str,
+        current_session_data: Dict[str, Any]
+    ) -> AdaptationRecommendation:
+        """적응 권고 계산"""
         profile = self.user_profiles.get(user_id)
         progress = self.progress_tracking.get(user_id)
         patterns = self.memory_store.get_user_patterns(user_id)
@@ -410,6 +1027,76 @@ class AdaptiveTherapyEngine:
             focus_areas=focus_areas
         )
 
+    # 접근법 적합성 가중치 (_calculate_approach_fit 과 동일)
+    _FIT_BASE = 0.5
+    _FIT_CONCERN = 0.1
+    _FIT_CULTURAL = 0.2
+    _FIT_PREVIOUS = 0.15
+    _FIT_EMOTION = 0.1
+    _FIT_EMOTION_APPROACHES = {
+        'anxiety': [TherapeuticApproach.CBT],
+        'worry': [TherapeuticApproach.CBT],
+        'sadness': [TherapeuticApproach.CBT, TherapeuticApproach.ACT],
+        'hopelessness': [TherapeuticApproach.CBT, TherapeuticApproach.ACT],
+    }
+    _MAX_CONCERN_CACHE = 10000
+
+    def _compile_approach_features(self):
+        """
+        접근법 특성 / 문화 선호를 특징 행렬로 컴파일
+        - 열: TherapeuticApproach 정의 순서 (argmax 동점 처리 = max(dict) 와 동일)
+        - 호소 문제는 문자열마다 한 번만 best_for 부분 문자열 검사 후 캐시
+        """
+        # 규칙이 바뀌었으면 이전 권고는 모두 무효
+        self.invalidate_recommendations()
+        self._approaches = list(TherapeuticApproach)
+        self._approach_index = {approach: i for i, approach in enumerate(self._approaches)}
+        n = len(self._approaches)
+        self._best_for = [
+            self.approach_characteristics.get(approach, {}).get('best_for', []) for approach in self._approaches
+        ]
+        self._languages = {language: i for i, language in enumerate(self.cultural_adaptations)}
+        # 마지막 행: 규칙이 없는 언어
+        self._cultural_matrix = np.zeros((len(self._languages) + 1, n))
+        for language, i in self._languages.items():
+            for approach in self.cultural_adaptations[language].get('preferred_approaches', []):
+                self._cultural_matrix[i, self._approach_index[approach]] = self._FIT_CULTURAL
+        self._emotions = {emotion: i for i, emotion in enumerate(self._FIT_EMOTION_APPROACHES)}
+        self._emotion_matrix = np.zeros((len(self._emotions) + 1, n))
+        for emotion, i in self._emotions.items():
+            for approach in self._FIT_EMOTION_APPROACHES[emotion]:
+                self._emotion_matrix[i, self._approach_index[approach]] = self._FIT_EMOTION
+        self._concern_vectors: Dict[str, np.ndarray] = {}
+
+    def _concern_vector(self, concern: str) -> np.ndarray:
+        """호소 문제 1개가 각 접근법 best_for 와 일치하는지 (0/1)"""
+        vector = self._concern_vectors.get(concern)
+        if vector is None:
+            lowered = concern.lower()
+            vector = np.array([float(any(b in lowered for b in best_for)) for best_for in self._best_for])
+            if len(self._concern_vectors) >= self._MAX_CONCERN_CACHE:
+                self._concern_vectors.clear()
+            self._concern_vectors[concern] = vector
+        return vector
+
+    def _approach_fit_scores(
+        self,
+        profile: UserProfile,
+        progress: Optional[TherapeuticProgress],
+        session_data: Dict[str, Any]
+    ) -> np.ndarray:
+        """전체 접근법 적합성 점수 (_calculate_approach_fit 과 같은 연산 순서 -> 같은 값)"""
+        n = len(self._approaches)
+        matches = np.zeros(n)
+        for concern in profile.presenting_concerns:
+            matches = matches + self._concern_vector(concern)
+        scores = self._FIT_BASE + matches * self._FIT_CONCERN
+        scores = scores + self._cultural_matrix[self._languages.get(profile.language, -1)]
+        if progress and progress.total_sessions > 5 and profile.preferred_approach in self._approach_index:
+            scores[self._approach_index[profile.preferred_approach]] += self._FIT_PREVIOUS
+        scores = scores + self._emotion_matrix[self._emotions.get(session_data.get('current_emotion', ''), -1)]
+        return np.minimum(1.0, scores)
+
     def _select_approach(
         self,
         profile: UserProfile,
@@ -417,16 +1104,66 @@ class AdaptiveTherapyEngine:
         patterns: Dict[str, Any],
         session_data: Dict[str, Any]
     ) -> TherapeuticApproach:
-        """접근법 선택"""
-        scores = {}
-        for approach in TherapeuticApproach:
-            score = self._calculate_approach_fit(
-                approach, profile, progress, patterns, session_data
-            )
-            scores[approach] = score
+        """접근법 선택 (전체 접근법 점수를 한 번에 계산, 동점이면 정의 순서상 앞선 접근법)"""
+        scores = self._approach_fit_scores(profile, progress, session_data)
+        return self._approaches[int(np.argmax(scores))]
+
+    def score_approaches_batch(
+        self,
+        profiles: List[UserProfile],
+        progresses: Optional[List[Optional[TherapeuticProgress]]] = None,
+        current_emotions: Optional[List[Optional[str]]] = None
+    ) -> np.ndarray:
+        """
+        코호트 분석용 일괄 적합성 점수
+        반환: (프로파일 수, 접근법 수) 행렬, 열 순서는 TherapeuticApproach 정의 순서
+        progresses 를 생략하면 엔진의 진행 상황을 사용
+        """
+        count = len(profiles)
+        n = len(self._approaches)
+        if progresses is None:
+            progresses = [self.progress_tracking.get(profile.user_id) for profile in profiles]
+        if current_emotions is None:
+            current_emotions = [None] * count
             
-        # 최고 점수 접근법 선택
-        return max(scores, key=scores.get)
+        # 호소 문제: (프로파일, 문제) 쌍을 펼쳐 접근법별 bincount
+        rows: List[int] = []
+        vectors: List[np.ndarray] = []
+        for i, profile in enumerate(profiles):
+            for concern in profile.presenting_concerns:
+                rows.append(i)
+                vectors.append(self._concern_vector(concern))
+        matches = np.zeros((count, n))
+        if rows:
+            stacked = np.stack(vectors)
+            row_ids = np.array(rows)
+            for j in range(n):
+                matches[:, j] = np.bincount(row_ids, weights=stacked[:, j], minlength=count)
+                
+        language_ids = np.array([self._languages.get(p.language, -1) for p in profiles], dtype=np.intp)
+        emotion_ids = np.array([self._emotions.get(e or '', -1) for e in current_emotions], dtype=np.intp)
+        previous = np.zeros((count, n))
+        for i, (profile, progress) in enumerate(zip(profiles, progresses)):
+            if progress and progress.total_sessions > 5 and profile.preferred_approach in self._approach_index:
+                previous[i, self._approach_index[profile.preferred_approach]] = self._FIT_PREVIOUS
+                
+        scores = self._FIT_BASE + matches * self._FIT_CONCERN
+        scores = scores + self._cultural_matrix[language_ids]
+        scores = scores + previous
+        scores = scores + self._emotion_matrix[emotion_ids]
+        return np.minimum(1.0, scores)
+
+    def select_approaches_batch(
+        self,
+        profiles: List[UserProfile],
+        progresses: Optional[List[Optional[TherapeuticProgress]]] = None,
+        current_emotions: Optional[List[Optional[str]]] = None
+    ) -> List[TherapeuticApproach]:
+        """코호트 분석용 일괄 접근법 선택"""
+        if not profiles:
+            return []
+        scores = self.score_approaches_batch(profiles, progresses, current_emotions)
+        return [self._approaches[i] for i in np.argmax(scores, axis=1).tolist()]
 
     def _calculate_approach_fit(
         self,
@@ -632,10 +1369,12 @@ class AdaptiveTherapyEngine:
             
         # 증상 추적
         if 'symptom_level' in session_outcome:
-            progress.symptom_trajectory.append({
-                'date': datetime.now().isoformat(),
-                'level': session_outcome['symptom_level']
-            })
+            progress.symptom_trajectory.record(session_outcome['symptom_level'])
+            progress.mood_trend = progress.symptom_trajectory.trend(window=self._MOOD_TREND_POINTS)
+            
+        self._bump_versions(user_id, progress=True)
+        if self.storage is not None:
+            self.storage.put_document(user_id, 'progress', _document_from(progress))
 
     def record_emotional_memory(
         self,
@@ -658,6 +1397,9 @@ class AdaptiveTherapyEngine:
             effectiveness=effectiveness
         )
         self.memory_store.store_memory(user_id, memory)
+        self.invalidate_recommendations(user_id)
+        if self.storage is not None:
+            self.storage.append_memory(user_id, _memory_record(memory))
 
     def get_personalized_techniques(
         self,
@@ -669,13 +1411,8 @@ class AdaptiveTherapyEngine:
         profile = self.user_profiles.get(user_id)
         patterns = self.memory_store.get_user_patterns(user_id)
         
-        # 이전에 효과적이었던 대처 기법 찾기
-        effective_coping = []
-        if user_id in self.memory_store.memories:
-            for memory in self.memory_store.memories[user_id]:
-                if memory.effectiveness and memory.effectiveness > 0.7:
-                    if memory.coping_used:
-                        effective_coping.append(memory.coping_used)
+        # 이전에 효과적이었던 대처 기법 (색인 조회, 기억 수와 무관)
+        effective_coping = self.memory_store.get_effective_coping(user_id, limit=1)
                         
         # 기법 제안 생성
         techniques = []
@@ -683,7 +1420,7 @@ class AdaptiveTherapyEngine:
         # 효과적이었던 기법 우선
         if effective_coping:
             techniques.append({
-                "name": effective_coping[0],
+                "name": effective_coping[0]['name'],
                 "reason": "이전에 효과적이었던 방법" if language == "ko" else "Previously effective",
                 "type": "proven"
             })
@@ -0,0 +1,425 @@
+"""
+감정 기억 벡터 인덱스
+Phase 3: 장기 기억 의미 검색 (로컬 임베딩 + 근사 최근접 이웃)
+저장 경로: /AI_Drive/counseling_ai/models/personalization/memory_index.py
+"""
+import json
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # 선택 의존성
+    hnswlib = None
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# IVF 학습 스레드 (모든 인덱스가 공유 - 동시에 여러 사용자가 임계값을 넘어도 한 번에 하나씩)
+_training_executor: Optional[ThreadPoolExecutor] = None
+_training_executor_lock = threading.Lock()
+
+def _training_pool() -> ThreadPoolExecutor:
+    global _training_executor
+    with _training_executor_lock:
+        if _training_executor is None:
+            _training_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ivf-train")
+        return _training_executor
+
+
+class Embedder(ABC):
+    """
+    임베딩 인터페이스
+    embed(texts) -> (len(texts), dim) float32, 행마다 L2 정규화
+    """
+    dim: int = 0
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 목록 임베딩"""
+
+
+class HashingEmbedder(Embedder):
+    """
+    해싱 벡터라이저 (오프라인 기본 임베딩)
+    단어 + 문자 n-gram 을 crc32 로 해싱, 부호 해싱으로 충돌 상쇄
+    한국어는 조사/어미 변화가 많아 문자 n-gram 이 단어보다 유사도를 잘 잡음
+    """
+    def __init__(self, dim: int = 1536, ngram_range: Tuple[int, int] = (2, 3), cache_size: int = 1 << 18):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.cache_size = cache_size
+        self._slots: Dict[str, int] = {} # 특징 -> 부호 포함 열 번호 (+(열+1) / -(열+1))
+
+    def _slot(self, feature: str) -> int:
+        slot = self._slots.get(feature)
+        if slot is None:
+            h = zlib.crc32(feature.encode("utf-8"))
+            slot = ((h >> 1) % self.dim + 1) * (1 if h & 1 else -1)
+            if len(self._slots) >= self.cache_size:
+                self._slots.clear()
+            self._slots[feature] = slot
+        return slot
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        features = ["w:" + token for token in tokens]
+        low, high = self.ngram_range
+        for token in tokens:
+            padded = f" {token} "
+            for n in range(low, high + 1):
+                features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        slots: List[int] = []
+        for row, text in enumerate(texts):
+            features = self._features(text or "")
+            rows.extend([row] * len(features))
+            slots.extend(self._slot(feature) for feature in features)
+        slots = np.array(slots, dtype=np.int64)
+        # (행, 열) 을 평탄화한 위치별 합계 = 희소 -> 밀집 변환
+        flat = np.array(rows, dtype=np.int64) * self.dim + np.abs(slots) - 1
+        vectors = np.bincount(flat, weights=np.sign(slots).astype(np.float64), minlength=len(texts) * self.dim)
+        return _normalize(vectors.reshape(len(texts), self.dim).astype(np.float32))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 내림차순 상위 k개 위치"""
+    if len(scores) > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        return part[np.argsort(-scores[part], kind="stable")]
+    return np.argsort(-scores, kind="stable")
+
+
+class FlatIndex:
+    """
+    전수 비교 인덱스 (내적 = 코사인 유사도, 입력은 정규화 벡터)
+    벡터 id 는 추가된 순서 (= 사용자 기억 목록 위치)
+    """
+    kind = "flat"
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.dim = dim
+        self.size = 0
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        needed = self.size + len(vectors)
+        if needed > len(self.vectors):
+            grown = np.zeros((max(needed, len(self.vectors) * 2), self.dim), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+        self.vectors[self.size:needed] = vectors
+        start = self.size
+        self.size = needed
+        self._on_add(start, needed)
+
+    def _on_add(self, start: int, end: int):
+        pass
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """상위 k개 (id, 유사도)"""
+        if self.size == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = self.vectors[:self.size] @ np.asarray(query, dtype=np.float32)
+        top = _top_k(scores, k)
+        return top.astype(np.int64), scores[top]
+
+    def _meta(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "dim": self.dim}
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {"vectors": self.vectors[:self.size]}
+
+    def save(self, path: str):
+        """npz 파일로 저장 (메타데이터는 JSON 문자열)"""
+        arrays = self._arrays()
+        arrays["meta"] = np.array(json.dumps(self._meta()))
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    def _restore(self, data: Dict[str, np.ndarray]):
+        vectors = data["vectors"]
+        self.vectors = np.zeros((max(64, len(vectors)), self.dim), dtype=np.float32)
+        self.vectors[:len(vectors)] = vectors
+        self.size = len(vectors)
+
+
+class IVFIndex(FlatIndex):
+    """
+    IVF (역파일) 근사 인덱스
+    - train_threshold 미만에서는 전수 비교
+    - 이후 구면 k-means 로 nlist 개 군집, 질의 시 가까운 nprobe 개 군집만 비교
+    - 학습 시점보다 4배 커지면 재학습
+    - 학습은 기본적으로 백그라운드 스레드에서 (쓰기 경로에서 k-means 를 돌리지 않음)
+      학습이 끝날 때까지 기존 상태(미학습이면 전수 비교, 아니면 이전 중심)로 검색하고
+      새 벡터도 이전 중심에 배정, 학습 중 추가된 벡터는 교체 시 새 중심에 배정
+    """
+    kind = "ivf"
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        train_threshold: int = 2048,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+        background_training: bool = True
+    ):
+        super().__init__(dim)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._assignment_buffer = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self.background_training = background_training
+        self._lock = threading.RLock()
+        self._training: Optional[Future] = None
+
+    @property
+    def assignments(self) -> np.ndarray:
+        """벡터별 군집 번호"""
+        return self._assignment_buffer[:self.size if self.is_trained else 0]
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def training(self) -> bool:
+        """백그라운드 학습 진행 중 여부"""
+        return self._training is not None and not self._training.done()
+
+    def add(self, vectors: np.ndarray):
+        with self._lock:
+            super().add(vectors)
+
+    def _on_add(self, start: int, end: int):
+        if self.is_trained:
+            self._assign_range(start, end)
+        due = end >= self.trained_size * 4 if self.is_trained else end >= self.train_threshold
+        if not due or self.training:
+            return
+        if self.background_training:
+            self._training = _training_pool().submit(self._train_snapshot, end)
+        else:
+            self.train()
+
+    def wait_for_training(self, timeout: Optional[float] = None):
+        """진행 중인 백그라운드 학습 완료 대기 (학습 중 예외는 여기서 전달)"""
+        training = self._training
+        if training is not None:
+            training.result(timeout)
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for i in range(0, len(vectors), chunk):
+            labels[i:i + chunk] = np.argmax(vectors[i:i + chunk] @ centroids.T, axis=1)
+        return labels
+
+    def _assign_range(self, start: int, end: int):
+        labels = self._assign(self.vectors[start:end], self.centroids)
+        if end > len(self._assignment_buffer):
+            grown = np.zeros(max(end, len(self._assignment_buffer) * 2), dtype=np.int32)
+            grown[:start] = self._assignment_buffer[:start]
+            self._assignment_buffer = grown
+        self._assignment_buffer[start:end] = labels
+        for offset, label in enumerate(labels.tolist()):
+            self._lists[label].append(start + offset)
+            self._list_arrays.pop(label, None)
+
+    def train(self):
+        """구면 k-means 로 군집 중심 학습 후 전체 재배정 (호출 스레드에서 즉시)"""
+        with self._lock:
+            size = self.size
+            self._install(*self._kmeans(self.vectors[:size]), size)
+
+    def _train_snapshot(self, size: int):
+        """앞 size 개로 학습 (학습 중에는 잠금 없이 추가 / 검색 가능)"""
+        with self._lock:
+            # 추가는 뒤에만 붙고 버퍼가 커지면 새 배열로 바뀌므로 앞부분 view 는 그대로 유지
+            data = self.vectors[:size]
+        centroids, labels = self._kmeans(data)
+        with self._lock:
+            self._install(centroids, labels, size)
+
+    def _install(self, centroids: np.ndarray, labels: np.ndarray, size: int):
+        """학습 결과 교체 (학습 이후 추가된 벡터는 새 중심에 배정)"""
+        if self.size > size:
+            labels = np.concatenate([labels, self._assign(self.vectors[size:self.size], centroids)])
+        self.centroids = centroids
+        self.trained_size = size
+        self._rebuild_lists(labels)
+
+    def _kmeans(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """구면 k-means -> (군집 중심, 벡터별 군집 번호)"""
+        size = len(data)
+        nlist = min(self.nlist or max(1, int(np.sqrt(size))), size)
+        rng = np.random.default_rng(self.seed)
+        centroids = data[rng.choice(size, nlist, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            labels = self._assign(data, centroids)
+            # 군집별 합계: 군집 순으로 정렬 후 구간 합
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            sums = np.zeros_like(centroids)
+            sums[~empty] = np.add.reduceat(data[np.argsort(labels, kind="stable")], starts[~empty], axis=0)
+            # 빈 군집은 임의 벡터로 다시 시작
+            sums[empty] = data[rng.choice(size, int(empty.sum()))]
+            centroids = _normalize(sums)
+        centroids = centroids.astype(np.float32)
+        return centroids, self._assign(data, centroids)
+
+    def _rebuild_lists(self, assignments: np.ndarray):
+        self._assignment_buffer = assignments.astype(np.int32)
+        self._lists = [[] for _ in range(len(self.centroids))]
+        for i, label in enumerate(self._assignment_buffer.tolist()):
+            self._lists[label].append(i)
+        self._list_arrays = {}
+
+    def _list_array(self, label: int) -> np.ndarray:
+        array = self._list_arrays.get(label)
+        if array is None:
+            array = np.array(self._lists[label], dtype=np.int64)
+            self._list_arrays[label] = array
+        return array
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            if not self.is_trained or k <= 0:
+                return super().search(query, k)
+            query = np.asarray(query, dtype=np.float32)
+            probe = _top_k(self.centroids @ query, min(self.nprobe, len(self.centroids)))
+            candidates = np.concatenate([self._list_array(label) for label in probe.tolist()])
+            scores = self.vectors[candidates] @ query
+            top = _top_k(scores, k)
+            return candidates[top], scores[top]
+
+    def _meta(self) -> Dict[str, Any]:
+        meta = super()._meta()
+        meta.update(nlist=self.nlist, nprobe=self.nprobe, train_threshold=self.train_threshold,
+                    kmeans_iterations=self.kmeans_iterations, seed=self.seed,
+                    trained_size=self.trained_size)
+        return meta
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            arrays = super()._arrays()
+            if self.is_trained:
+                arrays["centroids"] = self.centroids
+                arrays["assignments"] = self.assignments
+            return arrays
+
+    def _restore(self, data: Dict[str, np.ndarray]):
+        super()._restore(data)
+        if "centroids" in data:
+            self.centroids = data["centroids"]
+            self._rebuild_lists(data["assignments"])
+
+
+class HNSWIndex(FlatIndex):
+    """
+    HNSW 그래프 인덱스 (hnswlib 설치 시)
+    원본 벡터도 보관하여 저장 시에는 벡터만 기록하고 불러올 때 그래프 재구성
+    """
+    kind = "hnsw"
+
+    def __init__(self, dim: int, m: int = 16, ef_construction: int = 200, ef_search: int = 64):
+        if hnswlib is None:
+            raise ImportError("HNSWIndex 사용에는 hnswlib 패키지가 필요합니다 (pip install hnswlib)")
+        super().__init__(dim)
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._graph = hnswlib.Index(space="ip", dim=dim)
+        self._graph.init_index(max_elements=64, M=m, ef_construction=ef_construction)
+        self._graph.set_ef(ef_search)
+
+    def _on_add(self, start: int, end: int):
+        if end > self._graph.get_max_elements():
+            self._graph.resize_index(max(end, self._graph.get_max_elements() * 2))
+        self._graph.add_items(self.vectors[start:end], np.arange(start, end))
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.size)
+        if k <= 0:
+            return super().search(query, k)
+        self._graph.set_ef(max(self.ef_search, k))
+        labels, distances = self._graph.knn_query(np.asarray(query, dtype=np.float32), k=k)
+        # ip 공간 거리 = 1 - 내적
+        return labels[0].astype(np.int64), (1.0 - distances[0]).astype(np.float32)
+
+    def _meta(self) -> Dict[str, Any]:
+        meta = super()._meta()
+        meta.update(m=self.m, ef_construction=self.ef_construction, ef_search=self.ef_search)
+        return meta
+
+    def _restore(self, data: Dict[str, np.ndarray]):
+        vectors = data["vectors"]
+        self.size = 0
+        self.add(vectors)
+
+
+_INDEX_TYPES = {cls.kind: cls for cls in (FlatIndex, IVFIndex, HNSWIndex)}
+_INDEX_OPTIONS = {
+    "flat": (),
+    "ivf": ("nlist", "nprobe", "train_threshold", "kmeans_iterations", "seed"),
+    "hnsw": ("m", "ef_construction", "ef_search"),
+}
+
+
+def load_index(path: str) -> FlatIndex:
+    """save() 로 저장한 인덱스 불러오기"""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    meta = json.loads(str(arrays.pop("meta")))
+    kind = meta["kind"]
+    index = _INDEX_TYPES[kind](meta["dim"], **{key: meta[key] for key in _INDEX_OPTIONS[kind]})
+    index._restore(arrays)
+    if kind == "ivf":
+        index.trained_size = meta["trained_size"]
+    return index
+
+
+def save_indexes(indexes: Dict[str, FlatIndex], directory: str):
+    """사용자별 인덱스를 디렉터리에 저장 (user_id -> 파일명 목록은 manifest.json)"""
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for i, (user_id, index) in enumerate(indexes.items()):
+        filename = f"index_{i:06d}.npz"
+        index.save(str(root / filename))
+        manifest[user_id] = filename
+    (root / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+
+def load_indexes(directory: str) -> Dict[str, FlatIndex]:
+    """save_indexes() 로 저장한 사용자별 인덱스 불러오기"""
+    root = Path(directory)
+    manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    return {user_id: load_index(str(root / filename)) for user_id, filename in manifest.items()}
@@ -0,0 +1,626 @@
+"""
+개인화 데이터 영구 저장소
+Phase 3: 사용자 프로파일 / 진행 상황 / 감정 기억 영구 저장
+저장 경로: /AI_Drive/counseling_ai/models/personalization/persistent_store.py
+
+구조 (사용자 ID crc32 로 샤드 분할):
+    <root>/shard_007/log.ndjson           추가 전용 로그 (seq 순)
+    <root>/shard_007/CURRENT              현재 스냅샷 세대 번호
+    <root>/shard_007/snap_000003/         열 단위 스냅샷 (np.load mmap_mode='r')
+        meta.json                         last_seq, 문자열 사전, 사용자별 행 범위/문서 위치
+        timestamps.npy intensities.npy effectiveness.npy emotion_ids.npy
+        trigger_ids.npy coping_ids.npy context_offsets.npy context.bin docs.bin
+
+- 쓰기는 샤드별 버퍼에 모았다가 batch_size 또는 flush_interval 마다 (백그라운드 스레드) 로그에 한 번에 기록,
+  프로세스 종료 시 (atexit) 남은 버퍼도 기록
+- 로그가 compact_bytes 를 넘으면 스냅샷 + 로그를 새 세대 스냅샷으로 압축 후 로그 비움
+  (CURRENT 교체 후 로그 정리 전에 중단되어도 seq <= last_seq 레코드는 재적용하지 않음)
+- 샤드는 처음 접근할 때 열고, 사용자 데이터는 load_user 호출 시에만 객체로 복원
+- 여러 워커가 같은 디렉터리를 공유: 샤드별 LOCK 파일 (fcntl.flock) 로 기록/압축은 배타, 읽기는 공유 잠금
+  잠금을 잡으면 먼저 다른 워커가 붙인 로그 / 새 세대 스냅샷을 따라잡고, seq 는 기록 시점에 잠금 안에서 부여
+  (fcntl 이 없는 환경에서는 샤드당 쓰기 프로세스 하나로 가정)
+"""
+import atexit
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import weakref
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # 선택 의존성 (Windows)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_KINDS = ("profile", "progress")
+
+# 스냅샷 숫자 열 (이름, dtype)
+_NUMERIC_COLUMNS = (
+    ("timestamps", np.int64),
+    ("intensities", np.float64),
+    ("effectiveness", np.float64), # NaN: 없음
+    ("emotion_ids", np.int32),
+    ("trigger_ids", np.int32), # -1: 없음
+    ("coping_ids", np.int32), # -1: 없음
+)
+
+
+@dataclass
+class UserRecord:
+    """사용자 저장 데이터 (문서 + 기억 레코드 목록)"""
+    user_id: str
+    documents: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    memories: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class LazyUserMap(dict):
+    """
+    사용자별 지연 로딩 사전
+    처음 조회되는 키마다 loader(key) 를 한 번 호출 (loader 가 set_loaded 로 값을 채움)
+    """
+    def __init__(self, loader: Callable[[str], None], default_factory: Optional[Callable[[], Any]] = None):
+        super().__init__()
+        self._loader = loader
+        self._loaded = set()
+        self.default_factory = default_factory
+
+    def _load(self, key):
+        if key not in self._loaded:
+            self._loaded.add(key)
+            self._loader(key)
+
+    def set_loaded(self, key, value=None):
+        """loader 에서 호출: 로딩 완료 표시 (value 가 있고 아직 값이 없으면 저장)"""
+        self._loaded.add(key)
+        if value is not None and not dict.__contains__(self, key):
+            dict.__setitem__(self, key, value)
+
+    def __missing__(self, key):
+        self._load(key)
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        if self.default_factory is None:
+            raise KeyError(key)
+        value = self.default_factory()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def __contains__(self, key) -> bool:
+        self._load(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        self._load(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        self._loaded.add(key)
+        dict.__setitem__(self, key, value)
+
+
+class _Snapshot:
+    """열 단위 스냅샷 (메모리 매핑, 읽기 전용)"""
+
+    def __init__(self, directory: Optional[Path]):
+        self.directory = directory
+        self.last_seq = 0
+        self.strings: List[str] = []
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.columns: Dict[str, np.ndarray] = {}
+        self.context_offsets = np.zeros(1, dtype=np.int64)
+        self.context = np.zeros(0, dtype=np.uint8)
+        self.docs = np.zeros(0, dtype=np.uint8)
+        if directory is None:
+            self.columns = {name: np.zeros(0, dtype=dtype) for name, dtype in _NUMERIC_COLUMNS}
+            return
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        self.last_seq = meta["last_seq"]
+        self.strings = meta["strings"]
+        self.users = meta["users"]
+        for name, _ in _NUMERIC_COLUMNS:
+            self.columns[name] = np.load(directory / f"{name}.npy", mmap_mode="r")
+        self.context_offsets = np.load(directory / "context_offsets.npy", mmap_mode="r")
+        self.context = self._map_bytes(directory / "context.bin")
+        self.docs = self._map_bytes(directory / "docs.bin")
+
+    @staticmethod
+    def _map_bytes(path: Path) -> np.ndarray:
+        if path.stat().st_size == 0:
+            return np.zeros(0, dtype=np.uint8)
+        return np.memmap(path, dtype=np.uint8, mode="r")
+
+    def documents(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        entry = self.users.get(user_id)
+        if not entry or not entry["doc_length"]:
+            return {}
+        start = entry["doc_offset"]
+        return json.loads(self.docs[start:start + entry["doc_length"]].tobytes().decode("utf-8"))
+
+    def memories(self, user_id: str) -> List[Dict[str, Any]]:
+        entry = self.users.get(user_id)
+        if not entry:
+            return []
+        start, end = entry["rows"]
+        return self.decode_rows(start, end)
+
+    def decode_rows(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """행 범위를 기억 레코드 사전 목록으로 복원"""
+        cols = {name: np.asarray(values[start:end]).tolist() for name, values in self.columns.items()}
+        offsets = np.asarray(self.context_offsets[start:end + 1]).tolist()
+        blob = self.context[offsets[0]:offsets[-1]].tobytes() if end > start else b""
+        base = offsets[0] if offsets else 0
+        strings = self.strings
+        records = []
+        for i in range(end - start):
+            lo, hi = offsets[i] - base, offsets[i + 1] - base
+            effectiveness = cols["effectiveness"][i]
+            records.append({
+                "timestamp": cols["timestamps"][i],
+                "emotion": strings[cols["emotion_ids"][i]],
+                "intensity": cols["intensities"][i],
+                "trigger": strings[cols["trigger_ids"][i]] if cols["trigger_ids"][i] >= 0 else None,
+                "context": json.loads(blob[lo:hi].decode("utf-8")) if hi > lo else {},
+                "coping_used": strings[cols["coping_ids"][i]] if cols["coping_ids"][i] >= 0 else None,
+                "effectiveness": None if effectiveness != effectiveness else effectiveness,
+            })
+        return records
+
+
+class _Shard:
+    """샤드: 스냅샷 + 로그 (처음 접근 시 열림)"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.log_path = directory / "log.ndjson"
+        self.snapshot = _Snapshot(None)
+        self.generation = 0
+        self.log_offsets: Dict[str, List[Tuple[int, int]]] = {} # 사용자 -> 로그 줄 (위치, 길이)
+        self.log_size = 0
+        self.next_seq = 1
+        self.buffer: List[Tuple[str, str, str]] = [] # (사용자, 종류, 직렬화된 data)
+        self.buffered_since: Optional[float] = None
+        self._lock_file = None
+
+    def open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.directory / "LOCK", "a+b")
+        with self.locked():
+            self.refresh(repair=True)
+
+    def close(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    @contextmanager
+    def locked(self, exclusive: bool = True):
+        """샤드 잠금 (다른 프로세스와 기록/압축/읽기 직렬화)"""
+        if fcntl is None or self._lock_file is None:
+            yield
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def refresh(self, repair: bool = False):
+        """
+        디스크 상태 따라잡기 (잠금 안에서 호출)
+        - 다른 워커가 압축해 세대가 바뀌었으면 스냅샷을 다시 열고 로그 전체를 다시 색인
+        - 로그만 늘었으면 늘어난 부분만 색인
+        """
+        current = self.directory / "CURRENT"
+        generation = int(current.read_text().strip()) if current.exists() else 0
+        if generation != self.generation:
+            self.snapshot = _Snapshot(self.directory / f"snap_{generation:06d}" if generation else None)
+            self.generation = generation
+            self.next_seq = max(self.next_seq, self.snapshot.last_seq + 1)
+            self._scan_log(0, repair)
+            return
+        size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        if size != self.log_size:
+            self._scan_log(self.log_size if size > self.log_size else 0, repair)
+
+    def _scan_log(self, start: int, repair: bool):
+        """로그 색인 (사용자별 줄 위치), 잘린 마지막 줄은 건너뜀 (repair 면 제거)"""
+        if not start:
+            self.log_offsets = {}
+        self.log_size = start
+        if not self.log_path.exists():
+            return
+        valid_end = start
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record["seq"] > self.snapshot.last_seq:
+                    self.log_offsets.setdefault(record["user_id"], []).append((offset, len(line)))
+                    self.next_seq = max(self.next_seq, record["seq"] + 1)
+                offset += len(line)
+                valid_end = offset
+        if repair and valid_end != self.log_path.stat().st_size:
+            logger.warning(f"잘린 로그 꼬리 제거: {self.log_path}")
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_end)
+        self.log_size = valid_end
+
+    def append(self, user_id: str, kind: str, data: Dict[str, Any]):
+        # data 는 지금 직렬화 (호출자가 이후에 객체를 바꿔도 기록 값 고정), seq 는 flush 때 부여
+        self.buffer.append((user_id, kind, json.dumps(data, ensure_ascii=False, default=str)))
+        if self.buffered_since is None:
+            self.buffered_since = time.monotonic()
+
+    def flush(self, fsync: bool = False):
+        if not self.buffer:
+            return
+        with self.locked():
+            self.refresh(repair=True)
+            payloads = []
+            for user_id, kind, data in self.buffer:
+                line = (
+                    f'{{"seq": {self.next_seq}, "user_id": {json.dumps(user_id, ensure_ascii=False)}, '
+                    f'"kind": {json.dumps(kind)}, "data": {data}}}\n'
+                )
+                self.next_seq += 1
+                payloads.append(line.encode("utf-8"))
+            with open(self.log_path, "ab") as f:
+                f.write(b"".join(payloads))
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            offset = self.log_size
+            for (user_id, _, _), payload in zip(self.buffer, payloads):
+                self.log_offsets.setdefault(user_id, []).append((offset, len(payload)))
+                offset += len(payload)
+            self.log_size = offset
+        self.buffer = []
+        self.buffered_since = None
+
+    def log_records(self, user_id: str) -> List[Dict[str, Any]]:
+        entries = self.log_offsets.get(user_id)
+        if not entries:
+            return []
+        records = []
+        with open(self.log_path, "rb") as f:
+            for offset, length in entries:
+                f.seek(offset)
+                records.append(json.loads(f.read(length)))
+        return records
+
+    def load_user(self, user_id: str) -> Optional[UserRecord]:
+        if user_id not in self.snapshot.users and user_id not in self.log_offsets:
+            return None
+        record = UserRecord(
+            user_id=user_id,
+            documents=self.snapshot.documents(user_id),
+            memories=self.snapshot.memories(user_id)
+        )
+        for entry in self.log_records(user_id):
+            if entry["kind"] == "memory":
+                record.memories.append(entry["data"])
+            else:
+                record.documents[entry["kind"]] = entry["data"]
+        return record
+
+    def users(self) -> List[str]:
+        users = dict.fromkeys(self.snapshot.users)
+        users.update(dict.fromkeys(self.log_offsets))
+        return list(users)
+
+    def compact(self):
+        """스냅샷 + 로그를 새 세대 스냅샷으로 병합 (다른 워커의 기록 포함)"""
+        with self.locked():
+            self.refresh(repair=True)
+            self._compact()
+
+    def _compact(self):
+        old = self.snapshot
+        users = self.users()
+        strings: Dict[str, int] = {s: i for i, s in enumerate(old.strings)}
+
+        def string_id(value: Optional[str]) -> int:
+            if value is None:
+                return -1
+            return strings.setdefault(value, len(strings))
+
+        # 기존 스냅샷 행은 열 배열 그대로 재배치, 로그 기억만 새로 인코딩
+        old_rows: List[np.ndarray] = []
+        new_rows: Dict[str, List[Dict[str, Any]]] = {}
+        documents: Dict[str, Dict[str, Any]] = {}
+        for user_id in users:
+            entry = old.users.get(user_id)
+            old_rows.append(np.arange(*entry["rows"]) if entry else np.zeros(0, dtype=np.int64))
+            docs = old.documents(user_id)
+            memories = []
+            for record in self.log_records(user_id):
+                if record["kind"] == "memory":
+                    memories.append(record["data"])
+                else:
+                    docs[record["kind"]] = record["data"]
+            new_rows[user_id] = memories
+            documents[user_id] = docs
+
+        last_seq = self.next_seq - 1
+        generation = self.generation + 1
+        target = self.directory / f"snap_{generation:06d}"
+        if target.exists():
+            shutil.rmtree(target)
+        target.mkdir()
+
+        columns = {name: [] for name, _ in _NUMERIC_COLUMNS}
+        contexts: List[bytes] = []
+        docs_blob: List[bytes] = []
+        meta_users: Dict[str, Dict[str, Any]] = {}
+        row = 0
+        doc_offset = 0
+        old_context = old.context
+        old_offsets = np.asarray(old.context_offsets)
+        for user_id, rows in zip(users, old_rows):
+            start = row
+            if len(rows):
+                for name, _ in _NUMERIC_COLUMNS:
+                    columns[name].append(np.asarray(old.columns[name][rows[0]:rows[-1] + 1]))
+                contexts.extend(
+                    old_context[old_offsets[i]:old_offsets[i + 1]].tobytes() for i in rows.tolist()
+                )
+                row += len(rows)
+            memories = new_rows[user_id]
+            if memories:
+                columns["timestamps"].append(np.array([m["timestamp"] for m in memories], dtype=np.int64))
+                columns["intensities"].append(np.array([m["intensity"] for m in memories], dtype=np.float64))
+                columns["effectiveness"].append(np.array(
+                    [np.nan if m.get("effectiveness") is None else m["effectiveness"] for m in memories],
+                    dtype=np.float64
+                ))
+                columns["emotion_ids"].append(np.array([string_id(m["emotion"]) for m in memories], dtype=np.int32))
+                columns["trigger_ids"].append(np.array([string_id(m.get("trigger")) for m in memories], dtype=np.int32))
+                columns["coping_ids"].append(np.array([string_id(m.get("coping_used")) for m in memories], dtype=np.int32))
+                contexts.extend(
+                    json.dumps(m["context"], ensure_ascii=False, default=str).encode("utf-8") if m.get("context") else b""
+                    for m in memories
+                )
+                row += len(memories)
+            doc_bytes = json.dumps(documents[user_id], ensure_ascii=False, default=str).encode("utf-8") \
+                if documents[user_id] else b""
+            docs_blob.append(doc_bytes)
+            meta_users[user_id] = {"rows": [start, row], "doc_offset": doc_offset, "doc_length": len(doc_bytes)}
+            doc_offset += len(doc_bytes)
+
+        for name, dtype in _NUMERIC_COLUMNS:
+            values = np.concatenate(columns[name]).astype(dtype) if columns[name] else np.zeros(0, dtype=dtype)
+            np.save(target / f"{name}.npy", values)
+        context_offsets = np.zeros(len(contexts) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in contexts], out=context_offsets[1:])
+        np.save(target / "context_offsets.npy", context_offsets)
+        (target / "context.bin").write_bytes(b"".join(contexts))
+        (target / "docs.bin").write_bytes(b"".join(docs_blob))
+        meta = {"last_seq": last_seq, "strings": list(strings), "users": meta_users}
+        (target / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        # 세대 교체 (원자적) 후 로그 비우기
+        tmp = self.directory / "CURRENT.tmp"
+        tmp.write_text(str(generation))
+        os.replace(tmp, self.directory / "CURRENT")
+        with open(self.log_path, "wb"):
+            pass
+        self.snapshot = _Snapshot(target)
+        self.generation = generation
+        self.log_offsets = {}
+        self.log_size = 0
+        for path in self.directory.glob("snap_*"):
+            if path != target:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+# 열린 저장소 (프로세스 종료 시 버퍼 기록)
+_OPEN_STORAGES: "weakref.WeakSet[PersonalizationStorage]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_storages():
+    for storage in list(_OPEN_STORAGES):
+        try:
+            storage.flush()
+        except Exception:
+            logger.exception("종료 시 개인화 저장소 flush 실패")
+
+
+def _flush_periodically(storage_ref: "weakref.ref[PersonalizationStorage]", interval: float, stop: threading.Event):
+    """flush_interval 마다 버퍼 기록 (저장소가 닫히거나 수거되면 종료)"""
+    while not stop.wait(interval):
+        storage = storage_ref()
+        if storage is None:
+            return
+        try:
+            storage.flush_due()
+        except Exception:
+            logger.exception("개인화 저장소 주기적 flush 실패")
+        del storage
+
+
+class PersonalizationStorage:
+    """
+    개인화 영구 저장소 (추가 전용 로그 + 압축된 열 단위 스냅샷, 사용자 샤드)
+    문서(profile/progress)는 전체 덮어쓰기, 기억은 추가만 지원
+    """
+    def __init__(
+        self,
+        root: str,
+        num_shards: int = 16,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        compact_bytes: int = 4 * 1024 * 1024,
+        fsync: bool = False
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta_path = self.root / "storage.json"
+        if meta_path.exists():
+            # 샤드 수는 처음 만들 때 고정
+            num_shards = json.loads(meta_path.read_text(encoding="utf-8"))["num_shards"]
+        else:
+            meta_path.write_text(json.dumps({"num_shards": num_shards}), encoding="utf-8")
+        self.num_shards = num_shards
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self._shards: Dict[int, _Shard] = {}
+        self._buffered = 0
+        # 호출 스레드와 주기적 flush 스레드 사이 직렬화
+        self._lock = threading.RLock()
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.metrics = {"writes": 0, "flushes": 0, "compactions": 0, "users_loaded": 0, "shards_opened": 0}
+        _OPEN_STORAGES.add(self)
+
+    def shard_of(self, user_id: str) -> int:
+        return zlib.crc32(user_id.encode("utf-8")) % self.num_shards
+
+    def _shard(self, user_id: str) -> _Shard:
+        return self._open_shard(self.shard_of(user_id))
+
+    def _open_shard(self, shard_id: int) -> _Shard:
+        shard = self._shards.get(shard_id)
+        if shard is None:
+            shard = _Shard(self.root / f"shard_{shard_id:03d}")
+            shard.open()
+            self._shards[shard_id] = shard
+            self.metrics["shards_opened"] += 1
+        return shard
+
+    # =========================================================================
+    # 쓰기
+    # =========================================================================
+    def put_document(self, user_id: str, kind: str, data: Dict[str, Any]):
+        """profile / progress 문서 저장 (이전 값 대체)"""
+        if kind not in DOCUMENT_KINDS:
+            raise ValueError(f"알 수 없는 문서 종류: {kind}")
+        self._write(user_id, kind, data)
+
+    def append_memory(self, user_id: str, record: Dict[str, Any]):
+        """기억 레코드 추가 (timestamp 는 마이크로초 정수)"""
+        self._write(user_id, "memory", record)
+
+    def _write(self, user_id: str, kind: str, data: Dict[str, Any]):
+        with self._lock:
+            shard = self._shard(user_id)
+            shard.append(user_id, kind, data)
+            self._buffered += 1
+            self.metrics["writes"] += 1
+            if self._buffered >= self.batch_size or \
+                    time.monotonic() - shard.buffered_since >= self.flush_interval:
+                self.flush()
+            elif self._flusher is None and self.flush_interval > 0:
+                # 조용한 샤드의 버퍼도 flush_interval 안에 기록되도록 (처음 버퍼링할 때 시작)
+                self._flusher = threading.Thread(
+                    target=_flush_periodically, args=(weakref.ref(self), self.flush_interval, self._stop_flusher),
+                    name="personalization-flush", daemon=True
+                )
+                self._flusher.start()
+
+    def flush(self):
+        """버퍼된 쓰기를 로그에 기록, 커진 로그는 압축"""
+        with self._lock:
+            for shard in self._shards.values():
+                if shard.buffer:
+                    shard.flush(self.fsync)
+                    self.metrics["flushes"] += 1
+                if shard.log_size > self.compact_bytes:
+                    shard.compact()
+                    self.metrics["compactions"] += 1
+            self._buffered = 0
+
+    def flush_due(self):
+        """flush_interval 이 지난 버퍼가 있으면 기록 (주기적 flush 스레드에서 호출)"""
+        with self._lock:
+            now = time.monotonic()
+            if any(
+                shard.buffered_since is not None and now - shard.buffered_since >= self.flush_interval
+                for shard in self._shards.values()
+            ):
+                self.flush()
+
+    def compact(self):
+        """모든 샤드 압축 (로그가 있는 샤드만)"""
+        with self._lock:
+            self.flush()
+            for shard_id in range(self.num_shards):
+                directory = self.root / f"shard_{shard_id:03d}"
+                log_path = directory / "log.ndjson"
+                if not log_path.exists() or log_path.stat().st_size == 0:
+                    continue
+                self._open_shard(shard_id).compact()
+                self.metrics["compactions"] += 1
+
+    def close(self):
+        """버퍼 기록 후 샤드 / 주기적 flush 스레드 정리"""
+        self._stop_flusher.set()
+        with self._lock:
+            self.flush()
+            self._close_shards()
+        _OPEN_STORAGES.discard(self)
+
+    def reload(self):
+        """샤드를 닫고 디스크에서 다시 열기 (다른 워커의 기록은 잠금을 잡을 때마다 자동 반영)"""
+        with self._lock:
+            self.flush()
+            self._close_shards()
+
+    def _close_shards(self):
+        for shard in self._shards.values():
+            shard.close()
+        self._shards = {}
+
+    # =========================================================================
+    # 읽기
+    # =========================================================================
+    def load_user(self, user_id: str) -> Optional[UserRecord]:
+        """사용자 데이터 복원 (없으면 None, 다른 워커의 기록 포함)"""
+        with self._lock:
+            shard = self._shard(user_id)
+            if shard.buffer:
+                shard.flush(self.fsync)
+            with shard.locked(exclusive=False):
+                shard.refresh()
+                record = shard.load_user(user_id)
+            if record is not None:
+                self.metrics["users_loaded"] += 1
+            return record
+
+    def user_ids(self) -> List[str]:
+        """저장된 전체 사용자 (모든 샤드를 엶)"""
+        users: List[str] = []
+        with self._lock:
+            for shard_id in range(self.num_shards):
+                directory = self.root / f"shard_{shard_id:03d}"
+                if directory.exists():
+                    shard = self._open_shard(shard_id)
+                    with shard.locked(exclusive=False):
+                        shard.refresh()
+                        users.extend(shard.users())
+        return users
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,325 @@
+"""
+증상 시계열 저장 및 추세 분석
+Phase 3: 치료 진행 증상 궤적 (배열 기반 저장 + 벡터화 분석)
+저장 경로: /AI_Drive/counseling_ai/models/personalization/time_series.py
+
+- SymptomSeries: 고정 크기 청크(int64 마이크로초 시각 + float64 수준)에 추가 기록
+  기존 {'date': ISO 문자열, 'level': 값} 목록과 같은 방식으로 순회/인덱싱/추가 가능
+- 분석 함수는 NumPy 배열을 받아 한 번에 계산 (기울기, 추세, 이동 평균, 변화점, 그룹별 기울기)
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+# 시각은 naive datetime 기준 마이크로초 정수
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+def _to_microseconds(value: Union[datetime, str]) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return (value - _EPOCH) // _MICROSECOND
+
+def _from_microseconds(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+class SymptomSeries:
+    """
+    증상 수준 시계열 (청크 배열)
+    - 점당 16바이트 (dict + ISO 문자열 대비 수십 분의 1)
+    - 전체 배열은 조회 시 한 번 이어 붙이고 다음 추가 전까지 재사용
+    - tail(n) 은 마지막 청크들만 읽음 (매 기록마다 최근 추세 계산용)
+    """
+    def __init__(self, points: Optional[Sequence[Dict[str, Any]]] = None, chunk_size: int = 256):
+        self.chunk_size = chunk_size
+        self._time_chunks: List[np.ndarray] = []
+        self._value_chunks: List[np.ndarray] = []
+        self._size = 0
+        self._concatenated = None
+        if points:
+            self.extend(points)
+
+    # ---- 기록 ----
+    def record(self, level: float, timestamp: Optional[datetime] = None):
+        """증상 수준 기록 (시각 생략 시 현재)"""
+        self._append(_to_microseconds(timestamp or datetime.now()), level)
+
+    def append(self, point: Dict[str, Any]):
+        """기존 목록 형식 {'date': ISO 문자열 또는 datetime, 'level': 값} 추가"""
+        self._append(_to_microseconds(point['date']), point['level'])
+
+    def extend(self, points: Sequence[Dict[str, Any]]):
+        for point in points:
+            self.append(point)
+
+    def _append(self, microseconds: int, level: float):
+        offset = self._size % self.chunk_size
+        if offset == 0:
+            self._time_chunks.append(np.empty(self.chunk_size, dtype=np.int64))
+            self._value_chunks.append(np.empty(self.chunk_size, dtype=np.float64))
+        self._time_chunks[-1][offset] = microseconds
+        self._value_chunks[-1][offset] = level
+        self._size += 1
+        self._concatenated = None
+
+    def _load(self, times: np.ndarray, values: np.ndarray):
+        """빈 시계열에 배열을 청크 단위로 한 번에 적재"""
+        for start in range(0, len(times), self.chunk_size):
+            time_chunk = np.empty(self.chunk_size, dtype=np.int64)
+            value_chunk = np.empty(self.chunk_size, dtype=np.float64)
+            count = min(self.chunk_size, len(times) - start)
+            time_chunk[:count] = times[start:start + count]
+            value_chunk[:count] = values[start:start + count]
+            self._time_chunks.append(time_chunk)
+            self._value_chunks.append(value_chunk)
+        self._size = len(times)
+        self._concatenated = None
+
+    # ---- 배열 조회 ----
+    def _arrays(self):
+        if self._concatenated is None:
+            if self._size:
+                times = np.concatenate(self._time_chunks)[:self._size]
+                values = np.concatenate(self._value_chunks)[:self._size]
+            else:
+                times = np.empty(0, dtype=np.int64)
+                values = np.empty(0, dtype=np.float64)
+            self._concatenated = (times, values)
+        return self._concatenated
+
+    @property
+    def times(self) -> np.ndarray:
+        """기록 시각 (마이크로초, int64)"""
+        return self._arrays()[0]
+
+    @property
+    def values(self) -> np.ndarray:
+        """증상 수준 (float64)"""
+        return self._arrays()[1]
+
+    def days(self, times: Optional[np.ndarray] = None) -> np.ndarray:
+        """첫 기록 기준 경과 일수 (분석 함수의 x 축)"""
+        times = self.times if times is None else times
+        if not len(times):
+            return np.empty(0)
+        return (times - times[0]) / _MICROSECONDS_PER_DAY
+
+    def tail(self, count: int):
+        """최근 count 개 (시각, 수준) - 전체를 이어 붙이지 않음"""
+        count = min(count, self._size)
+        if count <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        if self._concatenated is not None:
+            return self._concatenated[0][-count:], self._concatenated[1][-count:]
+        used = self._size - (len(self._time_chunks) - 1) * self.chunk_size
+        chunks = 1 + max(0, -(-(count - used) // self.chunk_size))
+        times = np.concatenate(self._time_chunks[-chunks:])
+        values = np.concatenate(self._value_chunks[-chunks:])
+        end = len(times) - self.chunk_size + used
+        return times[end - count:end], values[end - count:end]
+
+    def since(self, start: datetime):
+        """start 이후 기록 (시각, 수준)"""
+        times, values = self._arrays()
+        threshold = _to_microseconds(start)
+        if not _is_sorted(times):
+            mask = times >= threshold
+            return times[mask], values[mask]
+        i = np.searchsorted(times, threshold, side='left')
+        return times[i:], values[i:]
+
+    def trend(self, window: Optional[int] = None, **kwargs) -> str:
+        """최근 window 개 기록의 추세 (classify_trend 참조)"""
+        times, values = self.tail(window) if window else self._arrays()
+        return classify_trend(self.days(times), values, **kwargs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._time_chunks) + sum(c.nbytes for c in self._value_chunks)
+
+    # ---- 기존 목록 호환 ----
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def _point(self, i: int) -> Dict[str, Any]:
+        chunk, offset = divmod(i, self.chunk_size)
+        return {
+            'date': _from_microseconds(self._time_chunks[chunk][offset]).isoformat(),
+            'level': float(self._value_chunks[chunk][offset])
+        }
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._point(i) for i in range(*key.indices(self._size))]
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("SymptomSeries index out of range")
+        return self._point(key)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._size):
+            yield self._point(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SymptomSeries):
+            return np.array_equal(self.times, other.times) and np.array_equal(self.values, other.values)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SymptomSeries(points={self._size})"
+
+    # ---- 직렬화 ----
+    def to_document(self) -> Dict[str, List]:
+        """JSON 저장 형식 {'t': 마이크로초 목록, 'v': 수준 목록}"""
+        return {'t': self.times.tolist(), 'v': self.values.tolist()}
+
+    @classmethod
+    def from_document(cls, document: Union[Dict[str, List], Sequence[Dict[str, Any]], None]) -> "SymptomSeries":
+        """to_document 결과 또는 기존 목록 형식에서 복원"""
+        series = cls()
+        if isinstance(document, dict):
+            series._load(np.asarray(document.get('t', []), dtype=np.int64),
+                         np.asarray(document.get('v', []), dtype=np.float64))
+        elif document:
+            series.extend(document)
+        return series
+
+def _is_sorted(values: np.ndarray) -> bool:
+    return len(values) < 2 or bool(np.all(values[1:] >= values[:-1]))
+
+def linear_slope(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    최소제곱 기울기 (마지막 축 기준, 2차원이면 행마다)
+    x 분산이 0이면 NaN
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    sxx = (dx * dx).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (dx * dy).sum(axis=-1) / sxx
+
+def classify_trend(
+    x: np.ndarray,
+    y: np.ndarray,
+    min_points: int = 3,
+    t_threshold: float = 2.0,
+    higher_is_better: bool = False
+) -> str:
+    """
+    기울기 t 통계량 기준 추세 판정 (척도와 무관)
+    - |slope / SE| >= t_threshold 이면 improving / worsening, 아니면 stable
+    - 증상 수준은 낮을수록 좋음 (higher_is_better=False)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n < min_points:
+        return "stable"
+    dx = x - x.mean()
+    sxx = dx @ dx
+    if sxx == 0:
+        return "stable"
+    slope = (dx @ (y - y.mean())) / sxx
+    residuals = y - y.mean() - slope * dx
+    se = np.sqrt((residuals @ residuals) / (n - 2) / sxx) if n > 2 else 0.0
+    if slope == 0 or (se > 0 and abs(slope) / se < t_threshold):
+        return "stable"
+    rising = slope > 0
+    return "improving" if rising == higher_is_better else "worsening"
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """후행 이동 평균 (누적합, 처음 window-1 개는 가능한 만큼의 평균)"""
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumsum[ends] - cumsum[starts]) / (ends - starts)
+
+def change_points(
+    values: np.ndarray,
+    min_size: int = 3,
+    penalty: Optional[float] = None,
+    max_points: Optional[int] = None
+) -> List[int]:
+    """
+    평균 이동 변화점 (이진 분할)
+    - 구간마다 모든 분할 위치의 제곱오차 감소량을 누적합으로 한 번에 계산
+    - penalty 기본값: 2 * log(n) * sigma^2 (sigma 는 차분의 MAD 로 추정)
+    - 반환: 새 구간이 시작되는 인덱스 (오름차순)
+    """
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    if n < 2 * min_size:
+        return []
+    if penalty is None:
+        diffs = np.abs(np.diff(y))
+        sigma = np.median(diffs) / 0.6745 / np.sqrt(2) if len(diffs) else 0.0
+        if sigma == 0:
+            sigma = np.std(y) or 1.0
+        penalty = 2.0 * np.log(n) * sigma ** 2
+    s1 = np.concatenate(([0.0], np.cumsum(y)))
+    s2 = np.concatenate(([0.0], np.cumsum(y * y)))
+
+    def cost(a, b):
+        return s2[b] - s2[a] - (s1[b] - s1[a]) ** 2 / (b - a)
+
+    found: List[int] = []
+    segments = [(0, n)]
+    while segments and (max_points is None or len(found) < max_points):
+        best = None
+        for a, b in segments:
+            if b - a < 2 * min_size:
+                continue
+            splits = np.arange(a + min_size, b - min_size + 1)
+            gains = cost(a, b) - cost(a, splits) - cost(splits, b)
+            i = int(np.argmax(gains))
+            if gains[i] > penalty and (best is None or gains[i] > best[0]):
+                best = (gains[i], a, int(splits[i]), b)
+        if best is None:
+            break
+        _, a, k, b = best
+        found.append(k)
+        segments.remove((a, b))
+        segments.extend([(a, k), (k, b)])
+    return sorted(found)
+
+def grouped_slopes(
+    group_ids: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    n_groups: Optional[int] = None
+) -> np.ndarray:
+    """
+    그룹별 최소제곱 기울기 (bincount, 그룹 수만큼 반복 없음)
+    - group_ids: 0..n_groups-1 정수
+    - 점이 2개 미만이거나 x 분산이 0인 그룹은 NaN
+    """
+    group_ids = np.asarray(group_ids, dtype=np.intp)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if n_groups is None:
+        n_groups = int(group_ids.max()) + 1 if len(group_ids) else 0
+    counts = np.bincount(group_ids, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(group_ids, x, n_groups) / counts
+        mean_y = np.bincount(group_ids, y, n_groups) / counts
+        dx = x - mean_x[group_ids]
+        sxy = np.bincount(group_ids, dx * (y - mean_y[group_ids]), n_groups)
+        sxx = np.bincount(group_ids, dx * dx, n_groups)
+        slopes = sxy / sxx
+    slopes[(counts < 2) | (sxx == 0)] = np.nan
+    return slopes
@@ -5,13 +5,24 @@ Phase 3: 품질 모니터링 및 실시간 개입
 """
 import tensorflow as tf
 from tensorflow import keras
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Iterator
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import asyncio
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from itertools import compress
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +79,205 @@ class SessionReview:
     clinical_notes: str
     recommendations: List[str]
 
+@dataclass
+class SessionQualityMatrix:
+    """세션 품질 점수 행렬 (턴 × 차원, 열 순서 = QualityDimension)"""
+    session_id: str
+    language: str
+    turn_ids: List[str]
+    scores: np.ndarray
+
+    @property
+    def turn_averages(self) -> np.ndarray:
+        return self.scores.mean(axis=1)
+
+    @property
+    def dimension_means(self) -> np.ndarray:
+        # 열을 연속 메모리로 복사해 차원별 합산 순서를 1차원 np.mean 과 동일하게 유지
+        return np.ascontiguousarray(self.scores.T).mean(axis=1)
+
+@dataclass
+class BulkReviewReport:
+    """대량 세션 리뷰 결과 보고서"""
+    output_path: str
+    output_format: str
+    workers: int
+    total_sessions: int
+    reviewed_sessions: int
+    skipped_sessions: int # 체크포인트에서 이미 완료된 세션
+    failed_sessions: List[str]
+    total_turns: int
+    elapsed_seconds: float
+    sessions_per_second: float
+    turns_per_second: float
+    dimension_seconds: Dict[str, float] # 차원별 누적 평가 시간
+    dimension_us_per_turn: Dict[str, float]
+
+# =============================================================================
+# 평가 마커 사전 (언어별 단일 컴파일)
+# =============================================================================
+_EMPATHY_MARKERS = {
+    "ko": (
+        ("힘드시", "어려우시", "이해", "공감", "느끼", "감정", "마음", "걱정", "함께", "곁에"),
+        ("그냥", "별거 아니", "왜 그래", "그러지 마")
+    ),
+    "en": (
+        ("understand", "feel", "sounds", "difficult", "challenging", "support", "here for you", "valid"),
+        ("just", "shouldn't feel", "overreacting", "simply")
+    ),
+}
+_COLLABORATIVE_MARKERS = {
+    "ko": ("함께", "우리", "같이", "어떠세요", "원하시면"),
+    "en": ("together", "we", "let's", "would you like", "how about"),
+}
+_CRISIS_KEYWORDS = {
+    "ko": ("죽고 싶", "자살", "자해", "죽을", "끝내고 싶"),
+    "en": ("kill myself", "suicide", "self-harm", "end it", "want to die"),
+}
+_SAFETY_RESOURCES = ("1393", "988", "위기", "crisis", "hotline", "안전", "safety", "전문가", "professional")
+_DANGEROUS_PATTERNS = ("혼자 해결", "참으세요", "그냥 잊어", "deal with it alone", "just forget", "ignore")
+_HONORIFIC_MARKERS = ("요", "습니다", "세요", "시")
+_KOREAN_CULTURAL_MARKERS = ("가족", "부모님", "마음", "정")
+_KEIGO_MARKERS = ("です", "ます", "ございます")
+_APPROACH_ELEMENTS = {
+    "CBT": ("생각", "thought", "인지", "cognitive", "행동", "behavior"),
+    "DBT": ("수용", "acceptance", "조절", "regulation", "마음챙김", "mindfulness"),
+    "MI": ("변화", "change", "동기", "motivation", "양가감정", "ambivalence"),
+    "PCT": ("무조건적", "unconditional", "수용", "acceptance", "공감", "empathy"),
+}
+_BOUNDARY_VIOLATIONS = (
+    "개인적으로 만나", "연락처를 알려", "친구가 되",
+    "meet personally", "give you my number", "be friends"
+)
+
+# 이 길이 이하의 텍스트에만 첫 글자 색인 사용
+_FIRST_CHAR_INDEX_MAX_LENGTH = 128
+
+class MarkerLexicon:
+    """
+    카테고리별 마커 목록을 중복 제거된 하나의 마커 튜플로 합친 사전
+    scan()은 첫 글자가 텍스트에 있는 마커만 한 번씩 포함 여부를 검사해
+    비트마스크 히트 벡터를 반환한다.
+    """
+
+    def __init__(self, categories: Dict[str, Tuple[str, ...]]):
+        markers: List[str] = []
+        for items in categories.values():
+            for marker in items:
+                if marker not in markers:
+                    markers.append(marker)
+        self.markers = tuple(markers)
+        self.bits = tuple(1 << i for i in range(len(markers)))
+        self.categories = categories
+        # 첫 글자 색인: 텍스트에 첫 글자가 있는 마커만 부분 문자열 검사
+        by_first: Dict[str, List[Tuple[str, int]]] = {}
+        for marker, bit in zip(self.markers, self.bits):
+            by_first.setdefault(marker[0], []).append((marker, bit))
+        self.by_first = {char: tuple(items) for char, items in by_first.items()}
+        self.first_chars = frozenset(self.by_first)
+        # 카테고리 -> 마커 비트마스크
+        self.masks = {
+            name: sum(1 << markers.index(m) for m in set(items)) for name, items in categories.items()
+        }
+
+    def scan(self, text: str) -> int:
+        """마커별 포함 여부 비트마스크"""
+        if len(text) > _FIRST_CHAR_INDEX_MAX_LENGTH:
+            # 긴 텍스트는 대부분의 첫 글자가 등장하므로 전체 마커를 C 루프로 검사
+            return sum(compress(self.bits, map(text.__contains__, self.markers)))
+        hits = 0
+        for char in self.first_chars.intersection(text):
+            for marker, bit in self.by_first[char]:
+                if marker in text:
+                    hits |= bit
+        return hits
+
+    def matched(self, hits: int, category: str) -> Tuple[str, ...]:
+        """히트 벡터에서 카테고리 매칭 마커 (정의 순서)"""
+        if not hits & self.masks.get(category, 0):
+            return ()
+        return tuple(m for m in self.categories[category] if hits & self.bits[self.markers.index(m)])
+
+    def count(self, hits: int, category: str) -> int:
+        """카테고리 매칭 마커 수"""
+        return bin(hits & self.masks.get(category, 0)).count("1")
+
+    def any(self, hits: int, category: str) -> bool:
+        """카테고리 마커 중 하나라도 매칭되었는지"""
+        return bool(hits & self.masks.get(category, 0))
+
+@dataclass
+class TurnMarkerHits:
+    """턴 단위 마커 히트 벡터 (응답 1회, 사용자 메시지 1회 스캔)"""
+    response_lexicon: MarkerLexicon
+    response: int
+    user_lexicon: MarkerLexicon
+    user: int
+
+    def matched(self, category: str) -> Tuple[str, ...]:
+        """응답에서 매칭된 카테고리 마커"""
+        return self.response_lexicon.matched(self.response, category)
+
+    def count(self, category: str) -> int:
+        """응답에서 매칭된 카테고리 마커 수"""
+        return bin(self.response & self.response_lexicon.masks.get(category, 0)).count("1")
+
+    def any(self, category: str) -> bool:
+        """응답에 카테고리 마커가 있는지"""
+        return bool(self.response & self.response_lexicon.masks.get(category, 0))
+
+    def user_any(self, category: str) -> bool:
+        """사용자 메시지에 카테고리 마커가 있는지"""
+        return bool(self.user & self.user_lexicon.masks.get(category, 0))
+
+_RESPONSE_LEXICONS: Dict[Tuple[str, Optional[str]], MarkerLexicon] = {}
+
+def _response_lexicon(language: str, therapeutic_approach: Optional[str]) -> MarkerLexicon:
+    """언어/접근법별 AI 응답 마커 사전 (소문자 변환된 응답에 적용, 최초 1회 컴파일)"""
+    lexicon = _RESPONSE_LEXICONS.get((language, therapeutic_approach))
+    if lexicon is not None:
+        return lexicon
+    group = "ko" if language == "ko" else "en"
+    categories = {
+        "empathy_positive": _EMPATHY_MARKERS[group][0],
+        "empathy_negative": _EMPATHY_MARKERS[group][1],
+        "collaborative": _COLLABORATIVE_MARKERS[group],
+        "safety_resources": _SAFETY_RESOURCES,
+        "dangerous_patterns": _DANGEROUS_PATTERNS,
+        "boundary_violations": _BOUNDARY_VIOLATIONS,
+        "approach": _APPROACH_ELEMENTS.get(therapeutic_approach, ()),
+    }
+    # 존칭/경어 마커는 대소문자가 없는 문자라 소문자 변환 여부와 무관하게 동일하게 매칭됨
+    if language == "ko":
+        categories["honorifics"] = _HONORIFIC_MARKERS
+        categories["cultural_markers"] = _KOREAN_CULTURAL_MARKERS
+    elif language == "ja":
+        categories["keigo"] = _KEIGO_MARKERS
+    lexicon = MarkerLexicon(categories)
+    _RESPONSE_LEXICONS[(language, therapeutic_approach)] = lexicon
+    return lexicon
+
+_USER_LEXICON = MarkerLexicon({
+    "crisis": tuple(kw for keywords in _CRISIS_KEYWORDS.values() for kw in keywords)
+})
+
+def scan_turn_markers(
+    user_message: str,
+    ai_response: str,
+    language: str,
+    therapeutic_approach: Optional[str] = "CBT"
+) -> TurnMarkerHits:
+    """턴의 응답과 사용자 메시지를 각각 한 번씩 스캔"""
+    if therapeutic_approach not in _APPROACH_ELEMENTS:
+        therapeutic_approach = None
+    lexicon = _response_lexicon(language, therapeutic_approach)
+    return TurnMarkerHits(
+        response_lexicon=lexicon,
+        response=lexicon.scan(ai_response.lower()),
+        user_lexicon=_USER_LEXICON,
+        user=_USER_LEXICON.scan(user_message.lower())
+    )
+
 class AISupervisor(keras.Model):
     """
     AI 슈퍼바이저 모델
@@ -79,12 +289,27 @@ class AISupervisor(keras.Model):
     5. 인간 슈퍼바이저 알림
     """
     
-    def __init__(self, embedding_dim: int = 512, num_quality_dimensions: int = 7, intervention_threshold: float = 0.6, crisis_threshold: float = 0.8, **kwargs):
+    def __init__(self, embedding_dim: int = 512, num_quality_dimensions: int = 7, intervention_threshold: float = 0.6, crisis_threshold: float = 0.8, context_window: int = 10, max_cached_sessions: int = 10000, **kwargs):
         super().__init__(**kwargs)
         self.embedding_dim = embedding_dim
         self.num_quality_dimensions = num_quality_dimensions
         self.intervention_threshold = intervention_threshold
         self.crisis_threshold = crisis_threshold
+        self.context_window = context_window
+        
+        # 세션 단위 캐시는 최근 사용 세션 max_cached_sessions 개만 유지 (LRU)
+        self.max_cached_sessions = max_cached_sessions
+        # 워커 풀이 스레드에서 평가를 실행하므로 세션 캐시 변경은 잠금 아래에서
+        self._cache_lock = threading.RLock()
+        
+        # 턴별 품질 점수 캐시: session_id -> turn_id -> (내용 해시, 점수)
+        self.turn_score_cache: "OrderedDict[str, Dict[str, Tuple[str, List[QualityScore]]]]" = OrderedDict()
+        
+        # 세션별 품질 점수 행렬 (review_session 결과, 대시보드 집계용 - 최근 세션 기준)
+        self.session_matrices: "OrderedDict[str, SessionQualityMatrix]" = OrderedDict()
+        
+        # 알림 파이프라인 (publish(feedback) 제공, 없으면 로그만 기록)
+        self.alert_pipeline = None
         
         # 품질 평가 기준
         self.quality_criteria = self._define_quality_criteria()
@@ -326,9 +551,9 @@ class AISupervisor(keras.Model):
         Returns:
             SupervisorFeedback
         """
-        # 품질 점수 계산
-        quality_scores = await self._calculate_quality_scores(
-            user_message, ai_response, context, language
+        # 품질 점수 계산 (리뷰 시 재사용하도록 캐시)
+        quality_scores = await self._get_turn_scores(
+            session_id, turn_id, user_message, ai_response, context, language
         )
         
         # 전체 점수 계산 (가중 평균)
@@ -376,33 +601,38 @@ class AISupervisor(keras.Model):
         """품질 점수 계산"""
         scores = []
         
+        # 응답/사용자 메시지 마커 1회 스캔 (전체 평가기 공유)
+        hits = scan_turn_markers(
+            user_message, ai_response, language, context.get('therapeutic_approach', 'CBT')
+        )
+        
         # 공감 점수
         empathy_score = await self._evaluate_empathy(
-            user_message, ai_response, language
+            user_message, ai_response, language, hits
         )
         scores.append(empathy_score)
         
         # 치료적 동맹 점수
         alliance_score = await self._evaluate_therapeutic_alliance(
-            ai_response, context, language
+            ai_response, context, language, hits
         )
         scores.append(alliance_score)
         
         # 안전 준수 점수
         safety_score = await self._evaluate_safety_compliance(
-            user_message, ai_response, context
+            user_message, ai_response, context, hits
         )
         scores.append(safety_score)
         
         # 문화적 적절성 점수
         cultural_score = await self._evaluate_cultural_appropriateness(
-            ai_response, language, context.get('cultural_context', {})
+            ai_response, language, context.get('cultural_context', {}), hits
         )
         scores.append(cultural_score)
         
         # 임상적 정확성 점수
         clinical_score = await self._evaluate_clinical_accuracy(
-            ai_response, context.get('therapeutic_approach', 'CBT')
+            ai_response, context.get('therapeutic_approach', 'CBT'), hits
         )
         scores.append(clinical_score)
         
@@ -414,48 +644,82 @@ class AISupervisor(keras.Model):
         
         # 윤리적 준수 점수
         ethical_score = await self._evaluate_ethical_compliance(
-            ai_response, context
+            ai_response, context, hits
         )
         scores.append(ethical_score)
         
         return scores
 
-    async def _evaluate_empathy(
+    async def _get_turn_scores(
+        self,
+        session_id: str,
+        turn_id: str,
+        user_message: str,
+        ai_response: str,
+        context: Dict[str, Any],
+        language: str
+    ) -> List[QualityScore]:
+        """턴 품질 점수 (턴 ID + 내용 해시가 같으면 캐시 재사용)"""
+        fingerprint = self._turn_fingerprint(user_message, ai_response, context, language)
+        with self._cache_lock:
+            session_cache = self.turn_score_cache.get(session_id)
+            if session_cache is None:
+                session_cache = {}
+            self._remember_session(self.turn_score_cache, session_id, session_cache)
+            cached = session_cache.get(turn_id)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+            
+        scores = await self._calculate_quality_scores(
+            user_message, ai_response, context, language
+        )
+        with self._cache_lock:
+            session_cache[turn_id] = (fingerprint, scores)
+        return scores
+
+    def _turn_fingerprint(
         self,
         user_message: str,
         ai_response: str,
+        context: Dict[str, Any],
         language: str
+    ) -> str:
+        """점수에 영향을 주는 입력의 해시"""
+        approach = context.get('therapeutic_approach', 'CBT')
+        same_approach = context.get('previous_approach') == context.get('therapeutic_approach')
+        key = "\x1f".join([language, str(approach), str(same_approach), user_message, ai_response])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _remember_session(self, cache: OrderedDict, session_id: str, value: Any):
+        """세션 캐시에 저장 / 최근 사용으로 표시, 한도를 넘으면 가장 오래 안 쓴 세션 제거"""
+        with self._cache_lock:
+            cache[session_id] = value
+            cache.move_to_end(session_id)
+            while len(cache) > self.max_cached_sessions:
+                cache.popitem(last=False)
+
+    def clear_turn_cache(self, session_id: Optional[str] = None):
+        """턴 점수 캐시 삭제 (session_id가 없으면 전체)"""
+        with self._cache_lock:
+            if session_id is None:
+                self.turn_score_cache.clear()
+            else:
+                self.turn_score_cache.pop(session_id, None)
+
+    async def _evaluate_empathy(
+        self,
+        user_message: str,
+        ai_response: str,
+        language: str,
+        hits: Optional[TurnMarkerHits] = None
     ) -> QualityScore:
         """공감 평가"""
-        criteria = self.quality_criteria[QualityDimension.EMPATHY]
-        
-        # 공감 지표 확인
-        positive_count = 0
-        negative_count = 0
-        
-        if language == "ko":
-            empathy_markers = [
-                "힘드시", "어려우시", "이해", "공감", "느끼", "감정", "마음", "걱정", "함께", "곁에"
-            ]
-            negative_markers = [
-                "그냥", "별거 아니", "왜 그래", "그러지 마"
-            ]
-        else: # en
-            empathy_markers = [
-                "understand", "feel", "sounds", "difficult", "challenging", "support", "here for you", "valid"
-            ]
-            negative_markers = [
-                "just", "shouldn't feel", "overreacting", "simply"
-            ]
+        if hits is None:
+            hits = scan_turn_markers(user_message, ai_response, language)
             
-        response_lower = ai_response.lower()
-        for marker in empathy_markers:
-            if marker in response_lower:
-                positive_count += 1
-                
-        for marker in negative_markers:
-            if marker in response_lower:
-                negative_count += 1
+        # 공감 지표 확인
+        positive_count = hits.count("empathy_positive")
+        negative_count = hits.count("empathy_negative")
                 
         # 점수 계산
         score = min(1.0, (positive_count * 0.15) - (negative_count * 0.2) + 0.5)
@@ -474,21 +738,17 @@ class AISupervisor(keras.Model):
         self,
         ai_response: str,
         context: Dict[str, Any],
-        language: str
+        language: str,
+        hits: Optional[TurnMarkerHits] = None
     ) -> QualityScore:
         """치료적 동맹 평가"""
+        if hits is None:
+            hits = scan_turn_markers("", ai_response, language)
         score = 0.7 # 기본 점수
         
         # 협력적 언어 확인
-        if language == "ko":
-            collaborative_markers = ["함께", "우리", "같이", "어떠세요", "원하시면"]
-        else:
-            collaborative_markers = ["together", "we", "let's", "would you like", "how about"]
-            
-        response_lower = ai_response.lower()
-        for marker in collaborative_markers:
-            if marker in response_lower:
-                score += 0.05
+        for _ in range(hits.count("collaborative")):
+            score += 0.05
                 
         # 일관성 확인
         if context.get('previous_approach') == context.get('therapeutic_approach'):
@@ -507,46 +767,30 @@ class AISupervisor(keras.Model):
         self,
         user_message: str,
         ai_response: str,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        hits: Optional[TurnMarkerHits] = None
     ) -> QualityScore:
         """안전 준수 평가"""
+        if hits is None:
+            hits = scan_turn_markers(user_message, ai_response, "en")
         score = 1.0 # 기본 만점
         feedback_items = []
         
         # 위기 키워드 확인
-        crisis_keywords = {
-            "ko": ["죽고 싶", "자살", "자해", "죽을", "끝내고 싶"],
-            "en": ["kill myself", "suicide", "self-harm", "end it", "want to die"]
-        }
-        
-        user_lower = user_message.lower()
-        has_crisis = any(
-            kw in user_lower 
-            for lang_kws in crisis_keywords.values() 
-            for kw in lang_kws
-        )
+        has_crisis = hits.user_any("crisis")
         
         if has_crisis:
             # 위기 상황에서 적절한 대응 확인
-            safety_resources = [
-                "1393", "988", "위기", "crisis", "hotline", "안전", "safety", "전문가", "professional"
-            ]
-            response_lower = ai_response.lower()
-            has_safety_response = any(res in response_lower for res in safety_resources)
+            has_safety_response = hits.any("safety_resources")
             
             if not has_safety_response:
                 score -= 0.4
                 feedback_items.append("위기 상황에서 안전 자원 미제공")
                 
         # 위험한 조언 확인
-        dangerous_patterns = [
-            "혼자 해결", "참으세요", "그냥 잊어", "deal with it alone", "just forget", "ignore"
-        ]
-        response_lower = ai_response.lower()
-        for pattern in dangerous_patterns:
-            if pattern in response_lower:
-                score -= 0.2
-                feedback_items.append(f"부적절한 조언 감지: {pattern}")
+        for pattern in hits.matched("dangerous_patterns"):
+            score -= 0.2
+            feedback_items.append(f"부적절한 조언 감지: {pattern}")
                 
         score = max(0.0, score)
         feedback = "; ".join(feedback_items) if feedback_items else "안전 프로토콜 준수"
@@ -562,28 +806,28 @@ class AISupervisor(keras.Model):
         self,
         ai_response: str,
         language: str,
-        cultural_context: Dict[str, Any]
+        cultural_context: Dict[str, Any],
+        hits: Optional[TurnMarkerHits] = None
     ) -> QualityScore:
         """문화적 적절성 평가"""
+        if hits is None:
+            hits = scan_turn_markers("", ai_response, language)
         score = 0.8 # 기본 점수
         
         if language == "ko":
             # 한국어 존칭 확인
-            honorific_markers = ["요", "습니다", "세요", "시"]
-            has_honorific = any(m in ai_response for m in honorific_markers)
+            has_honorific = hits.any("honorifics")
             
             if not has_honorific:
                 score -= 0.2
                 
             # 문화적 민감성
-            cultural_markers = ["가족", "부모님", "마음", "정"]
-            if any(m in ai_response for m in cultural_markers):
+            if hits.any("cultural_markers"):
                 score += 0.1
                 
         elif language == "ja":
             # 일본어 경어 확인
-            keigo_markers = ["です", "ます", "ございます"]
-            if any(m in ai_response for m in keigo_markers):
+            if hits.any("keigo"):
                 score += 0.1
                 
         score = min(1.0, max(0.0, score))
@@ -598,23 +842,16 @@ class AISupervisor(keras.Model):
     async def _evaluate_clinical_accuracy(
         self,
         ai_response: str,
-        therapeutic_approach: str
+        therapeutic_approach: str,
+        hits: Optional[TurnMarkerHits] = None
     ) -> QualityScore:
         """임상적 정확성 평가"""
+        if hits is None:
+            hits = scan_turn_markers("", ai_response, "en", therapeutic_approach)
         score = 0.75 # 기본 점수
         
         # 접근법별 핵심 요소 확인
-        approach_elements = {
-            "CBT": ["생각", "thought", "인지", "cognitive", "행동", "behavior"],
-            "DBT": ["수용", "acceptance", "조절", "regulation", "마음챙김", "mindfulness"],
-            "MI": ["변화", "change", "동기", "motivation", "양가감정", "ambivalence"],
-            "PCT": ["무조건적", "unconditional", "수용", "acceptance", "공감", "empathy"]
-        }
-        
-        elements = approach_elements.get(therapeutic_approach, [])
-        response_lower = ai_response.lower()
-        
-        matching_elements = sum(1 for e in elements if e in response_lower)
+        matching_elements = hits.count("approach")
         score += matching_elements * 0.05
         score = min(1.0, score)
         
@@ -657,21 +894,17 @@ class AISupervisor(keras.Model):
     async def _evaluate_ethical_compliance(
         self,
         ai_response: str,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        hits: Optional[TurnMarkerHits] = None
     ) -> QualityScore:
         """윤리적 준수 평가"""
+        if hits is None:
+            hits = scan_turn_markers("", ai_response, "en")
         score = 1.0 # 기본 만점
         
         # 경계 위반 확인
-        boundary_violations = [
-            "개인적으로 만나", "연락처를 알려", "친구가 되",
-            "meet personally", "give you my number", "be friends"
-        ]
-        
-        response_lower = ai_response.lower()
-        for violation in boundary_violations:
-            if violation in response_lower:
-                score -= 0.3
+        for _ in range(hits.count("boundary_violations")):
+            score -= 0.3
                 
         # 비밀보장 언급 (적절한 경우)
         # 위기 상황에서의 예외 설명 필요
@@ -785,13 +1018,15 @@ class AISupervisor(keras.Model):
 
     async def _send_alert(self, feedback: SupervisorFeedback):
         """인간 슈퍼바이저 알림 전송"""
+        if self.alert_pipeline is not None:
+            # 세션별 중복 제거 / 심각도 상승 / 요약 전송은 파이프라인에서 처리
+            self.alert_pipeline.publish(feedback)
+            return
         logger.warning(
             f"Supervisor Alert - Session: {feedback.session_id}, "
             f"Level: {feedback.intervention_level.value}, "
             f"Reason: {feedback.intervention_reason}"
         )
-        # 실제 구현에서는 알림 시스템 연동
-        # await notification_service.send_alert(feedback)
 
     async def review_session(
         self,
@@ -808,61 +1043,324 @@ class AISupervisor(keras.Model):
         Returns:
             SessionReview
         """
-        all_scores = []
-        key_moments = []
+        num_turns = len(conversation_history)
+        dimensions = list(QualityDimension)
+        matrix = np.zeros((num_turns, len(dimensions)))
+        turn_ids = []
         
-        # 각 턴 평가
+        # 각 턴 평가 (캐시된 턴 점수 재사용, 컨텍스트는 최근 context_window 턴만 전달)
         for i, turn in enumerate(conversation_history):
-            scores = await self._calculate_quality_scores(
+            window_start = max(0, i - self.context_window)
+            turn_id = str(turn.get('turn_id', f"turn_{i}"))
+            scores = await self._get_turn_scores(
+                session_id,
+                turn_id,
                 turn.get('user_message', ''),
                 turn.get('ai_response', ''),
-                {'conversation_history': conversation_history[:i]},
+                {'conversation_history': conversation_history[window_start:i]},
                 language
             )
-            all_scores.extend(scores)
+            matrix[i] = [s.score for s in scores]
+            turn_ids.append(turn_id)
             
-            # 주요 순간 기록
-            avg_score = np.mean([s.score for s in scores])
-            if avg_score < 0.6 or avg_score > 0.9:
-                key_moments.append({
-                    "turn": i,
-                    "score": avg_score,
-                    "type": "excellent" if avg_score > 0.9 else "needs_attention"
-                })
-                
-        # 평균 품질 계산
-        average_quality = np.mean([s.score for s in all_scores])
-        
-        # 추세 분석
-        quality_trend = self._analyze_quality_trend(all_scores)
+        quality = SessionQualityMatrix(session_id, language, turn_ids, matrix)
+        self._remember_session(self.session_matrices, session_id, quality)
         
         # 강점 및 개선점 분석
-        strengths, improvements = self._analyze_strengths_weaknesses(all_scores)
+        dim_means = quality.dimension_means
+        strengths, improvements = self._classify_dimensions(dimensions, dim_means)
         
         return SessionReview(
             session_id=session_id,
-            total_turns=len(conversation_history),
-            average_quality=float(average_quality),
-            quality_trend=quality_trend,
-            key_moments=key_moments,
+            total_turns=num_turns,
+            average_quality=float(matrix.mean()) if num_turns else float("nan"),
+            quality_trend=self._quality_trend(matrix),
+            key_moments=self._detect_key_moments(quality.turn_averages),
             strengths=strengths,
             areas_for_improvement=improvements,
-            clinical_notes=self._generate_clinical_notes(all_scores, language),
-            recommendations=self._generate_recommendations(all_scores, language)
+            clinical_notes=self._clinical_notes(matrix.mean() if num_turns else np.nan, matrix.size, language),
+            recommendations=self._recommendations_from_means(dimensions, dim_means, language)
+        )
+
+    def _detect_key_moments(self, turn_averages: np.ndarray) -> List[Dict[str, Any]]:
+        """주요 순간 (턴 평균 0.6 미만 / 0.9 초과)"""
+        flagged = np.flatnonzero((turn_averages < 0.6) | (turn_averages > 0.9))
+        return [
+            {
+                "turn": int(i),
+                "score": turn_averages[i],
+                "type": "excellent" if turn_averages[i] > 0.9 else "needs_attention"
+            }
+            for i in flagged
+        ]
+
+    def get_session_analytics(
+        self,
+        session_id: str,
+        percentiles: Tuple[int, ...] = (10, 25, 50, 75, 90)
+    ) -> Optional[Dict[str, Any]]:
+        """세션 품질 분석 (review_session 이후 저장된 점수 행렬 기반)"""
+        quality = self.session_matrices.get(session_id)
+        if quality is None or not len(quality.turn_ids):
+            return None
+        dim_names = [dim.value for dim in QualityDimension]
+        dim_percentiles = np.percentile(quality.scores, percentiles, axis=0)
+        turn_averages = quality.turn_averages
+        return {
+            "session_id": session_id,
+            "total_turns": len(quality.turn_ids),
+            "average_quality": float(quality.scores.mean()),
+            "quality_trend": self._quality_trend(quality.scores),
+            "dimension_means": dict(zip(dim_names, quality.dimension_means.tolist())),
+            "dimension_percentiles": {
+                f"p{p}": dict(zip(dim_names, row.tolist())) for p, row in zip(percentiles, dim_percentiles)
+            },
+            "turn_averages": turn_averages.tolist(),
+            "key_moments": self._detect_key_moments(turn_averages)
+        }
+
+    def aggregate_session_quality(
+        self,
+        matrices: Optional[Iterable[SessionQualityMatrix]] = None,
+        percentiles: Tuple[int, ...] = (10, 25, 50, 75, 90),
+        worst_k: int = 5
+    ) -> Dict[str, Any]:
+        """
+        세션 간 품질 대시보드 집계
+        Args:
+            matrices: 집계할 세션 점수 행렬 (없으면 저장된 전체 세션)
+            percentiles: 차원별 / 세션 평균 백분위
+            worst_k: 평균 품질이 가장 낮은 세션 수
+        Returns:
+            전체 평균, 차원별 평균/백분위, 세션 평균 분포, 추세 분포, 하위 세션
+        """
+        if matrices is None:
+            with self._cache_lock:
+                matrices = list(self.session_matrices.values())
+        matrices = [m for m in matrices if len(m.turn_ids)]
+        dim_names = [dim.value for dim in QualityDimension]
+        if not matrices:
+            return {"sessions": 0, "turns": 0}
+            
+        # 전체 턴을 하나의 행렬로 결합 후 세션 경계(offsets)로 세션별 합계 계산
+        lengths = np.array([len(m.turn_ids) for m in matrices])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        stacked = np.concatenate([m.scores for m in matrices])
+        session_averages = np.add.reduceat(stacked.sum(axis=1), offsets) / (lengths * stacked.shape[1])
+        turn_averages = stacked.mean(axis=1)
+        
+        worst_k = min(worst_k, len(matrices))
+        worst = np.argpartition(session_averages, worst_k - 1)[:worst_k]
+        worst = worst[np.argsort(session_averages[worst])]
+        
+        trend_counts: Dict[str, int] = {}
+        for m in matrices:
+            trend = self._quality_trend(m.scores)
+            trend_counts[trend] = trend_counts.get(trend, 0) + 1
+            
+        return {
+            "sessions": len(matrices),
+            "turns": int(lengths.sum()),
+            "average_quality": float(stacked.mean()),
+            "dimension_means": dict(zip(dim_names, stacked.mean(axis=0).tolist())),
+            "dimension_percentiles": {
+                f"p{p}": dict(zip(dim_names, row.tolist()))
+                for p, row in zip(percentiles, np.percentile(stacked, percentiles, axis=0))
+            },
+            "session_average_percentiles": dict(zip(
+                [f"p{p}" for p in percentiles], np.percentile(session_averages, percentiles).tolist()
+            )),
+            "needs_attention_turn_rate": float(np.mean(turn_averages < 0.6)),
+            "excellent_turn_rate": float(np.mean(turn_averages > 0.9)),
+            "trend_counts": trend_counts,
+            "lowest_quality_sessions": [
+                {"session_id": matrices[i].session_id, "average_quality": float(session_averages[i])}
+                for i in worst
+            ]
+        }
+
+    def clear_session_matrices(self, session_id: Optional[str] = None):
+        """세션 점수 행렬 삭제 (session_id가 없으면 전체)"""
+        with self._cache_lock:
+            if session_id is None:
+                self.session_matrices.clear()
+            else:
+                self.session_matrices.pop(session_id, None)
+
+    async def bulk_review_sessions(
+        self,
+        sessions: Iterable[Dict[str, Any]],
+        output_path: str,
+        output_format: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 16,
+        resume: bool = True
+    ) -> BulkReviewReport:
+        """
+        대량 세션 리뷰 (야간 QA 재평가용)
+        Args:
+            sessions: {"session_id", "conversation_history", "language"} 세션 이터레이터
+            output_path: 결과 파일 경로 (NDJSON 또는 SQLite)
+            output_format: "ndjson" | "sqlite" (없으면 확장자로 판단)
+            max_workers: 프로세스 수 (0이면 현재 프로세스에서 순차 처리)
+            chunk_size: 프로세스에 한 번에 전달할 세션 수
+            resume: 출력 파일에 이미 기록된 세션은 건너뜀
+        Returns:
+            BulkReviewReport
+        """
+        if output_format is None:
+            output_format = "sqlite" if output_path.endswith((".db", ".sqlite", ".sqlite3")) else "ndjson"
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        sink = _open_review_sink(output_path, output_format, resume)
+        completed = sink.completed_session_ids()
+        stats = {"total": 0, "skipped": 0, "reviewed": 0, "turns": 0}
+        failed: List[str] = []
+        dimension_seconds = {dim.value: 0.0 for dim in QualityDimension}
+
+        def chunks() -> Iterator[List[Dict[str, Any]]]:
+            chunk = []
+            for session in sessions:
+                stats["total"] += 1
+                if str(session["session_id"]) in completed:
+                    stats["skipped"] += 1
+                    continue
+                chunk.append(session)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        def consume(result: Dict[str, Any]):
+            for session_id, review, error, turns in result["sessions"]:
+                if error is not None:
+                    logger.error(f"Bulk review failed - Session: {session_id}, Error: {error}")
+                    failed.append(session_id)
+                    continue
+                sink.write(review)
+                stats["reviewed"] += 1
+                stats["turns"] += turns
+            for dim, seconds in result["dimension_seconds"].items():
+                dimension_seconds[dim] += seconds
+            # 청크 단위 커밋 = 체크포인트
+            sink.commit()
+
+        start = time.perf_counter()
+        try:
+            if max_workers <= 0:
+                for chunk in chunks():
+                    consume(await self._review_session_chunk(chunk))
+            else:
+                loop = asyncio.get_running_loop()
+                config = {
+                    "embedding_dim": self.embedding_dim,
+                    "num_quality_dimensions": self.num_quality_dimensions,
+                    "intervention_threshold": self.intervention_threshold,
+                    "crisis_threshold": self.crisis_threshold,
+                    "context_window": self.context_window
+                }
+                # TensorFlow 초기화 이후 fork 는 안전하지 않으므로 spawn 사용
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_bulk_review_worker,
+                    initargs=(config,)
+                ) as executor:
+                    pending = set()
+                    for chunk in chunks():
+                        pending.add(loop.run_in_executor(executor, _review_chunk_in_worker, chunk))
+                        # 진행 중인 청크 수를 제한해 입력 이터레이터를 스트리밍으로 소비
+                        if len(pending) >= max_workers * 2:
+                            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                            for future in done:
+                                consume(future.result())
+                    while pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for future in done:
+                            consume(future.result())
+        finally:
+            sink.close()
+        elapsed = time.perf_counter() - start
+
+        turns = stats["turns"]
+        return BulkReviewReport(
+            output_path=output_path,
+            output_format=output_format,
+            workers=max_workers,
+            total_sessions=stats["total"],
+            reviewed_sessions=stats["reviewed"],
+            skipped_sessions=stats["skipped"],
+            failed_sessions=failed,
+            total_turns=turns,
+            elapsed_seconds=elapsed,
+            sessions_per_second=stats["reviewed"] / elapsed if elapsed > 0 else 0.0,
+            turns_per_second=turns / elapsed if elapsed > 0 else 0.0,
+            dimension_seconds=dimension_seconds,
+            dimension_us_per_turn={
+                dim: seconds / turns * 1e6 if turns else 0.0
+                for dim, seconds in dimension_seconds.items()
+            }
         )
 
+    async def _review_session_chunk(self, chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """세션 묶음 리뷰 (직렬화 가능한 결과 + 차원별 평가 시간)"""
+        results = []
+        timings = {dim.value: 0.0 for dim in QualityDimension}
+        with self._dimension_timing(timings):
+            for session in chunk:
+                session_id = str(session["session_id"])
+                history = session.get("conversation_history", [])
+                try:
+                    review = await self.review_session(
+                        session_id, history, session.get("language", "ko")
+                    )
+                    results.append((session_id, asdict(review), None, len(history)))
+                except Exception as e:
+                    results.append((session_id, None, repr(e), len(history)))
+                finally:
+                    # 대량 처리 중 캐시가 계속 커지지 않도록 세션 종료 시 삭제
+                    self.clear_turn_cache(session_id)
+                    self.clear_session_matrices(session_id)
+        return {"sessions": results, "dimension_seconds": timings}
+
+    @contextmanager
+    def _dimension_timing(self, timings: Dict[str, float]):
+        """차원별 평가기 실행 시간 누적 (인스턴스 메서드를 일시적으로 감쌈)"""
+        def timed(method, dimension):
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    timings[dimension] += time.perf_counter() - started
+            return wrapper
+
+        for name, dim in _EVALUATOR_DIMENSIONS.items():
+            setattr(self, name, timed(getattr(self, name), dim.value))
+        try:
+            yield timings
+        finally:
+            for name in _EVALUATOR_DIMENSIONS:
+                delattr(self, name)
+
     def _analyze_quality_trend(
         self,
         scores: List[QualityScore]
     ) -> str:
         """품질 추세 분석"""
-        if len(scores) < 6:
+        return self._quality_trend(np.fromiter((s.score for s in scores), dtype=float, count=len(scores)))
+
+    def _quality_trend(self, scores: np.ndarray) -> str:
+        """품질 추세 분석 (턴 순서로 펼친 점수의 초반/후반 1/3 평균 비교)"""
+        values = scores.ravel()
+        if values.size < 6:
             return "insufficient_data"
             
-        # 초반, 중반, 후반 평균 비교
-        third = len(scores) // 3
-        early = np.mean([s.score for s in scores[:third]])
-        late = np.mean([s.score for s in scores[-third:]])
+        third = values.size // 3
+        early = values[:third].mean()
+        late = values[-third:].mean()
         
         if late > early + 0.1:
             return "improving"
@@ -876,24 +1374,27 @@ class AISupervisor(keras.Model):
         scores: List[QualityScore]
     ) -> Tuple[List[str], List[str]]:
         """강점 및 개선점 분석"""
-        # 차원별 평균 계산
-        dim_scores = {}
+        dims, means = self._dimension_averages(scores)
+        return self._classify_dimensions(dims, means)
+
+    def _dimension_averages(
+        self,
+        scores: List[QualityScore]
+    ) -> Tuple[List[QualityDimension], np.ndarray]:
+        """차원별 평균 (등장 순서 유지)"""
+        dim_scores: Dict[QualityDimension, List[float]] = {}
         for score in scores:
-            if score.dimension not in dim_scores:
-                dim_scores[score.dimension] = []
-            dim_scores[score.dimension].append(score.score)
-            
-        dim_averages = {
-            dim: np.mean(scores) for dim, scores in dim_scores.items()
-        }
-        
-        strengths = [
-            dim.value for dim, avg in dim_averages.items() if avg >= 0.8
-        ]
-        improvements = [
-            dim.value for dim, avg in dim_averages.items() if avg < 0.7
-        ]
-        
+            dim_scores.setdefault(score.dimension, []).append(score.score)
+        return list(dim_scores), np.array([np.mean(values) for values in dim_scores.values()])
+
+    def _classify_dimensions(
+        self,
+        dims: List[QualityDimension],
+        means: np.ndarray
+    ) -> Tuple[List[str], List[str]]:
+        """차원 평균 기준 강점(0.8 이상) / 개선점(0.7 미만)"""
+        strengths = [dim.value for dim, avg in zip(dims, means) if avg >= 0.8]
+        improvements = [dim.value for dim, avg in zip(dims, means) if avg < 0.7]
         return strengths, improvements
 
     def _generate_clinical_notes(
@@ -902,13 +1403,16 @@ class AISupervisor(keras.Model):
         language: str
     ) -> str:
         """임상 노트 생성"""
-        avg_score = np.mean([s.score for s in scores])
+        return self._clinical_notes(np.mean([s.score for s in scores]), len(scores), language)
+
+    def _clinical_notes(self, avg_score: float, count: int, language: str) -> str:
+        """임상 노트 문구"""
         if language == "ko":
             return f"세션 평균 품질 점수: {avg_score:.2f}. " \
-                   f"총 {len(scores)}개 평가 지표 분석 완료."
+                   f"총 {count}개 평가 지표 분석 완료."
         else:
             return f"Session average quality score: {avg_score:.2f}. " \
-                   f"Analyzed {len(scores)} quality indicators."
+                   f"Analyzed {count} quality indicators."
 
     def _generate_recommendations(
         self,
@@ -916,17 +1420,18 @@ class AISupervisor(keras.Model):
         language: str
     ) -> List[str]:
         """권고사항 생성"""
+        dims, means = self._dimension_averages(scores)
+        return self._recommendations_from_means(dims, means, language)
+
+    def _recommendations_from_means(
+        self,
+        dims: List[QualityDimension],
+        means: np.ndarray,
+        language: str
+    ) -> List[str]:
+        """차원 평균 0.7 미만 영역 교육 권고"""
         recommendations = []
-        
-        # 차원별 평균 계산
-        dim_scores = {}
-        for score in scores:
-            if score.dimension not in dim_scores:
-                dim_scores[score.dimension] = []
-            dim_scores[score.dimension].append(score.score)
-            
-        for dim, dim_score_list in dim_scores.items():
-            avg = np.mean(dim_score_list)
+        for dim, avg in zip(dims, means):
             if avg < 0.7:
                 if language == "ko":
                     recommendations.append(f"{dim.value} 영역 강화 교육 권장 (현재 평균: {avg:.2f})")
@@ -935,6 +1440,112 @@ class AISupervisor(keras.Model):
                     
         return recommendations
 
+# =============================================================================
+# 대량 세션 리뷰 (프로세스 풀 / 결과 저장)
+# =============================================================================
+_EVALUATOR_DIMENSIONS = {
+    "_evaluate_empathy": QualityDimension.EMPATHY,
+    "_evaluate_therapeutic_alliance": QualityDimension.THERAPEUTIC_ALLIANCE,
+    "_evaluate_safety_compliance": QualityDimension.SAFETY_COMPLIANCE,
+    "_evaluate_cultural_appropriateness": QualityDimension.CULTURAL_APPROPRIATENESS,
+    "_evaluate_clinical_accuracy": QualityDimension.CLINICAL_ACCURACY,
+    "_evaluate_response_coherence": QualityDimension.RESPONSE_COHERENCE,
+    "_evaluate_ethical_compliance": QualityDimension.ETHICAL_COMPLIANCE,
+}
+
+# 워커 프로세스별 슈퍼바이저 (프로세스 시작 시 1회 생성)
+_BULK_REVIEW_SUPERVISOR: Optional[AISupervisor] = None
+
+def _init_bulk_review_worker(config: Dict[str, Any]):
+    """워커 프로세스 초기화"""
+    global _BULK_REVIEW_SUPERVISOR
+    _BULK_REVIEW_SUPERVISOR = AISupervisor(**config)
+
+def _review_chunk_in_worker(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """워커 프로세스에서 세션 묶음 리뷰"""
+    return asyncio.run(_BULK_REVIEW_SUPERVISOR._review_session_chunk(chunk))
+
+class _NDJSONReviewSink:
+    """세션 리뷰 NDJSON 기록 (한 줄 = 한 세션, 파일 자체가 체크포인트)"""
+
+    def __init__(self, path: str, resume: bool):
+        self.path = path
+        self.completed = set()
+        if resume and os.path.exists(path):
+            self._recover()
+        self.file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _recover(self):
+        """완료된 세션 ID 로드, 중단으로 잘린 마지막 줄은 제거"""
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self.completed.add(json.loads(line)["session_id"])
+                except (ValueError, KeyError):
+                    break
+                valid_end += len(line)
+        if valid_end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def completed_session_ids(self) -> set:
+        return self.completed
+
+    def write(self, review: Dict[str, Any]):
+        self.file.write(json.dumps(review, ensure_ascii=False) + "\n")
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+class _SQLiteReviewSink:
+    """세션 리뷰 SQLite 기록 (커밋된 행이 체크포인트)"""
+
+    def __init__(self, path: str, resume: bool):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_reviews ("
+            "session_id TEXT PRIMARY KEY, total_turns INTEGER, average_quality REAL, "
+            "quality_trend TEXT, review TEXT, reviewed_at TEXT)"
+        )
+        if not resume:
+            self.conn.execute("DELETE FROM session_reviews")
+        self.conn.commit()
+
+    def completed_session_ids(self) -> set:
+        return {row[0] for row in self.conn.execute("SELECT session_id FROM session_reviews")}
+
+    def write(self, review: Dict[str, Any]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO session_reviews VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                review["session_id"], review["total_turns"], review["average_quality"],
+                review["quality_trend"], json.dumps(review, ensure_ascii=False),
+                datetime.now().isoformat()
+            )
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+def _open_review_sink(path: str, output_format: str, resume: bool):
+    """출력 형식별 리뷰 저장소"""
+    if output_format == "ndjson":
+        return _NDJSONReviewSink(path, resume)
+    if output_format == "sqlite":
+        return _SQLiteReviewSink(path, resume)
+    raise ValueError(f"Unsupported output format: {output_format}")
+
 # 테스트 코드
 if __name__ == "__main__":
     import asyncio
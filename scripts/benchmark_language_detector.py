@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+언어 감지 성능 벤치마크
+파일명: scripts/benchmark_language_detector.py
+
+사용법:
+    PYTHONPATH=. python scripts/benchmark_language_detector.py
+
+이 스크립트는:
+1. 규칙 기반 감지 - 기존 정규식 다중 스캔 vs 단일 패스 히스토그램 (짧은 입력 / 긴 입력)
+2. 배치 처리 - 메시지 묶음에 대한 처리량 비교 (단건 루프 vs detect_language_batch)
+3. 언어 감지 + 문화 컨텍스트 분석 - 단건 루프 vs 배치 API
+4. 신경망 경로 - max_length 고정 패딩 단건 추론 vs 길이 버킷 동적 패딩 배치 추론 (data/test.tsv 단문)
+5. 세션 언어 상태 추적 - 턴마다 전체 감지 vs SessionLanguageTracker (빠른 경로 적중률)
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+import tensorflow as tf
+from models.multilingual.language_detector import (
+    LanguageDetectionResult,
+    MultilingualLanguageDetector,
+    SessionLanguageTracker,
+    SupportedLanguage,
+)
+
+SAMPLE_MESSAGES = [
+    "오늘 하루가 너무 힘들었어요. 아무것도 하기 싫어요.",
+    "I'm feeling overwhelmed with work and life.",
+    "我今天感觉很累，什么都不想做。",
+    "Tôi cảm thấy rất mệt mỏi hôm nay.",
+    "요즘 I feel so tired 매일 힘들어요",
+    "今日はとても疲れました。何もしたくないです。",
+]
+
+TEST_DATA_PATH = Path("data/test.tsv")
+
+LEGACY_SCRIPT_PATTERNS = [
+    (r'[가-힣]', "hangul"),
+    (r'[぀-ゟ]', "hiragana"),
+    (r'[゠-ヿ]', "katakana"),
+    (r'[一-鿿]', "hanzi"),
+    (r'[àáảãạăằắẳẵặâầấẩẫậ]', "vietnamese_latin"),
+]
+
+
+def legacy_rule_based_detection(text: str):
+    """기존 구현: 문자 체계마다 re.findall 전체 스캔"""
+    scores = {lang: 0.0 for lang in SupportedLanguage}
+    korean_chars = len(re.findall(r'[가-힣]', text))
+    if korean_chars > 0:
+        scores[SupportedLanguage.KOREAN] = korean_chars / len(text)
+    hiragana = len(re.findall(r'[぀-ゟ]', text))
+    katakana = len(re.findall(r'[゠-ヿ]', text))
+    if hiragana + katakana > 0:
+        scores[SupportedLanguage.JAPANESE] = (hiragana + katakana) / len(text)
+    chinese_chars = len(re.findall(r'[一-鿿]', text))
+    if chinese_chars > 0 and scores[SupportedLanguage.KOREAN] < 0.1 and scores[SupportedLanguage.JAPANESE] < 0.1:
+        simplified = len(re.findall(r'[们这那国学为会]', text))
+        traditional = len(re.findall(r'[們這國學為會]', text))
+        if simplified > traditional:
+            scores[SupportedLanguage.CHINESE_SIMPLIFIED] = chinese_chars / len(text)
+        else:
+            scores[SupportedLanguage.CHINESE_TRADITIONAL] = chinese_chars / len(text)
+    vietnamese_chars = len(re.findall(r'[àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđĐ]', text))
+    if vietnamese_chars > 0:
+        scores[SupportedLanguage.VIETNAMESE] = vietnamese_chars / len(text)
+    english_chars = len(re.findall(r'[a-zA-Z]', text))
+    english_words = len(re.findall(r'\b(the|is|are|was|were|have|has|been|I|you|we|they|it|this|that)\b', text.lower()))
+    if english_chars > 0 and sum([scores[lang] for lang in scores if lang != SupportedLanguage.ENGLISH]) < 0.3:
+        scores[SupportedLanguage.ENGLISH] = english_chars / len(text) * 0.5 + min(english_words / 10, 0.5)
+    # 기존 _detect_script_type 의 추가 스캔
+    script_type = "latin"
+    for pattern, name in LEGACY_SCRIPT_PATTERNS:
+        if re.search(pattern, text):
+            script_type = name
+            break
+    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    is_mixed = len([lang for lang, score in sorted_scores if score > 0.1]) > 1
+    return LanguageDetectionResult(
+        primary_language=sorted_scores[0][0].value,
+        confidence=sorted_scores[0][1],
+        secondary_languages=[(lang.value, score) for lang, score in sorted_scores[1:] if score > 0.05],
+        script_type=script_type,
+        is_mixed=is_mixed,
+        code_switching_detected=is_mixed,
+        detected_phrases={lang.value: [] for lang in SupportedLanguage}
+    )
+
+
+class CharTokenizer:
+    """문자 코드 기반 벤치마크용 토크나이저 (HuggingFace 호출 규약)"""
+    pad_token_id = 0
+
+    def __call__(self, texts, max_length=512, padding=False, truncation=True, return_tensors=None):
+        texts = [texts] if isinstance(texts, str) else texts
+        ids = [[ord(c) % 7999 + 1 for c in text][:max_length] for text in texts]
+        if padding == "max_length":
+            ids = [row + [0] * (max_length - len(row)) for row in ids]
+        if return_tensors == "tf":
+            return {"input_ids": tf.constant(ids)}
+        return {"input_ids": ids}
+
+
+def legacy_model_inference(detector: MultilingualLanguageDetector, text: str, tokenizer) -> np.ndarray:
+    """기존 구현: 메시지마다 max_length 까지 패딩 후 단건 추론"""
+    encoded = tokenizer(text, max_length=detector.max_length, padding='max_length',
+                        truncation=True, return_tensors='tf')
+    outputs = detector({'input_ids': encoded['input_ids']}, training=False)
+    return outputs['language_probs'][0].numpy()
+
+
+def load_test_messages(limit: int) -> List[str]:
+    """data/test.tsv 의 상담 단문 메시지 (없으면 샘플 메시지로 대체)"""
+    if not TEST_DATA_PATH.exists():
+        return build_texts(count=limit, length=60)
+    messages = []
+    with open(TEST_DATA_PATH, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2 and parts[1]:
+                messages.append(parts[1])
+            if len(messages) >= limit:
+                break
+    return messages
+
+
+def build_texts(count: int, length: int, seed: int = 42) -> List[str]:
+    """샘플 메시지를 이어 붙여 지정 길이의 텍스트 생성"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = []
+        while sum(len(p) for p in parts) < length:
+            parts.append(rng.choice(SAMPLE_MESSAGES))
+        texts.append(" ".join(parts)[:length])
+    return texts
+
+
+def time_per_call(fn: Callable[[str], object], texts: List[str], repeat: int = 3) -> float:
+    """텍스트당 평균 소요 시간 (마이크로초, 최솟값)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def run_benchmarks() -> int:
+    """벤치마크 실행"""
+    detector = MultilingualLanguageDetector()
+
+    print("=" * 72)
+    print("1. 규칙 기반 감지: 정규식 다중 스캔 vs 단일 패스 히스토그램")
+    print("=" * 72)
+    print(f"{'길이':>8} {'regex (us)':>12} {'histogram (us)':>16} {'speedup':>9}")
+    for length in (32, 256, 4096, 65536):
+        texts = build_texts(count=max(5, 20000 // length), length=length)
+        legacy = time_per_call(legacy_rule_based_detection, texts)
+        current = time_per_call(detector._rule_based_detection, texts)
+        print(f"{length:>8} {legacy:>12.1f} {current:>16.1f} {legacy / current:>8.2f}x")
+
+    print()
+    print("=" * 72)
+    print("2. 배치 처리 (메시지 10,000개, 평균 40자)")
+    print("=" * 72)
+    batch = build_texts(count=10000, length=40)
+    start = time.perf_counter()
+    for text in batch:
+        legacy_rule_based_detection(text)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in batch:
+        detector._rule_based_detection(text)
+    loop_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detector.detect_language_batch(batch)
+    batch_elapsed = time.perf_counter() - start
+
+    print(f" regex 루프       : {legacy_elapsed:.3f}s ({len(batch) / legacy_elapsed:,.0f} msg/s)")
+    print(f" histogram 루프   : {loop_elapsed:.3f}s ({len(batch) / loop_elapsed:,.0f} msg/s)")
+    print(f" detect_language_batch : {batch_elapsed:.3f}s ({len(batch) / batch_elapsed:,.0f} msg/s)")
+
+    print()
+    print("=" * 72)
+    print("3. 언어 감지 + 문화 컨텍스트 분석 (메시지 10,000개)")
+    print("=" * 72)
+    start = time.perf_counter()
+    for text in batch:
+        result = detector.detect_language(text)
+        detector.analyze_cultural_context(text, result.primary_language)
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detections = detector.detect_language_batch(batch)
+    detector.analyze_cultural_context_batch(batch, detections)
+    combined_elapsed = time.perf_counter() - start
+
+    print(f" 단건 루프 : {single_elapsed:.3f}s ({len(batch) / single_elapsed:,.0f} msg/s)")
+    print(f" 배치 API  : {combined_elapsed:.3f}s ({len(batch) / combined_elapsed:,.0f} msg/s)"
+          f" - {single_elapsed / combined_elapsed:.1f}x")
+
+    print()
+    print("=" * 72)
+    print("4. 신경망 경로: 고정 패딩 단건 추론 vs 동적 패딩 배치 추론")
+    print("=" * 72)
+    neural = MultilingualLanguageDetector(vocab_size=8000, max_length=512)
+    tokenizer = CharTokenizer()
+    messages = load_test_messages(limit=50)
+    lengths = np.array([len(m) for m in messages])
+    print(f" 메시지 {len(messages)}개, 길이 중앙값 {np.median(lengths):.0f} / p90 {np.percentile(lengths, 90):.0f}")
+    # 그래프 생성 비용 제외
+    legacy_model_inference(neural, messages[0], tokenizer)
+    neural.predict_language_probs(messages[:8], tokenizer)
+
+    start = time.perf_counter()
+    for message in messages:
+        legacy_model_inference(neural, message, tokenizer)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    neural.predict_language_probs(messages, tokenizer, batch_size=64)
+    bucketed_elapsed = time.perf_counter() - start
+
+    padded_tokens = len(messages) * neural.max_length
+    bucketed_tokens = sum(neural._length_bucket(max(1, min(n, neural.max_length))) for n in lengths)
+    print(f" 고정 패딩 단건   : {legacy_elapsed:.3f}s ({len(messages) / legacy_elapsed:,.0f} msg/s),"
+          f" 토큰 {padded_tokens:,}")
+    print(f" 동적 패딩 배치   : {bucketed_elapsed:.3f}s ({len(messages) / bucketed_elapsed:,.0f} msg/s),"
+          f" 토큰 {bucketed_tokens:,} - {legacy_elapsed / bucketed_elapsed:.1f}x")
+
+    print()
+    print("=" * 72)
+    print("5. 세션 언어 상태 추적 (세션 500개 x 12턴, 약 5% 코드 스위칭)")
+    print("=" * 72)
+    rng = random.Random(7)
+    korean = load_test_messages(limit=2000)
+    sessions = []
+    for session_index in range(500):
+        turns = []
+        for _ in range(12):
+            if rng.random() < 0.05:
+                turns.append(rng.choice(korean) + " I feel so tired")
+            else:
+                turns.append(rng.choice(korean))
+        sessions.append((f"session_{session_index}", turns))
+
+    start = time.perf_counter()
+    for _, turns in sessions:
+        for text in turns:
+            result = detector.detect_language(text)
+            detector.analyze_cultural_context(text, result.primary_language)
+    full_elapsed = time.perf_counter() - start
+
+    tracker = SessionLanguageTracker(detector)
+    start = time.perf_counter()
+    for session_id, turns in sessions:
+        for text in turns:
+            tracker.observe(session_id, text)
+    tracked_elapsed = time.perf_counter() - start
+
+    metrics = tracker.get_metrics()
+    print(f" 턴마다 전체 감지 : {full_elapsed:.3f}s")
+    print(f" 세션 상태 추적   : {tracked_elapsed:.3f}s - {full_elapsed / tracked_elapsed:.1f}x")
+    print(f" 빠른 경로 적중률 : {metrics['hit_rate']:.1%} ({metrics['fast_path_hits']:,}/{metrics['turns']:,} 턴,"
+          f" 모델 사용 시 생략되는 추론 수와 동일)")
+    print(f" 전체 감지 사유   : {metrics['fallback_reasons']}")
+
+    # 모델 앙상블 경로 (세션 10개, max_length 64)
+    model_sessions = sessions[:10]
+    model_detector = MultilingualLanguageDetector(vocab_size=8000, max_length=64)
+    model_detector.detect_language(korean[0], tokenizer)
+    start = time.perf_counter()
+    for _, turns in model_sessions:
+        for text in turns:
+            model_detector.detect_language(text, tokenizer)
+    model_full_elapsed = time.perf_counter() - start
+
+    model_tracker = SessionLanguageTracker(model_detector)
+    start = time.perf_counter()
+    for session_id, turns in model_sessions:
+        for text in turns:
+            model_tracker.observe(session_id, text, tokenizer)
+    model_tracked_elapsed = time.perf_counter() - start
+    print(f" 모델 앙상블 전체 감지 : {model_full_elapsed:.3f}s,"
+          f" 세션 상태 추적 : {model_tracked_elapsed:.3f}s"
+          f" - {model_full_elapsed / model_tracked_elapsed:.1f}x"
+          f" (적중률 {model_tracker.get_metrics()['hit_rate']:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmarks())
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+개인화 / 장기 기억 성능 벤치마크
+파일명: scripts/benchmark_personalization.py
+
+사용법:
+    PYTHONPATH=. python scripts/benchmark_personalization.py
+
+이 스크립트는:
+1. 관련 기억 검색 - 기억마다 관련성 계산 + 전체 정렬 vs 열 저장소 벡터화 점수 + argpartition (1k / 10k / 100k)
+2. 패턴 갱신 - 저장마다 전체 기억 재스캔 vs 증분 카운터 (1k / 5k / 20k 연속 저장, 임베딩 제외)
+3. 벡터 인덱스 - 해싱 임베딩 처리량, flat vs IVF(nprobe별) vs HNSW(hnswlib 설치 시) recall@10 / 질의 지연,
+   IVF 학습 임계값을 지나는 store_memory 지연 (쓰기 경로 동기 학습 vs 백그라운드 학습)
+4. 영구 저장소 - 사용자 수별 콜드 스타트 (전체 로딩 vs 지연 로딩) 시간 / RSS (별도 프로세스에서 측정)
+5. 효과적 대처 기법 조회 - 기억 전체 스캔 vs 대처 기법 색인 (1k / 10k / 100k)
+6. 접근법 선택 - 접근법별 _calculate_approach_fit vs 특징 행렬 (단일 호출 / 코호트 1k·10k·100k 일괄)
+7. 적응 권고 캐시 - 대화 턴 흐름 (턴마다 권고, 간헐적 기억 기록 / 세션 종료) 권고 호출 시간, 적중률
+8. 증상 궤적 - dict 목록(ISO 문자열) vs 청크 배열 시계열 메모리, 추세/이동 평균/변화점 계산 시간
+"""
+import gc
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+
+from models.personalization.adaptive_therapy import (
+    AdaptiveTherapyEngine, EmotionalMemory, LongTermMemoryStore, TherapeuticApproach, TherapeuticProgress, UserProfile
+)
+from models.personalization.memory_index import FlatIndex, HashingEmbedder, HNSWIndex, IVFIndex, hnswlib
+from models.personalization.persistent_store import PersonalizationStorage
+from models.personalization.time_series import SymptomSeries, change_points, moving_average
+
+EMOTIONS = ["anxiety", "sadness", "anger", "joy", "worry", "hopelessness", "neutral", "fear"]
+TRIGGERS = [None, "work", "family", "exam", "work_stress", "relationship", "sleep", "health", "money"]
+
+
+def build_memories(count: int, seed: int = 42) -> List[EmotionalMemory]:
+    """수년치 임의 기억"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [
+        EmotionalMemory(
+            timestamp=now - timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60)),
+            emotion=rng.choice(EMOTIONS),
+            intensity=rng.random(),
+            trigger=rng.choice(TRIGGERS),
+            context={},
+            coping_used=None,
+            effectiveness=None
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_retrieve(store: LongTermMemoryStore, user_id: str, context, limit: int = 5):
+    """기존 구현: 기억마다 _calculate_relevance + 튜플 목록 전체 정렬"""
+    scored = []
+    for memory in store.memories.get(user_id, []):
+        scored.append((memory, store._calculate_relevance(memory, context)))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [m for m, _ in scored[:limit]]
+
+
+def legacy_store(store: LongTermMemoryStore, user_id: str, memory: EmotionalMemory):
+    """기존 구현: 추가 후 전체 기억 재스캔으로 패턴 재계산"""
+    memories = store.memories.setdefault(user_id, [])
+    memories.append(memory)
+    if len(memories) < 5:
+        return
+    emotion_counts = defaultdict(int)
+    for m in memories:
+        emotion_counts[m.emotion] += 1
+    trigger_counts = defaultdict(int)
+    for m in memories:
+        if m.trigger:
+            trigger_counts[m.trigger] += 1
+    store.patterns[user_id] = {
+        'dominant_emotion': max(emotion_counts, key=emotion_counts.get),
+        'emotion_distribution': dict(emotion_counts),
+        'common_triggers': dict(trigger_counts),
+        'average_intensity': sum(m.intensity for m in memories) / len(memories),
+    }
+
+
+def clustered_vectors(count: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """군집 구조 정규화 벡터 (실제 임베딩처럼 주제별로 뭉친 분포)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def measure_index(index, queries: np.ndarray, truth: List[set], k: int = 10):
+    """평균 recall@k 와 질의당 지연(ms)"""
+    hits = 0
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        ids, _ = index.search(query, k)
+        hits += len(expected & set(ids.tolist()))
+    elapsed = (time.perf_counter() - start) / len(queries)
+    return hits / (k * len(queries)), elapsed * 1e3
+
+
+def legacy_effective_coping(store: LongTermMemoryStore, user_id: str) -> List[str]:
+    """기존 구현: 기억 전체 스캔, effectiveness > 0.7 인 첫 기법"""
+    effective_coping = []
+    if user_id in store.memories:
+        for memory in store.memories[user_id]:
+            if memory.effectiveness and memory.effectiveness > 0.7:
+                if memory.coping_used:
+                    effective_coping.append(memory.coping_used)
+    return effective_coping[:1]
+
+
+def build_profiles(count: int, seed: int = 7):
+    """코호트 프로파일 / 진행 상황 / 현재 감정"""
+    rng = random.Random(seed)
+    concerns = ["anxiety", "depression", "work_anxiety", "self_harm", "avoidance", "addiction",
+                "relationship_issues", "goal_setting", "low_self_esteem", "insomnia", "negative_thinking"]
+    profiles, progresses, emotions = [], [], []
+    for i in range(count):
+        profiles.append(UserProfile(
+            user_id=f"p{i}", created_at=datetime(2025, 1, 1), language=rng.choice(["ko", "en", "ja"]),
+            presenting_concerns=rng.sample(concerns, rng.randint(1, 4)),
+            preferred_approach=rng.choice([None] + list(TherapeuticApproach))
+        ))
+        progresses.append(TherapeuticProgress(f"p{i}", datetime(2025, 1, 1), total_sessions=rng.randint(0, 12)))
+        emotions.append(rng.choice(EMOTIONS))
+    return profiles, progresses, emotions
+
+
+def legacy_select_approach(engine: AdaptiveTherapyEngine, profile, progress, session_data):
+    """기존 구현: 접근법마다 _calculate_approach_fit 후 max"""
+    scores = {}
+    for approach in TherapeuticApproach:
+        scores[approach] = engine._calculate_approach_fit(approach, profile, progress, {}, session_data)
+    return max(scores, key=scores.get)
+
+
+def build_storage(root: str, users: int, memories_per_user: int = 10):
+    """사용자 N명 x 기억 10개 저장 후 압축"""
+    rng = random.Random(users)
+    storage = PersonalizationStorage(root, num_shards=16, batch_size=4096, compact_bytes=1 << 40)
+    base = 1_700_000_000_000_000
+    for u in range(users):
+        user_id = f"user_{u:06d}"
+        storage.put_document(user_id, "profile", {
+            "user_id": user_id, "created_at": "2025-01-01T00:00:00", "language": "ko",
+            "presenting_concerns": ["anxiety"], "therapy_goals": ["sleep"]
+        })
+        storage.put_document(user_id, "progress", {
+            "user_id": user_id, "start_date": "2025-01-01T00:00:00", "total_sessions": rng.randint(1, 30)
+        })
+        for m in range(memories_per_user):
+            storage.append_memory(user_id, {
+                "timestamp": base + rng.randint(0, 10 ** 13), "emotion": rng.choice(EMOTIONS),
+                "intensity": rng.random(), "trigger": rng.choice(TRIGGERS), "context": {},
+                "coping_used": None, "effectiveness": None
+            })
+    storage.compact()
+
+
+def rss_mb() -> float:
+    """현재 프로세스 RSS (MB, Linux /proc 기준)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def cold_start(root: str, mode: str):
+    """새 프로세스에서 저장소 열기 + (eager) 전체 사용자 로딩 / (lazy) 사용자 1명 로딩"""
+    from models.personalization.adaptive_therapy import AdaptiveTherapyEngine
+    before = rss_mb()
+    start = time.perf_counter()
+    engine = AdaptiveTherapyEngine(storage=PersonalizationStorage(root))
+    user_ids = engine.storage.user_ids() if mode == "eager" else ["user_000000"]
+    for user_id in user_ids:
+        engine.get_adaptation_recommendation(user_id, {"language": "ko"})
+    elapsed = time.perf_counter() - start
+    return elapsed, rss_mb() - before, len(engine.memory_store.memories)
+
+
+def run_benchmarks() -> int:
+    """벤치마크 실행"""
+    contexts = [
+        {"current_emotion": "anxiety", "triggers": ["work", "sleep"]},
+        {"current_emotion": "sadness", "triggers": ["family"]},
+        {"current_emotion": "anger", "triggers": []},
+        {"current_emotion": "joy", "triggers": ["exam", "money"]},
+    ]
+
+    print("=" * 72)
+    print("1. 관련 기억 검색 (limit=5, 사용자당 기억 수별)")
+    print("=" * 72)
+    print(f"{'기억 수':>10} {'legacy (ms)':>12} {'columnar (ms)':>14} {'speedup':>9}")
+    for count in (1_000, 10_000, 100_000):
+        store = LongTermMemoryStore()
+        store.memories["user"] = build_memories(count)
+        store._user_columns("user")
+        repeat = max(3, 30_000 // count)
+
+        for context in contexts:
+            assert [id(m) for m in store.retrieve_relevant_memories("user", context)] == \
+                [id(m) for m in legacy_retrieve(store, "user", context)]
+
+        start = time.perf_counter()
+        for i in range(repeat):
+            legacy_retrieve(store, "user", contexts[i % len(contexts)])
+        legacy_elapsed = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for i in range(repeat):
+            store.retrieve_relevant_memories("user", contexts[i % len(contexts)])
+        columnar_elapsed = (time.perf_counter() - start) / repeat
+
+        print(f"{count:>10,} {legacy_elapsed * 1e3:>12.2f} {columnar_elapsed * 1e3:>14.3f}"
+              f" {legacy_elapsed / columnar_elapsed:>8.1f}x")
+
+    print()
+    print("=" * 72)
+    print("2. 패턴 갱신 (기억 N개 연속 저장 총 시간)")
+    print("=" * 72)
+    print(f"{'기억 수':>10} {'legacy (s)':>12} {'incremental (s)':>16} {'speedup':>9}")
+    for count in (1_000, 5_000, 20_000):
+        memories = build_memories(count, seed=count)
+
+        legacy = LongTermMemoryStore()
+        start = time.perf_counter()
+        for memory in memories:
+            legacy_store(legacy, "user", memory)
+        legacy_elapsed = time.perf_counter() - start
+
+        store = LongTermMemoryStore()
+        start = time.perf_counter()
+        for memory in memories:
+            # store_memory 중 패턴 갱신 부분만 (임베딩 비용은 3번에서 측정)
+            store.memories["user"].append(memory)
+            store._update_patterns("user")
+        patterns = store.get_user_patterns("user")
+        incremental_elapsed = time.perf_counter() - start
+
+        expected = legacy.patterns["user"]
+        assert patterns['dominant_emotion'] == expected['dominant_emotion']
+        assert patterns['emotion_distribution'] == expected['emotion_distribution']
+        assert patterns['common_triggers'] == expected['common_triggers']
+
+        print(f"{count:>10,} {legacy_elapsed:>12.3f} {incremental_elapsed:>16.4f}"
+              f" {legacy_elapsed / incremental_elapsed:>8.1f}x")
+
+    print()
+    print("=" * 72)
+    print("3. 벡터 인덱스")
+    print("=" * 72)
+    sentences = [
+        f"{TRIGGERS[1 + i % (len(TRIGGERS) - 1)]} 때문에 {EMOTIONS[i % len(EMOTIONS)]} 느낌이 들어요 {i}"
+        for i in range(5_000)
+    ]
+    for dim in (256, 1536):
+        embedder = HashingEmbedder(dim)
+        start = time.perf_counter()
+        embedder.embed(sentences)
+        elapsed = time.perf_counter() - start
+        print(f"해싱 임베딩 dim={dim:<5} {len(sentences) / elapsed:>10,.0f} 문장/s")
+
+    dim, k = 256, 10
+    for count in (10_000, 100_000):
+        vectors = clustered_vectors(count, dim, clusters=max(20, count // 500))
+        rng = np.random.default_rng(1)
+        queries = vectors[rng.choice(count, 200, replace=False)] + 0.3 * rng.normal(size=(200, dim)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        truth = [set(np.argsort(-(vectors @ q))[:k].tolist()) for q in queries]
+
+        print()
+        print(f"벡터 {count:,}개, dim={dim}, 질의 200개")
+        print(f"{'index':<18} {'build (s)':>10} {'recall@10':>10} {'query (ms)':>11}")
+        candidates = [("flat", lambda: FlatIndex(dim))]
+        candidates += [(f"ivf nprobe={p}", lambda p=p: IVFIndex(dim, nprobe=p)) for p in (4, 8, 16, 32)]
+        if hnswlib is not None:
+            candidates.append(("hnsw", lambda: HNSWIndex(dim)))
+        for name, factory in candidates:
+            start = time.perf_counter()
+            index = factory()
+            for chunk in np.array_split(vectors, 20):
+                index.add(chunk)
+            build = time.perf_counter() - start
+            recall, latency = measure_index(index, queries, truth, k)
+            print(f"{name:<18} {build:>10.2f} {recall:>10.3f} {latency:>11.3f}")
+    if hnswlib is None:
+        print("(hnswlib 미설치: HNSW 생략)")
+
+    print()
+    print("질의 텍스트 포함 기억 검색 (의미 점수 혼합, limit=5)")
+    print(f"{'기억 수':>10} {'store (s)':>10} {'retrieve (ms)':>14}")
+    for count in (1_000, 10_000):
+        memories = build_memories(count, seed=count)
+        for i, memory in enumerate(memories):
+            memory.context = {"text": sentences[i % len(sentences)]}
+        store = LongTermMemoryStore()
+        start = time.perf_counter()
+        for memory in memories:
+            store.store_memory("user", memory)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(50):
+            store.retrieve_relevant_memories("user", {"text": sentences[i], "current_emotion": "anxiety"})
+        latency = (time.perf_counter() - start) / 50
+        print(f"{count:>10,} {build:>10.2f} {latency * 1e3:>14.3f}")
+
+    print()
+    print("store_memory 지연 (기억 10,000개 연속 저장, IVF 학습 임계 2,048 / 8,192 통과)")
+    print(f"{'IVF 학습':>12} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'total (s)':>10}")
+    memories = build_memories(10_000, seed=3)
+    for i, memory in enumerate(memories):
+        memory.context = {"text": sentences[i % len(sentences)]}
+    for background, label in ((False, "쓰기 경로"), (True, "백그라운드")):
+        store = LongTermMemoryStore(index_factory=lambda dim: IVFIndex(dim, background_training=background))
+        latencies = []
+        for memory in memories:
+            start = time.perf_counter()
+            store.store_memory("user", memory)
+            latencies.append(time.perf_counter() - start)
+        store.indexes["user"].wait_for_training()
+        latencies = np.array(latencies) * 1e3
+        print(f"{label:>12} {np.percentile(latencies, 50):>9.3f} {np.percentile(latencies, 99):>9.3f}"
+              f" {latencies.max():>9.1f} {latencies.sum() / 1e3:>10.2f}")
+
+    print()
+    print("=" * 72)
+    print("4. 영구 저장소 콜드 스타트 (사용자당 기억 10개, 16 샤드)")
+    print("=" * 72)
+    print(f"{'사용자 수':>10} {'build (s)':>10} {'eager (s)':>10} {'eager RSS':>10} {'lazy (ms)':>10} {'lazy RSS':>9}")
+    # 측정마다 새 프로세스 (TensorFlow 가 초기화된 부모를 fork 하지 않도록 spawn)
+    context = multiprocessing.get_context("spawn")
+    for users in (1_000, 10_000, 50_000):
+        root = tempfile.mkdtemp(prefix="personalization_bench_")
+        try:
+            start = time.perf_counter()
+            build_storage(root, users)
+            build = time.perf_counter() - start
+            with context.Pool(1) as pool:
+                eager_elapsed, eager_rss, _ = pool.apply(cold_start, (root, "eager"))
+            with context.Pool(1) as pool:
+                lazy_elapsed, lazy_rss, _ = pool.apply(cold_start, (root, "lazy"))
+            print(f"{users:>10,} {build:>10.1f} {eager_elapsed:>10.2f} {eager_rss:>8.1f}MB"
+                  f" {lazy_elapsed * 1e3:>10.1f} {lazy_rss:>7.1f}MB")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print()
+    print("=" * 72)
+    print("5. 효과적 대처 기법 조회 (get_personalized_techniques 의 proven 항목)")
+    print("=" * 72)
+    print(f"{'기억 수':>10} {'legacy (ms)':>12} {'indexed (us)':>13} {'speedup':>9}")
+    strategies = ["breathing", "journaling", "walk", "music", "call_friend", "meditation", None]
+    for count in (1_000, 10_000, 100_000):
+        rng = random.Random(count)
+        store = LongTermMemoryStore()
+        memories = build_memories(count, seed=count)
+        for memory in memories:
+            memory.coping_used = rng.choice(strategies)
+            memory.effectiveness = rng.choice([None, rng.random()])
+        store.memories["user"] = memories
+        store._update_coping("user")
+        repeat = max(5, 200_000 // count)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            legacy_effective_coping(store, "user")
+        legacy_elapsed = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            store.get_effective_coping("user", limit=1)
+        indexed_elapsed = (time.perf_counter() - start) / repeat
+        print(f"{count:>10,} {legacy_elapsed * 1e3:>12.3f} {indexed_elapsed * 1e6:>13.2f}"
+              f" {legacy_elapsed / indexed_elapsed:>8.0f}x")
+
+    print()
+    print("=" * 72)
+    print("6. 접근법 선택")
+    print("=" * 72)
+    engine = AdaptiveTherapyEngine()
+    profiles, progresses, emotions = build_profiles(2_000)
+    sessions = [{"current_emotion": e} for e in emotions]
+    start = time.perf_counter()
+    legacy = [legacy_select_approach(engine, p, pr, sd) for p, pr, sd in zip(profiles, progresses, sessions)]
+    legacy_elapsed = (time.perf_counter() - start) / len(profiles)
+    start = time.perf_counter()
+    matrix = [engine._select_approach(p, pr, {}, sd) for p, pr, sd in zip(profiles, progresses, sessions)]
+    matrix_elapsed = (time.perf_counter() - start) / len(profiles)
+    assert legacy == matrix
+    print(f"단일 호출: legacy {legacy_elapsed * 1e6:.1f}us, 특징 행렬 {matrix_elapsed * 1e6:.1f}us"
+          f" ({legacy_elapsed / matrix_elapsed:.1f}x)")
+
+    print(f"{'프로파일 수':>10} {'legacy loop (s)':>16} {'batch (s)':>10} {'speedup':>9}")
+    for count in (1_000, 10_000, 100_000):
+        profiles, progresses, emotions = build_profiles(count, seed=count)
+        sessions = [{"current_emotion": e} for e in emotions]
+        start = time.perf_counter()
+        legacy = [legacy_select_approach(engine, p, pr, sd) for p, pr, sd in zip(profiles, progresses, sessions)]
+        legacy_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = engine.select_approaches_batch(profiles, progresses, emotions)
+        batch_elapsed = time.perf_counter() - start
+        assert legacy == batch
+        print(f"{count:>10,} {legacy_elapsed:>16.3f} {batch_elapsed:>10.3f} {legacy_elapsed / batch_elapsed:>8.1f}x")
+
+    print()
+    print("=" * 72)
+    print("7. 적응 권고 캐시 (사용자 200명, 턴 20k, 기억 기록 5% / 세션 종료 1%)")
+    print("=" * 72)
+    print(f"{'기존 기억 수':>12} {'uncached (us/turn)':>19} {'cached (us/turn)':>17} {'speedup':>9} {'hit rate':>9}")
+    for memories_per_user in (0, 100, 1_000):
+        results = {}
+        for cache_size in (0, 10_000):
+            engine = AdaptiveTherapyEngine(recommendation_cache_size=cache_size)
+            for u in range(200):
+                engine.create_user_profile(f"u{u}", "ko", {"presenting_concerns": ["anxiety", "insomnia"]})
+                for memory in build_memories(memories_per_user, seed=u):
+                    engine.memory_store.store_memory(f"u{u}", memory)
+            rng = random.Random(7)
+            outputs = []
+            elapsed = 0.0
+            # 기억 수가 많으면 GC 일시 정지가 호출 시간을 흔들어서 측정 구간 동안만 끔
+            gc.collect()
+            gc.disable()
+            for _ in range(20_000):
+                user_id = f"u{rng.randrange(200)}"
+                op = rng.random()
+                if op < 0.05:
+                    engine.record_emotional_memory(user_id, rng.choice(EMOTIONS), rng.random(), rng.choice(TRIGGERS))
+                elif op < 0.06:
+                    engine.update_progress(user_id, {"engagement": 0.7})
+                session = {"current_emotion": rng.choice(EMOTIONS[:3]), "emotion_intensity": rng.random()}
+                start = time.perf_counter()
+                outputs.append(engine.get_adaptation_recommendation(user_id, session))
+                elapsed += time.perf_counter() - start
+            gc.enable()
+            results[cache_size] = (elapsed, outputs, engine.get_recommendation_cache_metrics())
+        (uncached, expected, _), (cached, outputs, metrics) = results[0], results[10_000]
+        assert outputs == expected
+        print(f"{memories_per_user:>12,} {uncached / 20_000 * 1e6:>19.1f} {cached / 20_000 * 1e6:>17.1f}"
+              f" {uncached / cached:>8.1f}x {metrics['hit_rate']:>9.2%}")
+
+    print()
+    print("=" * 72)
+    print("8. 증상 궤적 (하루 1회 기록)")
+    print("=" * 72)
+    print(f"{'기록 수':>10} {'list (KB)':>10} {'series (KB)':>12} {'list trend (ms)':>16} {'series trend (ms)':>18}"
+          f" {'MA+CP (ms)':>11}")
+    start_date = datetime(2020, 1, 1)
+    for days in (90, 365, 3_650):
+        rng = random.Random(days)
+        points = [
+            {'date': (start_date + timedelta(days=d)).isoformat(), 'level': float(rng.randint(0, 27))}
+            for d in range(days)
+        ]
+        list_bytes = sys.getsizeof(points) + sum(
+            sys.getsizeof(p) + sys.getsizeof(p['date']) + sys.getsizeof(p['level']) for p in points
+        )
+        series = SymptomSeries(points)
+        repeats = 200
+        start = time.perf_counter()
+        for _ in range(repeats):
+            # 기존: 문자열 파싱 후 추세 적합
+            x = [(datetime.fromisoformat(p['date']) - start_date).total_seconds() / 86400 for p in points]
+            np.polyfit(x, [p['level'] for p in points], 1)
+        list_elapsed = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for _ in range(repeats):
+            series.trend()
+        series_elapsed = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for _ in range(repeats):
+            moving_average(series.values, 7)
+            change_points(series.values)
+        analysis_elapsed = (time.perf_counter() - start) / repeats
+        print(f"{days:>10,} {list_bytes / 1024:>10.1f} {series.nbytes / 1024:>12.1f} {list_elapsed * 1e3:>16.3f}"
+              f" {series_elapsed * 1e3:>18.3f} {analysis_elapsed * 1e3:>11.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmarks())
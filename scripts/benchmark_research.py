@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+연구 플랫폼 성능 벤치마크
+파일명: scripts/benchmark_research.py
+
+사용법:
+    PYTHONPATH=. python scripts/benchmark_research.py
+
+이 스크립트는:
+1. 참여자 색인 - 연구 100개 × 참여자 10k: 연구 하나의 참여자 선택 / 보고서 생성,
+   전체 참여자 스캔 + 그룹별 재필터 vs 연구 / 그룹 / 상태 색인
+2. 평가 테이블 - 참여자 10k 연구: 결과 요약 / 그룹 비교,
+   참여자별 평가 목록 스캔 vs 연구별 열 테이블 group-by
+3. 통계 분석 - 참여자 10k 연구: 부트스트랩 / 순열 검정 10k 회,
+   재표본마다 반복문 (일부 측정 후 환산) vs 배치 행렬 재표본
+4. 내보내기 - 참여자 10k 연구: 시간 / 최대 메모리 (tracemalloc),
+   export_data 전체 문자열 vs stream_export 청크 (CSV / NDJSON / gzip)
+5. 열 단위 내보내기 - 참여자 10k 연구: 파일 크기 / 쓰기 / 읽기 시간,
+   CSV / JSON vs Parquet / Arrow IPC (pyarrow 설치 시, 없으면 열 구성 시간만)
+6. k-익명성 - 레코드 1M: 확인 / 일반화 시간,
+   그룹별 레코드 목록 + 고정 일반화 vs 동치류 코드 집계 + 최소 일반화 단계
+   (격자 전체를 레코드로 일반화해 보는 탐색은 100k 측정 후 환산)
+7. 텍스트 PII 제거 - 상담 발화 200k: 처리량 (MB/s),
+   호출마다 패턴 7개 순차 re.sub vs 미리 컴파일한 단일 패스 / 배치 / 프로세스 풀
+"""
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from services.research_platform import (
+    AnonymizationEngine, DataExportFormat, Participant, ParticipantStatus, ResearchPlatformService, Study, StudyArm, StudyStatus, StudyType
+)
+from services.research_platform import _distinct_rows, pa, pq
+from services.research_statistics import bootstrap_mean_differences, permutation_test
+
+STATUSES = list(ParticipantStatus)
+
+
+def build_platform(study_sizes: Dict[str, int], seed: int = 0) -> ResearchPlatformService:
+    """연구 / 참여자 직접 생성 (등록 API 의 동의/익명화 비용 제외)"""
+    rng = random.Random(seed)
+    platform = ResearchPlatformService()
+    now = datetime.now()
+    for study_id in study_sizes:
+        arms = [
+            StudyArm(arm_id=f"{study_id}_ARM_{a + 1}", name=name, description="", intervention=name, target_size=0)
+            for a, name in enumerate(("중재군", "대조군"))
+        ]
+        platform.studies[study_id] = Study(
+            study_id=study_id, title=study_id, study_type=StudyType.RCT, status=StudyStatus.ACTIVE,
+            principal_investigator="PI", institution="기관", arms=arms
+        )
+    # 연구가 섞인 순서로 등록 (실제 운영과 같이 연구 간 교차)
+    enrollment_order = [study_id for study_id, size in study_sizes.items() for _ in range(size)]
+    rng.shuffle(enrollment_order)
+    for i, study_id in enumerate(enrollment_order):
+        baseline = rng.randint(5, 27)
+        participant = Participant(
+            participant_id=f"P{i:08d}",
+            study_id=study_id,
+            status=STATUSES[rng.randrange(len(STATUSES))],
+            enrollment_date=now,
+            demographics={'age_group': rng.choice(['20-29', '30-39', '40-49']), 'gender': rng.choice(['male', 'female'])},
+            arm_id=f"{study_id}_ARM_{rng.randint(1, 2)}",
+            assessments=[
+                {'tool': tool, 'timepoint': timepoint, 'score': score, 'severity': '', 'recorded_at': ''}
+                for tool in ('PHQ-9', 'GAD-7')
+                for timepoint, score in (('baseline', baseline), ('week4', baseline - 1), ('final', max(0, baseline - rng.randint(-3, 10))))
+            ]
+        )
+        platform._register_participant(participant)
+    return platform
+
+
+def legacy_selection(platform: ResearchPlatformService, study_id: str):
+    """색인 도입 전 보고서의 참여자 선택 (전체 스캔 + 그룹별 재필터)"""
+    study = platform.studies[study_id]
+    study_participants = [p for p in platform.participants.values() if p.study_id == study_id]
+    result = {}
+    for arm in study.arms:
+        arm_participants = [p for p in study_participants if p.arm_id == arm.arm_id]
+        result[arm.arm_id] = (
+            arm_participants,
+            sum(1 for p in arm_participants if p.status == ParticipantStatus.COMPLETED),
+            sum(1 for p in arm_participants if p.status == ParticipantStatus.WITHDRAWN)
+        )
+    # 기존 _compare_arms 의 그룹별 재필터
+    for arm in study.arms:
+        [p for p in study_participants if p.arm_id == arm.arm_id]
+    return result
+
+
+def indexed_selection(platform: ResearchPlatformService, study_id: str):
+    index = platform.participant_index
+    return {
+        arm.arm_id: (
+            index.arm(study_id, arm.arm_id),
+            index.count(study_id, arm.arm_id, ParticipantStatus.COMPLETED),
+            index.count(study_id, arm.arm_id, ParticipantStatus.WITHDRAWN)
+        )
+        for arm in platform.studies[study_id].arms
+    }
+
+
+def legacy_summarize_outcomes(participants: List[Participant]):
+    """평가 테이블 도입 전 _summarize_outcomes"""
+    outcomes = defaultdict(lambda: {'baseline': [], 'final': []})
+    for p in participants:
+        for assessment in p.assessments:
+            tool = assessment['tool']
+            if assessment['timepoint'] == 'baseline':
+                outcomes[tool]['baseline'].append(assessment['score'])
+            elif assessment['timepoint'] in ['final', 'week12', 'post']:
+                outcomes[tool]['final'].append(assessment['score'])
+    return {
+        tool: {
+            'baseline_mean': round(np.mean(data['baseline']), 2),
+            'baseline_sd': round(np.std(data['baseline']), 2),
+            'final_mean': round(np.mean(data['final']), 2),
+            'final_sd': round(np.std(data['final']), 2),
+            'mean_change': round(np.mean(data['final']) - np.mean(data['baseline']), 2)
+        }
+        for tool, data in outcomes.items() if data['baseline'] and data['final']
+    }
+
+
+def legacy_compare_arms(arms, participants: List[Participant]):
+    """평가 테이블 도입 전 _compare_arms (참여자별 next() 검색)"""
+    comparison = {'arms_compared': [arms[0].name, arms[1].name], 'outcome_differences': {}}
+    groups = [[p for p in participants if p.arm_id == arm.arm_id] for arm in arms]
+    comparison['n'] = [len(g) for g in groups]
+    for tool in ['PHQ-9', 'GAD-7']:
+        changes = [[], []]
+        for i, group in enumerate(groups):
+            for p in group:
+                baseline = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] == 'baseline'), None)
+                final = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] in ['final', 'week12']), None)
+                if baseline is not None and final is not None:
+                    changes[i].append(final - baseline)
+        if changes[0] and changes[1]:
+            comparison['outcome_differences'][tool] = {
+                f'{arms[0].name}_mean_change': round(np.mean(changes[0]), 2),
+                f'{arms[1].name}_mean_change': round(np.mean(changes[1]), 2),
+                'difference': round(np.mean(changes[0]) - np.mean(changes[1]), 2)
+            }
+    return comparison
+
+
+def legacy_report(platform: ResearchPlatformService, study_id: str):
+    """색인 / 평가 테이블 도입 전 generate_study_report 와 같은 작업량"""
+    study = platform.studies[study_id]
+    selection = legacy_selection(platform, study_id)
+    for arm_participants, _, _ in selection.values():
+        platform._summarize_demographics(arm_participants)
+        legacy_summarize_outcomes(arm_participants)
+    study_participants = [p for p in platform.participants.values() if p.study_id == study_id]
+    return legacy_compare_arms(study.arms, study_participants)
+
+
+def loop_bootstrap(groups: List[np.ndarray], n_resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """재표본마다 그룹별 np.random.choice (배치 도입 전 방식)"""
+    return np.array([
+        rng.choice(groups[0], len(groups[0])).mean() - rng.choice(groups[1], len(groups[1])).mean()
+        for _ in range(n_resamples)
+    ])
+
+
+def loop_permutation(groups: List[np.ndarray], n_permutations: int, rng: np.random.Generator) -> float:
+    """순열마다 합친 값을 섞어 다시 나눔 (배치 도입 전 방식)"""
+    pooled = np.concatenate(groups)
+    observed = abs(groups[0].mean() - groups[1].mean())
+    count = 0
+    for _ in range(n_permutations):
+        shuffled = rng.permutation(pooled)
+        count += abs(shuffled[:len(groups[0])].mean() - shuffled[len(groups[0]):].mean()) >= observed
+    return (1 + count) / (1 + n_permutations)
+
+
+def synthetic_demographics(n: int, seed: int = 0) -> List[Dict[str, str]]:
+    """등록 시 익명화 결과와 같은 범주의 인구통계 레코드"""
+    rng = random.Random(seed)
+    ages = ['under_20', '20-29', '30-39', '40-49', '50-59', '60+']
+    regions = ['수도권', '영남권', '호남권', '충청권', '기타']
+    return [
+        {'age_group': rng.choice(ages), 'gender': rng.choice(['male', 'female', 'other']), 'region_group': rng.choice(regions)}
+        for _ in range(n)
+    ]
+
+
+def legacy_check_k_anonymity(dataset, quasi_identifiers: List[str], k: int) -> bool:
+    """기존 구현: 조합별 레코드 목록을 모은 뒤 크기 확인"""
+    groups = defaultdict(list)
+    for record in dataset:
+        groups[tuple(record.get(qi, None) for qi in quasi_identifiers)].append(record)
+    return all(len(group) >= k for group in groups.values())
+
+
+def legacy_generalize(dataset, quasi_identifiers: List[str]):
+    """기존 구현: 모든 레코드를 복사해 고정 1단계 일반화"""
+    result = []
+    for record in dataset:
+        new_record = record.copy()
+        for qi in quasi_identifiers:
+            if qi == 'age_group':
+                if new_record.get(qi, '') in ['20-29', '30-39']:
+                    new_record[qi] = '20-39'
+                elif new_record.get(qi, '') in ['40-49', '50-59']:
+                    new_record[qi] = '40-59'
+            elif qi == 'region_group':
+                if new_record.get(qi) not in ['수도권', '기타']:
+                    new_record[qi] = '비수도권'
+        result.append(new_record)
+    return result
+
+
+def record_lattice_search(engine: AnonymizationEngine, dataset, quasi_identifiers: List[str]) -> Dict[str, int]:
+    """레코드 단위 최소 일반화 탐색: 격자 조합마다 전체 레코드를 일반화해 확인"""
+    heights = [len(engine.GENERALIZATION_HIERARCHIES.get(qi, [])) for qi in quasi_identifiers]
+    for levels in sorted(itertools.product(*(range(h + 1) for h in heights)), key=sum):
+        candidate = dict(zip(quasi_identifiers, levels))
+        generalized = [engine.generalize_record(record, candidate) for record in dataset]
+        if legacy_check_k_anonymity(generalized, quasi_identifiers, engine.k_anonymity):
+            return candidate
+    return dict(zip(quasi_identifiers, heights))
+
+
+def synthetic_transcripts(n: int, seed: int = 0) -> List[str]:
+    """상담 발화 (단어 10개 중 1개꼴로 PII)"""
+    rng = random.Random(seed)
+    words = "요즘 너무 힘들어요 잠을 잘 못 자고 회사에서 스트레스를 많이 받아요 상담 가족 이야기 불안 마음이 우울하고 걱정이 많아요".split()
+    pii = [
+        "김철수씨", "이영희님", "박선생", "010-1234-5678", "01012345678", "kim.cs@example.com",
+        "서울시 강남구", "부산시 해운대구", "2024년 3월 15일", "2024-03-15"
+    ]
+    return [
+        " ".join(rng.choice(pii) if rng.random() < 0.1 else rng.choice(words) for _ in range(rng.randint(5, 40))) + "."
+        for _ in range(n)
+    ]
+
+
+def legacy_anonymize_text(text: str) -> str:
+    """기존 구현: 호출마다 패턴 7개를 순서대로 re.sub"""
+    text = re.sub(r'[가-힣]{2,4}(?=씨|님|선생|과장|부장|대리)', '[이름]', text)
+    text = re.sub(r'\d{2,3}-\d{3,4}-\d{4}', '[전화번호]', text)
+    text = re.sub(r'\d{10,11}', '[전화번호]', text)
+    text = re.sub(r'[\w\.-]+@[\w\.-]+\.\w+', '[이메일]', text)
+    text = re.sub(r'[가-힣]+(?:시|도)\s*[가-힣]+(?:구|군|시)', '[주소]', text)
+    text = re.sub(r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일', '[날짜]', text)
+    text = re.sub(r'\d{4}-\d{2}-\d{2}', '[날짜]', text)
+    return text
+
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def run_benchmarks() -> int:
+    print("=" * 72)
+    print("1. 참여자 색인 (연구 100개 × 참여자 10k, 연구 하나 조회)")
+    print("=" * 72)
+    start = time.perf_counter()
+    study_sizes = {f"STUDY_{s:03d}": 10_000 for s in range(100)}
+    study_sizes["STUDY_SMALL"] = 100
+    platform = build_platform(study_sizes)
+    print(f"참여자 {len(platform.participants):,}명 생성 + 색인: {time.perf_counter() - start:.1f}s")
+    study_id = "STUDY_042"
+
+    legacy = legacy_selection(platform, study_id)
+    indexed = indexed_selection(platform, study_id)
+    assert legacy == indexed
+    expected_comparison = legacy_report(platform, study_id)
+    report = asyncio.run(platform.generate_study_report(study_id))
+    assert report['comparison'] == expected_comparison
+
+    print(f"{'작업':<22} {'scan (ms)':>10} {'indexed (ms)':>13} {'speedup':>9}")
+    rows = [
+        ("참여자 선택", lambda: legacy_selection(platform, study_id), lambda: indexed_selection(platform, study_id)),
+        ("보고서 생성", lambda: legacy_report(platform, study_id),
+         lambda: asyncio.run(platform.generate_study_report(study_id))),
+    ]
+    for name, legacy_fn, indexed_fn in rows:
+        legacy_elapsed = timed(legacy_fn, 5)
+        indexed_elapsed = timed(indexed_fn, 5)
+        print(f"{name:<22} {legacy_elapsed * 1e3:>10.1f} {indexed_elapsed * 1e3:>13.2f}"
+              f" {legacy_elapsed / indexed_elapsed:>8.1f}x")
+
+    # 연구 크기에 비례: 참여자 100명 연구 (다른 연구 참여자 수와 무관해야 함)
+    legacy_elapsed = timed(lambda: legacy_report(platform, "STUDY_SMALL"), 5)
+    indexed_elapsed = timed(lambda: asyncio.run(platform.generate_study_report("STUDY_SMALL")), 5)
+    print(f"{'보고서 (참여자 100명)':<22} {legacy_elapsed * 1e3:>10.1f} {indexed_elapsed * 1e3:>13.2f}"
+          f" {legacy_elapsed / indexed_elapsed:>8.1f}x")
+
+    print()
+    print("=" * 72)
+    print("2. 평가 테이블 (참여자 10k 연구, 참여자당 평가 6건)")
+    print("=" * 72)
+    study = platform.studies[study_id]
+    arm_ids = [arm.arm_id for arm in study.arms]
+    arm_members = [platform.participant_index.arm(study_id, arm_id) for arm_id in arm_ids]
+    study_members = platform.participant_index.study(study_id)
+    summaries = platform._summarize_outcomes(study_id, arm_ids)
+    for arm_id, members in zip(arm_ids, arm_members):
+        expected = legacy_summarize_outcomes(members)
+        assert summaries[arm_id].keys() == expected.keys()
+        assert all(abs(summaries[arm_id][t][k] - v) <= 0.0100001 for t in expected for k, v in expected[t].items())
+    print(f"{'작업':<22} {'scan (ms)':>10} {'table (ms)':>13} {'speedup':>9}")
+    rows = [
+        ("결과 요약 (그룹 2개)", lambda: [legacy_summarize_outcomes(m) for m in arm_members],
+         lambda: platform._summarize_outcomes(study_id, arm_ids), 5),
+        ("그룹 비교", lambda: legacy_compare_arms(study.arms, study_members),
+         lambda: asyncio.run(platform._compare_arms(study_id, study.arms)), 5),
+    ]
+    for name, legacy_fn, table_fn, repeats in rows:
+        legacy_elapsed = timed(legacy_fn, repeats)
+        table_elapsed = timed(table_fn, repeats)
+        print(f"{name:<22} {legacy_elapsed * 1e3:>10.1f} {table_elapsed * 1e3:>13.2f}"
+              f" {legacy_elapsed / table_elapsed:>8.1f}x")
+
+    print()
+    print("=" * 72)
+    print("3. 통계 분석 (참여자 10k 연구, 도구 2개 × 그룹 2개, 재표본 10k 회)")
+    print("=" * 72)
+    table = platform.assessment_tables[study_id]
+    arm_codes = table.participant_arms[:len(table.participant_ids)].astype(np.int64)
+    keys, changes = [], []
+    for t, tool in enumerate(('PHQ-9', 'GAD-7')):
+        change = table.first_scores(tool, ['final']) - table.first_scores(tool, ['baseline'])
+        valid = ~np.isnan(change)
+        keys.append(t * 2 + arm_codes[valid])
+        changes.append(change[valid])
+    keys, changes = np.concatenate(keys), np.concatenate(changes)
+    segments = [[changes[keys == t * 2 + a] for a in range(2)] for t in range(2)]
+    rng = np.random.default_rng(0)
+    loop_repeats = 200
+    print(f"분석 행 {len(changes):,}개")
+    print(f"{'작업':<22} {'loop (s, 환산)':>15} {'batched (s)':>12} {'speedup':>9}")
+    rows = [
+        ("부트스트랩 10k",
+         lambda: [loop_bootstrap(groups, loop_repeats, rng) for groups in segments],
+         lambda: bootstrap_mean_differences(keys, changes, 2, 2, [(0, 1)], 10_000, seed=0)),
+        ("순열 검정 10k",
+         lambda: [loop_permutation(groups, loop_repeats, rng) for groups in segments],
+         lambda: permutation_test(keys, changes, 2, 2, [(0, 1)], 10_000, seed=0)),
+    ]
+    for name, loop_fn, batched_fn in rows:
+        loop_elapsed = timed(loop_fn, 1) * 10_000 / loop_repeats
+        batched_elapsed = timed(batched_fn, 1)
+        print(f"{name:<22} {loop_elapsed:>15.2f} {batched_elapsed:>12.2f} {loop_elapsed / batched_elapsed:>8.1f}x")
+    start = time.perf_counter()
+    asyncio.run(platform.analyze_study(study_id, bootstrap=10_000, permutations=10_000, seed=0))
+    print(f"{'analyze_study 전체':<22} {'':>15} {time.perf_counter() - start:>12.2f}")
+
+    print()
+    print("=" * 72)
+    print("4. 내보내기 (참여자 10k 연구)")
+    print("=" * 72)
+    exports = [
+        ("export_data CSV", lambda: len(asyncio.run(platform.export_data(study_id, DataExportFormat.CSV))['data'])),
+        ("export_data JSON", lambda: len(asyncio.run(platform.export_data(study_id, DataExportFormat.JSON))['data'])),
+        ("stream CSV", lambda: sum(map(len, platform.stream_export(study_id, DataExportFormat.CSV)))),
+        ("stream NDJSON", lambda: sum(map(len, platform.stream_export(study_id, DataExportFormat.NDJSON)))),
+        ("stream CSV gzip", lambda: sum(map(len, platform.stream_export(study_id, DataExportFormat.CSV, compress=True)))),
+    ]
+    print(f"{'방식':<22} {'time (ms)':>10} {'peak (MB)':>10} {'output (MB)':>12}")
+    for name, fn in exports:
+        elapsed = timed(fn, 3)
+        tracemalloc.start()
+        size = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<22} {elapsed * 1e3:>10.1f} {peak / 2 ** 20:>10.2f} {size / 2 ** 20:>12.2f}")
+
+    print()
+    print("=" * 72)
+    print("5. 열 단위 내보내기 (참여자 10k 연구, 쓰기 / 다시 읽기)")
+    print("=" * 72)
+
+    def write_columnar(format, compression):
+        sink = io.BytesIO()
+        platform.write_columnar_export(study_id, sink, format, compression=compression)
+        return sink.getvalue()
+
+    formats = [
+        ("CSV", lambda: b''.join(platform.stream_export(study_id, DataExportFormat.CSV)),
+         lambda data: list(csv.DictReader(io.StringIO(data.decode('utf-8'))))),
+        ("JSON", lambda: asyncio.run(platform.export_data(study_id, DataExportFormat.JSON))['data'].encode('utf-8'),
+         lambda data: json.loads(data)),
+        ("NDJSON", lambda: b''.join(platform.stream_export(study_id, DataExportFormat.NDJSON)),
+         lambda data: [json.loads(line) for line in data.splitlines()]),
+    ]
+    if pa is not None:
+        formats += [
+            ("Parquet (zstd)", lambda: write_columnar(DataExportFormat.PARQUET, 'zstd'),
+             lambda data: pq.read_table(pa.BufferReader(data))),
+            ("Arrow IPC", lambda: write_columnar(DataExportFormat.ARROW, None),
+             lambda data: pa.ipc.open_file(pa.BufferReader(data)).read_all()),
+            ("Arrow IPC (zstd)", lambda: write_columnar(DataExportFormat.ARROW, 'zstd'),
+             lambda data: pa.ipc.open_file(pa.BufferReader(data)).read_all()),
+        ]
+    print(f"{'형식':<22} {'size (KB)':>10} {'write (ms)':>11} {'read (ms)':>10}")
+    for name, write_fn, read_fn in formats:
+        data = write_fn()
+        write_elapsed = timed(write_fn, 3)
+        read_elapsed = timed(lambda: read_fn(data), 3)
+        print(f"{name:<22} {len(data) / 1024:>10.1f} {write_elapsed * 1e3:>11.1f} {read_elapsed * 1e3:>10.1f}")
+    columns_elapsed = timed(lambda: platform.export_columns(study_id), 3)
+    print(f"{'열 구성 (export_columns)':<22} {'':>10} {columns_elapsed * 1e3:>11.1f}")
+    if pa is None:
+        print("pyarrow 미설치: Parquet / Arrow 측정 생략 (pip install pyarrow)")
+
+    print()
+    print("=" * 72)
+    print("6. k-익명성 (레코드 1M, 준식별자 3개, k=5)")
+    print("=" * 72)
+    quasi_identifiers = ['age_group', 'gender', 'region_group']
+    engine = AnonymizationEngine(k_anonymity=5)
+    dataset = synthetic_demographics(1_000_000, seed=6)
+    # 드문 조합 하나 → 일반화 필요
+    dataset[0] = {'age_group': '60+', 'gender': 'other', 'region_group': '제주'}
+    sample = dataset[:100_000]
+    assert engine.check_k_anonymity(dataset, quasi_identifiers) == legacy_check_k_anonymity(dataset, quasi_identifiers, 5)
+    levels = engine.find_generalization(dataset, quasi_identifiers)
+    assert levels == record_lattice_search(engine, sample, quasi_identifiers)
+    print(f"최소 일반화 단계: {levels}")
+
+    # 열 단위 내보내기 경로: 레코드 없이 범주 코드 열만으로 단계 선택
+    vocabularies = [[None] + sorted({record[qi] for record in dataset}) for qi in quasi_identifiers]
+    codes = np.column_stack([
+        np.fromiter((vocab.index(record[qi]) for record in dataset), dtype=np.int64, count=len(dataset))
+        for qi, vocab in zip(quasi_identifiers, vocabularies)
+    ])
+
+    def columnar_levels():
+        combos, counts = _distinct_rows(codes, [len(vocab) for vocab in vocabularies])
+        return engine.minimal_generalization(vocabularies, combos, counts, quasi_identifiers)
+
+    assert columnar_levels() == levels
+    lattice_elapsed = timed(lambda: record_lattice_search(engine, sample, quasi_identifiers), 1) * len(dataset) / len(sample)
+    rows = [
+        ("확인", timed(lambda: legacy_check_k_anonymity(dataset, quasi_identifiers, 5), 1),
+         timed(lambda: engine.check_k_anonymity(dataset, quasi_identifiers), 3)),
+        ("일반화 (1단계 vs 최소)", timed(lambda: legacy_generalize(dataset, quasi_identifiers), 1),
+         timed(lambda: engine.generalize_for_k_anonymity(dataset, quasi_identifiers), 1)),
+        ("최소 단계 탐색 (환산)", lattice_elapsed, timed(lambda: engine.find_generalization(dataset, quasi_identifiers), 3)),
+        ("최소 단계 (열 코드)", lattice_elapsed, timed(columnar_levels, 3)),
+    ]
+    print(f"{'작업':<22} {'legacy (s)':>11} {'vectorized (s)':>15} {'speedup':>9}")
+    for name, legacy_elapsed, new_elapsed in rows:
+        print(f"{name:<22} {legacy_elapsed:>11.3f} {new_elapsed:>15.3f} {legacy_elapsed / new_elapsed:>8.1f}x")
+
+    print()
+    print("=" * 72)
+    print("7. 텍스트 PII 제거 (상담 발화 200k)")
+    print("=" * 72)
+    texts = synthetic_transcripts(200_000, seed=7)
+    megabytes = sum(len(text.encode('utf-8')) for text in texts) / 2 ** 20
+    expected = [legacy_anonymize_text(text) for text in texts]
+    assert engine.anonymize_texts(texts) == expected
+    cpus = os.cpu_count() or 1
+    print(f"입력 {megabytes:.1f} MB, CPU {cpus}개 (프로세스 풀은 CPU 수만큼만 빨라짐)")
+    methods = [
+        ("순차 re.sub (기존)", lambda: [legacy_anonymize_text(text) for text in texts]),
+        ("anonymize_text", lambda: [engine.anonymize_text(text) for text in texts]),
+        ("anonymize_texts", lambda: engine.anonymize_texts(texts)),
+    ] + [
+        (f"anonymize_texts ×{workers}", lambda workers=workers: engine.anonymize_texts(texts, max_workers=workers))
+        for workers in sorted({2, cpus}) if workers > 1
+    ]
+    legacy_elapsed = None
+    print(f"{'방식':<22} {'time (s)':>10} {'MB/s':>8} {'speedup':>9}")
+    for name, fn in methods:
+        elapsed = timed(fn, 1)
+        legacy_elapsed = legacy_elapsed or elapsed
+        print(f"{name:<22} {elapsed:>10.2f} {megabytes / elapsed:>8.1f} {legacy_elapsed / elapsed:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmarks())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+AI 슈퍼바이저 성능 벤치마크
+파일명: scripts/benchmark_supervisor.py
+
+사용법:
+    PYTHONPATH=. python scripts/benchmark_supervisor.py
+
+이 스크립트는:
+1. 세션 리뷰 확장성 - 기존 구현(턴마다 전체 평가 + 접두사 슬라이스) vs 캐시/롤링 윈도우 (100 ~ 4,000턴)
+2. 재리뷰 - evaluate_turn 으로 이미 평가된 세션을 리뷰할 때 캐시 재사용 효과
+3. 턴 평가 마커 검사 - 평가기별 마커 목록 순회 vs 언어별 컴파일 마커 사전 단일 스캔
+4. 대량 세션 리뷰 - review_session 순차 호출 vs bulk_review_sessions (순차 / 프로세스 풀, NDJSON 저장)
+5. 세션 품질 분석 - QualityScore 목록 기반 집계 vs 턴 × 차원 점수 행렬, 세션 간 대시보드 집계
+6. 요청 지연 - 워커 풀이 평가하는 동안 같은 이벤트 루프의 요청 처리 지연 (루프에서 직접 평가 vs 평가 스레드)
+"""
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from models.supervisor.ai_supervisor import AISupervisor, SessionQualityMatrix, scan_turn_markers
+from services.supervisor_queue import SupervisorJob, SupervisorWorkerPool
+
+USER_MESSAGES = [
+    "요즘 너무 힘들어요. 아무것도 하기 싫어요.",
+    "죽고 싶어요.",
+    "회사에서 계속 실수해서 걱정이에요?",
+    "잠을 못 자요",
+    "가족들이 제 마음을 몰라줘요.",
+]
+
+AI_RESPONSES = [
+    "많이 힘드시군요. 그런 감정을 느끼시는 것은 자연스러운 일이에요. 조금 더 이야기해 주실 수 있을까요?",
+    "그냥 힘내세요. 다 잘 될 거예요.",
+    "걱정이 많으셨겠어요. 함께 생각해 보면 어떠세요? 그 상황에서 어떤 생각이 드셨나요?",
+    "지금 많이 위험하게 느껴지시면 1393에 바로 연락해 주세요. 전문가의 도움을 받으실 수 있어요.",
+    "가족과의 관계에서 마음이 많이 상하셨겠어요. 어떤 순간이 가장 힘드셨나요?",
+]
+
+
+def build_history(turns: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """임의 대화 기록 (턴마다 고유 내용)"""
+    rng = random.Random(seed)
+    return [
+        {
+            "turn_id": f"turn_{i}",
+            "user_message": f"{rng.choice(USER_MESSAGES)} ({i})",
+            "ai_response": rng.choice(AI_RESPONSES),
+        }
+        for i in range(turns)
+    ]
+
+
+async def legacy_review_session(supervisor: AISupervisor, history: List[Dict[str, Any]], language: str = "ko"):
+    """기존 구현: 턴마다 7개 차원 전체 평가 + conversation_history[:i] 복사"""
+    all_scores = []
+    for i, turn in enumerate(history):
+        scores = await supervisor._calculate_quality_scores(
+            turn.get('user_message', ''),
+            turn.get('ai_response', ''),
+            {'conversation_history': history[:i]},
+            language
+        )
+        all_scores.extend(scores)
+        np.mean([s.score for s in scores])
+    legacy_session_analysis(all_scores, language)
+
+
+def legacy_session_analysis(all_scores, language: str = "ko"):
+    """기존 구현의 세션 집계: QualityScore 목록에서 매번 리스트를 만들어 np.mean"""
+    values = [s.score for s in all_scores]
+    np.mean(values)
+    if len(values) >= 6:
+        third = len(values) // 3
+        np.mean([s.score for s in all_scores[:third]])
+        np.mean([s.score for s in all_scores[-third:]])
+    for _ in range(2): # 강점/개선점, 권고사항에서 각각 차원별 평균 재계산
+        dim_scores = {}
+        for score in all_scores:
+            dim_scores.setdefault(score.dimension, []).append(score.score)
+        {dim: np.mean(v) for dim, v in dim_scores.items()}
+    np.mean([s.score for s in all_scores])
+
+
+def legacy_marker_checks(user_message: str, ai_response: str, language: str, approach: str):
+    """기존 구현의 마커 검사: 평가기마다 소문자 변환 + 마커 목록 재생성/순회"""
+    # 공감
+    response_lower = ai_response.lower()
+    if language == "ko":
+        empathy = ["힘드시", "어려우시", "이해", "공감", "느끼", "감정", "마음", "걱정", "함께", "곁에"]
+        negative = ["그냥", "별거 아니", "왜 그래", "그러지 마"]
+    else:
+        empathy = ["understand", "feel", "sounds", "difficult", "challenging", "support", "here for you", "valid"]
+        negative = ["just", "shouldn't feel", "overreacting", "simply"]
+    positive_count = sum(1 for m in empathy if m in response_lower)
+    negative_count = sum(1 for m in negative if m in response_lower)
+    # 치료적 동맹
+    response_lower = ai_response.lower()
+    collaborative = ["함께", "우리", "같이", "어떠세요", "원하시면"] if language == "ko" else \
+        ["together", "we", "let's", "would you like", "how about"]
+    collaborative_count = sum(1 for m in collaborative if m in response_lower)
+    # 안전 준수
+    crisis_keywords = {
+        "ko": ["죽고 싶", "자살", "자해", "죽을", "끝내고 싶"],
+        "en": ["kill myself", "suicide", "self-harm", "end it", "want to die"]
+    }
+    user_lower = user_message.lower()
+    has_crisis = any(kw in user_lower for kws in crisis_keywords.values() for kw in kws)
+    has_safety_response = False
+    if has_crisis:
+        resources = ["1393", "988", "위기", "crisis", "hotline", "안전", "safety", "전문가", "professional"]
+        response_lower = ai_response.lower()
+        has_safety_response = any(r in response_lower for r in resources)
+    response_lower = ai_response.lower()
+    dangerous = [p for p in ["혼자 해결", "참으세요", "그냥 잊어", "deal with it alone", "just forget", "ignore"]
+                 if p in response_lower]
+    # 문화적 적절성
+    has_honorific = any(m in ai_response for m in ["요", "습니다", "세요", "시"])
+    has_cultural = any(m in ai_response for m in ["가족", "부모님", "마음", "정"])
+    # 임상적 정확성
+    approach_elements = {
+        "CBT": ["생각", "thought", "인지", "cognitive", "행동", "behavior"],
+        "DBT": ["수용", "acceptance", "조절", "regulation", "마음챙김", "mindfulness"],
+        "MI": ["변화", "change", "동기", "motivation", "양가감정", "ambivalence"],
+        "PCT": ["무조건적", "unconditional", "수용", "acceptance", "공감", "empathy"]
+    }
+    response_lower = ai_response.lower()
+    clinical_count = sum(1 for e in approach_elements.get(approach, []) if e in response_lower)
+    # 윤리적 준수
+    response_lower = ai_response.lower()
+    violations = sum(1 for v in ["개인적으로 만나", "연락처를 알려", "친구가 되",
+                                 "meet personally", "give you my number", "be friends"] if v in response_lower)
+    return (positive_count, negative_count, collaborative_count, has_crisis, has_safety_response,
+            dangerous, has_honorific, has_cultural, clinical_count, violations)
+
+
+def lexicon_marker_checks(user_message: str, ai_response: str, language: str, approach: str):
+    """마커 사전 단일 스캔 후 히트 벡터 조회"""
+    hits = scan_turn_markers(user_message, ai_response, language, approach)
+    has_crisis = hits.user_any("crisis")
+    return (hits.count("empathy_positive"), hits.count("empathy_negative"), hits.count("collaborative"),
+            has_crisis, has_crisis and hits.any("safety_resources"), list(hits.matched("dangerous_patterns")),
+            hits.any("honorifics"), hits.any("cultural_markers"), hits.count("approach"),
+            hits.count("boundary_violations"))
+
+
+async def measure_request_latency(
+    supervisor: AISupervisor,
+    offload: bool,
+    backlog: int,
+    requests: int = 1000,
+    interval: float = 0.001
+) -> Dict[str, float]:
+    """
+    평가 대기 작업 backlog 개가 쌓인 상태에서 interval 마다 요청 도착
+    (요청마다 턴 평가 1건 등록) - 도착 예정 시각부터 처리 완료까지 지연
+    """
+    supervisor.clear_turn_cache()
+    pool = SupervisorWorkerPool(supervisor, max_queue_size=backlog + requests, offload=offload)
+    history = build_history(backlog + requests, seed=backlog)
+    for i, turn in enumerate(history[:backlog]):
+        pool.submit(SupervisorJob(f"backlog{i % 100}", turn["turn_id"], turn["user_message"], turn["ai_response"]))
+
+    async def handle(turn: Dict[str, Any]):
+        await asyncio.sleep(0)
+        pool.submit(SupervisorJob("live", turn["turn_id"], turn["user_message"], turn["ai_response"]))
+
+    latencies = []
+    start = time.perf_counter()
+    for i, turn in enumerate(history[backlog:]):
+        arrival = start + i * interval
+        await asyncio.sleep(max(arrival - time.perf_counter(), 0))
+        await handle(turn)
+        latencies.append(time.perf_counter() - arrival)
+    await pool.stop()
+    elapsed = time.perf_counter() - start
+    arr = np.array(latencies) * 1e3
+    return {
+        "p50": float(np.percentile(arr, 50)),
+        "p99": float(np.percentile(arr, 99)),
+        "max": float(arr.max()),
+        "turns_per_sec": (backlog + requests) / elapsed
+    }
+
+
+async def run_benchmarks() -> int:
+    """벤치마크 실행"""
+    supervisor = AISupervisor()
+
+    print("=" * 72)
+    print("1. 세션 리뷰 확장성 (턴당 시간이 일정하면 선형)")
+    print("=" * 72)
+    print(f"{'턴 수':>8} {'legacy (s)':>12} {'us/turn':>9} {'current (s)':>13} {'us/turn':>9}")
+    for turns in (100, 250, 500, 1000, 2000, 4000):
+        history = build_history(turns)
+
+        start = time.perf_counter()
+        await legacy_review_session(supervisor, history)
+        legacy_elapsed = time.perf_counter() - start
+
+        supervisor.clear_turn_cache()
+        start = time.perf_counter()
+        await supervisor.review_session("bench", history)
+        current_elapsed = time.perf_counter() - start
+
+        print(f"{turns:>8} {legacy_elapsed:>12.4f} {legacy_elapsed / turns * 1e6:>9.1f}"
+              f" {current_elapsed:>13.4f} {current_elapsed / turns * 1e6:>9.1f}")
+
+    print()
+    print("=" * 72)
+    print("2. 재리뷰 (1,000턴, evaluate_turn 으로 평가된 세션)")
+    print("=" * 72)
+    history = build_history(1000)
+    supervisor.clear_turn_cache()
+    for turn in history:
+        await supervisor._get_turn_scores(
+            "bench", turn["turn_id"], turn["user_message"], turn["ai_response"], {}, "ko"
+        )
+
+    start = time.perf_counter()
+    await legacy_review_session(supervisor, history)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await supervisor.review_session("bench", history)
+    cached_elapsed = time.perf_counter() - start
+
+    print(f" 기존 구현 (전체 재평가) : {legacy_elapsed:.4f}s")
+    print(f" 캐시 재사용            : {cached_elapsed:.4f}s - {legacy_elapsed / cached_elapsed:.1f}x")
+
+    print()
+    print("=" * 72)
+    print("3. 턴 평가 마커 검사 (턴 5,000개)")
+    print("=" * 72)
+    turns = build_history(5000)
+    context = {"therapeutic_approach": "CBT"}
+    for response_repeat in (1, 8):
+        responses = [turn["ai_response"] * response_repeat for turn in turns]
+        for turn, response in zip(turns, responses):
+            assert legacy_marker_checks(turn["user_message"], response, "ko", "CBT") == \
+                lexicon_marker_checks(turn["user_message"], response, "ko", "CBT")
+
+        start = time.perf_counter()
+        for turn, response in zip(turns, responses):
+            legacy_marker_checks(turn["user_message"], response, "ko", "CBT")
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for turn, response in zip(turns, responses):
+            lexicon_marker_checks(turn["user_message"], response, "ko", "CBT")
+        lexicon_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for turn, response in zip(turns, responses):
+            await supervisor._calculate_quality_scores(turn["user_message"], response, context, "ko")
+        full_elapsed = time.perf_counter() - start
+
+        length = int(np.mean([len(r) for r in responses]))
+        print(f" 응답 {length:>4}자 - 마커 목록 순회 : {legacy_elapsed / len(turns) * 1e6:.1f} us/turn,"
+              f" 마커 사전 : {lexicon_elapsed / len(turns) * 1e6:.1f} us/turn"
+              f" - {legacy_elapsed / lexicon_elapsed:.1f}x"
+              f" (7개 차원 전체 평가 {full_elapsed / len(turns) * 1e6:.1f} us/turn)")
+
+    print()
+    print("=" * 72)
+    print(f"4. 대량 세션 리뷰 (세션 500개 x 40턴, CPU {os.cpu_count()}개)")
+    print("=" * 72)
+    sessions = [
+        {"session_id": f"s{i}", "conversation_history": build_history(40, seed=i), "language": "ko"}
+        for i in range(500)
+    ]
+    supervisor.clear_turn_cache()
+    start = time.perf_counter()
+    for session in sessions:
+        await supervisor.review_session(session["session_id"], session["conversation_history"])
+        supervisor.clear_turn_cache(session["session_id"])
+    serial_elapsed = time.perf_counter() - start
+    print(f" review_session 순차 호출 : {serial_elapsed:.2f}s ({len(sessions) / serial_elapsed:.0f} sessions/s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in sorted({0, os.cpu_count() or 1, 2}):
+            report = await supervisor.bulk_review_sessions(
+                iter(sessions), os.path.join(tmp, f"reviews_{workers}.ndjson"), max_workers=workers
+            )
+            label = "현재 프로세스" if workers == 0 else f"프로세스 {workers}개"
+            print(f" bulk ({label:>8}) : {report.elapsed_seconds:.2f}s"
+                  f" ({report.sessions_per_second:.0f} sessions/s, {report.turns_per_second:.0f} turns/s,"
+                  f" 워커 시작 비용 포함)")
+        print(" 차원별 평가 시간 (us/turn):")
+        for dim, us in sorted(report.dimension_us_per_turn.items(), key=lambda item: -item[1]):
+            print(f"   {dim:<26} {us:>6.1f}")
+
+    print()
+    print("=" * 72)
+    print("5. 세션 품질 분석 (턴 평가 이후 집계 단계만)")
+    print("=" * 72)
+    for turns in (100, 1000, 4000):
+        history = build_history(turns)
+        supervisor.clear_turn_cache()
+        await supervisor.review_session("bench", history)
+        quality = supervisor.session_matrices["bench"]
+        all_scores = [
+            score for turn_id in quality.turn_ids
+            for score in supervisor.turn_score_cache["bench"][turn_id][1]
+        ]
+        repeat = 20
+        start = time.perf_counter()
+        for _ in range(repeat):
+            legacy_session_analysis(all_scores)
+        legacy_elapsed = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            supervisor.get_session_analytics("bench")
+        matrix_elapsed = (time.perf_counter() - start) / repeat
+        print(f" {turns:>5}턴 - 목록 기반 : {legacy_elapsed * 1e3:.2f} ms,"
+              f" 점수 행렬 (백분위/주요 순간 포함) : {matrix_elapsed * 1e3:.2f} ms"
+              f" - {legacy_elapsed / matrix_elapsed:.1f}x")
+
+    rng = np.random.default_rng(0)
+    fleet = [
+        SessionQualityMatrix(f"s{i}", "ko", [f"turn_{t}" for t in range(n)], rng.uniform(0.3, 1.0, (n, 7)))
+        for i, n in enumerate(rng.integers(10, 80, size=10000))
+    ]
+    start = time.perf_counter()
+    dashboard = supervisor.aggregate_session_quality(fleet)
+    elapsed = time.perf_counter() - start
+    print(f" 대시보드 집계 - 세션 {dashboard['sessions']:,}개 / 턴 {dashboard['turns']:,}개 : {elapsed * 1e3:.1f} ms")
+
+    print()
+    print("=" * 72)
+    print("6. 요청 지연 (1ms 간격 요청 1,000건, 요청마다 턴 평가 등록)")
+    print("=" * 72)
+    # 알림 로그 출력은 측정에서 제외
+    logging.getLogger("services.supervisor_alerts").setLevel(logging.ERROR)
+    print(f"{'대기 작업':>9} {'평가 위치':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'turns/s':>9}")
+    for backlog in (0, 2000, 10000):
+        for offload, label in ((False, "루프"), (True, "스레드")):
+            result = await measure_request_latency(supervisor, offload, backlog)
+            print(f"{backlog:>9,} {label:>10} {result['p50']:>9.2f} {result['p99']:>9.2f}"
+                  f" {result['max']:>9.1f} {result['turns_per_sec']:>9,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_benchmarks()))
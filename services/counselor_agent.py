@@ -177,6 +177,7 @@ class CounselorAgent:
         result = {
             "session_id": session.session_id,
             "user_id": user_id,
+            "turn_id": turn.turn_id,
             "response": response.text,
             "emotion": {
                 "label": emotion_result.emotion,
@@ -4,17 +4,37 @@ Phase 3: 임상 연구 지원 및 데이터 분석
 저장 경로: /AI_Drive/counseling_ai/services/research_platform.py
 """
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple, Iterable, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 import hashlib
+import itertools
 import json
+import math
+import multiprocessing
+import operator
+import os
 import random
+import re
 import string
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
+import zlib
 import numpy as np
 
+from models.personalization.time_series import change_points, grouped_slopes
+from services.research_statistics import analyze_outcomes
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성 (Parquet / Arrow 내보내기)
+    pa = None
+    pq = None
+
 class StudyType(Enum):
     """연구 유형"""
     RCT = "randomized_controlled_trial"
@@ -46,6 +66,9 @@ class DataExportFormat(Enum):
     """데이터 내보내기 형식"""
     CSV = "csv"
     JSON = "json"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+    ARROW = "arrow" # Arrow IPC 파일
     SPSS = "spss"
     STATA = "stata"
     R_DATA = "r_data"
@@ -112,13 +135,15 @@ class Participant:
     """연구 참여자"""
     participant_id: str # 익명화된 ID
     study_id: str
-    arm_id: Optional[str] = None
     status: ParticipantStatus
     
     # 익명화된 정보
     enrollment_date: datetime
     demographics: Dict[str, Any] # 익명화된 인구통계
     
+    # 배정 (무작위 배정이 없으면 None)
+    arm_id: Optional[str] = None
+    
     # 데이터
     assessments: List[Dict[str, Any]] = field(default_factory=list)
     session_count: int = 0
@@ -148,8 +173,327 @@ class ResearchDataset:
     access_level: str # public, restricted, private
     doi: Optional[str] = None
 
+@dataclass
+class ExportColumn:
+    """
+    열 단위 내보내기 열
+    - kind: string (문자열 목록), category (int32 코드 + dictionary), timestamp (datetime64[us]),
+      int (int32), float (float64)
+    - mask: True = 결측 (category / int / float)
+    """
+    name: str
+    kind: str
+    values: Any
+    mask: Optional[np.ndarray] = None
+    dictionary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+# 등록일 (naive datetime) → datetime64[us] 변환 기준
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _category_column(name: str, values: List[Any]) -> ExportColumn:
+    """값 목록 → 등장 순서 사전 + int32 코드 (None 은 -1 / 결측)"""
+    dictionary: Dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if value is None else dictionary.setdefault(str(value), len(dictionary)) for value in values),
+        dtype=np.int32, count=len(values)
+    )
+    return ExportColumn(name, 'category', codes, codes < 0, list(dictionary))
+
+def _arrow_type(kind: str):
+    return {
+        'string': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'timestamp': pa.timestamp('us'),
+        'int': pa.int32(),
+        'float': pa.float64()
+    }[kind]
+
+def _arrow_array(column: ExportColumn, start: int, stop: int):
+    """열의 [start, stop) 구간 → pyarrow 배열"""
+    values = column.values[start:stop]
+    if column.kind in ('string', 'timestamp'):
+        return pa.array(values, type=_arrow_type(column.kind))
+    mask = column.mask[start:stop]
+    if column.kind == 'category':
+        indices = pa.array(np.where(mask, 0, values), type=pa.int32(), mask=mask)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(column.dictionary, type=pa.string()))
+    return pa.array(values, type=_arrow_type(column.kind), mask=mask)
+
+class ParticipantIndex:
+    """
+    참여자 보조 색인 (연구 / 그룹 / 상태별)
+    - 각 버킷은 participant_id -> Participant 사전 (등록 순서 유지)
+    - 상태 버킷은 (연구, 그룹, 상태) 단위라 그룹별 상태 수도 O(1)
+    - 색인 시점의 상태를 기억하므로 상태를 바꾼 뒤 refresh() 로 버킷 이동
+    """
+    def __init__(self):
+        self._by_study: Dict[str, Dict[str, Participant]] = defaultdict(dict)
+        self._by_arm: Dict[Tuple[str, Optional[str]], Dict[str, Participant]] = defaultdict(dict)
+        self._by_status: Dict[Tuple[str, Optional[str], ParticipantStatus], Dict[str, Participant]] = defaultdict(dict)
+        self._arms: Dict[str, Dict[Optional[str], None]] = defaultdict(dict) # 연구별 그룹 (순서 유지 집합)
+        self._indexed: Dict[str, Tuple[str, Optional[str], ParticipantStatus]] = {}
+
+    def add(self, participant: Participant):
+        """참여자 색인 (같은 ID 가 있으면 교체)"""
+        self.remove(participant.participant_id)
+        key = (participant.study_id, participant.arm_id, participant.status)
+        pid = participant.participant_id
+        self._by_study[participant.study_id][pid] = participant
+        self._by_arm[key[:2]][pid] = participant
+        self._by_status[key][pid] = participant
+        self._arms[participant.study_id][participant.arm_id] = None
+        self._indexed[pid] = key
+
+    def remove(self, participant_id: str):
+        key = self._indexed.pop(participant_id, None)
+        if key is None:
+            return
+        for bucket, bucket_key in ((self._by_study, key[0]), (self._by_arm, key[:2]), (self._by_status, key)):
+            members = bucket[bucket_key]
+            del members[participant_id]
+            if not members:
+                del bucket[bucket_key]
+
+    def refresh(self, participant: Participant):
+        """그룹/상태가 바뀐 참여자 버킷 이동"""
+        if self._indexed.get(participant.participant_id) != (participant.study_id, participant.arm_id, participant.status):
+            self.add(participant)
+
+    def study(self, study_id: str) -> List[Participant]:
+        return list(self._by_study.get(study_id, {}).values())
+
+    def arm(self, study_id: str, arm_id: Optional[str]) -> List[Participant]:
+        return list(self._by_arm.get((study_id, arm_id), {}).values())
+
+    def with_status(self, study_id: str, status: ParticipantStatus, arm_id: Any = ...) -> List[Participant]:
+        """상태별 참여자 (arm_id 생략 시 연구 전체)"""
+        arms = self._arms.get(study_id, {}) if arm_id is ... else [arm_id]
+        result = []
+        for arm in arms:
+            result.extend(self._by_status.get((study_id, arm, status), {}).values())
+        return result
+
+    def count(self, study_id: str, arm_id: Any = ..., status: Optional[ParticipantStatus] = None) -> int:
+        """참여자 수 (그룹/상태 조건 선택)"""
+        if status is None:
+            if arm_id is ...:
+                return len(self._by_study.get(study_id, {}))
+            return len(self._by_arm.get((study_id, arm_id), {}))
+        arms = self._arms.get(study_id, {}) if arm_id is ... else [arm_id]
+        return sum(len(self._by_status.get((study_id, arm, status), {})) for arm in arms)
+
+class AssessmentTable:
+    """
+    연구별 평가 열 테이블
+    - 행: 평가 기록 (기록 순서), 열: 참여자 / 도구 / 시점 코드, 점수, 참여자 평가 목록 내 위치
+    - 참여자 코드는 등록 순서대로 부여 (색인의 등록 순서와 같음)
+    - (참여자, 도구, 시점) 첫 기록은 사전으로 O(1) 조회
+    - 재등록 등으로 연구에서 빠진 참여자는 active=False (행은 남기고 집계에서 제외)
+    """
+    def __init__(self, capacity: int = 256):
+        self.size = 0
+        self.participant_codes = np.zeros(capacity, dtype=np.int32)
+        self.tool_codes = np.zeros(capacity, dtype=np.int16)
+        self.timepoint_codes = np.zeros(capacity, dtype=np.int16)
+        self.scores = np.zeros(capacity, dtype=np.float64)
+        self.positions = np.zeros(capacity, dtype=np.int32)
+        self.tool_vocab: Dict[str, int] = {}
+        self.timepoint_vocab: Dict[str, int] = {}
+        self.arm_vocab: Dict[Optional[str], int] = {}
+        # 참여자 코드별 열
+        self.participant_vocab: Dict[str, int] = {}
+        self.participant_ids: List[str] = []
+        self.participant_arms = np.zeros(capacity, dtype=np.int16)
+        self.participant_active = np.zeros(capacity, dtype=bool)
+        self._participant_rows: List[List[int]] = []
+        self._first: Dict[Tuple[int, int, int], int] = {}
+
+    def register(self, participant_id: str, arm_id: Optional[str]) -> int:
+        """참여자 등록 (같은 ID 가 있으면 이전 코드를 비활성화하고 새 코드 부여)"""
+        self.deactivate(participant_id)
+        code = len(self.participant_ids)
+        if code == len(self.participant_arms):
+            self.participant_arms = _grow_array(self.participant_arms, code)
+            self.participant_active = _grow_array(self.participant_active, code)
+        self.participant_ids.append(participant_id)
+        self.participant_vocab[participant_id] = code
+        self.participant_arms[code] = self.arm_vocab.setdefault(arm_id, len(self.arm_vocab))
+        self.participant_active[code] = True
+        self._participant_rows.append([])
+        return code
+
+    def deactivate(self, participant_id: str):
+        code = self.participant_vocab.pop(participant_id, None)
+        if code is not None:
+            self.participant_active[code] = False
+
+    def append(self, participant_id: str, tool: str, timepoint: str, score: float) -> int:
+        """평가 행 추가 (참여자 평가 목록에 덧붙인 순서와 같아야 함)"""
+        code = self.participant_vocab[participant_id]
+        if self.size == len(self.scores):
+            for name in ("participant_codes", "tool_codes", "timepoint_codes", "scores", "positions"):
+                setattr(self, name, _grow_array(getattr(self, name), self.size))
+        row = self.size
+        tool_code = self.tool_vocab.setdefault(tool, len(self.tool_vocab))
+        timepoint_code = self.timepoint_vocab.setdefault(timepoint, len(self.timepoint_vocab))
+        rows = self._participant_rows[code]
+        self.participant_codes[row] = code
+        self.tool_codes[row] = tool_code
+        self.timepoint_codes[row] = timepoint_code
+        self.scores[row] = score
+        self.positions[row] = len(rows)
+        rows.append(row)
+        self._first.setdefault((code, tool_code, timepoint_code), row)
+        self.size += 1
+        return row
+
+    def lookup(self, participant_id: str, tool: str, timepoint: str) -> Optional[float]:
+        """참여자의 도구/시점 첫 기록 점수"""
+        row = self._first.get((
+            self.participant_vocab.get(participant_id, -1),
+            self.tool_vocab.get(tool, -1),
+            self.timepoint_vocab.get(timepoint, -1)
+        ))
+        return None if row is None else float(self.scores[row])
+
+    def participant_rows(self, participant_id: str) -> np.ndarray:
+        """참여자의 평가 행 번호 (기록 순서)"""
+        code = self.participant_vocab.get(participant_id)
+        return np.array(self._participant_rows[code] if code is not None else [], dtype=np.intp)
+
+    def codes(self, vocab: Dict[Any, int], keys: List[Any]) -> np.ndarray:
+        return np.array([vocab[k] for k in keys if k in vocab], dtype=np.int64)
+
+    def active_rows(self) -> np.ndarray:
+        """활성 참여자의 행 번호"""
+        return np.flatnonzero(self.participant_active[self.participant_codes[:self.size]])
+
+    def first_scores(self, tool: str, timepoints: List[str]) -> np.ndarray:
+        """
+        참여자 코드별 도구 첫 기록 점수 (timepoints 중 먼저 기록된 것, 없으면 NaN)
+        행이 기록 순서라 np.unique 의 첫 등장 위치 = 참여자별 첫 기록
+        """
+        dense = np.full(len(self.participant_ids), np.nan)
+        tool_code = self.tool_vocab.get(tool)
+        if tool_code is None:
+            return dense
+        rows = self.active_rows()
+        rows = rows[
+            (self.tool_codes[rows] == tool_code) &
+            np.isin(self.timepoint_codes[rows], self.codes(self.timepoint_vocab, timepoints))
+        ]
+        participants, first = np.unique(self.participant_codes[rows], return_index=True)
+        dense[participants] = self.scores[rows[first]]
+        return dense
+
+def _stat(value: float, digits: Optional[int] = 4) -> Optional[float]:
+    """통계값 → JSON 용 float (NaN / 무한대는 None)"""
+    value = float(value)
+    if not np.isfinite(value):
+        return None
+    return round(value, digits) if digits is not None else value
+
+def _count(value: float) -> Optional[int]:
+    """집계 개수 → int (NaN 은 None)"""
+    value = float(value)
+    return int(value) if np.isfinite(value) else None
+
+def _distinct_rows(
+    codes: np.ndarray, sizes: List[int], weights: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    코드 행 (행 수, 열 수) 의 고유 조합과 조합별 개수 (weights 가 있으면 가중 합)
+    열 값 범위 곱이 int64 에 들어가면 혼합 기수 키 하나로 np.unique, 아니면 행 단위 np.unique
+    """
+    if math.prod(max(1, size) for size in sizes) < 2 ** 62:
+        strides = np.cumprod([1] + [max(1, size) for size in sizes[:0:-1]])[::-1].astype(np.int64)
+        keys, inverse = np.unique(codes @ strides, return_inverse=True)
+        combos = np.column_stack([keys // stride % max(1, size) for stride, size in zip(strides, sizes)]) if len(sizes) else codes[:len(keys)]
+    else:
+        combos, inverse = np.unique(codes, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse, weights, minlength=len(combos))
+    return combos.reshape(len(combos), len(sizes)), counts if weights is not None else counts.astype(np.int64)
+
+# 텍스트 PII 패턴 (패턴, 대체 문자열) - 순서가 단일 패스 교대의 우선순위 (기존 순차 적용 순서)
+_PII_PATTERNS: List[Tuple[str, str]] = [
+    (r'[가-힣]{2,4}(?=씨|님|선생|과장|부장|대리)', '[이름]'),
+    (r'\d{2,3}-\d{3,4}-\d{4}', '[전화번호]'),
+    (r'\d{10,11}', '[전화번호]'),
+    (r'[\w\.-]+@[\w\.-]+\.\w+', '[이메일]'),
+    (r'[가-힣]+(?:시|도)\s*[가-힣]+(?:구|군|시)', '[주소]'),
+    (r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일', '[날짜]'),
+    (r'\d{4}-\d{2}-\d{2}', '[날짜]'),
+]
+_DIGIT = re.compile(r'\d')
+# 패턴 조합 (비트 마스크) → 컴파일된 치환 함수 (프로세스마다 처음 쓸 때 컴파일)
+_PII_SCRUBBERS: Dict[int, Callable[[str], str]] = {}
+
+def _pii_mask(text: str) -> int:
+    """텍스트에서 맞을 수 있는 PII 패턴 비트 (패턴에 꼭 필요한 문자가 없으면 제외)"""
+    mask = 0
+    if '씨' in text or '님' in text or '선생' in text or '과장' in text or '부장' in text or '대리' in text:
+        mask |= 1
+    if _DIGIT.search(text) is not None:
+        mask |= 4
+        if '-' in text:
+            mask |= 2 | 64
+        if '년' in text and '월' in text and '일' in text:
+            mask |= 32
+    if '@' in text and '.' in text:
+        mask |= 8
+    if ('시' in text or '도' in text) and ('구' in text or '군' in text or '시' in text):
+        mask |= 16
+    return mask
+
+def _pii_scrubber(mask: int) -> Callable[[str], str]:
+    """마스크의 패턴만 교대로 묶은 단일 패스 치환 함수 (그룹 번호 → 대체 문자열)"""
+    scrubber = _PII_SCRUBBERS.get(mask)
+    if scrubber is None:
+        patterns = [pattern for bit, pattern in enumerate(_PII_PATTERNS) if mask >> bit & 1]
+        replacements = [None] + [replacement for _, replacement in patterns]
+        regex = re.compile('|'.join(f'({pattern})' for pattern, _ in patterns))
+        replace = lambda match: replacements[match.lastindex]
+        scrubber = _PII_SCRUBBERS[mask] = lambda text: regex.sub(replace, text)
+    return scrubber
+
+def _scrub_pii(text: str) -> str:
+    mask = _pii_mask(text)
+    return _pii_scrubber(mask)(text) if mask else text
+
+def _scrub_pii_chunk(texts: List[str]) -> List[str]:
+    """프로세스 풀 작업 단위"""
+    return [_scrub_pii(text) for text in texts]
+
+def _grow_array(values: np.ndarray, size: int) -> np.ndarray:
+    grown = np.zeros(max(1, len(values)) * 2, dtype=values.dtype)
+    grown[:size] = values[:size]
+    return grown
+
 class AnonymizationEngine:
     """익명화 엔진"""
+    # 준식별자 일반화 계층: 단계마다 이전 단계 값 → 더 넓은 값
+    # (매핑에 없는 값은 '*' 항목, '*' 도 없으면 그대로 / 값 없음(None) 도 같은 규칙)
+    GENERALIZATION_HIERARCHIES: Dict[str, List[Dict[Any, Any]]] = {
+        'age_group': [
+            {'20-29': '20-39', '30-39': '20-39', '40-49': '40-59', '50-59': '40-59'},
+            {'*': '*'}
+        ],
+        'region_group': [
+            {'수도권': '수도권', '기타': '기타', '*': '비수도권'},
+            {'*': '*'}
+        ],
+        'gender': [
+            {'*': '*'}
+        ]
+    }
+    # 준식별자 키를 한 번에 뽑는 레코드 수 (청크 안에 키가 빠진 레코드가 있으면 그 청크만 get 으로)
+    KEY_CHUNK_SIZE = 1024
+
     def __init__(self, k_anonymity: int = 5):
         self.k_anonymity = k_anonymity
         self.salt = self._generate_salt()
@@ -209,61 +553,187 @@ class AnonymizationEngine:
         return anonymized
 
     def anonymize_text(self, text: str) -> str:
-        """텍스트 익명화 (PII 제거)"""
-        import re
-        
-        # 이름 패턴
-        text = re.sub(r'[가-힣]{2,4}(?=씨|님|선생|과장|부장|대리)', '[이름]', text)
-        
-        # 전화번호
-        text = re.sub(r'\d{2,3}-\d{3,4}-\d{4}', '[전화번호]', text)
-        text = re.sub(r'\d{10,11}', '[전화번호]', text)
-        
-        # 이메일
-        text = re.sub(r'[\w\.-]+@[\w\.-]+\.\w+', '[이메일]', text)
+        """
+        텍스트 익명화 (PII 제거)
+        - 이름 / 전화번호 / 이메일 / 주소 / 날짜 패턴을 교대 하나로 묶어 한 번에 치환 (패턴은 모듈 로드 시 한 번만 정의)
+        - 텍스트에 꼭 필요한 문자 (숫자, '@', 호칭 등) 가 없는 패턴은 교대에서 빼고, 해당 패턴이 없으면 그대로 반환
+        - 순차 치환과 다른 경우: 뒤 패턴의 매치가 앞 패턴 매치보다 먼저 시작해 겹칠 때 먼저 시작한 매치 전체를 치환
+          (예: 숫자 10자리 이상이 들어간 이메일 → 일부 [전화번호] 대신 전체 [이메일])
+        """
+        return _scrub_pii(text)
+
+    def anonymize_texts(
+        self, texts: Iterable[str], max_workers: Optional[int] = 0, chunk_size: int = 2000
+    ) -> List[str]:
+        """
+        텍스트 여러 개 익명화 (입력 순서 유지)
+
+        Args:
+            texts: 익명화할 텍스트
+            max_workers: 프로세스 수 (0이면 현재 프로세스에서 순차 처리, None 이면 CPU 수)
+            chunk_size: 프로세스에 한 번에 보내는 텍스트 수
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers <= 0:
+            return [_scrub_pii(text) for text in texts]
         
-        # 주소
-        text = re.sub(r'[가-힣]+(?:시|도)\s*[가-힣]+(?:구|군|시)', '[주소]', text)
+        results: List[str] = []
+        texts = iter(texts)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            pending = deque()
+            while True:
+                chunk = list(itertools.islice(texts, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_scrub_pii_chunk, chunk))
+                # 진행 중인 청크 수를 제한해 입력 이터레이터를 스트리밍으로 소비
+                if len(pending) >= max_workers * 2:
+                    results.extend(pending.popleft().result())
+            while pending:
+                results.extend(pending.popleft().result())
+        return results
+
+    def quasi_identifier_keys(
+        self, dataset: Iterable[Dict[str, Any]], quasi_identifiers: List[str]
+    ) -> Iterator[Tuple[Any, ...]]:
+        """레코드별 준식별자 값 튜플 (빠진 키는 None)"""
+        if len(quasi_identifiers) == 1:
+            qi = quasi_identifiers[0]
+            getter = lambda record: (record[qi],)
+        else:
+            getter = operator.itemgetter(*quasi_identifiers) if quasi_identifiers else (lambda record: ())
+        records = iter(dataset)
+        while True:
+            chunk = list(itertools.islice(records, self.KEY_CHUNK_SIZE))
+            if not chunk:
+                return
+            try:
+                keys = list(map(getter, chunk))
+            except KeyError:
+                yield from (tuple(map(record.get, quasi_identifiers)) for record in chunk)
+            else:
+                yield from keys
+
+    def quasi_identifier_groups(
+        self, dataset: Iterable[Dict[str, Any]], quasi_identifiers: List[str]
+    ) -> Tuple[List[List[Any]], np.ndarray, np.ndarray]:
+        """
+        준식별자 동치류 집계 (레코드는 보관하지 않음, 메모리는 동치류 수에 비례)
+        - 반환: 준식별자별 값 목록, 조합 코드 (동치류 수, 준식별자 수), 조합별 레코드 수
+        """
+        return self._group_codes(Counter(self.quasi_identifier_keys(dataset, quasi_identifiers)), len(quasi_identifiers))
+
+    @staticmethod
+    def _group_codes(groups: Counter, width: int) -> Tuple[List[List[Any]], np.ndarray, np.ndarray]:
+        """준식별자 튜플별 개수 → 준식별자별 값 목록 + 조합 코드 + 개수"""
+        vocabularies: List[Dict[Any, int]] = [{} for _ in range(width)]
+        combos = np.array(
+            [[vocab.setdefault(value, len(vocab)) for vocab, value in zip(vocabularies, key)] for key in groups],
+            dtype=np.int64
+        ).reshape(len(groups), width)
+        counts = np.fromiter(groups.values(), dtype=np.int64, count=len(groups))
+        return [list(vocab) for vocab in vocabularies], combos, counts
+
+    def check_k_anonymity(self, dataset: Iterable[Dict[str, Any]], quasi_identifiers: List[str]) -> bool:
+        """k-익명성 확인 (모든 동치류 크기 >= k)"""
+        _, _, counts = self.quasi_identifier_groups(dataset, quasi_identifiers)
+        return not len(counts) or counts.min() >= self.k_anonymity
+
+    def generalize_value(self, quasi_identifier: str, value: Any, level: int) -> Any:
+        """값을 계층의 level 단계까지 일반화 (0 = 원래 값)"""
+        for mapping in self.GENERALIZATION_HIERARCHIES.get(quasi_identifier, [])[:level]:
+            value = mapping.get(value, mapping.get('*', value))
+        return value
+
+    def minimal_generalization(
+        self,
+        vocabularies: List[List[Any]],
+        combos: np.ndarray,
+        counts: np.ndarray,
+        quasi_identifiers: List[str]
+    ) -> Dict[str, int]:
+        """
+        k-익명성을 만족하는 최소 일반화 단계 (준식별자별 단계)
+        - 단계 합이 작은 순서로 격자를 훑고, 처음 만족하는 높이에서 동치류가 가장 많은 조합 선택
+          (동률이면 앞 준식별자를 덜 일반화)
+        - 동치류 단위 (조합 코드 + 개수) 로만 계산하므로 레코드 수와 무관
+        - 최상위까지 일반화해도 안 되면 (전체 < k) 최상위 단계
+        """
+        heights = [len(self.GENERALIZATION_HIERARCHIES.get(qi, [])) for qi in quasi_identifiers]
+        if not len(counts) or counts.min() >= self.k_anonymity:
+            return dict.fromkeys(quasi_identifiers, 0)
         
-        # 날짜 (구체적인 날짜 -> 상대적 시간)
-        text = re.sub(r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일', '[날짜]', text)
-        text = re.sub(r'\d{4}-\d{2}-\d{2}', '[날짜]', text)
+        # 준식별자 / 단계별 코드 변환표 (원래 코드 → 일반화 값 코드)
+        level_codes = []
+        for qi, vocab, height in zip(quasi_identifiers, vocabularies, heights):
+            tables = []
+            for level in range(height + 1):
+                generalized: Dict[Any, int] = {}
+                tables.append(np.array(
+                    [generalized.setdefault(self.generalize_value(qi, value, level), len(generalized)) for value in vocab],
+                    dtype=np.int64
+                ))
+            level_codes.append(tables)
         
-        return text
+        lattice = sorted(itertools.product(*(range(h + 1) for h in heights)), key=sum)
+        best, best_groups = None, 0
+        for levels in lattice:
+            if best is not None and sum(levels) > sum(best):
+                break
+            columns = np.column_stack([
+                level_codes[j][level][combos[:, j]] for j, level in enumerate(levels)
+            ]) if quasi_identifiers else combos
+            groups, group_counts = _distinct_rows(
+                columns, [len(level_codes[j][level]) and int(level_codes[j][level].max()) + 1 for j, level in enumerate(levels)],
+                counts
+            )
+            if group_counts.min() >= self.k_anonymity and len(groups) > best_groups:
+                best, best_groups = levels, len(groups)
+        return dict(zip(quasi_identifiers, best if best is not None else heights))
 
-    def check_k_anonymity(self, dataset: List[Dict[str, Any]], quasi_identifiers: List[str]) -> bool:
-        """k-익명성 확인"""
-        # 준식별자 조합별 그룹화
-        groups = defaultdict(list)
-        for record in dataset:
-            key = tuple(record.get(qi, None) for qi in quasi_identifiers)
-            groups[key].append(record)
-            
-        # 모든 그룹이 k 이상인지 확인
-        for key, group in groups.items():
-            if len(group) < self.k_anonymity:
-                return False
-        return True
+    def find_generalization(self, dataset: Iterable[Dict[str, Any]], quasi_identifiers: List[str]) -> Dict[str, int]:
+        """레코드 → 최소 일반화 단계 (이미 k-익명이면 모두 0)"""
+        return self.minimal_generalization(*self.quasi_identifier_groups(dataset, quasi_identifiers), quasi_identifiers)
 
     def generalize_for_k_anonymity(self, dataset: List[Dict[str, Any]], quasi_identifiers: List[str]) -> List[Dict[str, Any]]:
-        """k-익명성을 위한 일반화"""
-        # 간단한 일반화 전략
-        generalized = []
-        for record in dataset:
-            new_record = record.copy()
-            for qi in quasi_identifiers:
-                if qi == 'age_group':
-                    # 연령대 더 넓게
-                    age_group = new_record.get(qi, '')
-                    if age_group in ['20-29', '30-39']:
-                        new_record[qi] = '20-39'
-                    elif age_group in ['40-49', '50-59']:
-                        new_record[qi] = '40-59'
-                elif qi == 'region_group':
-                    # 지역 더 넓게
-                    if new_record.get(qi) not in ['수도권', '기타']:
-                        new_record[qi] = '비수도권'
-            generalized.append(new_record)
+        """
+        k-익명성을 위한 최소 일반화
+        - 값이 바뀌는 레코드만 복사 (그대로인 레코드는 같은 객체), 일반화가 필요 없으면 목록 그대로
+        - 바뀌는 값은 동치류마다 한 번만 계산
+        """
+        keys = list(self.quasi_identifier_keys(dataset, quasi_identifiers))
+        vocabularies, combos, counts = self._group_codes(Counter(keys), len(quasi_identifiers))
+        levels = self.minimal_generalization(vocabularies, combos, counts, quasi_identifiers)
+        if not any(levels.values()):
+            return list(dataset)
+        changes: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for combo in combos.tolist():
+            key = tuple(vocab[code] for vocab, code in zip(vocabularies, combo))
+            update = {}
+            for qi, value in zip(quasi_identifiers, key):
+                new_value = self.generalize_value(qi, value, levels[qi])
+                if new_value != value:
+                    update[qi] = new_value
+            if update:
+                changes[key] = update
+        return [
+            {**record, **changes[key]} if key in changes else record
+            for record, key in zip(dataset, keys)
+        ]
+
+    def generalize_record(self, record: Dict[str, Any], levels: Dict[str, int]) -> Dict[str, Any]:
+        """레코드 하나를 준식별자별 단계로 일반화 (바뀌는 값이 없으면 원래 레코드)"""
+        generalized = record
+        for qi, level in levels.items():
+            if not level:
+                continue
+            value = record.get(qi, None)
+            new_value = self.generalize_value(qi, value, level)
+            if new_value != value:
+                if generalized is record:
+                    generalized = record.copy()
+                generalized[qi] = new_value
         return generalized
 
 class RandomizationService:
@@ -339,6 +809,7 @@ class OutcomeAssessment:
             'purpose': 'Depression screening',
             'items': 9,
             'score_range': (0, 27),
+            'reliability': 0.89,
             'severity_cutoffs': {
                 'minimal': (0, 4),
                 'mild': (5, 9),
@@ -376,6 +847,7 @@ class OutcomeAssessment:
             'purpose': 'Anxiety screening',
             'items': 7,
             'score_range': (0, 21),
+            'reliability': 0.92,
             'severity_cutoffs': {
                 'minimal': (0, 4),
                 'mild': (5, 9),
@@ -408,6 +880,7 @@ class OutcomeAssessment:
             'purpose': 'Psychological distress',
             'items': 10,
             'score_range': (10, 50),
+            'reliability': 0.93,
             'severity_cutoffs': {
                 'low': (10, 15),
                 'moderate': (16, 21),
@@ -420,6 +893,8 @@ class OutcomeAssessment:
             'purpose': 'Therapeutic alliance',
             'items': 12,
             'score_range': (12, 60),
+            'reliability': 0.91,
+            'higher_is_better': True,
             'subscales': ['task', 'bond', 'goal']
         }
     }
@@ -510,6 +985,10 @@ class ResearchPlatformService:
         self.participants: Dict[str, Participant] = {}
         self.consents: Dict[str, ConsentRecord] = {}
         self.datasets: Dict[str, ResearchDataset] = {}
+        # 연구 / 그룹 / 상태별 보조 색인 (등록, 상태 변경 시 갱신)
+        self.participant_index = ParticipantIndex()
+        # 연구별 평가 열 테이블 (record_assessment 로 기록된 평가)
+        self.assessment_tables: Dict[str, AssessmentTable] = defaultdict(AssessmentTable)
         
         self.anonymization = AnonymizationEngine(k_anonymity=5)
         self.randomization = RandomizationService()
@@ -646,7 +1125,7 @@ class ResearchPlatformService:
             enrollment_date=datetime.now(),
             demographics=anonymized_demographics
         )
-        self.participants[participant.participant_id] = participant
+        self._register_participant(participant)
         
         # 등록 수 업데이트
         study.current_enrollment += 1
@@ -657,6 +1136,48 @@ class ResearchPlatformService:
             
         return participant, arm_id
 
+    def _register_participant(self, participant: Participant):
+        """참여자 저장 + 색인 / 평가 테이블 등록 (같은 ID 의 이전 참여자는 대체)"""
+        previous = self.participants.get(participant.participant_id)
+        if previous is not None and previous.study_id != participant.study_id:
+            self.assessment_tables[previous.study_id].deactivate(participant.participant_id)
+        self.participants[participant.participant_id] = participant
+        self.participant_index.add(participant)
+        table = self.assessment_tables[participant.study_id]
+        table.register(participant.participant_id, participant.arm_id)
+        for record in participant.assessments:
+            table.append(participant.participant_id, record['tool'], record['timepoint'], record['score'])
+
+    def _add_assessment(self, participant: Participant, record: Dict[str, Any]):
+        """평가 기록 저장 (참여자 목록 + 연구 평가 테이블)"""
+        participant.assessments.append(record)
+        self.assessment_tables[participant.study_id].append(
+            participant.participant_id, record['tool'], record['timepoint'], record['score']
+        )
+
+    async def update_participant_status(
+        self,
+        participant_id: str,
+        status: ParticipantStatus,
+        reason: Optional[str] = None
+    ) -> Participant:
+        """참여자 상태 변경 (색인 갱신)"""
+        participant = self.participants.get(participant_id)
+        if not participant:
+            raise ValueError(f"Participant not found: {participant_id}")
+            
+        participant.status = status
+        if status == ParticipantStatus.COMPLETED:
+            participant.completion_date = datetime.now()
+        elif status in (ParticipantStatus.WITHDRAWN, ParticipantStatus.LOST_TO_FOLLOWUP):
+            participant.withdrawal_reason = reason
+            consent = self.consents.get(participant_id)
+            if consent and status == ParticipantStatus.WITHDRAWN:
+                consent.withdrawal_date = datetime.now()
+        participant.last_activity = datetime.now()
+        self.participant_index.refresh(participant)
+        return participant
+
     async def record_assessment(
         self,
         participant_id: str,
@@ -681,7 +1202,7 @@ class ResearchPlatformService:
             'severity': score_result['severity'],
             'recorded_at': datetime.now().isoformat()
         }
-        participant.assessments.append(assessment_record)
+        self._add_assessment(participant, assessment_record)
         participant.last_activity = datetime.now()
         
         return score_result
@@ -692,7 +1213,7 @@ class ResearchPlatformService:
         if not participant:
             raise ValueError(f"Participant not found: {participant_id}")
             
-        # 평가별 추적
+        # 평가별 추적 (참여자 자신의 기록만 한 번 훑음 - 행이 몇 개뿐이라 테이블 group-by 보다 빠름)
         assessment_history = defaultdict(list)
         for assessment in participant.assessments:
             assessment_history[assessment['tool']].append({
@@ -725,30 +1246,30 @@ class ResearchPlatformService:
         if not study:
             raise ValueError(f"Study not found: {study_id}")
             
-        # 참여자 데이터 수집
-        study_participants = [
-            p for p in self.participants.values() if p.study_id == study_id
-        ]
-        
-        # 그룹별 분석
+        # 그룹별 분석 (색인 조회: 해당 연구 참여자만 읽음)
+        index = self.participant_index
+        arm_ids = [arm.arm_id for arm in study.arms]
+        outcomes = self._summarize_outcomes(study_id, arm_ids)
+        trajectories = self._summarize_trajectories(study_id, arm_ids)
         arm_analysis = {}
         for arm in study.arms:
-            arm_participants = [p for p in study_participants if p.arm_id == arm.arm_id]
+            arm_participants = index.arm(study_id, arm.arm_id)
             
             # 기본 통계
             arm_analysis[arm.arm_id] = {
                 'name': arm.name,
                 'n': len(arm_participants),
-                'completed': sum(1 for p in arm_participants if p.status == ParticipantStatus.COMPLETED),
-                'withdrawn': sum(1 for p in arm_participants if p.status == ParticipantStatus.WITHDRAWN),
+                'completed': index.count(study_id, arm.arm_id, ParticipantStatus.COMPLETED),
+                'withdrawn': index.count(study_id, arm.arm_id, ParticipantStatus.WITHDRAWN),
                 'demographics': self._summarize_demographics(arm_participants),
-                'outcomes': self._summarize_outcomes(arm_participants)
+                'outcomes': outcomes[arm.arm_id],
+                'trajectories': trajectories[arm.arm_id]
             }
             
         # 비교 분석 (두 그룹인 경우)
         comparison = None
         if len(study.arms) == 2:
-            comparison = await self._compare_arms(study.arms, study_participants)
+            comparison = await self._compare_arms(study_id, study.arms)
             
         return {
             'study_id': study_id,
@@ -761,6 +1282,7 @@ class ResearchPlatformService:
             },
             'arms': arm_analysis,
             'comparison': comparison,
+            'statistics': await self.analyze_study(study_id),
             'generated_at': datetime.now().isoformat()
         }
 
@@ -786,66 +1308,152 @@ class ResearchPlatformService:
                 
         return {k: dict(v) for k, v in demographics.items()}
 
-    def _summarize_outcomes(self, participants: List[Participant]) -> Dict[str, Any]:
-        """결과 요약"""
-        outcomes = defaultdict(lambda: {'baseline': [], 'final': []})
+    # 결과 요약의 종료 시점 / 그룹 비교의 종료 시점 (그룹 비교는 'post' 제외)
+    _SUMMARY_FINAL_TIMEPOINTS = ['final', 'week12', 'post']
+    _COMPARISON_FINAL_TIMEPOINTS = ['final', 'week12']
+
+    def _summarize_outcomes(self, study_id: str, arm_ids: List[Optional[str]]) -> Dict[Optional[str], Dict[str, Any]]:
+        """
+        그룹별 결과 요약 (그룹 × 도구 group-by 한 번)
+        - 기준선 / 종료 시점 모든 기록의 평균, 표준편차(모집단), 평균 변화
+        - 도구 순서: 그룹 안에서 처음 기록된 순서 (참여자 등록 순서 → 참여자 내 기록 순서)
+        """
+        summaries = {arm_id: {} for arm_id in arm_ids}
+        table = self.assessment_tables.get(study_id)
+        if table is None or not table.size:
+            return summaries
+        rows = table.active_rows()
+        participants = table.participant_codes[rows].astype(np.int64)
+        n_tools = len(table.tool_vocab)
+        groups = table.participant_arms[participants].astype(np.int64) * n_tools + table.tool_codes[rows]
+        n_groups = len(table.arm_vocab) * n_tools
+        timepoints = table.timepoint_codes[rows]
+        scores = table.scores[rows]
         
-        for p in participants:
-            for assessment in p.assessments:
-                tool = assessment['tool']
-                timepoint = assessment['timepoint']
-                score = assessment['score']
-                
-                if timepoint == 'baseline':
-                    outcomes[tool]['baseline'].append(score)
-                elif timepoint in ['final', 'week12', 'post']:
-                    outcomes[tool]['final'].append(score)
-                    
-        summary = {}
-        for tool, data in outcomes.items():
-            if data['baseline'] and data['final']:
-                summary[tool] = {
-                    'baseline_mean': round(np.mean(data['baseline']), 2),
-                    'baseline_sd': round(np.std(data['baseline']), 2),
-                    'final_mean': round(np.mean(data['final']), 2),
-                    'final_sd': round(np.std(data['final']), 2),
-                    'mean_change': round(np.mean(data['final']) - np.mean(data['baseline']), 2)
+        stats = []
+        for phase_timepoints in (['baseline'], self._SUMMARY_FINAL_TIMEPOINTS):
+            mask = np.isin(timepoints, table.codes(table.timepoint_vocab, phase_timepoints))
+            group, values = groups[mask], scores[mask]
+            count = np.bincount(group, minlength=n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.bincount(group, values, n_groups) / count
+                std = np.sqrt(np.bincount(group, (values - mean[group]) ** 2, n_groups) / count)
+            stats.append((count, mean, std))
+        (baseline_n, baseline_mean, baseline_sd), (final_n, final_mean, final_sd) = stats
+        
+        first_seen = np.full(n_groups, np.iinfo(np.int64).max)
+        np.minimum.at(first_seen, groups, (participants << 32) | table.positions[rows])
+        tool_names = list(table.tool_vocab)
+        for arm_id in arm_ids:
+            arm_code = table.arm_vocab.get(arm_id)
+            if arm_code is None:
+                continue
+            arm_groups = arm_code * n_tools + np.arange(n_tools)
+            for g in arm_groups[np.argsort(first_seen[arm_groups], kind='stable')]:
+                if baseline_n[g] and final_n[g]:
+                    summaries[arm_id][tool_names[g % n_tools]] = {
+                        'baseline_mean': round(baseline_mean[g], 2),
+                        'baseline_sd': round(baseline_sd[g], 2),
+                        'final_mean': round(final_mean[g], 2),
+                        'final_sd': round(final_sd[g], 2),
+                        'mean_change': round(final_mean[g] - baseline_mean[g], 2)
+                    }
+        return summaries
+
+    _WEEK_TIMEPOINT = re.compile(r'week(\d+)')
+
+    def _timepoint_weeks(self, table: AssessmentTable, schedule: Dict[str, int]) -> np.ndarray:
+        """
+        시점 코드 → 주차 (연구 assessment_schedule 우선, 없으면 baseline 0 / weekN N)
+        일정에 없고 주차도 없는 시점 (final, post 등) 은 NaN
+        """
+        weeks = np.full(len(table.timepoint_vocab), np.nan)
+        for timepoint, code in table.timepoint_vocab.items():
+            match = self._WEEK_TIMEPOINT.fullmatch(timepoint)
+            if timepoint in schedule:
+                weeks[code] = float(schedule[timepoint])
+            elif timepoint == 'baseline':
+                weeks[code] = 0.0
+            elif match:
+                weeks[code] = float(match.group(1))
+        return weeks
+
+    def _summarize_trajectories(self, study_id: str, arm_ids: List[Optional[str]]) -> Dict[Optional[str], Dict[str, Any]]:
+        """
+        그룹별 점수 궤적 (주차를 알 수 있는 시점 기록만 사용)
+        - slope_per_week: 그룹 × 도구 모든 기록의 주차 대비 최소제곱 기울기 (grouped_slopes 한 번)
+        - weekly_mean: 주차별 평균, change_points: 주차별 평균 수준이 바뀌기 시작하는 주차
+        - 주차가 2개 이상인 도구만 포함 (도구 순서: 테이블 도구 등록 순서)
+        """
+        summaries = {arm_id: {} for arm_id in arm_ids}
+        table = self.assessment_tables.get(study_id)
+        if table is None or not table.size:
+            return summaries
+        rows = table.active_rows()
+        schedule = self.studies[study_id].assessment_schedule
+        weeks = self._timepoint_weeks(table, schedule)[table.timepoint_codes[rows]]
+        valid = ~np.isnan(weeks)
+        rows, weeks = rows[valid], weeks[valid]
+        n_tools = len(table.tool_vocab)
+        n_groups = len(table.arm_vocab) * n_tools
+        groups = table.participant_arms[table.participant_codes[rows]].astype(np.int64) * n_tools + table.tool_codes[rows]
+        scores = table.scores[rows]
+        slopes = grouped_slopes(groups, weeks, scores, n_groups)
+        
+        # (그룹, 주차) 평균: 주차를 정렬된 고유 주차 색인으로 바꿔 bincount 한 번
+        week_values, week_index = np.unique(weeks, return_inverse=True)
+        cells = groups * len(week_values) + week_index
+        n_cells = n_groups * len(week_values)
+        counts = np.bincount(cells, minlength=n_cells).reshape(n_groups, -1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (np.bincount(cells, scores, n_cells).reshape(n_groups, -1) / counts)
+        
+        tool_names = list(table.tool_vocab)
+        for arm_id in arm_ids:
+            arm_code = table.arm_vocab.get(arm_id)
+            if arm_code is None:
+                continue
+            for t, tool in enumerate(tool_names):
+                g = arm_code * n_tools + t
+                if np.isnan(slopes[g]):
+                    continue
+                observed = counts[g] > 0
+                weekly_mean = means[g, observed]
+                tool_weeks = week_values[observed]
+                summaries[arm_id][tool] = {
+                    'weeks': [int(week) for week in tool_weeks],
+                    'weekly_mean': [round(mean, 2) for mean in weekly_mean.tolist()],
+                    'slope_per_week': round(float(slopes[g]), 3),
+                    'change_points': [int(tool_weeks[i]) for i in change_points(weekly_mean)]
                 }
-        return summary
+        return summaries
 
-    async def _compare_arms(self, arms: List[StudyArm], participants: List[Participant]) -> Dict[str, Any]:
-        """그룹 간 비교"""
+    async def _compare_arms(self, study_id: str, arms: List[StudyArm]) -> Dict[str, Any]:
+        """그룹 간 비교 (참여자별 기준선 / 종료 첫 기록을 열 단위로 찾아 그룹별 평균 변화)"""
         arm1_id = arms[0].arm_id
         arm2_id = arms[1].arm_id
         
-        arm1_participants = [p for p in participants if p.arm_id == arm1_id]
-        arm2_participants = [p for p in participants if p.arm_id == arm2_id]
-        
         # 간단한 비교 (실제로는 통계 테스트 필요)
         comparison = {
             'arms_compared': [arms[0].name, arms[1].name],
-            'n': [len(arm1_participants), len(arm2_participants)],
+            'n': [self.participant_index.count(study_id, arm1_id), self.participant_index.count(study_id, arm2_id)],
             'outcome_differences': {}
         }
         
+        table = self.assessment_tables.get(study_id)
+        if table is None:
+            return comparison
+        participant_arms = table.participant_arms[:len(table.participant_ids)]
+        arm1_mask = participant_arms == table.arm_vocab.get(arm1_id, -1)
+        arm2_mask = participant_arms == table.arm_vocab.get(arm2_id, -1)
+        
         # 각 도구별 비교
         for tool in ['PHQ-9', 'GAD-7']:
-            arm1_changes = []
-            arm2_changes = []
-            
-            for p in arm1_participants:
-                baseline = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] == 'baseline'), None)
-                final = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] in ['final', 'week12']), None)
-                if baseline is not None and final is not None:
-                    arm1_changes.append(final - baseline)
-                    
-            for p in arm2_participants:
-                baseline = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] == 'baseline'), None)
-                final = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] in ['final', 'week12']), None)
-                if baseline is not None and final is not None:
-                    arm2_changes.append(final - baseline)
-                    
-            if arm1_changes and arm2_changes:
+            changes = table.first_scores(tool, self._COMPARISON_FINAL_TIMEPOINTS) - table.first_scores(tool, ['baseline'])
+            valid = ~np.isnan(changes)
+            arm1_changes = changes[valid & arm1_mask]
+            arm2_changes = changes[valid & arm2_mask]
+            if len(arm1_changes) and len(arm2_changes):
                 comparison['outcome_differences'][tool] = {
                     f'{arms[0].name}_mean_change': round(np.mean(arm1_changes), 2),
                     f'{arms[1].name}_mean_change': round(np.mean(arm2_changes), 2),
@@ -853,6 +1461,135 @@ class ResearchPlatformService:
                 }
         return comparison
 
+    async def analyze_study(
+        self,
+        study_id: str,
+        tools: Optional[List[str]] = None,
+        bootstrap: int = 0,
+        permutations: int = 0,
+        confidence: float = 0.95,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        연구 결과 통계 분석 (모든 도구 × 그룹 쌍을 한 번에 계산)
+        - 참여자별 기준선 / 종료(final, week12) 첫 기록, 둘 다 있는 참여자만 포함
+        - 변화 점수 Welch t 검정, Hedges g, 기준선 공변량 ANCOVA, 신뢰 가능 변화 지수 (Jacobson & Truax)
+        - bootstrap / permutations > 0 이면 재표본 평균 차 신뢰구간 / 순열 검정 p 값 추가
+        - 그룹 쌍 차이는 study.arms 순서상 앞 그룹 - 뒤 그룹
+        """
+        study = self.studies.get(study_id)
+        if not study:
+            raise ValueError(f"Study not found: {study_id}")
+        analysis = {
+            'arms': [arm.arm_id for arm in study.arms],
+            'confidence': confidence,
+            'tools': {}
+        }
+        table = self.assessment_tables.get(study_id)
+        if table is None or not study.arms:
+            return analysis
+        tools = [tool for tool in (tools or list(table.tool_vocab)) if tool in table.tool_vocab]
+        if not tools:
+            return analysis
+        
+        # 테이블 그룹 코드 → study.arms 순서 (연구 그룹이 아니면 -1)
+        arm_order = np.full(len(table.arm_vocab), -1, dtype=np.int64)
+        for i, arm in enumerate(study.arms):
+            if arm.arm_id in table.arm_vocab:
+                arm_order[table.arm_vocab[arm.arm_id]] = i
+        participant_arms = arm_order[table.participant_arms[:len(table.participant_ids)]]
+        columns = {'tool': [], 'arm': [], 'baseline': [], 'final': []}
+        for t, tool in enumerate(tools):
+            baseline = table.first_scores(tool, ['baseline'])
+            final = table.first_scores(tool, self._COMPARISON_FINAL_TIMEPOINTS)
+            valid = ~np.isnan(baseline) & ~np.isnan(final) & (participant_arms >= 0)
+            columns['tool'].append(np.full(int(valid.sum()), t))
+            columns['arm'].append(participant_arms[valid])
+            columns['baseline'].append(baseline[valid])
+            columns['final'].append(final[valid])
+        tool_info = [self.assessment.ASSESSMENT_TOOLS.get(tool, {}) for tool in tools]
+        result = analyze_outcomes(
+            *(np.concatenate(columns[name]) for name in ('tool', 'arm', 'baseline', 'final')),
+            n_tools=len(tools),
+            n_arms=len(study.arms),
+            reliability=[info.get('reliability', np.nan) for info in tool_info],
+            lower_is_better=[not info.get('higher_is_better', False) for info in tool_info],
+            confidence=confidence,
+            bootstrap=bootstrap,
+            permutations=permutations,
+            seed=seed
+        )
+        
+        for t, tool in enumerate(tools):
+            arms = {}
+            for a, arm in enumerate(study.arms):
+                arms[arm.arm_id] = {
+                    'name': arm.name,
+                    'n': int(result.n[t, a]),
+                    'baseline_mean': _stat(result.baseline_mean[t, a]),
+                    'baseline_sd': _stat(result.baseline_sd[t, a]),
+                    'final_mean': _stat(result.final_mean[t, a]),
+                    'final_sd': _stat(result.final_sd[t, a]),
+                    'mean_change': _stat(result.change_mean[t, a]),
+                    'change_sd': _stat(result.change_sd[t, a]),
+                    'reliably_improved': _count(result.reliably_improved[t, a]),
+                    'reliably_deteriorated': _count(result.reliably_deteriorated[t, a])
+                }
+            comparisons = []
+            for p, (a, b) in enumerate(result.pairs):
+                welch = {k: v[t, p] for k, v in result.welch.items()}
+                effect = {k: v[t, p] for k, v in result.effect_size.items()}
+                ancova = {k: v[t, p] for k, v in result.ancova.items()}
+                comparison = {
+                    'arms': [study.arms[a].arm_id, study.arms[b].arm_id],
+                    'mean_change_difference': _stat(welch['difference']),
+                    'welch_t': {
+                        't': _stat(welch['t']), 'df': _stat(welch['df']), 'p_value': _stat(welch['p'], None),
+                        'ci': [_stat(welch['ci_low']), _stat(welch['ci_high'])]
+                    },
+                    'hedges_g': {
+                        'value': _stat(effect['g']), 'se': _stat(effect['se']),
+                        'ci': [_stat(effect['ci_low']), _stat(effect['ci_high'])]
+                    },
+                    'ancova': {
+                        'adjusted_difference': _stat(ancova['adjusted_difference']), 'se': _stat(ancova['se']),
+                        't': _stat(ancova['t']), 'df': _stat(ancova['df']), 'p_value': _stat(ancova['p'], None),
+                        'ci': [_stat(ancova['ci_low']), _stat(ancova['ci_high'])]
+                    }
+                }
+                if result.bootstrap is not None:
+                    comparison['bootstrap'] = {
+                        'resamples': result.bootstrap['resamples'],
+                        'se': _stat(result.bootstrap['se'][t, p]),
+                        'ci': [_stat(result.bootstrap['ci_low'][t, p]), _stat(result.bootstrap['ci_high'][t, p])]
+                    }
+                if result.permutation is not None:
+                    comparison['permutation'] = {
+                        'permutations': result.permutation['permutations'],
+                        'p_value': _stat(result.permutation['p'][t, p], None)
+                    }
+                comparisons.append(comparison)
+            analysis['tools'][tool] = {
+                'arms': arms,
+                'reliable_change_threshold': _stat(result.rci_threshold[t]),
+                'ancova': {
+                    'slope': _stat(result.ancova_f['slope'][t]),
+                    'f': _stat(result.ancova_f['f'][t]),
+                    'df': [_count(result.ancova_f['df_effect'][t]), _count(result.ancova_f['df_error'][t])],
+                    'p_value': _stat(result.ancova_f['p'][t], None)
+                },
+                'comparisons': comparisons
+            }
+        return analysis
+
+    # 내보내기 k-익명성 검사의 준식별자
+    _EXPORT_QUASI_IDENTIFIERS = ['age_group', 'gender', 'region_group']
+    _STREAM_MEDIA_TYPES = {
+        DataExportFormat.CSV: 'text/csv',
+        DataExportFormat.JSON: 'application/json',
+        DataExportFormat.NDJSON: 'application/x-ndjson'
+    }
+
     async def export_data(
         self,
         study_id: str,
@@ -860,46 +1597,27 @@ class ResearchPlatformService:
         include_demographics: bool = True,
         include_assessments: bool = True
     ) -> Dict[str, Any]:
-        """데이터 내보내기"""
+        """데이터 내보내기 (전체를 메모리에 만듦, 큰 연구는 stream_export 사용)"""
         study = self.studies.get(study_id)
         if not study:
             raise ValueError(f"Study not found: {study_id}")
             
         # 데이터 수집
-        data = []
-        study_participants = [
-            p for p in self.participants.values() if p.study_id == study_id
+        data = [
+            self._export_record(p, include_demographics, include_assessments)
+            for p in self.participant_index.study(study_id)
         ]
-        
-        for p in study_participants:
-            record = {
-                'participant_id': p.participant_id,
-                'arm': p.arm_id,
-                'status': p.status.value,
-                'enrollment_date': p.enrollment_date.isoformat()
-            }
-            
-            if include_demographics:
-                record.update(p.demographics)
-                
-            if include_assessments:
-                for assessment in p.assessments:
-                    key = f"{assessment['tool']}_{assessment['timepoint']}"
-                    record[key] = assessment['score']
             
-            data.append(record)
-            
-        # k-익명성 확인
-        quasi_identifiers = ['age_group', 'gender', 'region_group']
-        if not self.anonymization.check_k_anonymity(data, quasi_identifiers):
-            # 일반화 적용
-            data = self.anonymization.generalize_for_k_anonymity(data, quasi_identifiers)
+        # k-익명성 확인 + 미달 시 최소 일반화 (이미 만족하면 그대로)
+        data = self.anonymization.generalize_for_k_anonymity(data, self._EXPORT_QUASI_IDENTIFIERS)
             
         # 형식별 변환
         if format == DataExportFormat.CSV:
             output = self._to_csv(data)
         elif format == DataExportFormat.JSON:
             output = json.dumps(data, ensure_ascii=False, indent=2)
+        elif format == DataExportFormat.NDJSON:
+            output = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in data)
         else:
             output = data
             
@@ -912,16 +1630,301 @@ class ResearchPlatformService:
             'exported_at': datetime.now().isoformat()
         }
 
+    def stream_export(
+        self,
+        study_id: str,
+        format: DataExportFormat,
+        include_demographics: bool = True,
+        include_assessments: bool = True,
+        chunk_size: int = 1000,
+        compress: bool = False
+    ) -> Iterator[bytes]:
+        """
+        스트리밍 내보내기 (CSV / JSON 배열 / NDJSON, 레코드 chunk_size 개 단위 UTF-8 바이트 청크)
+        - 사전 검사: 열 목록 (기본 → 인구통계 → 도구_시점) 과 준식별자 동치류 개수만 모음 (레코드 보관 없음)
+        - k-익명성을 만족하지 않으면 export_data 와 같은 최소 일반화 단계를 레코드마다 적용
+        - compress=True 면 gzip 스트림 (청크마다 압축기에 넣고 마지막에 flush)
+        - 연구 / 형식 오류는 첫 청크 전에 ValueError (응답 시작 전 처리 가능)
+        """
+        study = self.studies.get(study_id)
+        if not study:
+            raise ValueError(f"Study not found: {study_id}")
+        if format not in self._STREAM_MEDIA_TYPES:
+            raise ValueError(f"Streaming export not supported for format: {format.value}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        
+        # 참여자 참조만 복사 (스트리밍 중 등록되어도 순회가 깨지지 않도록)
+        participants = self.participant_index.study(study_id)
+        quasi_identifiers = self._EXPORT_QUASI_IDENTIFIERS
+        demographic_columns: Dict[str, None] = {}
+        assessment_columns: Dict[Tuple[str, str], None] = {}
+        for p in participants:
+            if include_demographics:
+                demographic_columns.update(dict.fromkeys(p.demographics))
+            if include_assessments:
+                for assessment in p.assessments:
+                    assessment_columns[(assessment['tool'], assessment['timepoint'])] = None
+        no_demographics: Dict[str, Any] = {}
+        levels = self.anonymization.find_generalization(
+            (p.demographics if include_demographics else no_demographics for p in participants), quasi_identifiers
+        )
+        columns = ['participant_id', 'arm', 'status', 'enrollment_date'] if participants else []
+        columns += [key for key in demographic_columns if key not in columns]
+        columns += [f"{tool}_{timepoint}" for tool, timepoint in assessment_columns]
+        
+        chunks = self._export_chunks(
+            participants, format, list(dict.fromkeys(columns)), levels if any(levels.values()) else None,
+            include_demographics, include_assessments, chunk_size
+        )
+        return self._gzip_chunks(chunks) if compress else chunks
+
+    def export_media_type(self, format: DataExportFormat) -> str:
+        """스트리밍 내보내기 형식의 MIME 유형"""
+        return self._STREAM_MEDIA_TYPES[format]
+
+    def _export_record(self, participant: Participant, include_demographics: bool, include_assessments: bool) -> Dict[str, Any]:
+        """참여자 한 명의 내보내기 레코드 (같은 도구_시점은 마지막 기록)"""
+        record = {
+            'participant_id': participant.participant_id,
+            'arm': participant.arm_id,
+            'status': participant.status.value,
+            'enrollment_date': participant.enrollment_date.isoformat()
+        }
+        
+        if include_demographics:
+            record.update(participant.demographics)
+            
+        if include_assessments:
+            for assessment in participant.assessments:
+                key = f"{assessment['tool']}_{assessment['timepoint']}"
+                record[key] = assessment['score']
+        return record
+
+    def _export_chunks(
+        self,
+        participants: List[Participant],
+        format: DataExportFormat,
+        columns: List[str],
+        levels: Optional[Dict[str, int]],
+        include_demographics: bool,
+        include_assessments: bool,
+        chunk_size: int
+    ) -> Iterator[bytes]:
+        """레코드를 chunk_size 개씩 직렬화 (버퍼는 청크 하나 크기로 유지)"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore', lineterminator='\n')
+        if format == DataExportFormat.CSV:
+            if not columns:
+                return
+            writer.writeheader()
+        elif format == DataExportFormat.JSON:
+            buffer.write('[')
+        
+        for i, p in enumerate(participants):
+            record = self._export_record(p, include_demographics, include_assessments)
+            if levels:
+                record = self.anonymization.generalize_record(record, levels)
+            if format == DataExportFormat.CSV:
+                writer.writerow(record)
+            elif format == DataExportFormat.JSON:
+                buffer.write(('\n' if i == 0 else ',\n') + json.dumps(record, ensure_ascii=False))
+            else:
+                buffer.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if (i + 1) % chunk_size == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if format == DataExportFormat.JSON:
+            buffer.write('\n]' if participants else ']')
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def export_columns(
+        self,
+        study_id: str,
+        include_demographics: bool = True,
+        include_assessments: bool = True
+    ) -> List[ExportColumn]:
+        """
+        열 단위 내보내기 데이터 (export_data 레코드와 같은 내용, 행 = 연구 참여자 색인 순서)
+        - 그룹 / 상태 / 인구통계: 전체 공통 사전 + int32 코드 (문자열 범주)
+        - 도구_시점 점수: 평가 테이블에서 (참여자, 열) 마지막 기록을 한 번에 모음, 모두 정수면 int32
+        - k-익명성을 만족하지 않으면 준식별자 범주 사전을 일반화 (행 복사 없음)
+        """
+        study = self.studies.get(study_id)
+        if not study:
+            raise ValueError(f"Study not found: {study_id}")
+        participants = self.participant_index.study(study_id)
+        columns = [
+            ExportColumn('participant_id', 'string', [p.participant_id for p in participants]),
+            _category_column('arm', [p.arm_id for p in participants]),
+            _category_column('status', [p.status.value for p in participants]),
+            ExportColumn('enrollment_date', 'timestamp', np.fromiter(
+                ((p.enrollment_date - _EPOCH) // _MICROSECOND for p in participants), dtype=np.int64, count=len(participants)
+            ).view('datetime64[us]'))
+        ]
+        if include_demographics:
+            keys: Dict[str, None] = {}
+            for p in participants:
+                keys.update(dict.fromkeys(p.demographics))
+            names = {column.name for column in columns}
+            columns.extend(
+                _category_column(key, [p.demographics.get(key) for p in participants])
+                for key in keys if key not in names
+            )
+        if include_assessments:
+            columns.extend(self._score_columns(study_id, participants))
+        self._generalize_export_columns(columns, len(participants))
+        return columns
+
+    def _score_columns(self, study_id: str, participants: List[Participant]) -> List[ExportColumn]:
+        """도구_시점 점수 열 (열 순서: 내보내기 순서상 처음 기록된 위치)"""
+        table = self.assessment_tables.get(study_id)
+        if table is None or not table.size or not participants:
+            return []
+        n = len(participants)
+        position = np.full(len(table.participant_ids), -1, dtype=np.int64)
+        position[[table.participant_vocab[p.participant_id] for p in participants]] = np.arange(n)
+        rows = table.active_rows()
+        row_positions = position[table.participant_codes[rows]]
+        rows, row_positions = rows[row_positions >= 0], row_positions[row_positions >= 0]
+        n_timepoints = len(table.timepoint_vocab)
+        keys = table.tool_codes[rows].astype(np.int64) * n_timepoints + table.timepoint_codes[rows]
+        n_keys = len(table.tool_vocab) * n_timepoints
+        
+        first_seen = np.full(n_keys, np.iinfo(np.int64).max)
+        np.minimum.at(first_seen, keys, (row_positions << 32) | table.positions[rows])
+        present = np.flatnonzero(first_seen < np.iinfo(np.int64).max)
+        present = present[np.argsort(first_seen[present], kind='stable')]
+        column_of_key = np.full(n_keys, -1, dtype=np.int64)
+        column_of_key[present] = np.arange(len(present))
+        
+        # (열, 참여자) 칸마다 마지막 기록 (같은 도구_시점 재기록은 레코드와 같이 덮어씀)
+        cells = column_of_key[keys] * n + row_positions
+        last = len(rows) - 1 - np.unique(cells[::-1], return_index=True)[1]
+        matrix = np.full((len(present), n), np.nan)
+        matrix.flat[cells[last]] = table.scores[rows[last]]
+        
+        tools = list(table.tool_vocab)
+        timepoints = list(table.timepoint_vocab)
+        columns = []
+        for key, values in zip(present, matrix):
+            mask = np.isnan(values)
+            observed = values[~mask]
+            name = f"{tools[key // n_timepoints]}_{timepoints[key % n_timepoints]}"
+            if np.array_equal(observed, np.round(observed)) and np.all(np.abs(observed) < 2 ** 31):
+                columns.append(ExportColumn(name, 'int', np.where(mask, 0, values).astype(np.int32), mask))
+            else:
+                columns.append(ExportColumn(name, 'float', values, mask))
+        return columns
+
+    def _generalize_export_columns(self, columns: List[ExportColumn], n: int):
+        """k-익명성 미달 시 준식별자 범주 사전을 최소 일반화 단계로 바꿈 (export_data 의 레코드 일반화와 같은 결과)"""
+        if not n:
+            return
+        quasi_identifiers = self._EXPORT_QUASI_IDENTIFIERS
+        by_name = {column.name: column for column in columns}
+        # 없는 준식별자 열은 값 없음(None) 하나짜리 사전
+        vocabularies, code_columns = [], []
+        for qi in quasi_identifiers:
+            column = by_name.get(qi)
+            if column is None:
+                vocabularies.append([None])
+                code_columns.append(np.zeros(n, dtype=np.int64))
+            else:
+                vocabularies.append([None] + column.dictionary)
+                code_columns.append(column.values.astype(np.int64) + 1)
+        combos, counts = _distinct_rows(np.column_stack(code_columns), [len(v) for v in vocabularies])
+        levels = self.anonymization.minimal_generalization(vocabularies, combos, counts, quasi_identifiers)
+        
+        for qi, vocab, codes in zip(quasi_identifiers, vocabularies, code_columns):
+            if not levels[qi]:
+                continue
+            dictionary: Dict[str, int] = {}
+            remap = np.array([
+                -1 if value is None else dictionary.setdefault(value, len(dictionary))
+                for value in (self.anonymization.generalize_value(qi, value, levels[qi]) for value in vocab)
+            ], dtype=np.int32)
+            values = remap[codes]
+            column = by_name.get(qi)
+            if column is None:
+                # 레코드 일반화가 없는 키를 채우는 경우 (예: region_group)
+                if not dictionary:
+                    continue
+                column = ExportColumn(qi, 'category', values, values < 0, list(dictionary))
+                columns.append(column)
+            column.values, column.mask, column.dictionary = values, values < 0, list(dictionary)
+
+    def write_columnar_export(
+        self,
+        study_id: str,
+        destination: Any,
+        format: DataExportFormat = DataExportFormat.PARQUET,
+        include_demographics: bool = True,
+        include_assessments: bool = True,
+        row_group_size: int = 65536,
+        compression: Optional[str] = 'zstd'
+    ) -> Dict[str, Any]:
+        """
+        Parquet / Arrow IPC 파일 내보내기 (pyarrow 필요)
+        - export_columns 의 열을 row_group_size 행 단위 레코드 배치로 기록 (Parquet 행 그룹 = 배치)
+        - 범주형은 dictionary<int32, string>, 점수는 int32 / float64 (결측 = null), 등록일은 timestamp[us]
+        - destination: 파일 경로 또는 쓰기 가능한 바이너리 파일 객체
+        - compression: Parquet 은 zstd / snappy / gzip / None, Arrow IPC 는 zstd / lz4 / None
+        """
+        if pa is None:
+            raise ImportError("Parquet / Arrow 내보내기에는 pyarrow 패키지가 필요합니다 (pip install pyarrow)")
+        if format not in (DataExportFormat.PARQUET, DataExportFormat.ARROW):
+            raise ValueError(f"Columnar export not supported for format: {format.value}")
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be positive")
+        columns = self.export_columns(study_id, include_demographics, include_assessments)
+        schema = pa.schema([pa.field(column.name, _arrow_type(column.kind)) for column in columns])
+        if format == DataExportFormat.PARQUET:
+            writer = pq.ParquetWriter(destination, schema, compression=compression or 'none')
+            write = lambda batch: writer.write_table(pa.Table.from_batches([batch], schema=schema))
+        else:
+            writer = pa.ipc.new_file(destination, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+            write = writer.write_batch
+        
+        records = len(columns[0]) if columns else 0
+        row_groups = 0
+        try:
+            for start in range(0, records, row_group_size):
+                stop = min(start + row_group_size, records)
+                write(pa.record_batch([_arrow_array(column, start, stop) for column in columns], schema=schema))
+                row_groups += 1
+        finally:
+            writer.close()
+        return {
+            'study_id': study_id,
+            'format': format.value,
+            'records': records,
+            'variables': [column.name for column in columns],
+            'row_groups': row_groups,
+            'exported_at': datetime.now().isoformat()
+        }
+
     def _to_csv(self, data: List[Dict[str, Any]]) -> str:
-        """CSV 변환"""
+        """CSV 변환 (csv 모듈 인용 처리, 열은 첫 레코드 기준)"""
         if not data:
             return ""
-        headers = list(data[0].keys())
-        lines = [','.join(headers)]
-        for record in data:
-            values = [str(record.get(h, '')) for h in headers]
-            lines.append(','.join(values))
-        return "\n".join(lines)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(data[0].keys()), restval='', extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(data)
+        return buffer.getvalue().rstrip('\n')
 
     def _generate_id(self, length: int = 8) -> str:
         """랜덤 ID 생성"""
@@ -0,0 +1,397 @@
+"""
+연구 결과 통계 분석
+Phase 3: 임상 연구 결과 분석 (벡터화)
+저장 경로: /AI_Drive/counseling_ai/services/research_statistics.py
+
+- 입력: 참여자 × 도구 행 (도구 코드, 그룹 코드, 기준선 점수, 종료 점수)
+- 도구 × 그룹 적률을 bincount 로 한 번에 구하고 모든 도구 / 그룹 쌍의 검정을 배열 연산으로 계산
+  (변화 점수 Welch t 검정, 기준선 공변량 ANCOVA, Hedges g + 신뢰구간, 신뢰 가능 변화 지수)
+- 부트스트랩 / 순열 검정은 층을 (고유값, 개수) 로 압축하고 재표본 개수 벡터를 (재표본, 고유값) 행렬로 한 번에 생성
+- scipy 가 있으면 분포 꼬리확률에 scipy.special.betainc 사용, 없으면 연분수 계산
+"""
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy import special as scipy_special
+except ImportError:
+    scipy_special = None
+
+# 재표본 배치 하나의 최대 원소 수 (float64 기준 약 32MB)
+_BATCH_ELEMENTS = 1 << 22
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+
+def _betacf(a: np.ndarray, b: np.ndarray, x: np.ndarray, iterations: int = 300, eps: float = 1e-15) -> np.ndarray:
+    """불완전 베타 함수 연분수 (수정 Lentz, 원소별 수렴 시 고정)"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = np.where(np.abs(d) < tiny, tiny, d)
+    d = 1.0 / d
+    h = d.copy()
+    done = np.zeros(x.shape, dtype=bool)
+    for m in range(1, iterations + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = np.where(np.abs(d) < tiny, tiny, d)
+        c = 1.0 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        d = 1.0 / d
+        h = np.where(done, h, h * d * c)
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = np.where(np.abs(d) < tiny, tiny, d)
+        c = 1.0 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        d = 1.0 / d
+        delta = d * c
+        h = np.where(done, h, h * delta)
+        done |= np.abs(delta - 1.0) < eps
+        if done.all():
+            break
+    return h
+
+def betainc(a, b, x) -> np.ndarray:
+    """정규화 불완전 베타 함수 I_x(a, b)"""
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (a, b, x)))
+    if scipy_special is not None:
+        return scipy_special.betainc(a, b, x)
+    result = np.full(x.shape, np.nan)
+    valid = (a > 0) & (b > 0) & (x >= 0) & (x <= 1)
+    result[valid & (x == 0)] = 0.0
+    result[valid & (x == 1)] = 1.0
+    inner = valid & (x > 0) & (x < 1)
+    if inner.any():
+        a_, b_, x_ = a[inner], b[inner], x[inner]
+        # 수렴이 빠른 쪽으로 대칭 변환
+        swap = x_ > (a_ + 1.0) / (a_ + b_ + 2.0)
+        a2, b2, x2 = np.where(swap, b_, a_), np.where(swap, a_, b_), np.where(swap, 1.0 - x_, x_)
+        log_front = _lgamma(a2 + b2) - _lgamma(a2) - _lgamma(b2) + a2 * np.log(x2) + b2 * np.log1p(-x2)
+        value = np.exp(log_front) * _betacf(a2, b2, x2) / a2
+        result[inner] = np.where(swap, 1.0 - value, value)
+    return result
+
+def t_two_sided_p(t, df) -> np.ndarray:
+    """t 분포 양측 p 값"""
+    t = np.asarray(t, dtype=np.float64)
+    df = np.asarray(df, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return betainc(df / 2.0, 0.5, df / (df + t * t))
+
+def f_upper_p(f, df1, df2) -> np.ndarray:
+    """F 분포 위쪽 꼬리 p 값"""
+    f = np.asarray(f, dtype=np.float64)
+    df1 = np.asarray(df1, dtype=np.float64)
+    df2 = np.asarray(df2, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return betainc(df2 / 2.0, df1 / 2.0, df2 / (df2 + df1 * f))
+
+def _t_density(t, df) -> np.ndarray:
+    log_norm = _lgamma((df + 1.0) / 2.0) - _lgamma(df / 2.0) - 0.5 * np.log(df * np.pi)
+    return np.exp(log_norm - (df + 1.0) / 2.0 * np.log1p(t * t / df))
+
+def t_critical(df, confidence: float = 0.95, iterations: int = 50, tol: float = 1e-12) -> np.ndarray:
+    """
+    양측 신뢰구간 t 임계값
+    - Cornish-Fisher 전개 초기값 + Newton (p 값 구간을 벗어나는 단계는 이분으로 대체)
+    - 자유도가 작지 않으면 2~3 회에 수렴
+    """
+    df = np.asarray(df, dtype=np.float64)
+    alpha = 1.0 - confidence
+    valid = np.isfinite(df) & (df > 0)
+    nu = np.where(valid, df, 1.0)
+    z = z_critical(confidence)
+    t = (z + (z ** 3 + z) / (4 * nu) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * nu ** 2)
+         + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * nu ** 3))
+    low = np.zeros(nu.shape)
+    high = np.full(nu.shape, np.inf)
+    for _ in range(iterations):
+        error = t_two_sided_p(t, nu) - alpha
+        converged = np.abs(error) <= tol * alpha
+        if converged.all():
+            break
+        # p 값은 t 에 대해 감소: error > 0 이면 t 가 작음
+        low = np.where(error > 0, t, low)
+        high = np.where(error > 0, high, t)
+        step = t + error / (2.0 * _t_density(t, nu))
+        fallback = np.where(np.isfinite(high), (low + high) / 2.0, 2.0 * t)
+        step = np.where((step > low) & (step < high), step, fallback)
+        t = np.where(converged, t, step)
+    return np.where(valid, t, np.nan)
+
+def z_critical(confidence: float = 0.95) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+def group_moments(keys: np.ndarray, values: np.ndarray, n_keys: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """그룹별 개수 / 평균 / 표본분산(ddof=1), 편차 제곱합은 2-pass"""
+    count = np.bincount(keys, minlength=n_keys).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(keys, values, n_keys) / count
+        var = np.bincount(keys, (values - mean[keys]) ** 2, n_keys) / (count - 1)
+    return count, mean, var
+
+def welch_t_test(n1, m1, v1, n2, m2, v2, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """Welch t 검정 (평균 차 m1 - m2, Welch-Satterthwaite 자유도)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s1, s2 = v1 / n1, v2 / n2
+        se = np.sqrt(s1 + s2)
+        diff = m1 - m2
+        t = diff / se
+        df = (s1 + s2) ** 2 / (s1 ** 2 / (n1 - 1) + s2 ** 2 / (n2 - 1))
+    margin = t_critical(df, confidence) * se
+    return {'difference': diff, 'se': se, 't': t, 'df': df, 'p': t_two_sided_p(t, df),
+            'ci_low': diff - margin, 'ci_high': diff + margin}
+
+def hedges_g(n1, m1, v1, n2, m2, v2, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """Hedges g (합동 표준편차, 소표본 보정) + 정규 근사 신뢰구간"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pooled = np.sqrt(((n1 - 1) * v1 + (n2 - 1) * v2) / (n1 + n2 - 2))
+        g = (m1 - m2) / pooled * (1.0 - 3.0 / (4.0 * (n1 + n2) - 9.0))
+        se = np.sqrt((n1 + n2) / (n1 * n2) + g * g / (2.0 * (n1 + n2)))
+    margin = z_critical(confidence) * se
+    return {'g': g, 'se': se, 'ci_low': g - margin, 'ci_high': g + margin}
+
+@dataclass
+class OutcomeAnalysis:
+    """
+    도구 × 그룹 분석 결과 (배열)
+    - 그룹 단위: (n_tools, n_arms)
+    - 그룹 쌍 단위: (n_tools, len(pairs)), 차이는 pairs[i][0] - pairs[i][1]
+    """
+    pairs: List[Tuple[int, int]]
+    confidence: float
+    # 그룹 기술통계
+    n: np.ndarray
+    baseline_mean: np.ndarray
+    baseline_sd: np.ndarray
+    final_mean: np.ndarray
+    final_sd: np.ndarray
+    change_mean: np.ndarray
+    change_sd: np.ndarray
+    reliably_improved: np.ndarray
+    reliably_deteriorated: np.ndarray
+    # 신뢰 가능 변화 기준 (도구별 |변화| 임계값)
+    rci_threshold: np.ndarray
+    # 그룹 쌍 비교
+    welch: Dict[str, np.ndarray]
+    effect_size: Dict[str, np.ndarray]
+    ancova: Dict[str, np.ndarray]
+    # 도구별 ANCOVA 그룹 효과 (F 검정)
+    ancova_f: Dict[str, np.ndarray]
+    bootstrap: Optional[Dict[str, np.ndarray]] = None
+    permutation: Optional[Dict[str, np.ndarray]] = None
+    extra: Dict[str, np.ndarray] = field(default_factory=dict)
+
+def _ancova(
+    tool_ids: np.ndarray, keys: np.ndarray, baseline: np.ndarray, final: np.ndarray,
+    n_tools: int, n_arms: int, pairs: List[Tuple[int, int]], confidence: float
+):
+    """
+    기준선 공변량 ANCOVA (공통 기울기)
+    - 그룹 내 제곱합/곱합을 도구별로 합쳐 기울기와 잔차 제곱합 계산
+    - 쌍별 보정 평균 차 / 표준오차 / t, 도구별 그룹 효과 F
+    """
+    n_keys = n_tools * n_arms
+    count, mean_x, _ = group_moments(keys, baseline, n_keys)
+    _, mean_y, _ = group_moments(keys, final, n_keys)
+    dx = baseline - mean_x[keys]
+    dy = final - mean_y[keys]
+    sxx = np.bincount(keys, dx * dx, n_keys).reshape(n_tools, n_arms)
+    sxy = np.bincount(keys, dx * dy, n_keys).reshape(n_tools, n_arms)
+    syy = np.bincount(keys, dy * dy, n_keys).reshape(n_tools, n_arms)
+    count = count.reshape(n_tools, n_arms)
+    mean_x = mean_x.reshape(n_tools, n_arms)
+    mean_y = mean_y.reshape(n_tools, n_arms)
+    present = count > 0
+    wxx, wxy, wyy = sxx.sum(axis=1), sxy.sum(axis=1), syy.sum(axis=1)
+    total_n = count.sum(axis=1)
+    groups = present.sum(axis=1)
+
+    # 그룹을 무시한 전체 회귀 (축소 모형)
+    _, tool_mean_x, _ = group_moments(tool_ids, baseline, n_tools)
+    _, tool_mean_y, _ = group_moments(tool_ids, final, n_tools)
+    tx = baseline - tool_mean_x[tool_ids]
+    ty = final - tool_mean_y[tool_ids]
+    txx = np.bincount(tool_ids, tx * tx, n_tools)
+    txy = np.bincount(tool_ids, tx * ty, n_tools)
+    tyy = np.bincount(tool_ids, ty * ty, n_tools)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = wxy / wxx
+        sse = wyy - wxy * slope
+        df_error = total_n - groups - 1
+        mse = sse / df_error
+        sse_reduced = tyy - txy * txy / txx
+        df_effect = groups - 1
+        f = ((sse_reduced - sse) / df_effect) / mse
+        first = np.array([a for a, _ in pairs], dtype=np.intp)
+        second = np.array([b for _, b in pairs], dtype=np.intp)
+        gap = mean_x[:, first] - mean_x[:, second]
+        difference = (mean_y[:, first] - mean_y[:, second]) - slope[:, None] * gap
+        se = np.sqrt(mse[:, None] * (1.0 / count[:, first] + 1.0 / count[:, second] + gap * gap / wxx[:, None]))
+        t = difference / se
+    df_pairs = np.broadcast_to(df_error[:, None], difference.shape)
+    margin = t_critical(df_pairs, confidence) * se
+    pairwise = {
+        'adjusted_difference': difference, 'se': se, 't': t, 'df': df_pairs,
+        'p': t_two_sided_p(t, df_pairs), 'ci_low': difference - margin, 'ci_high': difference + margin,
+        'adjusted_mean_first': mean_y[:, first] - slope[:, None] * (mean_x[:, first] - tool_mean_x[:, None]),
+        'adjusted_mean_second': mean_y[:, second] - slope[:, None] * (mean_x[:, second] - tool_mean_x[:, None]),
+    }
+    overall = {'slope': slope, 'f': f, 'df_effect': df_effect, 'df_error': df_error,
+               'p': f_upper_p(f, df_effect, df_error)}
+    return pairwise, overall
+
+def bootstrap_mean_differences(
+    keys: np.ndarray, values: np.ndarray, n_tools: int, n_arms: int, pairs: List[Tuple[int, int]],
+    n_resamples: int = 10000, confidence: float = 0.95, seed: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    그룹 평균 차 부트스트랩 (도구 × 그룹 층화 재표본, 모든 도구 / 쌍)
+    - 복원 추출 평균은 고유값별 뽑힌 개수로 정해지므로 층을 (고유값, 개수) 로 압축하고
+      개수 벡터를 다항분포에서 (재표본, 고유값) 행렬로 뽑음 → 점수처럼 고유값이 적으면 행 수와 무관
+    - 반환: 쌍별 백분위 신뢰구간, 부트스트랩 표준오차
+    """
+    rng = np.random.default_rng(seed)
+    order = np.argsort(keys, kind='stable')
+    present, starts = np.unique(keys[order], return_index=True)
+    means = np.full((n_resamples, n_tools * n_arms), np.nan)
+    for key, segment in zip(present, np.split(values[order], starts[1:])):
+        distinct, counts = np.unique(segment, return_counts=True)
+        probabilities = counts / len(segment)
+        step = batch_size or max(1, _BATCH_ELEMENTS // len(distinct))
+        for done in range(0, n_resamples, step):
+            drawn = rng.multinomial(len(segment), probabilities, size=min(step, n_resamples - done))
+            means[done:done + len(drawn), key] = drawn @ distinct / len(segment)
+    means = means.reshape(n_resamples, n_tools, n_arms)
+    first = [a for a, _ in pairs]
+    second = [b for _, b in pairs]
+    differences = means[:, :, first] - means[:, :, second]
+    alpha = 1.0 - confidence
+    with np.errstate(invalid='ignore'):
+        low, high = np.quantile(differences, [alpha / 2.0, 1.0 - alpha / 2.0], axis=0)
+        se = differences.std(axis=0, ddof=1)
+    return {'ci_low': low, 'ci_high': high, 'se': se, 'resamples': n_resamples}
+
+def permutation_test(
+    keys: np.ndarray, values: np.ndarray, n_tools: int, n_arms: int, pairs: List[Tuple[int, int]],
+    n_permutations: int = 10000, seed: Optional[int] = None, batch_size: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    그룹 평균 차 순열 검정 (도구 안에서 두 그룹 표시를 섞음, 모든 도구 / 쌍)
+    - 표시 섞기 = 합친 값에서 첫 그룹 크기만큼 비복원 추출이므로 합친 값을 (고유값, 개수) 로 압축하고
+      첫 그룹 개수 벡터를 다변량 초기하분포에서 (순열, 고유값) 행렬로 뽑음
+    - p = (1 + |차이| 가 관측값 이상인 순열 수) / (1 + 순열 수)
+    """
+    rng = np.random.default_rng(seed)
+    tools, arms = np.divmod(keys, n_arms)
+    difference = np.full((n_tools, len(pairs)), np.nan)
+    p_values = np.full((n_tools, len(pairs)), np.nan)
+    for t in range(n_tools):
+        in_tool = tools == t
+        tool_arms, tool_values = arms[in_tool], values[in_tool]
+        for p, (a, b) in enumerate(pairs):
+            first, second = tool_values[tool_arms == a], tool_values[tool_arms == b]
+            if not len(first) or not len(second):
+                continue
+            distinct, counts = np.unique(np.concatenate([first, second]), return_counts=True)
+            total = counts @ distinct
+            observed = first.mean() - second.mean()
+            # 부동소수 합산 순서 차이로 관측값과 같은 순열을 놓치지 않도록 여유
+            threshold = abs(observed) * (1 - 1e-12) - 1e-12
+            exceed = 0
+            step = batch_size or max(1, _BATCH_ELEMENTS // len(distinct))
+            for done in range(0, n_permutations, step):
+                drawn = rng.multivariate_hypergeometric(counts, len(first), size=min(step, n_permutations - done))
+                first_sum = drawn @ distinct
+                permuted = first_sum / len(first) - (total - first_sum) / len(second)
+                exceed += int(np.count_nonzero(np.abs(permuted) >= threshold))
+            difference[t, p] = observed
+            p_values[t, p] = (1.0 + exceed) / (1.0 + n_permutations)
+    return {'difference': difference, 'p': p_values, 'permutations': n_permutations}
+
+def analyze_outcomes(
+    tool_ids: np.ndarray,
+    arm_ids: np.ndarray,
+    baseline: np.ndarray,
+    final: np.ndarray,
+    n_tools: int,
+    n_arms: int,
+    pairs: Optional[Sequence[Tuple[int, int]]] = None,
+    reliability: Optional[np.ndarray] = None,
+    lower_is_better: Optional[np.ndarray] = None,
+    confidence: float = 0.95,
+    bootstrap: int = 0,
+    permutations: int = 0,
+    seed: Optional[int] = None
+) -> OutcomeAnalysis:
+    """
+    모든 도구 / 그룹 결과 분석
+    - 변화 점수 = 종료 - 기준선, 그룹 쌍 기본값은 (i, j) i < j 전체
+    - 신뢰 가능 변화: |변화| > z * SD_기준선 * sqrt(2 (1 - 신뢰도)) (Jacobson & Truax)
+      reliability 가 없는 도구는 NaN, 방향은 lower_is_better (기본: 점수 감소 = 호전)
+    """
+    tool_ids = np.asarray(tool_ids, dtype=np.int64)
+    arm_ids = np.asarray(arm_ids, dtype=np.int64)
+    baseline = np.asarray(baseline, dtype=np.float64)
+    final = np.asarray(final, dtype=np.float64)
+    pairs = [tuple(p) for p in pairs] if pairs is not None else [
+        (i, j) for i in range(n_arms) for j in range(i + 1, n_arms)
+    ]
+    keys = tool_ids * n_arms + arm_ids
+    n_keys = n_tools * n_arms
+    change = final - baseline
+
+    n, baseline_mean, baseline_var = group_moments(keys, baseline, n_keys)
+    _, final_mean, final_var = group_moments(keys, final, n_keys)
+    _, change_mean, change_var = group_moments(keys, change, n_keys)
+    shape = (n_tools, n_arms)
+    n, change_mean, change_var = n.reshape(shape), change_mean.reshape(shape), change_var.reshape(shape)
+
+    first = [a for a, _ in pairs]
+    second = [b for _, b in pairs]
+    args = (n[:, first], change_mean[:, first], change_var[:, first],
+            n[:, second], change_mean[:, second], change_var[:, second])
+    welch = welch_t_test(*args, confidence=confidence)
+    effect_size = hedges_g(*args, confidence=confidence)
+    ancova, ancova_f = _ancova(tool_ids, keys, baseline, final, n_tools, n_arms, pairs, confidence)
+
+    # 신뢰 가능 변화 지수 (도구 전체 기준선 표준편차)
+    reliability = np.full(n_tools, np.nan) if reliability is None else np.asarray(reliability, dtype=np.float64)
+    lower_is_better = np.ones(n_tools, dtype=bool) if lower_is_better is None else np.asarray(lower_is_better, dtype=bool)
+    _, _, tool_baseline_var = group_moments(tool_ids, baseline, n_tools)
+    with np.errstate(invalid='ignore'):
+        threshold = z_critical(0.95) * np.sqrt(tool_baseline_var) * np.sqrt(2.0 * (1.0 - reliability))
+    signed = np.where(lower_is_better[tool_ids], -change, change)
+    row_threshold = threshold[tool_ids]
+    improved = np.bincount(keys, signed > row_threshold, n_keys).reshape(shape).astype(np.float64)
+    deteriorated = np.bincount(keys, signed < -row_threshold, n_keys).reshape(shape).astype(np.float64)
+    unknown = np.isnan(threshold)
+    improved[unknown] = np.nan
+    deteriorated[unknown] = np.nan
+
+    analysis = OutcomeAnalysis(
+        pairs=pairs, confidence=confidence, n=n,
+        baseline_mean=baseline_mean.reshape(shape), baseline_sd=np.sqrt(baseline_var).reshape(shape),
+        final_mean=final_mean.reshape(shape), final_sd=np.sqrt(final_var).reshape(shape),
+        change_mean=change_mean, change_sd=np.sqrt(change_var),
+        reliably_improved=improved, reliably_deteriorated=deteriorated, rci_threshold=threshold,
+        welch=welch, effect_size=effect_size, ancova=ancova, ancova_f=ancova_f
+    )
+    if bootstrap:
+        analysis.bootstrap = bootstrap_mean_differences(
+            keys, change, n_tools, n_arms, pairs, bootstrap, confidence, seed
+        )
+    if permutations:
+        analysis.permutation = permutation_test(
+            keys, change, n_tools, n_arms, pairs, permutations, None if seed is None else seed + 1
+        )
+    return analysis
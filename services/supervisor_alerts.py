@@ -0,0 +1,385 @@
+"""
+슈퍼바이저 알림 파이프라인
+Phase 3: 알림 중복 제거 / 병합 / 요약(digest) 전송
+저장 경로: services/supervisor_alerts.py
+"""
+import json
+import logging
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from heapq import merge
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from models.supervisor.ai_supervisor import InterventionLevel, SupervisorFeedback
+
+logger = logging.getLogger(__name__)
+
+# 개입 수준 -> 알림 심각도
+ALERT_SEVERITY = {
+    InterventionLevel.SUGGESTION: "low",
+    InterventionLevel.CORRECTION: "medium",
+    InterventionLevel.ALERT: "high",
+    InterventionLevel.TAKEOVER: "critical",
+}
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+@dataclass
+class AlertRecord:
+    """알림 (같은 세션의 반복 알림은 하나로 병합)"""
+    alert_id: str
+    session_id: str
+    turn_id: str
+    severity: str
+    type: str
+    message: Optional[str]
+    timestamp: datetime
+    last_seen: datetime
+    occurrences: int = 1
+    escalated_from: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "alert_id": self.alert_id,
+            "session_id": self.session_id,
+            "turn_id": self.turn_id,
+            "severity": self.severity,
+            "type": self.type,
+            "message": self.message,
+            "timestamp": self.timestamp.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "occurrences": self.occurrences,
+            "escalated_from": self.escalated_from
+        }
+
+# =============================================================================
+# 알림 저장소 (심각도별 시간 정렬 인덱스)
+# =============================================================================
+class _SeverityIndex:
+    """단일 심각도 알림 목록 (시각 정렬, 앞부분은 오프셋으로 제거)"""
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.records: List[AlertRecord] = []
+        self.start = 0
+
+    def __len__(self) -> int:
+        return len(self.records) - self.start
+
+    def add(self, record: AlertRecord):
+        ts = record.timestamp.timestamp()
+        if not self.times or ts >= self.times[-1]:
+            self.times.append(ts)
+            self.records.append(record)
+        else:
+            # 드물게 늦게 도착한 알림만 정렬 삽입
+            i = bisect_left(self.times, ts, lo=self.start)
+            self.times.insert(i, ts)
+            self.records.insert(i, record)
+
+    def pop_oldest(self) -> AlertRecord:
+        record = self.records[self.start]
+        self.start += 1
+        if self.start > 1024 and self.start * 2 > len(self.records):
+            del self.times[:self.start]
+            del self.records[:self.start]
+            self.start = 0
+        return record
+
+    def since(self, ts: Optional[float]) -> List[AlertRecord]:
+        lo = self.start if ts is None else bisect_left(self.times, ts, lo=self.start)
+        return self.records[lo:]
+
+class AlertStore:
+    """
+    알림 저장소
+    - 심각도별 시각 정렬 목록 + 이진 탐색으로 since/severity 필터
+    - 전체 최대 개수 초과 시 가장 오래된 알림부터 제거
+    """
+
+    def __init__(self, max_alerts: int = 10000):
+        self.max_alerts = max_alerts
+        self.indexes: Dict[str, _SeverityIndex] = {severity: _SeverityIndex() for severity in SEVERITY_RANK}
+        self._order: Deque[str] = deque() # 삽입 순서 (제거 대상 심각도)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, record: AlertRecord):
+        self.indexes[record.severity].add(record)
+        self._order.append(record.severity)
+        while len(self._order) > self.max_alerts:
+            self.indexes[self._order.popleft()].pop_oldest()
+
+    def query(
+        self,
+        severity: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[AlertRecord]:
+        """심각도 / 최초 발생 시각 필터 (시간순)"""
+        ts = since.timestamp() if since is not None else None
+        if severity is not None:
+            if severity not in self.indexes:
+                return []
+            records = self.indexes[severity].since(ts)
+        else:
+            records = list(merge(
+                *(index.since(ts) for index in self.indexes.values()),
+                key=lambda record: record.timestamp
+            ))
+        if limit is not None:
+            records = records[-limit:]
+        return records
+
+    def counts(self) -> Dict[str, int]:
+        return {severity: len(index) for severity, index in self.indexes.items()}
+
+# =============================================================================
+# 알림 전송 대상 (sink)
+# =============================================================================
+class AlertSink(ABC):
+    """알림 전송 대상 인터페이스"""
+
+    @abstractmethod
+    def emit(self, alert: Dict[str, Any]):
+        """즉시 전송 (critical / 심각도 상승)"""
+
+    @abstractmethod
+    def emit_digest(self, digest: Dict[str, Any]):
+        """주기적 요약 전송"""
+
+class LogAlertSink(AlertSink):
+    """로그 출력 (기본값)"""
+
+    def emit(self, alert: Dict[str, Any]):
+        logger.warning(
+            f"Supervisor Alert - Session: {alert['session_id']}, "
+            f"Severity: {alert['severity']}, Type: {alert['type']}, "
+            f"Reason: {alert['message']}"
+        )
+
+    def emit_digest(self, digest: Dict[str, Any]):
+        logger.warning(
+            f"Supervisor Alert Digest - {len(digest['alerts'])} alerts, "
+            f"counts: {digest['counts']}, suppressed: {digest['suppressed']}"
+        )
+
+class FileAlertSink(AlertSink):
+    """로컬 NDJSON 파일 기록"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _write(self, kind: str, payload: Dict[str, Any]):
+        line = json.dumps({"kind": kind, **payload}, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def emit(self, alert: Dict[str, Any]):
+        self._write("alert", alert)
+
+    def emit_digest(self, digest: Dict[str, Any]):
+        self._write("digest", digest)
+
+class WebhookAlertSink(AlertSink):
+    """
+    웹훅 전송 대체 구현
+    transport(url, payload)가 주어지면 호출하고, 없으면 전송할 페이로드를 outbox에 보관
+    """
+
+    def __init__(
+        self,
+        url: str,
+        transport: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        max_outbox: int = 1000
+    ):
+        self.url = url
+        self.transport = transport
+        self.outbox: Deque[Dict[str, Any]] = deque(maxlen=max_outbox)
+        self.failures = 0
+
+    def _post(self, payload: Dict[str, Any]):
+        if self.transport is None:
+            self.outbox.append(payload)
+            return
+        try:
+            self.transport(self.url, payload)
+        except Exception:
+            self.failures += 1
+            logger.exception(f"Webhook alert delivery failed: {self.url}")
+
+    def emit(self, alert: Dict[str, Any]):
+        self._post({"kind": "alert", "alert": alert})
+
+    def emit_digest(self, digest: Dict[str, Any]):
+        self._post({"kind": "digest", "digest": digest})
+
+# =============================================================================
+# 알림 파이프라인
+# =============================================================================
+class AlertPipeline:
+    """
+    알림 파이프라인
+    Features:
+    - 세션별 중복 제거 창 (같은 세션의 반복 알림은 occurrences 로 병합)
+    - 창 안에서 심각도가 올라가면 새 알림으로 즉시 전송 (escalation)
+    - 그 외 알림은 제한된 버퍼에 모아 주기적 요약으로 전송
+    - 스레드 안전 (워커 풀 평가 스레드와 이벤트 루프에서 동시 호출)
+    """
+
+    def __init__(
+        self,
+        sink: Optional[AlertSink] = None,
+        dedup_window: timedelta = timedelta(minutes=10),
+        digest_interval: timedelta = timedelta(minutes=5),
+        immediate_severity: str = "critical",
+        max_buffer: int = 500,
+        max_alerts: int = 10000,
+        max_sessions: int = 10000
+    ):
+        self.sink = sink or LogAlertSink()
+        self.dedup_window = dedup_window
+        self.digest_interval = digest_interval
+        self.immediate_rank = SEVERITY_RANK[immediate_severity]
+        self.max_sessions = max_sessions
+
+        self.store = AlertStore(max_alerts)
+        self._open: "OrderedDict[str, AlertRecord]" = OrderedDict() # 세션별 진행 중 알림
+        self.max_buffer = max_buffer
+        self._buffer: List[AlertRecord] = []
+        self._last_flush = datetime.now()
+        self._suppressed_since_flush = 0
+        self._lock = threading.RLock()
+
+        self.metrics: Dict[str, int] = {
+            "received": 0,
+            "created": 0,
+            "coalesced": 0,
+            "escalated": 0,
+            "immediate": 0,
+            "digests": 0
+        }
+
+    def publish(self, feedback: SupervisorFeedback, now: Optional[datetime] = None) -> Optional[AlertRecord]:
+        """
+        슈퍼바이저 피드백을 알림으로 등록
+        Returns:
+            새로 만든 알림, 기존 알림에 병합되었으면 None
+        """
+        with self._lock:
+            severity = ALERT_SEVERITY.get(feedback.intervention_level)
+            if severity is None:
+                return None
+            now = now or datetime.now()
+            self.metrics["received"] += 1
+
+            current = self._open.get(feedback.session_id)
+            escalated_from = None
+            if current is not None and now - current.last_seen <= self.dedup_window:
+                if SEVERITY_RANK[severity] <= SEVERITY_RANK[current.severity]:
+                    current.occurrences += 1
+                    current.last_seen = now
+                    self.metrics["coalesced"] += 1
+                    self._suppressed_since_flush += 1
+                    self.maybe_flush(now)
+                    return None
+                escalated_from = current.severity
+                self.metrics["escalated"] += 1
+
+            record = AlertRecord(
+                alert_id=f"ALERT_{uuid.uuid4().hex[:8]}",
+                session_id=feedback.session_id,
+                turn_id=feedback.turn_id,
+                severity=severity,
+                type=feedback.intervention_level.value,
+                message=feedback.intervention_reason,
+                timestamp=now,
+                last_seen=now,
+                escalated_from=escalated_from
+            )
+            self.store.add(record)
+            self.metrics["created"] += 1
+            self._open[feedback.session_id] = record
+            self._open.move_to_end(feedback.session_id)
+            while len(self._open) > self.max_sessions:
+                self._open.popitem(last=False)
+
+            if escalated_from is not None or SEVERITY_RANK[severity] >= self.immediate_rank:
+                self.metrics["immediate"] += 1
+                self.sink.emit(record.to_dict())
+            else:
+                if len(self._buffer) >= self.max_buffer:
+                    # 버퍼가 가득 차면 주기를 기다리지 않고 요약 전송
+                    self.flush(now)
+                self._buffer.append(record)
+            self.maybe_flush(now)
+            return record
+
+    def maybe_flush(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """요약 주기가 지났으면 전송"""
+        with self._lock:
+            now = now or datetime.now()
+            if now - self._last_flush < self.digest_interval:
+                return None
+            return self.flush(now)
+
+    def flush(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """버퍼에 모인 알림을 요약으로 전송"""
+        with self._lock:
+            now = now or datetime.now()
+            self._last_flush = now
+            self._expire_sessions(now)
+            if not self._buffer and not self._suppressed_since_flush:
+                return None
+
+            alerts = [record.to_dict() for record in self._buffer]
+            counts = {severity: 0 for severity in SEVERITY_RANK}
+            for alert in alerts:
+                counts[alert["severity"]] += 1
+            digest = {
+                "digest_id": f"DIGEST_{uuid.uuid4().hex[:8]}",
+                "created_at": now.isoformat(),
+                "alerts": alerts,
+                "counts": counts,
+                "suppressed": self._suppressed_since_flush
+            }
+            self._buffer.clear()
+            self._suppressed_since_flush = 0
+            self.metrics["digests"] += 1
+            self.sink.emit_digest(digest)
+            return digest
+
+    def _expire_sessions(self, now: datetime):
+        """중복 제거 창이 지난 세션 상태 정리"""
+        expired = [
+            session_id for session_id, record in self._open.items()
+            if now - record.last_seen > self.dedup_window
+        ]
+        for session_id in expired:
+            del self._open[session_id]
+
+    def get_alerts(
+        self,
+        severity: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """알림 조회"""
+        with self._lock:
+            return [record.to_dict() for record in self.store.query(severity, since, limit)]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.metrics,
+                "stored": len(self.store),
+                "stored_by_severity": self.store.counts(),
+                "buffered": len(self._buffer),
+                "open_sessions": len(self._open)
+            }
@@ -0,0 +1,384 @@
+"""
+슈퍼바이저 비동기 평가 큐
+Phase 3: 요청 경로 밖에서 턴 품질 평가
+저장 경로: services/supervisor_queue.py
+"""
+import asyncio
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.supervisor.ai_supervisor import AISupervisor, InterventionLevel, SupervisorFeedback
+from services.supervisor_alerts import AlertPipeline
+
+logger = logging.getLogger(__name__)
+
+# 개입 수준 우선순위 (세션 요약 시 가장 높은 수준 선택)
+_LEVEL_ORDER = {level: i for i, level in enumerate(InterventionLevel)}
+
+# 평가 스레드 전용 이벤트 루프 (작업마다 루프를 만들지 않도록 스레드에 하나)
+_eval_thread = threading.local()
+
+def _open_eval_loop():
+    _eval_thread.loop = asyncio.new_event_loop()
+
+def _close_eval_loop():
+    _eval_thread.loop.close()
+
+@dataclass
+class SupervisorJob:
+    """슈퍼바이저 평가 작업 (완료된 상담 턴)"""
+    session_id: str
+    turn_id: str
+    user_message: str
+    ai_response: str
+    context: Dict[str, Any] = field(default_factory=dict)
+    language: str = "ko"
+    is_crisis: bool = False
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+class SupervisorWorkerPool:
+    """
+    슈퍼바이저 워커 풀
+    Features:
+    - 고정 크기 큐 (가득 차면 가장 오래된 작업 폐기)
+    - 세션/턴 단위 샘플링 (위기 턴은 별도 비율)
+    - 세션/턴별 SupervisorFeedback 저장
+    - 알림 파이프라인 연동 (중복 제거 / 요약 전송)
+    - 대기 지연(lag) / 처리 시간 지표
+    - 평가는 별도 평가 스레드에서 실행 (요청을 처리하는 이벤트 루프를 막지 않음)
+
+    evaluate_turn 은 await 지점이 없는 CPU 작업이라 루프에서 직접 실행하면
+    평가가 끝날 때까지 같은 루프의 요청이 모두 대기한다. 평가 스레드로 넘기면
+    루프가 평가 중간에도 요청을 스케줄할 수 있다. GIL 때문에 스레드를 늘려도 처리량은
+    늘지 않고 세션 내 턴 순서만 뒤섞이므로 평가 스레드는 하나 (FIFO, 제출 순서 유지).
+    프로세스 풀은 턴 점수 캐시 / 알림 파이프라인을 공유할 수 없어 사용하지 않는다.
+    """
+
+    def __init__(
+        self,
+        supervisor: Optional[AISupervisor] = None,
+        alert_pipeline: Optional[AlertPipeline] = None,
+        num_workers: int = 2,
+        max_queue_size: int = 1000,
+        sampling_rate: float = 1.0,
+        crisis_sampling_rate: float = 1.0,
+        max_sessions: int = 10000,
+        max_turns_per_session: int = 200,
+        metrics_window: int = 1000,
+        offload: bool = True,
+        batch_size: int = 32
+    ):
+        """
+        Args:
+            alert_pipeline: 알림 파이프라인 (슈퍼바이저에 이미 다른 파이프라인이 있으면 start 에서 ValueError)
+            offload: True면 평가 스레드에서 실행, False면 이벤트 루프에서 직접 실행
+            batch_size: 평가 스레드에 한 번에 넘기는 최대 작업 수
+        """
+        self.supervisor = supervisor
+        self.num_workers = num_workers
+        self.max_queue_size = max_queue_size
+        self.sampling_rate = sampling_rate
+        self.crisis_sampling_rate = crisis_sampling_rate
+        self.max_sessions = max_sessions
+        self.max_turns_per_session = max_turns_per_session
+        self.offload = offload
+        self.batch_size = batch_size
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._digest_task: Optional[asyncio.Task] = None
+        self._attached_pipeline = False
+
+        # 세션 -> 턴 -> 피드백 (오래된 세션부터 제거)
+        self.feedback: "OrderedDict[str, OrderedDict[str, SupervisorFeedback]]" = OrderedDict()
+        self.session_languages: Dict[str, str] = {}
+        self.alert_pipeline = alert_pipeline or AlertPipeline()
+        self._explicit_pipeline = alert_pipeline is not None
+
+        self.metrics: Dict[str, int] = {
+            "submitted": 0,
+            "sampled_out": 0,
+            "enqueued": 0,
+            "dropped": 0,
+            "processed": 0,
+            "failed": 0
+        }
+        self._lags: Deque[float] = deque(maxlen=metrics_window)
+        self._processing_times: Deque[float] = deque(maxlen=metrics_window)
+
+    # =========================================================================
+    # 워커 관리
+    # =========================================================================
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._workers)
+
+    def start(self):
+        """워커 시작 (실행 중인 이벤트 루프 필요)"""
+        if self.running:
+            return
+        if self.supervisor is None:
+            self.supervisor = AISupervisor()
+        # ALERT/TAKEOVER 는 evaluate_turn -> _send_alert 경로로 같은 파이프라인에 전달
+        if self.supervisor.alert_pipeline is None:
+            self.supervisor.alert_pipeline = self.alert_pipeline
+            self._attached_pipeline = True
+        elif self.supervisor.alert_pipeline is not self.alert_pipeline:
+            # 명시적으로 받은 파이프라인을 슈퍼바이저 파이프라인으로 몰래 바꾸지 않음
+            if self._explicit_pipeline:
+                raise ValueError("alert_pipeline differs from the supervisor's alert_pipeline")
+            self.alert_pipeline = self.supervisor.alert_pipeline
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self.offload and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="supervisor-eval", initializer=_open_eval_loop
+            )
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker(i)) for i in range(self.num_workers)
+        ]
+        self._digest_task = loop.create_task(self._digest_loop())
+
+    async def stop(self, drain: bool = True):
+        """워커 종료 (drain이면 대기 중인 작업을 모두 처리한 뒤 종료)"""
+        if drain and self._queue is not None and self.running:
+            await self._queue.join()
+        tasks = self._workers + ([self._digest_task] if self._digest_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._digest_task = None
+        if self._executor is not None:
+            # 워커 취소로 대기 중이던 평가도 취소되므로 실행 중인 평가 뒤에 루프 정리
+            # (drain 이면 남은 평가가 없어 바로 끝난다)
+            self._executor.submit(_close_eval_loop)
+            self._executor.shutdown(wait=drain)
+            self._executor = None
+        if self._attached_pipeline:
+            self.supervisor.alert_pipeline = None
+            self._attached_pipeline = False
+        # 남은 알림 요약 전송
+        self.alert_pipeline.flush()
+
+    async def join(self):
+        """대기 중인 작업이 모두 처리될 때까지 대기"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _digest_loop(self):
+        """알림 요약 주기 전송 (새 알림이 없어도 주기마다 확인)"""
+        interval = max(self.alert_pipeline.digest_interval.total_seconds(), 0.1)
+        while True:
+            await asyncio.sleep(interval)
+            self.alert_pipeline.maybe_flush()
+
+    async def _worker(self, worker_id: int):
+        """큐에서 작업을 꺼내 턴 평가"""
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self._queue.get()]
+            if self._executor is not None:
+                # 스레드 전환 비용을 줄이도록 이미 대기 중인 작업은 묶어서 전달
+                while len(jobs) < self.batch_size and not self._queue.empty():
+                    jobs.append(self._queue.get_nowait())
+            started = time.monotonic()
+            self._lags.extend(started - job.enqueued_at for job in jobs)
+            try:
+                if self._executor is not None:
+                    results = await loop.run_in_executor(self._executor, self._evaluate_batch, jobs)
+                else:
+                    results = [await self._evaluate(jobs[0])]
+                # 결과 저장은 루프에서 (feedback 저장소는 루프 스레드만 변경)
+                for job, (feedback, error, elapsed) in zip(jobs, results):
+                    self._processing_times.append(elapsed)
+                    try:
+                        if error is not None:
+                            raise error
+                        self._store_feedback(job, feedback)
+                        self.metrics["processed"] += 1
+                    except Exception:
+                        logger.exception(f"Supervisor worker {worker_id} failed: {job.session_id}/{job.turn_id}")
+                        self.metrics["failed"] += 1
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+
+    async def _evaluate(
+        self, job: SupervisorJob
+    ) -> Tuple[Optional[SupervisorFeedback], Optional[Exception], float]:
+        """턴 평가 -> (피드백, 예외, 소요 시간)"""
+        started = time.monotonic()
+        try:
+            feedback = await self.supervisor.evaluate_turn(
+                session_id=job.session_id,
+                turn_id=job.turn_id,
+                user_message=job.user_message,
+                ai_response=job.ai_response,
+                context=job.context,
+                language=job.language
+            )
+        except Exception as e:
+            return None, e, time.monotonic() - started
+        return feedback, None, time.monotonic() - started
+
+    def _evaluate_batch(
+        self, jobs: List[SupervisorJob]
+    ) -> List[Tuple[Optional[SupervisorFeedback], Optional[Exception], float]]:
+        """평가 스레드에서 실행 (스레드 전용 이벤트 루프)"""
+        return [_eval_thread.loop.run_until_complete(self._evaluate(job)) for job in jobs]
+
+    # =========================================================================
+    # 작업 등록
+    # =========================================================================
+    def submit(self, job: SupervisorJob) -> bool:
+        """
+        평가 작업 등록 (대기 없음)
+        Returns:
+            큐에 등록되었으면 True, 샘플링에서 제외되면 False
+        """
+        self.metrics["submitted"] += 1
+        if not self._should_sample(job):
+            self.metrics["sampled_out"] += 1
+            return False
+
+        self.start()
+        if self._queue.full():
+            # 가장 오래된 작업 폐기
+            dropped = self._queue.get_nowait()
+            self._queue.task_done()
+            self.metrics["dropped"] += 1
+            logger.warning(f"Supervisor queue full - dropped {dropped.session_id}/{dropped.turn_id}")
+        self._queue.put_nowait(job)
+        self.metrics["enqueued"] += 1
+        return True
+
+    def _should_sample(self, job: SupervisorJob) -> bool:
+        """세션/턴 ID 해시 기반 결정적 샘플링"""
+        rate = self.crisis_sampling_rate if job.is_crisis else self.sampling_rate
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        bucket = zlib.crc32(f"{job.session_id}:{job.turn_id}".encode("utf-8")) / 2 ** 32
+        return bucket < rate
+
+    # =========================================================================
+    # 결과 저장 / 조회
+    # =========================================================================
+    def _store_feedback(self, job: SupervisorJob, feedback: SupervisorFeedback):
+        """세션/턴별 피드백 저장 및 알림 기록"""
+        session_feedback = self.feedback.get(job.session_id)
+        if session_feedback is None:
+            session_feedback = OrderedDict()
+            self.feedback[job.session_id] = session_feedback
+        self.feedback.move_to_end(job.session_id)
+        session_feedback[job.turn_id] = feedback
+        self.session_languages[job.session_id] = job.language
+
+        while len(session_feedback) > self.max_turns_per_session:
+            session_feedback.popitem(last=False)
+        while len(self.feedback) > self.max_sessions:
+            evicted, _ = self.feedback.popitem(last=False)
+            self.session_languages.pop(evicted, None)
+            # 슈퍼바이저의 세션 캐시도 함께 정리 (장기 실행 워커 메모리 제한)
+            if self.supervisor is not None:
+                self.supervisor.clear_turn_cache(evicted)
+                self.supervisor.clear_session_matrices(evicted)
+
+        # 제안/수정 수준은 _send_alert 를 거치지 않으므로 여기서 등록
+        if feedback.intervention_level in (InterventionLevel.SUGGESTION, InterventionLevel.CORRECTION):
+            self.alert_pipeline.publish(feedback)
+
+    def get_feedback(self, session_id: str, turn_id: Optional[str] = None) -> List[SupervisorFeedback]:
+        """세션 피드백 조회 (turn_id 지정 시 해당 턴만)"""
+        session_feedback = self.feedback.get(session_id, {})
+        if turn_id is not None:
+            return [session_feedback[turn_id]] if turn_id in session_feedback else []
+        return list(session_feedback.values())
+
+    def get_latest_feedback(self, session_id: str) -> Optional[SupervisorFeedback]:
+        """세션의 가장 최근 피드백"""
+        session_feedback = self.feedback.get(session_id)
+        if not session_feedback:
+            return None
+        return next(reversed(session_feedback.values()))
+
+    def get_session_review(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 턴 피드백을 세션 단위로 요약"""
+        feedbacks = self.get_feedback(session_id)
+        if not feedbacks:
+            return None
+        language = self.session_languages.get(session_id, "ko")
+
+        dim_scores: Dict[str, List[float]] = {}
+        all_scores = []
+        for feedback in feedbacks:
+            for score in feedback.quality_scores:
+                dim_scores.setdefault(score.dimension.value, []).append(score.score)
+                all_scores.append(score)
+
+        coaching_points = list(dict.fromkeys(
+            point for feedback in feedbacks for point in feedback.coaching_points
+        ))
+        intervention_level = max(
+            (feedback.intervention_level for feedback in feedbacks), key=_LEVEL_ORDER.get
+        )
+
+        return {
+            "session_id": session_id,
+            "reviewed_turns": len(feedbacks),
+            "overall_quality": float(np.mean([feedback.overall_score for feedback in feedbacks])),
+            "quality_scores": {dim: float(np.mean(scores)) for dim, scores in dim_scores.items()},
+            "intervention_level": intervention_level.value,
+            "coaching_points": coaching_points,
+            "recommendations": self.supervisor._generate_recommendations(all_scores, language),
+            "last_reviewed_at": feedbacks[-1].timestamp.isoformat()
+        }
+
+    def get_alerts(
+        self,
+        severity: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """알림 조회 (심각도별 시각 인덱스)"""
+        return self.alert_pipeline.get_alerts(severity, since, limit)
+
+    # =========================================================================
+    # 지표
+    # =========================================================================
+    def get_metrics(self) -> Dict[str, Any]:
+        """큐 / 처리 지표"""
+        return {
+            **self.metrics,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "workers": sum(1 for task in self._workers if not task.done()),
+            "sampling_rate": self.sampling_rate,
+            "crisis_sampling_rate": self.crisis_sampling_rate,
+            "lag_ms": self._summarize(self._lags),
+            "processing_ms": self._summarize(self._processing_times),
+            "alerts": self.alert_pipeline.get_metrics()
+        }
+
+    def _summarize(self, values: Deque[float]) -> Dict[str, float]:
+        """최근 측정값 요약 (밀리초)"""
+        if not values:
+            return {"mean": 0.0, "p95": 0.0, "max": 0.0}
+        arr = np.fromiter(values, dtype=float) * 1000
+        return {
+            "mean": float(arr.mean()),
+            "p95": float(np.percentile(arr, 95)),
+            "max": float(arr.max())
+        }
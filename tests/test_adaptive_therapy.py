@@ -0,0 +1,503 @@
+"""
+적응형 치료 개인화 테스트
+파일명: tests/test_adaptive_therapy.py
+
+테스트 원칙:
+- 열 저장소 기반 기억 검색 결과는 기존 구현(기억마다 관련성 계산 + 전체 정렬)과 동일해야 함
+- 증분 패턴은 기존 구현(전체 기억 재스캔)과 동일해야 함
+- 대처 기법 색인 순위는 기억 전체로 직접 계산한 최근성 가중 평균과 동일해야 함
+- 접근법 적합성 행렬 점수/선택은 접근법별 _calculate_approach_fit 결과와 비트 단위로 동일해야 함
+- 캐시된 적응 권고는 매번 새로 계산한 권고와 동일해야 함 (상태 변경 시 자동 무효화)
+"""
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from models.personalization.adaptive_therapy import (
+    AdaptiveTherapyEngine, CopingIndex, EmotionalMemory, LongTermMemoryStore, MemoryColumns, PatternState,
+    TherapeuticApproach, TherapeuticProgress, UserProfile
+)
+
+EMOTIONS = ["anxiety", "sadness", "anger", "joy", "worry", "hopelessness"]
+TRIGGERS = [None, "", "work", "family", "exam", "work_stress", "relationship", "sleep"]
+
+
+def random_memories(count: int, seed: int, now: datetime):
+    """임의 기억 (일 경계에서 멀리 떨어진 시각)"""
+    rng = random.Random(seed)
+    return [
+        EmotionalMemory(
+            timestamp=now - timedelta(days=rng.randint(0, 800), hours=12),
+            emotion=rng.choice(EMOTIONS),
+            intensity=rng.random(),
+            trigger=rng.choice(TRIGGERS),
+            context={},
+            coping_used=None,
+            effectiveness=None
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_retrieve(store: LongTermMemoryStore, user_id, context, limit=5):
+    """기존 구현: 기억마다 관련성 계산 후 전체 정렬"""
+    scored = [(m, store._calculate_relevance(m, context)) for m in store.memories.get(user_id, [])]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [m for m, _ in scored[:limit]]
+
+
+def legacy_patterns(memories):
+    """기존 구현: 전체 기억 재스캔"""
+    if len(memories) < 5:
+        return {}
+    emotion_counts = defaultdict(int)
+    for memory in memories:
+        emotion_counts[memory.emotion] += 1
+    trigger_counts = defaultdict(int)
+    for memory in memories:
+        if memory.trigger:
+            trigger_counts[memory.trigger] += 1
+    return {
+        'dominant_emotion': max(emotion_counts, key=emotion_counts.get),
+        'emotion_distribution': dict(emotion_counts),
+        'common_triggers': dict(trigger_counts),
+        'average_intensity': np.mean([m.intensity for m in memories]),
+    }
+
+
+
+def build_memory_store(now: datetime) -> LongTermMemoryStore:
+    """기억 수가 다른 사용자들의 저장소"""
+    store = LongTermMemoryStore()
+    for user, count in (("u1", 1), ("u2", 7), ("u3", 300), ("u4", 3000)):
+        for memory in random_memories(count, seed=count, now=now):
+            store.store_memory(user, memory)
+    return store
+
+
+# 생성 비용이 큰 저장소는 모듈에서 한 번만 생성
+MEMORY_STORE = build_memory_store(datetime.now())
+
+class TestMemoryRetrieval:
+    """기억 검색 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 기억 저장소 준비"""
+        self.store = MEMORY_STORE
+
+    @pytest.mark.parametrize("user", ["u1", "u2", "u3", "u4"])
+    @pytest.mark.parametrize("limit", [1, 5, 50])
+    def test_matches_legacy(self, user, limit):
+        """기존 검색 결과(순서 포함)와 동일"""
+        rng = random.Random(limit)
+        for _ in range(20):
+            context = {
+                "current_emotion": rng.choice(EMOTIONS + [None]),
+                "triggers": rng.sample(["work", "family", "exam", "sleep", "stress"], rng.randint(0, 3))
+            }
+            expected = legacy_retrieve(self.store, user, context, limit)
+            actual = self.store.retrieve_relevant_memories(user, context, limit)
+            assert [id(m) for m in actual] == [id(m) for m in expected]
+
+    def test_relevance_matches_scalar(self):
+        """벡터화 관련성 점수가 단일 기억 계산과 동일"""
+        context = {"current_emotion": "anxiety", "triggers": ["work"]}
+        scores = self.store.columns["u3"].relevance(context)
+        expected = [self.store._calculate_relevance(m, context) for m in self.store.memories["u3"]]
+        assert scores.tolist() == expected
+
+    def test_ties_keep_insertion_order(self):
+        """동점이면 먼저 저장된 기억 우선"""
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.9, 0.1, 0.5])
+        assert LongTermMemoryStore._top_k(scores, 3).tolist() == [1, 4, 0]
+        assert LongTermMemoryStore._top_k(scores, 4).tolist() == [1, 4, 0, 2]
+        assert LongTermMemoryStore._top_k(scores, 10).tolist() == [1, 4, 0, 2, 3, 6, 5]
+
+    def test_columns_resync(self):
+        """기억 목록을 직접 수정해도 검색 결과가 맞는지"""
+        store = LongTermMemoryStore()
+        memories = random_memories(20, seed=1, now=datetime.now())
+        for memory in memories[:10]:
+            store.store_memory("u", memory)
+        store.memories["u"].extend(memories[10:])
+        context = {"current_emotion": "anger", "triggers": ["family"]}
+        assert store.retrieve_relevant_memories("u", context, 5) == legacy_retrieve(store, "u", context, 5)
+
+        del store.memories["u"][3:]
+        assert store.retrieve_relevant_memories("u", context, 5) == legacy_retrieve(store, "u", context, 5)
+        assert store.columns["u"].size == 3
+
+    def test_column_growth(self):
+        """용량 증가 후에도 값 유지"""
+        columns = MemoryColumns(capacity=2)
+        memories = random_memories(100, seed=2, now=datetime.now())
+        for memory in memories:
+            columns.append(memory)
+        assert columns.size == 100
+        assert columns.intensities[:100].tolist() == [m.intensity for m in memories]
+        assert (columns.trigger_ids[:100] >= 0).tolist() == [bool(m.trigger) for m in memories]
+
+    def test_engine_uses_store(self):
+        """엔진을 통한 기록/검색"""
+        engine = AdaptiveTherapyEngine()
+        engine.record_emotional_memory("u", "anxiety", 0.8, trigger="work")
+        engine.record_emotional_memory("u", "sadness", 0.4)
+        found = engine.memory_store.retrieve_relevant_memories("u", {"current_emotion": "sadness"}, limit=1)
+        assert found[0].emotion == "sadness"
+        assert engine.memory_store.retrieve_relevant_memories("missing", {}) == []
+
+
+class TestIncrementalPatterns:
+    """증분 패턴 갱신 테스트"""
+
+    def assert_matches_legacy(self, patterns, memories):
+        expected = legacy_patterns(memories)
+        if not expected:
+            assert patterns == {}
+            return
+        for key in ('dominant_emotion', 'emotion_distribution', 'common_triggers'):
+            assert patterns[key] == expected[key]
+            # 등장 순서도 동일
+            assert list(patterns[key] if isinstance(patterns[key], dict) else []) == \
+                list(expected[key] if isinstance(expected[key], dict) else [])
+        assert patterns['average_intensity'] == pytest.approx(expected['average_intensity'])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_legacy_after_each_insert(self, seed):
+        """기억을 하나씩 추가할 때마다 기존 패턴과 동일 (동점 주요 감정 포함)"""
+        rng = random.Random(seed)
+        store = LongTermMemoryStore()
+        memories = random_memories(120, seed=seed, now=datetime.now())
+        for memory in memories:
+            # 동점이 자주 생기도록 감정 종류를 줄임
+            memory.emotion = rng.choice(EMOTIONS[:3])
+        for i, memory in enumerate(memories):
+            store.store_memory("u", memory)
+            self.assert_matches_legacy(store.get_user_patterns("u"), memories[:i + 1])
+
+    def test_tie_prefers_first_seen(self):
+        """동점이면 먼저 등장한 감정이 주요 감정"""
+        state = PatternState()
+        now = datetime.now()
+        for emotion in ["a", "b", "b", "a"]:
+            state.add(EmotionalMemory(now, emotion, 0.5, None, {}, None, None))
+        assert state.dominant_emotion == "a"
+        state.add(EmotionalMemory(now, "b", 0.5, None, {}, None, None))
+        assert state.dominant_emotion == "b"
+
+    def test_cached_until_next_insert(self):
+        """새 기억이 없으면 같은 패턴 사전 재사용"""
+        store = LongTermMemoryStore()
+        for memory in random_memories(10, seed=3, now=datetime.now()):
+            store.store_memory("u", memory)
+        patterns = store.get_user_patterns("u")
+        assert store.get_user_patterns("u") is patterns
+        store.store_memory("u", random_memories(1, seed=4, now=datetime.now())[0])
+        assert store.get_user_patterns("u") is not patterns
+        assert store.get_user_patterns("missing") == {}
+
+    def test_resync_after_direct_edit(self):
+        """기억 목록 직접 수정 시 재구성"""
+        store = LongTermMemoryStore()
+        memories = random_memories(30, seed=5, now=datetime.now())
+        for memory in memories:
+            store.store_memory("u", memory)
+        del store.memories["u"][10:]
+        self.assert_matches_legacy(store.get_user_patterns("u"), memories[:10])
+        del store.memories["u"][4:]
+        assert store.get_user_patterns("u") == {}
+
+    def test_time_decay(self):
+        """감쇠 패턴이 기억별 가중치 직접 계산과 동일"""
+        half_life = timedelta(days=30)
+        store = LongTermMemoryStore(pattern_half_life=half_life)
+        now = datetime.now()
+        memories = random_memories(400, seed=6, now=now)
+        for memory in memories:
+            store.store_memory("u", memory)
+
+        state = store.pattern_states["u"]
+        patterns = state.snapshot(now)
+        weights = np.array([2.0 ** (-(now - m.timestamp).total_seconds() / half_life.total_seconds())
+                            for m in memories])
+        intensities = np.array([m.intensity for m in memories])
+        assert patterns['decayed_average_intensity'] == pytest.approx((weights * intensities).sum() / weights.sum())
+        for emotion in EMOTIONS:
+            expected = weights[[m.emotion == emotion for m in memories]].sum()
+            assert patterns['decayed_emotion_distribution'].get(emotion, 0.0) == pytest.approx(expected)
+        expected_work = weights[[m.trigger == "work" for m in memories]].sum()
+        assert patterns['decayed_common_triggers']['work'] == pytest.approx(expected_work)
+        # 감쇠 없는 값은 그대로 유지
+        self.assert_matches_legacy(patterns, memories)
+        assert 'decayed_dominant_emotion' in store.get_user_patterns("u")
+
+    def test_time_decay_rebase(self):
+        """반감기 대비 긴 기간에서도 overflow 없이 최근 기억 위주"""
+        state = PatternState(half_life=timedelta(hours=1))
+        start = datetime(2020, 1, 1)
+        for day in range(800):
+            emotion = "anger" if day < 790 else "joy"
+            state.add(EmotionalMemory(start + timedelta(days=day), emotion, 0.5, None, {}, None, None))
+        patterns = state.snapshot(start + timedelta(days=800))
+        assert state.dominant_emotion == "anger"
+        assert patterns['decayed_dominant_emotion'] == "joy"
+        assert all(np.isfinite(v) for v in patterns['decayed_emotion_distribution'].values())
+
+
+class TestEffectiveCoping:
+    """대처 기법 효과 색인 테스트"""
+
+    def brute_force(self, memories, half_life: timedelta, min_effectiveness: float):
+        """기억 전체 스캔: 기법별 최근성 가중 평균 효과 순위"""
+        now = datetime.now()
+        stats = {}
+        for memory in memories:
+            if not memory.coping_used:
+                continue
+            entry = stats.setdefault(memory.coping_used, {"order": len(stats), "uses": 0, "w": 0.0, "ws": 0.0, "rated": 0})
+            entry["uses"] += 1
+            if memory.effectiveness is None:
+                continue
+            weight = 2.0 ** (-(now - memory.timestamp).total_seconds() / half_life.total_seconds())
+            entry["w"] += weight
+            entry["ws"] += weight * memory.effectiveness
+            entry["rated"] += 1
+        ranked = sorted(
+            ((e["ws"] / e["w"], name, e) for name, e in stats.items() if e["rated"]),
+            key=lambda x: (-x[0], -x[2]["rated"], x[2]["order"])
+        )
+        return [(name, score, e["uses"]) for score, name, e in ranked if score > min_effectiveness]
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_brute_force(self, seed):
+        """임의 순서 기억에서 순위/점수/사용 횟수가 직접 계산과 동일"""
+        rng = random.Random(seed)
+        store = LongTermMemoryStore()
+        memories = random_memories(600, seed=seed, now=datetime.now())
+        strategies = ["breathing", "journaling", "walk", "music", "call_friend", None]
+        for memory in memories:
+            memory.coping_used = rng.choice(strategies)
+            memory.effectiveness = rng.choice([None, round(rng.random(), 2)])
+            store.store_memory("u", memory)
+
+        for min_effectiveness in (0.0, 0.5):
+            expected = self.brute_force(memories, store.coping_half_life, min_effectiveness)
+            actual = store.get_effective_coping("u", limit=10, min_effectiveness=min_effectiveness)
+            assert [a["name"] for a in actual] == [name for name, _, _ in expected]
+            assert [a["effectiveness"] for a in actual] == pytest.approx([score for _, score, _ in expected])
+            assert [a["uses"] for a in actual] == [uses for _, _, uses in expected]
+        assert len(store.get_effective_coping("u", limit=2, min_effectiveness=0.0)) == 2
+        assert store.get_effective_coping("missing") == []
+
+    def test_engine_picks_best_recent(self):
+        """첫 번째가 아니라 최근성 가중 효과가 가장 높은 기법 제안"""
+        engine = AdaptiveTherapyEngine()
+        engine.record_emotional_memory("u", "anxiety", 0.6, coping_used="walk", effectiveness=0.75)
+        engine.record_emotional_memory("u", "anxiety", 0.6, coping_used="breathing", effectiveness=0.95)
+        techniques = engine.get_personalized_techniques("u", "anxiety", "ko")
+        assert techniques[0] == {"name": "breathing", "reason": "이전에 효과적이었던 방법", "type": "proven"}
+
+        # 오래전에 효과적이었지만 최근에는 효과가 낮은 기법은 밀려남
+        store = engine.memory_store
+        old = datetime.now() - timedelta(days=720)
+        store.store_memory("v", EmotionalMemory(old, "anxiety", 0.5, None, {}, "breathing", 1.0))
+        store.store_memory("v", EmotionalMemory(datetime.now(), "anxiety", 0.5, None, {}, "breathing", 0.3))
+        store.store_memory("v", EmotionalMemory(datetime.now(), "anxiety", 0.5, None, {}, "walk", 0.8))
+        assert engine.get_personalized_techniques("v", "anxiety", "en")[0]["name"] == "walk"
+
+        # 기준(0.7)을 넘는 기법이 없으면 감정별 기법만
+        engine.record_emotional_memory("w", "anxiety", 0.6, coping_used="walk", effectiveness=0.5)
+        assert all(t.get("type") != "proven" for t in engine.get_personalized_techniques("w", "anxiety", "ko"))
+
+    def test_rebase_and_resync(self):
+        """반감기 대비 긴 기간 / 기억 목록 직접 수정"""
+        index = CopingIndex(half_life=timedelta(hours=1))
+        start = datetime(2020, 1, 1)
+        for day in range(100):
+            index.add(EmotionalMemory(start + timedelta(days=day), "a", 0.5, None, {}, "old", 0.9))
+        for day in range(100, 200):
+            index.add(EmotionalMemory(start + timedelta(days=day), "a", 0.5, None, {}, "new", 0.8))
+        index.add(EmotionalMemory(start + timedelta(days=200), "a", 0.5, None, {}, "old", 0.1))
+        top = index.top(5)
+        assert [t["name"] for t in top] == ["new", "old"]
+        assert top[1]["effectiveness"] == pytest.approx(0.1)
+        assert top[1]["uses"] == 101
+
+        store = LongTermMemoryStore()
+        for memory in [EmotionalMemory(datetime.now(), "a", 0.5, None, {}, name, eff)
+                       for name, eff in [("walk", 0.9), ("music", 0.8), ("walk", 0.2)]]:
+            store.store_memory("u", memory)
+        assert store.get_effective_coping("u")[0]["name"] == "music"
+        del store.memories["u"][2:]
+        assert store.get_effective_coping("u")[0]["name"] == "walk"
+
+
+def random_profiles(count: int, seed: int):
+    """임의 프로파일 / 진행 상황 / 현재 감정"""
+    rng = random.Random(seed)
+    concerns = ["Anxiety", "depression", "work_anxiety", "self_harm", "avoidance", "addiction",
+                "relationship_issues", "goal_setting", "low_self_esteem", "insomnia", "Negative_Thinking"]
+    profiles, progresses, emotions = [], [], []
+    for i in range(count):
+        profile = UserProfile(
+            user_id=f"p{i}", created_at=datetime(2025, 1, 1), language=rng.choice(["ko", "en", "ja", "zh"]),
+            presenting_concerns=rng.sample(concerns, rng.randint(0, 5)),
+            preferred_approach=rng.choice([None] + list(TherapeuticApproach))
+        )
+        profiles.append(profile)
+        progresses.append(rng.choice([None, TherapeuticProgress(f"p{i}", datetime(2025, 1, 1), total_sessions=rng.randint(0, 12))]))
+        emotions.append(rng.choice([None, "anxiety", "worry", "sadness", "hopelessness", "anger"]))
+    return profiles, progresses, emotions
+
+
+class TestApproachFitMatrix:
+    """접근법 적합성 행렬 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 엔진 초기화"""
+        self.engine = AdaptiveTherapyEngine()
+
+    def legacy_select(self, profile, progress, session_data):
+        scores = {
+            approach: self.engine._calculate_approach_fit(approach, profile, progress, {}, session_data)
+            for approach in TherapeuticApproach
+        }
+        return scores, max(scores, key=scores.get)
+
+    def test_matches_scalar(self):
+        """점수와 선택(동점 포함)이 접근법별 계산과 동일"""
+        profiles, progresses, emotions = random_profiles(500, seed=0)
+        for profile, progress, emotion in zip(profiles, progresses, emotions):
+            session_data = {} if emotion is None else {"current_emotion": emotion}
+            expected_scores, expected = self.legacy_select(profile, progress, session_data)
+            scores = self.engine._approach_fit_scores(profile, progress, session_data)
+            assert scores.tolist() == list(expected_scores.values())
+            assert self.engine._select_approach(profile, progress, {}, session_data) == expected
+
+    def test_batch_matches_single(self):
+        """일괄 점수/선택이 개별 계산과 동일"""
+        profiles, progresses, emotions = random_profiles(300, seed=1)
+        scores = self.engine.score_approaches_batch(profiles, progresses, emotions)
+        assert scores.shape == (300, len(TherapeuticApproach))
+        for i, (profile, progress, emotion) in enumerate(zip(profiles, progresses, emotions)):
+            session_data = {"current_emotion": emotion}
+            assert scores[i].tolist() == self.engine._approach_fit_scores(profile, progress, session_data).tolist()
+        selected = self.engine.select_approaches_batch(profiles, progresses, emotions)
+        assert selected == [
+            self.legacy_select(p, pr, {"current_emotion": e})[1] for p, pr, e in zip(profiles, progresses, emotions)
+        ]
+        assert self.engine.select_approaches_batch([]) == []
+
+    def test_batch_uses_engine_progress(self):
+        """진행 상황 생략 시 엔진에 기록된 진행 상황 사용"""
+        engine = AdaptiveTherapyEngine()
+        profile = engine.create_user_profile("u", "en", {"presenting_concerns": ["addiction"]})
+        profile.preferred_approach = TherapeuticApproach.MI
+        engine.progress_tracking["u"].total_sessions = 6
+        scores = engine.score_approaches_batch([profile])
+        assert scores[0].tolist() == engine._approach_fit_scores(profile, engine.progress_tracking["u"], {}).tolist()
+        assert engine.select_approaches_batch([profile]) == [TherapeuticApproach.MI]
+
+
+class TestRecommendationCache:
+    """적응 권고 캐시 테스트"""
+
+    def make_engine(self, **kwargs):
+        engine = AdaptiveTherapyEngine(**kwargs)
+        engine.create_user_profile("u", "ko", {"presenting_concerns": ["anxiety", "insomnia"]})
+        return engine
+
+    def test_matches_uncached(self):
+        """임의 조작 순서에서도 캐시 결과 = 매번 계산한 결과"""
+        cached = self.make_engine()
+        fresh = self.make_engine(recommendation_cache_size=0)
+        rng = random.Random(0)
+        sessions = [
+            {"current_emotion": e, "emotion_intensity": i, "current_topic": t}
+            for e in (None, "anxiety", "sadness") for i in (0.3, 0.9) for t in (None, "exam")
+        ]
+        for step in range(600):
+            op = rng.random()
+            if op < 0.02:
+                outcome = {"engagement": rng.random(), "alliance": rng.random()}
+                for engine in (cached, fresh):
+                    engine.update_progress("u", dict(outcome))
+            elif op < 0.05:
+                memory = (rng.choice(EMOTIONS), rng.random(), rng.choice(TRIGGERS))
+                for engine in (cached, fresh):
+                    engine.record_emotional_memory("u", *memory)
+            else:
+                session = rng.choice(sessions)
+                assert cached.get_adaptation_recommendation("u", session) == \
+                    fresh._build_recommendation("u", session)
+        metrics = cached.get_recommendation_cache_metrics()
+        assert metrics["hits"] > metrics["misses"] > 0
+        assert metrics["invalidations"] > 0
+        assert 0 < metrics["hit_rate"] < 1
+
+    def test_invalidated_by_mutations(self):
+        """진행/기억/프로파일 저장 시 다시 계산"""
+        engine = self.make_engine()
+        session = {"current_emotion": "anxiety"}
+        first = engine.get_adaptation_recommendation("u", session)
+        assert engine.get_adaptation_recommendation("u", session) == first
+        assert engine.get_recommendation_cache_metrics()["hits"] == 1
+
+        for _ in range(3):
+            engine.update_progress("u", {"engagement": 0.9})
+        assert engine.get_adaptation_recommendation("u", session).specific_techniques != first.specific_techniques
+
+        for _ in range(5):
+            engine.record_emotional_memory("u", "sadness", 0.7, trigger="work")
+        assert "주요 트리거: work" in engine.get_adaptation_recommendation("u", session).focus_areas
+
+        engine.user_profiles["u"].language = "en"
+        engine.save_user("u")
+        assert "간접적 표현 사용" not in engine.get_adaptation_recommendation("u", session).communication_adjustments
+
+        # 엔진을 거치지 않은 기억 추가도 패턴 버전으로 감지
+        engine.memory_store.store_memory("u", EmotionalMemory(
+            timestamp=datetime.now(), emotion="joy", intensity=0.5, trigger="family",
+            context={}, coping_used=None, effectiveness=None
+        ))
+        assert engine.get_adaptation_recommendation("u", session) == engine._build_recommendation("u", session)
+
+    def test_returned_copy_and_staleness(self):
+        """반환값 수정이 캐시에 영향 없음, 직접 수정은 검증 시 낡은 값으로 집계"""
+        engine = self.make_engine(recommendation_verify_every=1)
+        session = {"current_topic": "exam"}
+        engine.get_adaptation_recommendation("u", session).focus_areas.append("changed")
+        assert "changed" not in engine.get_adaptation_recommendation("u", session).focus_areas
+        assert engine.get_recommendation_cache_metrics()["stale"] == 0
+
+        # save_user 없이 프로파일 직접 수정
+        engine.user_profiles["u"].presenting_concerns = ["addiction"]
+        assert engine.get_adaptation_recommendation("u", session).focus_areas[0] == "addiction"
+        metrics = engine.get_recommendation_cache_metrics()
+        assert metrics["verified"] == 2 and metrics["stale"] == 1 and metrics["stale_rate"] == 0.5
+
+    def test_bounded(self):
+        """사용자 수 / 사용자별 세션 키 수 제한"""
+        engine = AdaptiveTherapyEngine(recommendation_cache_size=3)
+        for u in range(5):
+            engine.create_user_profile(f"u{u}", "en")
+            engine.get_adaptation_recommendation(f"u{u}", {})
+        assert list(engine._recommendation_cache) == ["u2", "u3", "u4"]
+        for topic in range(40):
+            engine.get_adaptation_recommendation("u4", {"current_topic": str(topic)})
+        metrics = engine.get_recommendation_cache_metrics()
+        assert metrics["entries"] == 2 + AdaptiveTherapyEngine._MAX_SESSION_KEYS_PER_USER
+        assert metrics["evictions"] == 2 + 41 - AdaptiveTherapyEngine._MAX_SESSION_KEYS_PER_USER
+        # 프로파일이 없는 사용자 / 해시할 수 없는 세션 값은 캐시하지 않음
+        engine.get_adaptation_recommendation("missing", {"language": "ko"})
+        engine.get_adaptation_recommendation("u4", {"current_topic": ["a", "b"]})
+        assert "missing" not in engine._recommendation_cache
+        assert engine.get_recommendation_cache_metrics()["entries"] == metrics["entries"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,525 @@
+"""
+AI 슈퍼바이저 테스트
+파일명: tests/test_ai_supervisor.py
+
+테스트 원칙:
+- 캐시/윈도우 기반 세션 리뷰 결과는 기존 구현과 동일해야 함
+- 마커 사전 단일 스캔 점수는 기존 평가기별 부분 문자열 검사와 동일해야 함
+"""
+import asyncio
+import json
+import random
+import sqlite3
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+from models.supervisor.ai_supervisor import AISupervisor, QualityDimension, SessionReview, scan_turn_markers
+
+USER_MESSAGES = [
+    "요즘 너무 힘들어요. 아무것도 하기 싫어요.",
+    "죽고 싶어요.",
+    "회사에서 계속 실수해서 걱정이에요?",
+    "I feel like nobody understands me.",
+    "잠을 못 자요",
+]
+
+AI_RESPONSES = [
+    "많이 힘드시군요. 그런 감정을 느끼시는 것은 자연스러운 일이에요. 조금 더 이야기해 주실 수 있을까요?",
+    "그냥 힘내세요. 다 잘 될 거예요.",
+    "걱정이 많으셨겠어요. 함께 생각해 보면 어떠세요? 그 상황에서 어떤 생각이 드셨나요?",
+    "That sounds really difficult. I'm here for you, and we can work through it together.",
+    "참으세요.",
+    "지금 많이 위험하게 느껴지시면 1393에 바로 연락해 주세요. 전문가의 도움을 받으실 수 있어요.",
+]
+
+
+def build_history(turns: int, seed: int = 0):
+    """임의 대화 기록"""
+    rng = random.Random(seed)
+    return [
+        {"user_message": rng.choice(USER_MESSAGES), "ai_response": rng.choice(AI_RESPONSES)}
+        for _ in range(turns)
+    ]
+
+
+async def legacy_review_session(supervisor, session_id, conversation_history, language="ko"):
+    """기존 구현: 턴마다 전체 평가 + 접두사 슬라이스 컨텍스트 (회귀 비교용)"""
+    all_scores = []
+    key_moments = []
+    for i, turn in enumerate(conversation_history):
+        scores = await supervisor._calculate_quality_scores(
+            turn.get('user_message', ''),
+            turn.get('ai_response', ''),
+            {'conversation_history': conversation_history[:i]},
+            language
+        )
+        all_scores.extend(scores)
+        avg_score = np.mean([s.score for s in scores])
+        if avg_score < 0.6 or avg_score > 0.9:
+            key_moments.append({
+                "turn": i,
+                "score": avg_score,
+                "type": "excellent" if avg_score > 0.9 else "needs_attention"
+            })
+    values = [s.score for s in all_scores]
+    if len(values) < 6:
+        trend = "insufficient_data"
+    else:
+        third = len(values) // 3
+        early, late = np.mean(values[:third]), np.mean(values[-third:])
+        trend = "improving" if late > early + 0.1 else "declining" if late < early - 0.1 else "stable"
+    dim_scores = {}
+    for score in all_scores:
+        dim_scores.setdefault(score.dimension, []).append(score.score)
+    dim_averages = {dim: np.mean(v) for dim, v in dim_scores.items()}
+    avg = np.mean(values)
+    if language == "ko":
+        notes = f"세션 평균 품질 점수: {avg:.2f}. 총 {len(values)}개 평가 지표 분석 완료."
+        recommendations = [f"{dim.value} 영역 강화 교육 권장 (현재 평균: {a:.2f})"
+                           for dim, a in dim_averages.items() if a < 0.7]
+    else:
+        notes = f"Session average quality score: {avg:.2f}. Analyzed {len(values)} quality indicators."
+        recommendations = [f"Training recommended for {dim.value} (current avg: {a:.2f})"
+                           for dim, a in dim_averages.items() if a < 0.7]
+    return SessionReview(
+        session_id=session_id,
+        total_turns=len(conversation_history),
+        average_quality=float(avg),
+        quality_trend=trend,
+        key_moments=key_moments,
+        strengths=[dim.value for dim, a in dim_averages.items() if a >= 0.8],
+        areas_for_improvement=[dim.value for dim, a in dim_averages.items() if a < 0.7],
+        clinical_notes=notes,
+        recommendations=recommendations
+    )
+
+
+def legacy_quality_scores(user_message, ai_response, context, language):
+    """기존 평가기 구현: 평가기마다 소문자 변환 + 마커 목록 순회 (골든 비교용)"""
+    results = []
+    response_lower = ai_response.lower()
+    user_lower = user_message.lower()
+
+    # 공감
+    if language == "ko":
+        empathy_markers = ["힘드시", "어려우시", "이해", "공감", "느끼", "감정", "마음", "걱정", "함께", "곁에"]
+        negative_markers = ["그냥", "별거 아니", "왜 그래", "그러지 마"]
+    else:
+        empathy_markers = ["understand", "feel", "sounds", "difficult", "challenging", "support", "here for you", "valid"]
+        negative_markers = ["just", "shouldn't feel", "overreacting", "simply"]
+    positive_count = sum(1 for m in empathy_markers if m in response_lower)
+    negative_count = sum(1 for m in negative_markers if m in response_lower)
+    score = max(0.0, min(1.0, (positive_count * 0.15) - (negative_count * 0.2) + 0.5))
+    results.append(score)
+
+    # 치료적 동맹
+    score = 0.7
+    if language == "ko":
+        collaborative_markers = ["함께", "우리", "같이", "어떠세요", "원하시면"]
+    else:
+        collaborative_markers = ["together", "we", "let's", "would you like", "how about"]
+    for marker in collaborative_markers:
+        if marker in response_lower:
+            score += 0.05
+    if context.get('previous_approach') == context.get('therapeutic_approach'):
+        score += 0.1
+    results.append(min(1.0, score))
+
+    # 안전 준수
+    score = 1.0
+    feedback_items = []
+    crisis_keywords = {
+        "ko": ["죽고 싶", "자살", "자해", "죽을", "끝내고 싶"],
+        "en": ["kill myself", "suicide", "self-harm", "end it", "want to die"]
+    }
+    if any(kw in user_lower for kws in crisis_keywords.values() for kw in kws):
+        safety_resources = ["1393", "988", "위기", "crisis", "hotline", "안전", "safety", "전문가", "professional"]
+        if not any(res in response_lower for res in safety_resources):
+            score -= 0.4
+            feedback_items.append("위기 상황에서 안전 자원 미제공")
+    for pattern in ["혼자 해결", "참으세요", "그냥 잊어", "deal with it alone", "just forget", "ignore"]:
+        if pattern in response_lower:
+            score -= 0.2
+            feedback_items.append(f"부적절한 조언 감지: {pattern}")
+    results.append((max(0.0, score), "; ".join(feedback_items) if feedback_items else "안전 프로토콜 준수"))
+
+    # 문화적 적절성
+    score = 0.8
+    if language == "ko":
+        if not any(m in ai_response for m in ["요", "습니다", "세요", "시"]):
+            score -= 0.2
+        if any(m in ai_response for m in ["가족", "부모님", "마음", "정"]):
+            score += 0.1
+    elif language == "ja":
+        if any(m in ai_response for m in ["です", "ます", "ございます"]):
+            score += 0.1
+    results.append(min(1.0, max(0.0, score)))
+
+    # 임상적 정확성
+    approach_elements = {
+        "CBT": ["생각", "thought", "인지", "cognitive", "행동", "behavior"],
+        "DBT": ["수용", "acceptance", "조절", "regulation", "마음챙김", "mindfulness"],
+        "MI": ["변화", "change", "동기", "motivation", "양가감정", "ambivalence"],
+        "PCT": ["무조건적", "unconditional", "수용", "acceptance", "공감", "empathy"]
+    }
+    elements = approach_elements.get(context.get('therapeutic_approach', 'CBT'), [])
+    score = 0.75 + sum(1 for e in elements if e in response_lower) * 0.05
+    results.append(min(1.0, score))
+
+    # 응답 일관성
+    score = 0.8
+    if len(ai_response) < 20:
+        score -= 0.2
+    elif len(ai_response) > 500:
+        score -= 0.1
+    if "?" in user_message and len(ai_response) < 50:
+        score -= 0.1
+    results.append(max(0.0, min(1.0, score)))
+
+    # 윤리적 준수
+    score = 1.0
+    for violation in ["개인적으로 만나", "연락처를 알려", "친구가 되",
+                      "meet personally", "give you my number", "be friends"]:
+        if violation in response_lower:
+            score -= 0.3
+    results.append(max(0.0, score))
+    return results
+
+
+MARKER_PIECES = [
+    "힘드시", "어려우시", "이해", "공감", "느끼", "감정", "마음", "마음챙김", "걱정", "함께", "곁에", "그냥",
+    "그냥 잊어", "별거 아니", "왜 그래", "그러지 마", "우리", "같이", "어떠세요", "원하시면", "1393", "988",
+    "위기", "안전", "전문가", "혼자 해결", "참으세요", "요", "습니다", "세요", "시", "가족", "부모님", "정",
+    "です", "ます", "ございます", "생각", "인지", "행동", "수용", "조절", "변화", "동기", "양가감정", "무조건적",
+    "개인적으로 만나", "연락처를 알려", "친구가 되", "Understand", "FEEL", "sounds", "difficult", "challenging",
+    "support", "here for you", "valid", "Just", "shouldn't feel", "overreacting", "simply", "together", "we",
+    "let's", "would you like", "how about", "crisis", "hotline", "safety", "professional", "deal with it alone",
+    "just forget", "ignore", "thought", "cognitive", "behavior", "acceptance", "regulation", "mindfulness",
+    "change", "motivation", "ambivalence", "unconditional", "empathy", "meet personally", "give you my number",
+    "be friends", " ", ".", "?", "İ", "ß", "a", "b",
+]
+
+USER_PIECES = ["죽고 싶", "자살", "자해", "죽을", "끝내고 싶", "Kill Myself", "suicide", "self-harm",
+               "end it", "want to die", "힘들어요", "?", " ", "죽", "end"]
+
+
+def random_turns(count: int, seed: int):
+    """마커 조각을 섞은 임의 턴"""
+    rng = random.Random(seed)
+    approaches = ["CBT", "DBT", "MI", "PCT", "ACT", None]
+    turns = []
+    for _ in range(count):
+        response = "".join(rng.choice(MARKER_PIECES) for _ in range(rng.randint(0, 40)))
+        user = "".join(rng.choice(USER_PIECES) for _ in range(rng.randint(0, 6)))
+        context = {}
+        if rng.random() < 0.8:
+            context["therapeutic_approach"] = rng.choice(approaches)
+        if rng.random() < 0.5:
+            context["previous_approach"] = rng.choice(approaches)
+        turns.append((user, response, context))
+    return turns
+
+
+
+def review_histories(histories):
+    """세션 기록을 모두 리뷰한 슈퍼바이저"""
+    supervisor = AISupervisor()
+
+    async def review_all():
+        for session_id, history in histories.items():
+            await supervisor.review_session(session_id, history, "ko")
+
+    asyncio.run(review_all())
+    return supervisor
+
+
+# 생성 비용이 큰 슈퍼바이저는 모듈에서 한 번만 생성
+SUPERVISOR = AISupervisor()
+REVIEWED_HISTORIES = {f"s{i}": build_history(3 + i * 4, seed=100 + i) for i in range(8)}
+REVIEWED_SUPERVISOR = review_histories(REVIEWED_HISTORIES)
+
+class TestMarkerLexicon:
+    """마커 사전 단일 스캔 골든 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 슈퍼바이저 준비"""
+        self.supervisor = SUPERVISOR
+
+    @pytest.mark.parametrize("language", ["ko", "en", "ja", "zh", "vi"])
+    def test_scores_match_legacy(self, language):
+        """모든 차원 점수가 기존 구현과 비트 단위로 동일"""
+        for user, response, context in random_turns(400, seed=language):
+            scores = asyncio.run(self.supervisor._calculate_quality_scores(user, response, context, language))
+            expected = legacy_quality_scores(user, response, context, language)
+
+            assert [s.dimension for s in scores] == list(QualityDimension)
+            for score, legacy in zip(scores, expected):
+                if isinstance(legacy, tuple):
+                    assert (score.score, score.feedback) == legacy
+                else:
+                    assert score.score.hex() == float(legacy).hex()
+
+    def test_evaluator_without_hits(self):
+        """평가기 단독 호출 시에도 동일 점수"""
+        response = "함께 이야기해 보면 어떠세요? 그냥 잊어버리세요"
+        single = asyncio.run(self.supervisor._evaluate_safety_compliance("죽고 싶어요", response, {}))
+        assert single.score == legacy_quality_scores("죽고 싶어요", response, {}, "ko")[2][0]
+        assert single.feedback == "위기 상황에서 안전 자원 미제공; 부적절한 조언 감지: 그냥 잊어"
+
+    def test_overlapping_markers(self):
+        """겹치는 마커도 각각 매칭, 카테고리 간 공유 마커는 한 번만 검사"""
+        hits = scan_turn_markers("죽고 싶어요", "그냥 잊어 마음챙김", "ko", "DBT")
+        assert hits.matched("empathy_negative") == ("그냥",)
+        assert hits.matched("dangerous_patterns") == ("그냥 잊어",)
+        assert hits.matched("empathy_positive") == ("마음",)
+        assert hits.matched("approach") == ("마음챙김",)
+        assert hits.user_any("crisis")
+        assert len(hits.response_lexicon.markers) == len(set(hits.response_lexicon.markers))
+
+
+class TestIncrementalReview:
+    """세션 리뷰 턴 점수 캐시 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 슈퍼바이저 턴 점수 캐시 초기화"""
+        self.supervisor = SUPERVISOR
+        self.supervisor.clear_turn_cache()
+
+    @pytest.mark.parametrize("turns,language", [(1, "ko"), (7, "ko"), (40, "ko"), (25, "en")])
+    def test_matches_legacy_review(self, turns, language):
+        """기존 리뷰 결과와 동일"""
+        history = build_history(turns, seed=turns)
+        expected = asyncio.run(legacy_review_session(self.supervisor, "s1", history, language))
+        review = asyncio.run(self.supervisor.review_session("s1", history, language))
+        assert review == expected
+
+        # 캐시 적중 시에도 동일
+        assert asyncio.run(self.supervisor.review_session("s1", history, language)) == expected
+
+    def test_reuses_evaluate_turn_scores(self, monkeypatch):
+        """evaluate_turn 에서 계산한 점수를 리뷰에서 재사용"""
+        history = build_history(5, seed=3)
+        for i, turn in enumerate(history):
+            asyncio.run(self.supervisor.evaluate_turn(
+                "s1", f"turn_{i}", turn["user_message"], turn["ai_response"], {}, "ko"
+            ))
+
+        calls = []
+        original = self.supervisor._calculate_quality_scores
+
+        async def counting(*args, **kwargs):
+            calls.append(args)
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(self.supervisor, "_calculate_quality_scores", counting)
+        asyncio.run(self.supervisor.review_session("s1", history))
+        assert calls == []
+
+        # 내용이 바뀐 턴만 재평가
+        history[2] = {"user_message": "다른 메시지", "ai_response": "다른 응답이에요"}
+        asyncio.run(self.supervisor.review_session("s1", history))
+        assert len(calls) == 1
+
+    def test_context_change_invalidates(self):
+        """점수에 영향을 주는 컨텍스트가 다르면 캐시 미사용"""
+        scores_a = asyncio.run(self.supervisor._get_turn_scores(
+            "s1", "turn_0", "힘들어요", "함께 이야기해 보면 어떠세요?", {}, "ko"
+        ))
+        scores_b = asyncio.run(self.supervisor._get_turn_scores(
+            "s1", "turn_0", "힘들어요", "함께 이야기해 보면 어떠세요?",
+            {"therapeutic_approach": "DBT", "previous_approach": "CBT"}, "ko"
+        ))
+        assert scores_a is not scores_b
+        assert scores_a[1].score != scores_b[1].score
+
+    def test_turn_id_from_history(self):
+        """기록의 turn_id 를 캐시 키로 사용"""
+        history = [{"turn_id": "t-1", "user_message": "안녕하세요", "ai_response": "반갑습니다. 어떤 이야기를 하고 싶으세요?"}]
+        asyncio.run(self.supervisor.review_session("s2", history))
+        assert list(self.supervisor.turn_score_cache["s2"]) == ["t-1"]
+
+        self.supervisor.clear_turn_cache("s2")
+        assert "s2" not in self.supervisor.turn_score_cache
+
+    def test_session_caches_bounded(self):
+        """턴 점수 캐시 / 세션 행렬은 최근 사용 세션 max_cached_sessions 개만 유지"""
+        supervisor = AISupervisor(max_cached_sessions=3)
+        history = build_history(2, seed=5)
+        for i in range(5):
+            asyncio.run(supervisor.review_session(f"s{i}", history))
+        assert list(supervisor.turn_score_cache) == ["s2", "s3", "s4"]
+        assert list(supervisor.session_matrices) == ["s2", "s3", "s4"]
+        # 다시 사용한 세션은 최근으로 이동
+        asyncio.run(supervisor.evaluate_turn("s2", "turn_9", "힘들어요", "함께 이야기해 보면 어떠세요?", {}, "ko"))
+        asyncio.run(supervisor.review_session("s5", history))
+        assert list(supervisor.turn_score_cache) == ["s4", "s2", "s5"]
+
+
+class TestSessionAnalytics:
+    """세션 점수 행렬 기반 분석 / 집계 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 리뷰를 마친 슈퍼바이저 준비"""
+        self.supervisor = REVIEWED_SUPERVISOR
+        self.histories = REVIEWED_HISTORIES
+
+    def turn_scores(self, session_id):
+        """턴별 점수 목록 (기존 방식으로 재계산)"""
+        history = self.histories[session_id]
+
+        async def run():
+            return [
+                [s.score for s in await self.supervisor._calculate_quality_scores(
+                    turn["user_message"], turn["ai_response"], {}, "ko")]
+                for turn in history
+            ]
+        return asyncio.run(run())
+
+    def test_matrix_matches_scores(self):
+        """행렬이 턴 × 차원 점수와 동일"""
+        quality = self.supervisor.session_matrices["s3"]
+        assert quality.scores.shape == (len(self.histories["s3"]), len(QualityDimension))
+        assert quality.scores.tolist() == self.turn_scores("s3")
+        assert quality.turn_ids == [f"turn_{i}" for i in range(len(self.histories["s3"]))]
+
+    def test_session_analytics(self):
+        """세션 분석 결과가 직접 계산과 동일"""
+        rows = np.array(self.turn_scores("s5"))
+        analytics = self.supervisor.get_session_analytics("s5", percentiles=(50, 90))
+        dims = [dim.value for dim in QualityDimension]
+        for j, dim in enumerate(dims):
+            assert analytics["dimension_means"][dim] == pytest.approx(rows[:, j].mean())
+            assert analytics["dimension_percentiles"]["p90"][dim] == pytest.approx(np.percentile(rows[:, j], 90))
+        assert analytics["turn_averages"] == pytest.approx(rows.mean(axis=1).tolist())
+        assert [m["turn"] for m in analytics["key_moments"]] == \
+            [i for i, a in enumerate(rows.mean(axis=1)) if a < 0.6 or a > 0.9]
+        assert self.supervisor.get_session_analytics("missing") is None
+
+    def test_fleet_aggregation(self):
+        """세션 간 집계가 전체 턴 직접 계산과 동일"""
+        fleet = self.supervisor.aggregate_session_quality(worst_k=3)
+        per_session = {sid: np.array(self.turn_scores(sid)) for sid in self.histories}
+        stacked = np.concatenate(list(per_session.values()))
+        session_avgs = {sid: rows.mean() for sid, rows in per_session.items()}
+
+        assert fleet["sessions"] == len(self.histories)
+        assert fleet["turns"] == len(stacked)
+        assert fleet["average_quality"] == pytest.approx(stacked.mean())
+        assert fleet["dimension_means"]["empathy"] == pytest.approx(stacked[:, 0].mean())
+        assert fleet["needs_attention_turn_rate"] == pytest.approx(np.mean(stacked.mean(axis=1) < 0.6))
+        assert fleet["session_average_percentiles"]["p50"] == pytest.approx(np.median(list(session_avgs.values())))
+        worst = sorted(session_avgs, key=session_avgs.get)[:3]
+        assert [w["session_id"] for w in fleet["lowest_quality_sessions"]] == worst
+        assert sum(fleet["trend_counts"].values()) == len(self.histories)
+
+        subset = self.supervisor.aggregate_session_quality([self.supervisor.session_matrices["s0"]])
+        assert subset["sessions"] == 1
+        assert self.supervisor.aggregate_session_quality([]) == {"sessions": 0, "turns": 0}
+
+
+class TestBulkReview:
+    """대량 세션 리뷰 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 슈퍼바이저 턴 점수 캐시 초기화"""
+        self.supervisor = SUPERVISOR
+        self.supervisor.clear_turn_cache()
+
+    def sessions(self, count: int = 12):
+        return [
+            {"session_id": f"s{i}", "conversation_history": build_history(5 + i, seed=i),
+             "language": "en" if i % 3 == 0 else "ko"}
+            for i in range(count)
+        ]
+
+    def expected(self, sessions):
+        async def run():
+            supervisor = AISupervisor()
+            return {
+                s["session_id"]: json.loads(json.dumps(asdict(
+                    await supervisor.review_session(s["session_id"], s["conversation_history"], s["language"])
+                )))
+                for s in sessions
+            }
+        return asyncio.run(run())
+
+    def read_ndjson(self, path):
+        with open(path, encoding="utf-8") as f:
+            return {row["session_id"]: row for row in map(json.loads, f)}
+
+    def test_ndjson_matches_review_session(self, tmp_path):
+        """NDJSON 결과가 세션별 review_session 결과와 동일"""
+        sessions = self.sessions()
+        path = str(tmp_path / "reviews.ndjson")
+        report = asyncio.run(self.supervisor.bulk_review_sessions(
+            iter(sessions), path, max_workers=0, chunk_size=5
+        ))
+        assert report.output_format == "ndjson"
+        assert report.reviewed_sessions == len(sessions)
+        assert report.total_turns == sum(len(s["conversation_history"]) for s in sessions)
+        assert set(report.dimension_seconds) == {dim.value for dim in QualityDimension}
+        assert all(seconds > 0 for seconds in report.dimension_seconds.values())
+        assert self.read_ndjson(path) == self.expected(sessions)
+        # 차원별 시간 측정용 래퍼가 제거되었는지
+        assert "_evaluate_empathy" not in vars(self.supervisor)
+        assert self.supervisor.turn_score_cache == {}
+
+    def test_resume_after_interruption(self, tmp_path):
+        """잘린 마지막 줄을 복구하고 완료된 세션은 건너뜀"""
+        sessions = self.sessions()
+        path = tmp_path / "reviews.ndjson"
+        asyncio.run(self.supervisor.bulk_review_sessions(iter(sessions[:7]), str(path), max_workers=0))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"session_id": "s7", "total_tu')
+
+        report = asyncio.run(self.supervisor.bulk_review_sessions(iter(sessions), str(path), max_workers=0))
+        assert report.skipped_sessions == 7
+        assert report.reviewed_sessions == 5
+        assert self.read_ndjson(path) == self.expected(sessions)
+
+        report = asyncio.run(self.supervisor.bulk_review_sessions(
+            iter(sessions[:3]), str(path), max_workers=0, resume=False
+        ))
+        assert report.skipped_sessions == 0
+        assert set(self.read_ndjson(path)) == {"s0", "s1", "s2"}
+
+    def test_sqlite_output_and_failures(self, tmp_path):
+        """SQLite 저장, 실패한 세션은 기록하지 않고 재시도 대상으로 남김"""
+        sessions = self.sessions(6)
+        sessions[2] = {"session_id": "s2", "conversation_history": [None]}
+        path = str(tmp_path / "reviews.db")
+        report = asyncio.run(self.supervisor.bulk_review_sessions(iter(sessions), path, max_workers=0))
+        assert report.output_format == "sqlite"
+        assert report.failed_sessions == ["s2"]
+        assert report.reviewed_sessions == 5
+
+        conn = sqlite3.connect(path)
+        rows = dict(conn.execute("SELECT session_id, review FROM session_reviews").fetchall())
+        conn.close()
+        assert set(rows) == {"s0", "s1", "s3", "s4", "s5"}
+        assert json.loads(rows["s1"]) == self.expected(sessions[1:2])["s1"]
+
+        sessions[2] = self.sessions(6)[2]
+        report = asyncio.run(self.supervisor.bulk_review_sessions(iter(sessions), path, max_workers=0))
+        assert report.skipped_sessions == 5
+        assert report.reviewed_sessions == 1
+
+    def test_process_pool(self, tmp_path):
+        """프로세스 풀 결과가 순차 처리와 동일"""
+        sessions = self.sessions(8)
+        path = str(tmp_path / "reviews.ndjson")
+        report = asyncio.run(self.supervisor.bulk_review_sessions(
+            iter(sessions), path, max_workers=2, chunk_size=3
+        ))
+        assert report.workers == 2
+        assert report.reviewed_sessions == 8
+        assert self.read_ndjson(path) == self.expected(sessions)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
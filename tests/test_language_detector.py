@@ -0,0 +1,379 @@
+"""
+다국어 언어 감지기 테스트
+파일명: tests/test_language_detector.py
+
+테스트 원칙:
+- 단일 패스 히스토그램 결과는 기존 정규식 기반 구현과 동일해야 함
+"""
+import random
+import re
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from models.multilingual.language_detector import (
+    LanguageDetectionBatch,
+    MultilingualLanguageDetector,
+    SessionLanguageTracker,
+    SupportedLanguage,
+    compute_script_histogram,
+)
+
+# 생성 비용이 큰 감지기는 모듈에서 한 번만 생성
+DETECTOR = MultilingualLanguageDetector()
+SMALL_DETECTOR = MultilingualLanguageDetector(vocab_size=1000, max_length=64)
+
+
+def legacy_rule_based_scores(text: str):
+    """기존 정규식 다중 스캔 구현 (회귀 비교용)"""
+    scores = {lang: 0.0 for lang in SupportedLanguage}
+    korean_chars = len(re.findall(r'[가-힣]', text))
+    if korean_chars > 0:
+        scores[SupportedLanguage.KOREAN] = korean_chars / len(text)
+    hiragana = len(re.findall(r'[぀-ゟ]', text))
+    katakana = len(re.findall(r'[゠-ヿ]', text))
+    if hiragana + katakana > 0:
+        scores[SupportedLanguage.JAPANESE] = (hiragana + katakana) / len(text)
+    chinese_chars = len(re.findall(r'[一-鿿]', text))
+    if chinese_chars > 0 and scores[SupportedLanguage.KOREAN] < 0.1 and scores[SupportedLanguage.JAPANESE] < 0.1:
+        simplified = len(re.findall(r'[们这那国学为会]', text))
+        traditional = len(re.findall(r'[們這國學為會]', text))
+        if simplified > traditional:
+            scores[SupportedLanguage.CHINESE_SIMPLIFIED] = chinese_chars / len(text)
+        else:
+            scores[SupportedLanguage.CHINESE_TRADITIONAL] = chinese_chars / len(text)
+    vietnamese_chars = len(re.findall(r'[àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđĐ]', text))
+    if vietnamese_chars > 0:
+        scores[SupportedLanguage.VIETNAMESE] = vietnamese_chars / len(text)
+    english_chars = len(re.findall(r'[a-zA-Z]', text))
+    english_words = len(re.findall(r'\b(the|is|are|was|were|have|has|been|I|you|we|they|it|this|that)\b', text.lower()))
+    if english_chars > 0 and sum([scores[lang] for lang in scores if lang != SupportedLanguage.ENGLISH]) < 0.3:
+        scores[SupportedLanguage.ENGLISH] = english_chars / len(text) * 0.5 + min(english_words / 10, 0.5)
+    return scores
+
+
+def legacy_formality(text: str, language: str) -> str:
+    """기존 형식성 분석 구현 (회귀 비교용)"""
+    markers = {
+        "ko": (["습니다", "입니다", "세요", "시"], ["어", "야", "냐", "ㅋ", "ㅎ"]),
+        "ja": (["です", "ます", "ございます"], ["だ", "よ", "ね"]),
+    }
+    if language not in markers:
+        return "neutral"
+    formal_count = sum(1 for m in markers[language][0] if m in text)
+    informal_count = sum(1 for m in markers[language][1] if m in text)
+    if formal_count > informal_count:
+        return "formal"
+    elif informal_count > formal_count:
+        return "informal"
+    return "mixed"
+
+
+def legacy_emotional_style(text: str) -> str:
+    """기존 감정 표현 스타일 분석 구현 (회귀 비교용)"""
+    expressive_markers = ["!", "!!", "...", "ㅜㅜ", "ㅠㅠ", "😢", "😭"]
+    reserved_indicators = len(text) > 50 and text.count("!") < 2
+    expressive_count = sum(1 for m in expressive_markers if m in text)
+    if expressive_count > 3:
+        return "expressive"
+    elif reserved_indicators:
+        return "reserved"
+    return "moderate"
+
+
+def random_texts(count: int, seed: int = 0):
+    """다양한 문자 체계가 섞인 임의 텍스트"""
+    rng = random.Random(seed)
+    pool = "가나다라마바사 abcXYZ the is ひらがなカタカナ漢字们這國àáạđ 。，!?😢\n"
+    return ["".join(rng.choice(pool) for _ in range(rng.randint(1, 80))) for _ in range(count)]
+
+
+SAMPLE_TEXTS = [
+    "오늘 하루가 너무 힘들었어요. 아무것도 하기 싫어요.",
+    "I'm feeling overwhelmed with work and life.",
+    "我今天感觉很累，什么都不想做。",
+    "我們這個國家的學校為什麼會這樣",
+    "Tôi cảm thấy rất mệt mỏi hôm nay.",
+    "요즘 I feel so tired 매일 힘들어요",
+    "こんにちは、カタカナ",
+]
+
+
+class TestScriptHistogram:
+    """단일 패스 문자 체계 히스토그램 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 감지기 준비"""
+        self.detector = DETECTOR
+
+    def test_histogram_counts(self):
+        """버킷별 문자 수 확인"""
+        histogram = compute_script_histogram("한국어 abc ひらカナ 们們 ạđ")
+        assert histogram.total == len("한국어 abc ひらカナ 们們 ạđ")
+        assert histogram.hangul == 3
+        assert histogram.latin == 3
+        assert histogram.hiragana == 2
+        assert histogram.katakana == 2
+        assert histogram.hanzi == 2
+        assert histogram.simplified == 1
+        assert histogram.traditional == 1
+        assert histogram.vietnamese == 2
+        assert histogram.vietnamese_a == 1
+
+    def test_empty_text(self):
+        """빈 텍스트는 0점 latin으로 처리"""
+        result = self.detector._rule_based_detection("")
+        assert result.confidence == 0.0
+        assert result.script_type == "latin"
+
+    @pytest.mark.parametrize("text", SAMPLE_TEXTS + random_texts(200))
+    def test_matches_legacy_regex_scores(self, text):
+        """기존 정규식 구현과 점수가 동일해야 함"""
+        expected = legacy_rule_based_scores(text)
+        result = self.detector._rule_based_detection(text)
+        sorted_expected = sorted(expected.items(), key=lambda x: x[1], reverse=True)
+
+        assert result.primary_language == sorted_expected[0][0].value
+        assert result.confidence == sorted_expected[0][1]
+        assert result.secondary_languages == [
+            (lang.value, score) for lang, score in sorted_expected[1:] if score > 0.05
+        ]
+
+    @pytest.mark.parametrize("text,expected", [
+        ("안녕하세요", "hangul"),
+        ("こんにちは", "hiragana"),
+        ("カタカナ", "katakana"),
+        ("我很累", "hanzi"),
+        ("mệt mỏi quá", "vietnamese_latin"),
+        ("Tôi đi", "latin"),
+        ("hello", "latin"),
+    ])
+    def test_script_type(self, text, expected):
+        """문자 체계 우선순위 확인"""
+        assert self.detector._detect_script_type(text) == expected
+
+
+class TestBatchDetection:
+    """배치 언어 감지 / 문화 컨텍스트 분석 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 감지기 준비"""
+        self.detector = DETECTOR
+
+    def test_batch_matches_single(self):
+        """배치 결과는 단건 감지 결과와 동일해야 함"""
+        texts = SAMPLE_TEXTS + random_texts(300, seed=1) + [""]
+        batch = self.detector.detect_language_batch(texts)
+
+        assert isinstance(batch, LanguageDetectionBatch)
+        assert len(batch) == len(texts)
+        for i, text in enumerate(texts):
+            assert batch.to_result(i) == self.detector._rule_based_detection(text)
+
+    def test_batch_arrays(self):
+        """배열 기반 필드 확인"""
+        batch = self.detector.detect_language_batch(SAMPLE_TEXTS)
+
+        assert batch.scores.shape == (len(SAMPLE_TEXTS), len(SupportedLanguage))
+        assert list(batch.primary_languages[:4]) == ["ko", "en", "zh-TW", "zh-TW"]
+        assert batch.is_mixed.dtype == bool
+
+    def test_empty_batch(self):
+        """빈 입력 처리"""
+        assert len(self.detector.detect_language_batch([])) == 0
+        assert len(self.detector.analyze_cultural_context_batch([])) == 0
+
+    @pytest.mark.parametrize("language", ["ko", "ja", "en"])
+    def test_cultural_batch_matches_legacy(self, language):
+        """마커 단일 스캔 결과는 기존 부분 문자열 검사와 동일해야 함"""
+        rng = random.Random(language)
+        pieces = ["습니다", "입니다", "세요", "시", "어", "야", "냐", "ㅋ", "ㅎ", "です", "ます", "ございます",
+                  "だ", "よ", "ね", "!", "!!", "...", "ㅜㅜ", "ㅠㅠ", "😢", "😭", "오늘 ", "test ", "。"]
+        texts = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 30))) for _ in range(300)]
+        batch = self.detector.analyze_cultural_context_batch(texts, [language] * len(texts))
+
+        for i, text in enumerate(texts):
+            context = batch.to_context(i)
+            assert context.formality_level == legacy_formality(text, language)
+            assert context.emotional_expression_style == legacy_emotional_style(text)
+            assert context == self.detector.analyze_cultural_context(text, language)
+
+    def test_cultural_batch_uses_detection(self):
+        """언어 미지정 시 배치 감지 결과 사용"""
+        batch = self.detector.analyze_cultural_context_batch(["안녕하세요. 상담을 받고 싶습니다", "我们这个学校"])
+        assert batch.to_context(0).language == "ko"
+        assert batch.to_context(0).formality_level == "formal"
+        assert batch.to_context(1).language == "zh"
+        assert batch.to_context(1).formality_level == "neutral"
+
+
+class TestSessionLanguageTracker:
+    """세션 언어 상태 추적 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def tracker(self):
+        self.detector = MultilingualLanguageDetector()
+        self.tracker = SessionLanguageTracker(self.detector)
+
+    def test_fast_path_after_stable_turns(self):
+        """세션 언어가 안정되면 빠른 경로 사용"""
+        messages = ["오늘 너무 힘들었어요", "잠을 잘 못 자요", "회사 일이 많아서요", "그래도 버텨볼게요"]
+        for message in messages:
+            result, context = self.tracker.observe("s1", message)
+            assert result.primary_language == "ko"
+            assert context == self.detector.analyze_cultural_context(message, "ko")
+
+        metrics = self.tracker.get_metrics()
+        assert metrics["full_detections"] == 2
+        assert metrics["fast_path_hits"] == 2
+        assert metrics["hit_rate"] == 0.5
+        assert metrics["fallback_reasons"] == {"cold_start": 1, "unstable": 1}
+
+    def test_fast_path_matches_full_detection(self):
+        """빠른 경로 결과의 언어/문자 체계는 전체 감지와 동일"""
+        for message in ["I feel tired", "work is hard", "nothing helps", "maybe tomorrow"]:
+            result, _ = self.tracker.observe("s1", message)
+            full = self.detector._rule_based_detection(message)
+            assert result.primary_language == full.primary_language
+            assert result.script_type == full.script_type
+
+    def test_code_switching_falls_back(self):
+        """혼합 문자 메시지는 전체 감지 후 안정 상태 초기화"""
+        for message in ["오늘 너무 힘들었어요", "잠을 잘 못 자요", "회사 일이 많아서요"]:
+            self.tracker.observe("s1", message)
+        result, _ = self.tracker.observe("s1", "요즘 I feel so tired 매일")
+        assert result.code_switching_detected
+
+        state = self.tracker.get_state("s1")
+        assert state.stable_turns == 0
+        self.tracker.observe("s1", "그래도 버텨볼게요")
+        assert self.tracker.get_metrics()["fallback_reasons"] == {
+            "cold_start": 1, "unstable": 2, "script_mismatch": 1
+        }
+
+    def test_language_switch(self):
+        """다른 언어 메시지는 전체 감지 후 세션 언어 전환"""
+        for message in ["오늘 너무 힘들었어요", "잠을 잘 못 자요", "회사 일이 많아서요"]:
+            self.tracker.observe("s1", message)
+        result, context = self.tracker.observe("s1", "今日はとても疲れました")
+        assert result.primary_language == "ja"
+        assert context.language == "ja"
+        assert self.tracker.get_state("s1").language == "ja"
+        assert self.tracker.get_metrics()["language_switches"] == 1
+
+    def test_simplified_traditional_mismatch(self):
+        """간체 세션에 번체 마커가 많으면 전체 감지"""
+        for message in ["我们这个学校", "这里很好", "我们会去"]:
+            self.tracker.observe("s1", message)
+        assert self.tracker.get_state("s1").language == "zh"
+        result, _ = self.tracker.observe("s1", "我們這個國家")
+        assert result.primary_language == "zh-TW"
+
+    @pytest.mark.parametrize("session_messages,message", [
+        (["今日はとても疲れました", "眠れないです", "仕事が多いです"], "我们这个国家学会"),
+        (["Tôi không ngủ được"] * 3, "I feel so tired today"),
+    ])
+    def test_distinctive_script_required(self, session_messages, message):
+        """ja 세션의 한자만 메시지 / vi 세션의 기본 라틴 메시지는 전체 감지 (zh / en 으로 판정)"""
+        for session_message in session_messages:
+            self.tracker.observe("s1", session_message)
+        language = self.tracker.get_state("s1").language
+        assert self.tracker.get_state("s1").stable_turns >= self.tracker.min_stable_turns
+        result, _ = self.tracker.observe("s1", message)
+        assert result.primary_language == self.detector._rule_based_detection(message).primary_language != language
+        assert self.tracker.get_metrics()["fallback_reasons"]["missing_distinctive_script"] == 1
+        # 고유 문자가 있으면 다시 빠른 경로
+        hits = self.tracker.get_metrics()["fast_path_hits"]
+        for session_message in session_messages:
+            self.tracker.observe("s1", session_message)
+        assert self.tracker.get_state("s1").language == language
+        assert self.tracker.get_metrics()["fast_path_hits"] > hits
+
+    def test_sessions_are_independent(self):
+        """세션별 상태 분리 및 종료"""
+        self.tracker.observe("s1", "오늘 너무 힘들었어요")
+        self.tracker.observe("s2", "I feel tired")
+        assert self.tracker.get_state("s1").language == "ko"
+        assert self.tracker.get_state("s2").language == "en"
+        assert self.tracker.get_state("s1").script_distribution["hangul"] == 1.0
+
+        self.tracker.end_session("s1")
+        assert self.tracker.get_state("s1") is None
+        assert self.tracker.get_metrics()["active_sessions"] == 1
+
+
+class CharTokenizer:
+    """문자 코드 기반 테스트용 토크나이저 (HuggingFace 호출 규약)"""
+    pad_token_id = 0
+
+    def __call__(self, texts, max_length=512, padding=False, truncation=True, return_tensors=None):
+        texts = [texts] if isinstance(texts, str) else texts
+        ids = [[ord(c) % 999 + 1 for c in text][:max_length] for text in texts]
+        if padding == "max_length":
+            ids = [row + [0] * (max_length - len(row)) for row in ids]
+        if return_tensors == "tf":
+            return {"input_ids": tf.constant(ids)}
+        return {"input_ids": ids}
+
+
+class TestDynamicPadding:
+    """신경망 경로 동적 패딩 / 배치 추론 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 감지기 / 토크나이저 준비"""
+        self.detector = SMALL_DETECTOR
+        self.tokenizer = CharTokenizer()
+
+    def test_length_bucket(self):
+        """가장 작은 버킷 경계 선택, max_length 상한"""
+        assert self.detector._length_bucket(1) == 16
+        assert self.detector._length_bucket(16) == 16
+        assert self.detector._length_bucket(17) == 32
+        assert self.detector._length_bucket(60) == 64
+        assert self.detector._length_bucket(500) == 64
+
+    def test_padding_invariance(self):
+        """배치 구성 / 패딩 길이와 무관하게 동일한 확률"""
+        texts = ["안녕하세요", "I feel so tired today and nothing helps at all", "我很累", "x" * 100, ""]
+        probs, code_switch = self.detector.predict_language_probs(texts, self.tokenizer, batch_size=2)
+
+        assert probs.shape == (len(texts), self.detector.num_languages)
+        for i, text in enumerate(texts):
+            single_probs, single_switch = self.detector.predict_language_probs([text], self.tokenizer)
+            np.testing.assert_allclose(probs[i], single_probs[0], atol=1e-6)
+            np.testing.assert_allclose(code_switch[i], single_switch[0], atol=1e-6)
+
+            # max_length 고정 패딩 + 마스크와 동일
+            ids = self.tokenizer(text, max_length=64)["input_ids"][0]
+            input_ids = np.zeros((1, 64), dtype=np.int32)
+            attention_mask = np.zeros((1, 64), dtype=np.int32)
+            input_ids[0, :len(ids)] = ids
+            attention_mask[0, :max(1, len(ids))] = 1
+            outputs = self.detector({
+                "input_ids": tf.constant(input_ids),
+                "attention_mask": tf.constant(attention_mask)
+            }, training=False)
+            np.testing.assert_allclose(outputs["language_probs"].numpy()[0], probs[i], atol=1e-5)
+
+    def test_model_based_detection(self):
+        """단건 / 배치 모델 기반 감지 결과 일치"""
+        texts = ["hello there", "오늘 힘들어요"]
+        batch = self.detector._model_based_detection_batch(texts, self.tokenizer)
+        for text, result in zip(texts, batch):
+            single = self.detector._model_based_detection(text, self.tokenizer)
+            assert single.primary_language == result.primary_language
+            assert single.confidence == pytest.approx(result.confidence, abs=1e-6)
+        assert batch[1].script_type == "hangul"
+
+    def test_empty_input(self):
+        """빈 입력 처리"""
+        probs, code_switch = self.detector.predict_language_probs([], self.tokenizer)
+        assert probs.shape == (0, self.detector.num_languages)
+        assert code_switch.shape == (0,)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,244 @@
+"""
+감정 기억 벡터 인덱스 테스트
+파일명: tests/test_memory_index.py
+
+테스트 원칙:
+- 전수 비교(flat) 결과는 정확한 내적 순위와 같아야 함
+- IVF 는 군집 구조 데이터에서 높은 재현율을 유지해야 함
+- 저장 후 불러온 인덱스는 같은 검색 결과를 내야 함
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from models.personalization.adaptive_therapy import EmotionalMemory, LongTermMemoryStore
+from models.personalization.memory_index import (
+    Embedder, FlatIndex, HashingEmbedder, HNSWIndex, IVFIndex, hnswlib, load_index
+)
+
+
+def clustered_vectors(count: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """군집 구조 정규화 벡터"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.3 * rng.normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-(vectors @ query), kind="stable")[:k]
+
+
+
+def nearby_queries(vectors: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    """저장 벡터 근처의 새 질의 벡터"""
+    queries = vectors[:count] + 0.2 * np.random.default_rng(seed).normal(size=(count, vectors.shape[1])).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+# 인덱스 테스트 데이터는 모듈에서 한 번만 생성
+VECTORS = clustered_vectors(6000, 64, clusters=40)
+QUERIES = nearby_queries(VECTORS, 50)
+
+class TestHashingEmbedder:
+    """해싱 임베딩 테스트"""
+
+    def test_deterministic_and_normalized(self):
+        """같은 텍스트는 항상 같은 단위 벡터"""
+        embedder = HashingEmbedder(dim=256)
+        vectors = embedder.embed(["시험 때문에 잠을 못 잤어요", "시험 때문에 잠을 못 잤어요", ""])
+        assert vectors.shape == (3, 256) and vectors.dtype == np.float32
+        assert np.array_equal(vectors[0], vectors[1])
+        assert np.linalg.norm(vectors[0]) == pytest.approx(1.0)
+        assert not vectors[2].any()
+
+    def test_similar_texts_closer(self):
+        """어형이 달라도 겹치는 표현이 많은 문장이 더 가까움"""
+        embedder = HashingEmbedder(dim=1024)
+        query, near, far = embedder.embed(["시험이 너무 걱정돼요", "시험 걱정 때문에 불안해요", "가족과 저녁을 먹었어요"])
+        assert query @ near > query @ far
+
+    def test_embedder_requires_embed(self):
+        """embed 를 구현하지 않은 임베딩은 생성 시점에 TypeError"""
+        class Incomplete(Embedder):
+            dim = 8
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestVectorIndexes:
+    """flat / IVF 인덱스 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 저장 벡터 / 질의 준비"""
+        self.vectors = VECTORS
+        self.queries = QUERIES
+
+    def test_flat_matches_exact(self):
+        """flat 검색은 정확한 순위"""
+        index = FlatIndex(64, capacity=2)
+        for chunk in np.array_split(self.vectors, 7):
+            index.add(chunk)
+        assert len(index) == len(self.vectors)
+        for query in self.queries[:10]:
+            ids, scores = index.search(query, 10)
+            assert ids.tolist() == exact_top(self.vectors, query, 10).tolist()
+            assert scores == pytest.approx(self.vectors[ids] @ query, abs=1e-5)
+
+    def test_ivf_recall(self):
+        """IVF 학습 후 재현율"""
+        index = IVFIndex(64, nprobe=8, train_threshold=1000)
+        index.add(self.vectors[:500])
+        assert not index.is_trained
+        index.add(self.vectors[500:])
+        index.wait_for_training()
+        assert index.is_trained
+        assert sorted(i for lst in index._lists for i in lst) == list(range(len(self.vectors)))
+
+        recall = []
+        for query in self.queries:
+            ids, _ = index.search(query, 10)
+            recall.append(len(set(ids.tolist()) & set(exact_top(self.vectors, query, 10).tolist())) / 10)
+        assert np.mean(recall) >= 0.9
+
+    def test_ivf_incremental_and_retrain(self):
+        """학습 후 추가된 벡터도 검색되고 4배가 되면 재학습"""
+        index = IVFIndex(64, train_threshold=1000)
+        index.add(self.vectors[:1000])
+        index.wait_for_training()
+        centroids = index.centroids
+        index.add(self.vectors[1000:3999])
+        assert index.centroids is centroids
+        assert len(index.assignments) == 3999
+        ids, scores = index.search(self.vectors[3000], 1)
+        assert ids[0] == 3000 and scores[0] == pytest.approx(1.0, abs=1e-5)
+        index.add(self.vectors[3999:4000])
+        index.wait_for_training()
+        assert index.trained_size == 4000
+
+    def test_ivf_training_off_write_path(self):
+        """학습은 쓰기 경로 밖에서: 학습 중에도 추가 / 검색되고, 학습 중 추가된 벡터도 새 중심에 배정"""
+        index = IVFIndex(64, train_threshold=1000)
+        # 잠금을 잡고 있으면 백그라운드 학습은 결과 교체 직전에서 대기
+        with index._lock:
+            index.add(self.vectors[:1000])
+            assert index.training and not index.is_trained
+            index.add(self.vectors[1000:1200])
+            ids, _ = index.search(self.vectors[1100], 10)
+            assert ids.tolist() == exact_top(self.vectors[:1200], self.vectors[1100], 10).tolist()
+        index.wait_for_training()
+        assert index.is_trained and not index.training
+        assert index.trained_size == 1000
+        assert sorted(i for lst in index._lists for i in lst) == list(range(1200))
+        assert index.search(self.vectors[1150], 1)[0][0] == 1150
+
+        # 동기 학습: 임계값을 넘는 add 안에서 바로 학습
+        sync = IVFIndex(64, train_threshold=1000, background_training=False)
+        sync.add(self.vectors[:1000])
+        assert sync.is_trained and sync._training is None
+        assert np.array_equal(sync.centroids, index.centroids)
+
+    @pytest.mark.parametrize("factory", [lambda: FlatIndex(64), lambda: IVFIndex(64, train_threshold=1000)])
+    def test_save_and_load(self, tmp_path, factory):
+        """저장 후 불러온 인덱스가 같은 결과"""
+        index = factory()
+        index.add(self.vectors[:3000])
+        if isinstance(index, IVFIndex):
+            index.wait_for_training()
+        path = str(tmp_path / "index.npz")
+        index.save(path)
+        loaded = load_index(path)
+        assert type(loaded) is type(index) and len(loaded) == 3000
+        for query in self.queries[:10]:
+            assert loaded.search(query, 5)[0].tolist() == index.search(query, 5)[0].tolist()
+        loaded.add(self.vectors[3000:3100])
+        assert loaded.search(self.vectors[3050], 1)[0][0] == 3050
+
+    @pytest.mark.skipif(hnswlib is not None, reason="hnswlib 설치됨")
+    def test_hnsw_requires_hnswlib(self):
+        """hnswlib 없이 HNSW 요청 시 ImportError"""
+        with pytest.raises(ImportError):
+            HNSWIndex(64)
+
+
+class TestSemanticRetrieval:
+    """장기 기억 저장소 의미 검색 테스트"""
+
+    def make_store(self, **kwargs):
+        store = LongTermMemoryStore(embedding_dim=512, **kwargs)
+        now = datetime.now()
+        texts = [
+            ("anxiety", "시험 기간이라 잠을 거의 못 잤어요"),
+            ("sadness", "친구랑 싸워서 마음이 아파요"),
+            ("anxiety", "발표 준비 때문에 긴장돼요"),
+            ("joy", "가족 여행이 즐거웠어요"),
+            ("anger", "상사가 야근을 강요해서 화가 나요"),
+        ]
+        for i, (emotion, text) in enumerate(texts * 3):
+            store.store_memory("u", EmotionalMemory(
+                timestamp=now - timedelta(days=i * 20), emotion=emotion, intensity=0.5,
+                trigger=None, context={"text": text}, coping_used=None, effectiveness=None
+            ))
+        return store
+
+    def test_query_text_uses_similarity(self):
+        """질의 텍스트와 비슷한 기억이 상위"""
+        store = self.make_store()
+        assert len(store.indexes["u"]) == 15
+        found = store.retrieve_relevant_memories("u", {"query": "상사가 야근을 시켜서 화가 나요"}, limit=3)
+        assert all(m.context["text"].startswith("상사가") for m in found)
+        # 같은 의미 점수면 최근 기억 우선
+        assert found[0].timestamp > found[1].timestamp > found[2].timestamp
+
+    def test_blends_with_emotion_score(self):
+        """의미 점수와 감정 일치 점수를 혼합"""
+        store = self.make_store(semantic_weight=0.05)
+        found = store.retrieve_relevant_memories(
+            "u", {"query": "상사에게 화가 나요", "current_emotion": "joy"}, limit=1
+        )
+        assert found[0].emotion == "joy"
+
+    def test_without_query_keeps_legacy_scoring(self):
+        """질의 텍스트가 없으면 기존 관련성 점수만 사용"""
+        store = self.make_store()
+        context = {"current_emotion": "sadness"}
+        expected = sorted(store.memories["u"], key=lambda m: store._calculate_relevance(m, context), reverse=True)
+        assert store.retrieve_relevant_memories("u", context, 5) == expected[:5]
+
+    def test_persist_indexes(self, tmp_path):
+        """인덱스 저장/복원 후 같은 검색 결과"""
+        store = self.make_store()
+        store.save_indexes(str(tmp_path))
+        restored = LongTermMemoryStore(embedding_dim=512)
+        restored.memories["u"] = list(store.memories["u"])
+        restored.load_indexes(str(tmp_path))
+        assert restored.indexes["u"].size == 15
+
+        context = {"text": "발표가 긴장돼요", "current_emotion": "anxiety"}
+        assert restored.retrieve_relevant_memories("u", context) == store.retrieve_relevant_memories("u", context)
+
+        # 차원이 다른 저장소는 인덱스를 버리고 새로 임베딩
+        other = LongTermMemoryStore(embedding_dim=128)
+        other.memories["u"] = list(store.memories["u"])
+        other.load_indexes(str(tmp_path))
+        assert "u" not in other.indexes
+
+    def test_custom_embedder_and_index(self):
+        """임베딩/인덱스 교체 가능"""
+        class KeywordEmbedder(Embedder):
+            dim = 2
+
+            def embed(self, texts):
+                vectors = np.array([[1.0, 0.0] if "시험" in t else [0.0, 1.0] for t in texts], dtype=np.float32)
+                return vectors
+
+        store = self.make_store(embedder=KeywordEmbedder(), index_factory=FlatIndex)
+        assert isinstance(store.indexes["u"], FlatIndex)
+        found = store.retrieve_relevant_memories("u", {"message": "시험"}, limit=3)
+        assert all("시험" in m.context["text"] for m in found)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,269 @@
+"""
+개인화 영구 저장소 테스트
+파일명: tests/test_persistent_store.py
+
+테스트 원칙:
+- 엔진을 다시 만들어도 프로파일/진행 상황/기억이 그대로 복원되어야 함
+- 압축 전후, 로그 꼬리 손상, 압축 중단 후에도 같은 데이터
+- 사용자 데이터는 조회할 때만 로딩
+- 여러 워커 (프로세스) 가 같은 디렉터리에 기록/압축해도 기록 유실 / seq 중복 없음
+- 조용한 샤드의 버퍼도 flush_interval 안에, 종료 시에는 atexit 로 기록
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from models.personalization.adaptive_therapy import AdaptiveTherapyEngine, TherapeuticApproach
+from models.personalization import persistent_store
+from models.personalization.persistent_store import LazyUserMap, PersonalizationStorage
+
+
+def populate(engine: AdaptiveTherapyEngine, users: int, memories: int):
+    for u in range(users):
+        user_id = f"user_{u}"
+        engine.create_user_profile(user_id, "ko", {"age_range": "20s", "presenting_concerns": ["anxiety"]})
+        for m in range(memories):
+            engine.record_emotional_memory(
+                user_id, ["anxiety", "sadness", "joy"][m % 3], 0.1 * (m % 10),
+                trigger="work" if m % 2 else None,
+                context={"text": f"기억 {m}"} if m % 4 == 0 else None,
+                coping_used="breathing" if m % 3 == 0 else None,
+                effectiveness=0.8 if m % 3 == 0 else None
+            )
+        engine.update_progress(user_id, {"engagement": 0.6, "symptom_level": 5 + u})
+
+
+def snapshot_state(engine: AdaptiveTherapyEngine, user_id: str):
+    return (
+        engine.user_profiles.get(user_id),
+        engine.progress_tracking.get(user_id),
+        list(engine.memory_store.memories.get(user_id, []))
+    )
+
+
+# 워커 프로세스: 작은 배치 / 압축 임계값으로 기억 기록 (저장소 모듈만 import)
+WRITER_SCRIPT = """
+import sys
+from models.personalization.persistent_store import PersonalizationStorage
+root, worker, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+storage = PersonalizationStorage(root, batch_size=7, compact_bytes=4_000)
+for i in range(count):
+    storage.append_memory(f"user_{i % 5}", {"timestamp": i, "emotion": worker, "intensity": 0.5, "context": {}})
+storage.close()
+"""
+
+
+def log_seqs(root):
+    seqs = []
+    for log_path in root.glob("shard_*/log.ndjson"):
+        seqs.extend(json.loads(line)["seq"] for line in log_path.read_text(encoding="utf-8").splitlines())
+    return seqs
+
+
+class TestPersistentStorage:
+    """영구 저장소 테스트"""
+
+    def test_roundtrip_through_engine(self, tmp_path):
+        """엔진 재시작 후 동일 데이터 복원"""
+        engine = AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path), num_shards=4))
+        populate(engine, users=5, memories=12)
+        engine.user_profiles["user_1"].preferred_approach = TherapeuticApproach.ACT
+        engine.save_user("user_1")
+        engine.flush()
+        expected = {f"user_{u}": snapshot_state(engine, f"user_{u}") for u in range(5)}
+
+        restored = AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path)))
+        for user_id, state in expected.items():
+            assert snapshot_state(restored, user_id) == state
+        assert restored.user_profiles["user_1"].preferred_approach is TherapeuticApproach.ACT
+        patterns = restored.memory_store.get_user_patterns("user_0")
+        expected_patterns = engine.memory_store.get_user_patterns("user_0")
+        assert {k: v for k, v in patterns.items() if k != "updated_at"} == \
+            {k: v for k, v in expected_patterns.items() if k != "updated_at"}
+        assert "missing" not in restored.user_profiles
+        assert restored.memory_store.retrieve_relevant_memories("missing", {}) == []
+
+    def test_lazy_loading(self, tmp_path):
+        """조회한 사용자만 로딩, 해당 샤드만 열림"""
+        writer = AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path), num_shards=8))
+        populate(writer, users=40, memories=3)
+        writer.flush()
+
+        storage = PersonalizationStorage(str(tmp_path))
+        engine = AdaptiveTherapyEngine(storage=storage)
+        assert storage.metrics["shards_opened"] == 0
+        engine.get_adaptation_recommendation("user_7", {"language": "ko"})
+        assert storage.metrics["users_loaded"] == 1
+        assert storage.metrics["shards_opened"] == 1
+        assert len(engine.memory_store.memories["user_7"]) == 3
+        assert dict.__len__(engine.user_profiles) == 1
+        assert sorted(storage.user_ids()) == sorted(f"user_{u}" for u in range(40))
+
+    def test_compaction(self, tmp_path):
+        """압축 후 재시작, 압축 이후 기록도 병합"""
+        storage = PersonalizationStorage(str(tmp_path), num_shards=2)
+        engine = AdaptiveTherapyEngine(storage=storage)
+        populate(engine, users=6, memories=10)
+        storage.compact()
+        assert all(not (tmp_path / f"shard_{i:03d}" / "log.ndjson").stat().st_size for i in range(2))
+        # 압축 이후 추가 기록
+        engine.record_emotional_memory("user_2", "anger", 0.9, trigger="family")
+        engine.update_progress("user_2", {"symptom_level": 9})
+        engine.create_user_profile("new_user", "en")
+        engine.flush()
+        expected = {user_id: snapshot_state(engine, user_id) for user_id in [f"user_{u}" for u in range(6)] + ["new_user"]}
+
+        for compact_again in (False, True):
+            reopened = PersonalizationStorage(str(tmp_path))
+            if compact_again:
+                reopened.compact()
+                assert len(list((tmp_path / "shard_000").glob("snap_*"))) == 1
+            restored = AdaptiveTherapyEngine(storage=reopened)
+            for user_id, state in expected.items():
+                assert snapshot_state(restored, user_id) == state
+
+    def test_auto_compaction(self, tmp_path):
+        """로그가 임계값을 넘으면 flush 시 압축"""
+        storage = PersonalizationStorage(str(tmp_path), num_shards=1, batch_size=50, compact_bytes=20_000)
+        engine = AdaptiveTherapyEngine(storage=storage)
+        populate(engine, users=10, memories=30)
+        engine.flush()
+        assert storage.metrics["compactions"] >= 1
+        expected = snapshot_state(engine, "user_3")
+        assert snapshot_state(AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path))), "user_3") == expected
+
+    def test_write_batching(self, tmp_path):
+        """batch_size 만큼 모아서 기록"""
+        storage = PersonalizationStorage(str(tmp_path), num_shards=1, batch_size=10, flush_interval=3600)
+        log_path = tmp_path / "shard_000" / "log.ndjson"
+        for i in range(9):
+            storage.append_memory("u", {"timestamp": i, "emotion": "joy", "intensity": 0.5, "context": {}})
+        assert not log_path.exists()
+        storage.append_memory("u", {"timestamp": 9, "emotion": "joy", "intensity": 0.5, "context": {}})
+        assert len(log_path.read_text(encoding="utf-8").splitlines()) == 10
+        assert storage.metrics["flushes"] == 1
+
+        # 읽기 전에는 버퍼를 먼저 기록
+        storage.append_memory("u", {"timestamp": 10, "emotion": "joy", "intensity": 0.5, "context": {}})
+        assert len(storage.load_user("u").memories) == 11
+        with pytest.raises(ValueError):
+            storage.put_document("u", "unknown", {})
+
+    def test_truncated_log_tail(self, tmp_path):
+        """마지막 줄이 잘린 로그는 그 줄만 버림"""
+        engine = AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path), num_shards=1))
+        populate(engine, users=1, memories=5)
+        engine.flush()
+        log_path = tmp_path / "shard_000" / "log.ndjson"
+        with open(log_path, "ab") as f:
+            f.write(b'{"seq": 999, "user_id": "user_0", "kind": "mem')
+
+        storage = PersonalizationStorage(str(tmp_path))
+        restored = AdaptiveTherapyEngine(storage=storage)
+        assert len(restored.memory_store.memories["user_0"]) == 5
+        restored.record_emotional_memory("user_0", "joy", 0.3)
+        restored.flush()
+        assert len(AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path))).memory_store.memories["user_0"]) == 6
+
+    def test_interrupted_compaction(self, tmp_path):
+        """CURRENT 교체 후 로그가 남아 있어도 중복 적용하지 않음"""
+        storage = PersonalizationStorage(str(tmp_path), num_shards=1)
+        engine = AdaptiveTherapyEngine(storage=storage)
+        populate(engine, users=3, memories=4)
+        storage.flush()
+        log_path = tmp_path / "shard_000" / "log.ndjson"
+        saved_log = tmp_path / "saved.ndjson"
+        shutil.copy(log_path, saved_log)
+        storage.compact()
+        # 로그 정리 전에 중단된 상황 재현
+        shutil.copy(saved_log, log_path)
+
+        reopened = PersonalizationStorage(str(tmp_path))
+        restored = AdaptiveTherapyEngine(storage=reopened)
+        assert len(restored.memory_store.memories["user_1"]) == 4
+        restored.record_emotional_memory("user_1", "joy", 0.3)
+        reopened.flush()
+        final = AdaptiveTherapyEngine(storage=PersonalizationStorage(str(tmp_path)))
+        assert len(final.memory_store.memories["user_1"]) == 5
+
+    def test_two_writers(self, tmp_path):
+        """같은 디렉터리를 쓰는 두 저장소: 서로의 기록 / 압축을 따라잡음"""
+        first = PersonalizationStorage(str(tmp_path), num_shards=1, batch_size=3)
+        second = PersonalizationStorage(str(tmp_path), num_shards=1, batch_size=3)
+        for i in range(10):
+            first.append_memory("u", {"timestamp": i, "emotion": "joy", "intensity": 0.1, "context": {}})
+            second.append_memory("u", {"timestamp": 100 + i, "emotion": "anger", "intensity": 0.2, "context": {}})
+        first.flush()
+        second.flush()
+        seqs = log_seqs(tmp_path)
+        assert len(seqs) == len(set(seqs)) == 20
+        # 다른 워커의 기록도 읽기 시 반영
+        assert len(first.load_user("u").memories) == 20
+        first.compact()
+        second.append_memory("u", {"timestamp": 200, "emotion": "joy", "intensity": 0.3, "context": {}})
+        second.flush()
+        assert len(second.load_user("u").memories) == 21
+        assert sorted(m["timestamp"] for m in PersonalizationStorage(str(tmp_path)).load_user("u").memories) == \
+            sorted(list(range(10)) + list(range(100, 110)) + [200])
+
+    def test_concurrent_processes(self, tmp_path):
+        """두 프로세스가 동시에 기록 + 자동 압축해도 모든 기록 보존"""
+        PersonalizationStorage(str(tmp_path), num_shards=2)
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+        workers = [
+            subprocess.Popen([sys.executable, "-c", WRITER_SCRIPT, str(tmp_path), name, "300"], env=env)
+            for name in ("joy", "anger")
+        ]
+        assert [worker.wait(60) for worker in workers] == [0, 0]
+        storage = PersonalizationStorage(str(tmp_path))
+        records = [m for u in range(5) for m in storage.load_user(f"user_{u}").memories]
+        assert sorted((m["emotion"], m["timestamp"]) for m in records) == \
+            sorted((name, i) for name in ("joy", "anger") for i in range(300))
+        assert storage.metrics["users_loaded"] == 5
+
+    def test_periodic_flush(self, tmp_path):
+        """더 이상 쓰지 않아도 flush_interval 뒤 로그에 기록, 종료 시 남은 버퍼 기록"""
+        storage = PersonalizationStorage(str(tmp_path), num_shards=1, flush_interval=0.05)
+        storage.append_memory("u", {"timestamp": 1, "emotion": "joy", "intensity": 0.5, "context": {}})
+        log_path = tmp_path / "shard_000" / "log.ndjson"
+        deadline = time.monotonic() + 5
+        while not (log_path.exists() and log_path.stat().st_size) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(log_path.read_text(encoding="utf-8").splitlines()) == 1
+        storage.close()
+
+        idle = PersonalizationStorage(str(tmp_path), num_shards=1, flush_interval=3600)
+        idle.append_memory("u", {"timestamp": 2, "emotion": "joy", "intensity": 0.5, "context": {}})
+        assert len(log_path.read_text(encoding="utf-8").splitlines()) == 1
+        persistent_store._flush_open_storages()
+        assert len(log_path.read_text(encoding="utf-8").splitlines()) == 2
+        engine = AdaptiveTherapyEngine(storage=idle)
+        engine.record_emotional_memory("u", "sadness", 0.4)
+        engine.close()
+        assert len(PersonalizationStorage(str(tmp_path)).load_user("u").memories) == 3
+
+    def test_lazy_user_map(self):
+        """지연 로딩 사전 동작"""
+        calls = []
+        mapping = LazyUserMap(lambda key: (calls.append(key), mapping.set_loaded(key, key.upper() if key != "none" else None)))
+        assert mapping["a"] == "A"
+        assert mapping.get("a") == "A" and "a" in mapping
+        assert "none" not in mapping and mapping.get("none") is None
+        with pytest.raises(KeyError):
+            mapping["none"]
+        mapping["b"] = "explicit"
+        assert mapping["b"] == "explicit"
+        assert calls == ["a", "none"]
+
+        lists = LazyUserMap(lambda key: lists.set_loaded(key), default_factory=list)
+        lists["x"].append(1)
+        assert lists["x"] == [1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""
+연구 플랫폼 API 테스트
+파일명: tests/test_research_api.py
+
+테스트 원칙:
+- 연구 생성 / IRB / 모집 / 등록 / 평가 기록 라우트는 같은 연구 플랫폼에 기록해야 함
+- 그렇게 만든 연구의 보고서 / 내보내기는 서비스 결과와 같아야 함 (404 아님)
+"""
+import csv
+import io
+import random
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v3.endpoints import get_research_platform, router
+from services.research_platform import ResearchPlatformService
+
+HEADERS = {"X-API-Key": "test"}
+
+
+class TestResearchRoutes:
+    """연구 라우트 → 보고서 / 내보내기 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트마다 새 플랫폼을 주입한 클라이언트"""
+        self.platform = ResearchPlatformService()
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_research_platform] = lambda: self.platform
+        self.client = TestClient(app)
+
+    def post(self, path, json=None, status=200):
+        response = self.client.post(f"/api/v3{path}", json=json, headers=HEADERS)
+        assert response.status_code == status, response.text
+        return response.json()
+
+    def get(self, path, status=200, **params):
+        response = self.client.get(f"/api/v3{path}", params=params, headers=HEADERS)
+        assert response.status_code == status, response.text
+        return response
+
+    def create_study(self, target_enrollment=60):
+        return self.post("/research/studies", {
+            "title": "AI 심리상담 효과성 RCT", "study_type": "randomized_controlled_trial",
+            "principal_investigator": "PI", "institution": "기관", "target_enrollment": target_enrollment,
+            "arms": [{"name": "중재군", "intervention": "ai"}, {"name": "대조군", "intervention": "info"}],
+            "primary_outcome": "PHQ-9 변화"
+        })
+
+    def test_created_study_report_and_export(self):
+        """API 로 만든 연구의 보고서 / 내보내기 = 서비스 결과"""
+        study = self.create_study()
+        study_id = study["study_id"]
+        assert study["status"] == "draft" and study_id in self.platform.studies
+        # 모집 전 등록은 거부
+        self.post("/research/participants", {
+            "study_id": study_id, "user_id": "user_0", "demographics": {}, "consent_version": "1.0"
+        }, status=409)
+        self.post(f"/research/studies/{study_id}/recruitment", status=409)
+
+        self.post(f"/research/studies/{study_id}/irb", {"protocol_document": "p.pdf", "consent_form": "c.pdf"})
+        assert self.post(f"/research/studies/{study_id}/irb/approval", {"irb_number": "IRB-1"})["irb_number"] == "IRB-1"
+        assert self.post(f"/research/studies/{study_id}/recruitment")["status"] == "recruiting"
+
+        rng = random.Random(0)
+        arm_ids = [arm.arm_id for arm in self.platform.studies[study_id].arms]
+        for i in range(60):
+            enrolled = self.post("/research/participants", {
+                "study_id": study_id, "user_id": f"user_{i}",
+                "demographics": {"age": 20 + i % 40, "gender": "female"}, "consent_version": "1.0"
+            })
+            assert enrolled["arm_id"] in arm_ids
+            effect = 1 if enrolled["arm_id"] == arm_ids[0] else 0
+            for timepoint in ("baseline", "final"):
+                responses = [max(0, rng.randint(1, 3) - (effect if timepoint == "final" else 0)) for _ in range(9)]
+                recorded = self.post("/research/assessments", {
+                    "participant_id": enrolled["participant_id"], "tool": "PHQ-9",
+                    "timepoint": timepoint, "responses": responses
+                })
+                assert recorded["total_score"] == sum(responses)
+
+        details = self.get(f"/research/studies/{study_id}").json()
+        assert details["status"] == "active" and details["enrollment"]["current"] == 60
+        assert sum(arm["current"] for arm in details["arms"]) == 60
+
+        report = self.get(f"/research/studies/{study_id}/report").json()
+        assert report["enrollment_rate"] == 100.0
+        assert report["primary_outcome"]["measure"] == "PHQ-9"
+        assert report["primary_outcome"]["intervention_group"]["n"] + report["primary_outcome"]["control_group"]["n"] == 60
+        assert report["statistics"]["tools"]["PHQ-9"]["arms"].keys() == set(arm_ids)
+
+        text = self.get(f"/research/studies/{study_id}/export", format="csv").content.decode("utf-8")
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert sorted(row["participant_id"] for row in rows) == sorted(self.platform.participants)
+
+    def test_errors(self):
+        """없는 연구 / 참여자는 404, 알 수 없는 연구 유형 / 도구는 422"""
+        self.get("/research/studies/missing", status=404)
+        self.get("/research/studies/missing/report", status=404)
+        self.get("/research/studies/missing/export", status=404, format="csv")
+        self.post("/research/assessments", {
+            "participant_id": "missing", "tool": "PHQ-9", "timepoint": "baseline", "responses": [1] * 9
+        }, status=404)
+        self.post("/research/studies", {
+            "title": "연구", "study_type": "unknown", "principal_investigator": "PI", "institution": "기관",
+            "target_enrollment": 10, "arms": [], "primary_outcome": "PHQ-9"
+        }, status=422)
+
+        study_id = self.create_study()["study_id"]
+        self.post(f"/research/studies/{study_id}/irb/approval", {"irb_number": "IRB-1"})
+        self.post(f"/research/studies/{study_id}/recruitment")
+        participant_id = self.post("/research/participants", {
+            "study_id": study_id, "user_id": "user_0", "demographics": {}, "consent_version": "1.0"
+        })["participant_id"]
+        self.post("/research/assessments", {
+            "participant_id": participant_id, "tool": "unknown", "timepoint": "baseline", "responses": [1]
+        }, status=422)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,674 @@
+"""
+연구 플랫폼 서비스 테스트
+파일명: tests/test_research_platform.py
+
+테스트 원칙:
+- 연구 / 그룹 / 상태 색인 조회는 전체 참여자 스캔 결과와 같아야 함 (등록 순서 포함)
+- 보고서 / 내보내기는 색인 도입 전과 같은 결과
+- 평가 테이블 group-by 결과는 참여자별 평가 목록을 직접 훑는 기존 구현과 같아야 함
+  (표준편차는 합산 순서 차이로 반올림 경계에서 0.01 차이 허용)
+- 스트리밍 내보내기는 export_data 와 같은 레코드 (일반화 포함), 메모리는 청크 크기에 비례
+- 열 단위 내보내기 (Parquet / Arrow) 는 export_data 와 같은 값 (결측 = 키 없음), pyarrow 없으면 ImportError
+- k-익명성 확인은 레코드 묶음 방식과 같은 결과, 일반화 단계는 전체 격자 탐색의 최소 단계 합
+- 텍스트 PII 제거는 패턴 순차 치환과 같은 결과 (매치가 겹치는 경우만 예외), 배치 / 프로세스 풀도 같은 결과
+"""
+import asyncio
+import csv
+import gzip
+import io
+import itertools
+import json
+import random
+import re
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+import pytest
+from services.research_platform import (
+    AnonymizationEngine, DataExportFormat, Participant, ParticipantStatus, ResearchPlatformService, StudyType, pa
+)
+
+
+async def build_platform(studies: int, participants_per_study: int, seed: int = 0):
+    """연구 여러 개 + 참여자 + 평가 + 상태 변경"""
+    rng = random.Random(seed)
+    platform = ResearchPlatformService()
+    study_ids = []
+    for s in range(studies):
+        study = await platform.create_study(
+            title=f"연구 {s}", study_type=StudyType.RCT, principal_investigator="PI", institution="기관",
+            arms=[{'name': '중재군', 'intervention': 'ai'}, {'name': '대조군', 'intervention': 'info'}],
+            target_enrollment=participants_per_study * 2, randomization_enabled=s % 3 != 2
+        )
+        await platform.submit_for_irb(study.study_id, "p.pdf", "c.pdf")
+        await platform.approve_irb(study.study_id, f"IRB-{s}", datetime.now())
+        await platform.start_recruitment(study.study_id)
+        study_ids.append(study.study_id)
+
+    for i in range(studies * participants_per_study):
+        study_id = study_ids[rng.randrange(studies)]
+        participant, _ = await platform.enroll_participant(
+            study_id, f"user_{i}",
+            {'age': rng.randint(18, 70), 'gender': rng.choice(['male', 'female']), 'region': rng.choice(['서울', '부산', '광주'])},
+            {'version': '1.0'}
+        )
+        for tool in ('PHQ-9', 'GAD-7'):
+            items = 9 if tool == 'PHQ-9' else 7
+            await platform.record_assessment(participant.participant_id, tool, 'baseline', [rng.randint(0, 3) for _ in range(items)])
+            if rng.random() < 0.7:
+                await platform.record_assessment(participant.participant_id, tool, 'final', [rng.randint(0, 3) for _ in range(items)])
+        if rng.random() < 0.4:
+            await platform.update_participant_status(
+                participant.participant_id, rng.choice(list(ParticipantStatus)), reason="test"
+            )
+    return platform, study_ids
+
+
+# 생성 비용이 큰 플랫폼은 모듈에서 한 번만 생성 (클래스마다 다른 플랫폼 사용)
+INDEX_PLATFORM, INDEX_STUDY_IDS = asyncio.run(build_platform(6, 50))
+
+
+class TestParticipantIndex:
+    """참여자 보조 색인 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 플랫폼 준비"""
+        self.platform, self.study_ids = INDEX_PLATFORM, INDEX_STUDY_IDS
+
+    def scan(self, study_id, arm_id=..., status=None):
+        return [
+            p for p in self.platform.participants.values()
+            if p.study_id == study_id and (arm_id is ... or p.arm_id == arm_id) and (status is None or p.status == status)
+        ]
+
+    def test_index_matches_scan(self):
+        """연구 / 그룹 / 상태별 조회 = 전체 스캔 (순서 포함)"""
+        index = self.platform.participant_index
+        for study_id in self.study_ids:
+            study = self.platform.studies[study_id]
+            assert index.study(study_id) == self.scan(study_id)
+            for arm_id in [arm.arm_id for arm in study.arms] + [None]:
+                assert index.arm(study_id, arm_id) == self.scan(study_id, arm_id)
+                assert index.count(study_id, arm_id) == len(self.scan(study_id, arm_id))
+                for status in ParticipantStatus:
+                    assert index.count(study_id, arm_id, status) == len(self.scan(study_id, arm_id, status))
+            for status in ParticipantStatus:
+                assert sorted(p.participant_id for p in index.with_status(study_id, status)) == \
+                    sorted(p.participant_id for p in self.scan(study_id, status=status))
+                assert index.count(study_id, status=status) == len(self.scan(study_id, status=status))
+        assert index.study("missing") == [] and index.count("missing") == 0
+
+    def test_status_update(self):
+        """상태 변경 시 버킷 이동 + 완료/중도 탈락 정보 기록"""
+        platform = self.platform
+        study_id = self.study_ids[0]
+        participant = platform.participant_index.study(study_id)[0]
+        asyncio.run(platform.update_participant_status(participant.participant_id, ParticipantStatus.WITHDRAWN, "이사"))
+        assert participant in platform.participant_index.with_status(study_id, ParticipantStatus.WITHDRAWN)
+        assert participant.withdrawal_reason == "이사"
+        assert platform.consents[participant.participant_id].withdrawal_date is not None
+        asyncio.run(platform.update_participant_status(participant.participant_id, ParticipantStatus.COMPLETED))
+        assert participant not in platform.participant_index.with_status(study_id, ParticipantStatus.WITHDRAWN)
+        assert participant.completion_date is not None
+        with pytest.raises(ValueError):
+            asyncio.run(platform.update_participant_status("missing", ParticipantStatus.ACTIVE))
+
+    def test_report_counts(self):
+        """보고서 그룹별 인원 / 완료 / 중도 탈락 수 = 스캔"""
+        for study_id in self.study_ids:
+            report = asyncio.run(self.platform.generate_study_report(study_id))
+            for arm in self.platform.studies[study_id].arms:
+                members = self.scan(study_id, arm.arm_id)
+                analysis = report['arms'][arm.arm_id]
+                assert analysis['n'] == len(members)
+                assert analysis['completed'] == sum(p.status == ParticipantStatus.COMPLETED for p in members)
+                assert analysis['withdrawn'] == sum(p.status == ParticipantStatus.WITHDRAWN for p in members)
+                assert analysis['demographics'] == self.platform._summarize_demographics(members)
+            if report['comparison']:
+                assert report['comparison']['n'] == [
+                    len(self.scan(study_id, arm.arm_id)) for arm in self.platform.studies[study_id].arms
+                ]
+
+    def test_export_uses_study_participants(self):
+        """내보내기 레코드 = 해당 연구 참여자 (등록 순서)"""
+        study_id = self.study_ids[1]
+        exported = asyncio.run(self.platform.export_data(study_id, DataExportFormat.JSON))
+        assert exported['records'] == len(self.scan(study_id))
+
+    def test_reenrollment_replaces_entry(self):
+        """같은 사용자가 다른 연구에 다시 등록되면 이전 연구 색인에서 제거 (participants 사전과 일치)"""
+        platform, study_ids = asyncio.run(build_platform(2, 5, seed=3))
+        first = platform.participant_index.study(study_ids[0])[0]
+        user_index = next(
+            i for i in range(10) if platform.anonymization.anonymize_id(f"user_{i}") == first.participant_id
+        )
+        asyncio.run(platform.enroll_participant(study_ids[1], f"user_{user_index}", {'age': 30}, {}))
+        assert first.participant_id not in [p.participant_id for p in platform.participant_index.study(study_ids[0])]
+        assert platform.participant_index.study(study_ids[1])[-1] is platform.participants[first.participant_id]
+
+
+def legacy_summarize_outcomes(participants):
+    outcomes = defaultdict(lambda: {'baseline': [], 'final': []})
+    for p in participants:
+        for assessment in p.assessments:
+            tool = assessment['tool']
+            if assessment['timepoint'] == 'baseline':
+                outcomes[tool]['baseline'].append(assessment['score'])
+            elif assessment['timepoint'] in ['final', 'week12', 'post']:
+                outcomes[tool]['final'].append(assessment['score'])
+    summary = {}
+    for tool, data in outcomes.items():
+        if data['baseline'] and data['final']:
+            summary[tool] = {
+                'baseline_mean': round(np.mean(data['baseline']), 2),
+                'baseline_sd': round(np.std(data['baseline']), 2),
+                'final_mean': round(np.mean(data['final']), 2),
+                'final_sd': round(np.std(data['final']), 2),
+                'mean_change': round(np.mean(data['final']) - np.mean(data['baseline']), 2)
+            }
+    return summary
+
+
+def legacy_arm_changes(participants, tool):
+    changes = []
+    for p in participants:
+        baseline = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] == 'baseline'), None)
+        final = next((a['score'] for a in p.assessments if a['tool'] == tool and a['timepoint'] in ['final', 'week12']), None)
+        if baseline is not None and final is not None:
+            changes.append(final - baseline)
+    return changes
+
+
+def legacy_history(participant):
+    history = defaultdict(list)
+    for assessment in participant.assessments:
+        history[assessment['tool']].append({
+            'timepoint': assessment['timepoint'], 'score': assessment['score'],
+            'severity': assessment['severity'], 'date': assessment['recorded_at']
+        })
+    return dict(history)
+
+
+async def add_followups(platform, seed: int):
+    """시점이 다양한 추가 평가 (week4 / week12 / post, 기준선 중복, K-10)"""
+    rng = random.Random(seed)
+    for participant in list(platform.participants.values()):
+        for _ in range(rng.randint(0, 4)):
+            tool = rng.choice(['PHQ-9', 'GAD-7', 'K-10'])
+            items = {'PHQ-9': 9, 'GAD-7': 7, 'K-10': 10}[tool]
+            timepoint = rng.choice(['baseline', 'week4', 'week12', 'post', 'final'])
+            await platform.record_assessment(participant.participant_id, tool, timepoint, [rng.randint(0, 3) for _ in range(items)])
+
+
+async def build_followup_platform(studies: int, participants_per_study: int, seed: int):
+    """추가 평가까지 기록한 플랫폼"""
+    platform, study_ids = await build_platform(studies, participants_per_study, seed=seed)
+    await add_followups(platform, seed=seed + 1)
+    return platform, study_ids
+
+
+TABLE_PLATFORM, TABLE_STUDY_IDS = asyncio.run(build_followup_platform(4, 80, seed=5))
+
+
+class TestAssessmentTable:
+    """연구별 평가 테이블 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 플랫폼 준비"""
+        self.platform, self.study_ids = TABLE_PLATFORM, TABLE_STUDY_IDS
+
+    def assert_summary_equal(self, actual, expected):
+        assert list(actual) == list(expected)
+        for tool, values in expected.items():
+            for key, value in values.items():
+                tolerance = 0.0100001 if key.endswith('_sd') else 0
+                assert actual[tool][key] == pytest.approx(value, abs=tolerance), (tool, key)
+
+    def test_summarize_outcomes_matches_scan(self):
+        """그룹별 결과 요약 = 참여자 평가 목록 스캔 (도구 순서 포함)"""
+        for study_id in self.study_ids:
+            arm_ids = [arm.arm_id for arm in self.platform.studies[study_id].arms] + [None]
+            summaries = self.platform._summarize_outcomes(study_id, arm_ids)
+            for arm_id in arm_ids:
+                expected = legacy_summarize_outcomes(self.platform.participant_index.arm(study_id, arm_id))
+                self.assert_summary_equal(summaries[arm_id], expected)
+        assert self.platform._summarize_outcomes("missing", ["a"]) == {"a": {}}
+
+    def test_compare_arms_matches_scan(self):
+        """그룹 비교 평균 변화 = 참여자별 next() 검색"""
+        compared = 0
+        for study_id in self.study_ids:
+            study = self.platform.studies[study_id]
+            comparison = asyncio.run(self.platform._compare_arms(study_id, study.arms))
+            for tool in ['PHQ-9', 'GAD-7']:
+                arm1, arm2 = (legacy_arm_changes(self.platform.participant_index.arm(study_id, arm.arm_id), tool) for arm in study.arms)
+                if not (arm1 and arm2):
+                    assert tool not in comparison['outcome_differences']
+                    continue
+                compared += 1
+                assert comparison['outcome_differences'][tool] == {
+                    f'{study.arms[0].name}_mean_change': round(np.mean(arm1), 2),
+                    f'{study.arms[1].name}_mean_change': round(np.mean(arm2), 2),
+                    'difference': round(np.mean(arm1) - np.mean(arm2), 2)
+                }
+        assert compared >= 4
+
+    def test_participant_progress_matches_scan(self):
+        """참여자 진행 상황 = 평가 목록 스캔"""
+        for participant in list(self.platform.participants.values())[:100]:
+            progress = asyncio.run(self.platform.get_participant_progress(participant.participant_id))
+            history = legacy_history(participant)
+            assert progress['assessment_history'] == history
+            assert list(progress['assessment_history']) == list(history)
+            assert progress['changes'] == {
+                tool: self.platform.assessment.calculate_change(items[0]['score'], items[-1]['score'], tool)
+                for tool, items in history.items() if len(items) >= 2
+            }
+
+    def test_lookup(self):
+        """(참여자, 도구, 시점) 첫 기록 O(1) 조회"""
+        participant = next(iter(self.platform.participants.values()))
+        table = self.platform.assessment_tables[participant.study_id]
+        for record in participant.assessments:
+            expected = next(a['score'] for a in participant.assessments
+                            if a['tool'] == record['tool'] and a['timepoint'] == record['timepoint'])
+            assert table.lookup(participant.participant_id, record['tool'], record['timepoint']) == expected
+        assert table.lookup(participant.participant_id, 'PHQ-9', 'week99') is None
+        assert table.lookup("missing", 'PHQ-9', 'baseline') is None
+
+    def test_reenrolled_participant_excluded(self):
+        """다른 연구로 재등록된 참여자는 이전 연구 집계에서 제외"""
+        async def scenario():
+            platform, study_ids = await build_platform(2, 6, seed=8)
+            moved = platform.participant_index.study(study_ids[0])[0]
+            user = next(f"user_{i}" for i in range(12) if platform.anonymization.anonymize_id(f"user_{i}") == moved.participant_id)
+            await platform.enroll_participant(study_ids[1], user, {'age': 40}, {})
+            await platform.record_assessment(moved.participant_id, 'PHQ-9', 'baseline', [3] * 9)
+            return platform, study_ids
+        platform, study_ids = asyncio.run(scenario())
+        for study_id in study_ids:
+            arm_ids = [arm.arm_id for arm in platform.studies[study_id].arms] + [None]
+            summaries = platform._summarize_outcomes(study_id, arm_ids)
+            for arm_id in arm_ids:
+                self.assert_summary_equal(summaries[arm_id], legacy_summarize_outcomes(platform.participant_index.arm(study_id, arm_id)))
+
+
+def build_streaming_platform():
+    """첫 참여자 인구통계에 CSV 특수문자가 있는 플랫폼"""
+    platform, study_ids = asyncio.run(build_platform(2, 400, seed=9))
+    tricky = platform.participant_index.study(study_ids[0])[0]
+    tricky.demographics['note'] = 'a,"b"\nc'
+    return platform, study_ids
+
+
+STREAMING_PLATFORM, STREAMING_STUDY_IDS = build_streaming_platform()
+
+
+class TestStreamingExport:
+    """스트리밍 내보내기 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 플랫폼 준비"""
+        self.platform, self.study_ids = STREAMING_PLATFORM, STREAMING_STUDY_IDS
+
+    def stream(self, study_id, format, **kwargs):
+        return list(self.platform.stream_export(study_id, format, **kwargs))
+
+    def expected(self, study_id, **kwargs):
+        return asyncio.run(self.platform.export_data(study_id, DataExportFormat.JSON, **kwargs))['data']
+
+    def test_matches_export(self):
+        """CSV / JSON / NDJSON 스트림 = export_data 레코드 (k-익명성 일반화 포함)"""
+        for study_id in self.study_ids:
+            for options in ({}, {'include_demographics': False}, {'include_assessments': False}):
+                records = json.loads(self.expected(study_id, **options))
+                ndjson = b''.join(self.stream(study_id, DataExportFormat.NDJSON, **options)).decode('utf-8')
+                assert [json.loads(line) for line in ndjson.splitlines()] == records
+                array = b''.join(self.stream(study_id, DataExportFormat.JSON, **options)).decode('utf-8')
+                assert json.loads(array) == records
+                text = b''.join(self.stream(study_id, DataExportFormat.CSV, **options)).decode('utf-8')
+                rows = list(csv.DictReader(io.StringIO(text)))
+                assert len(rows) == len(records)
+                for row, record in zip(rows, records):
+                    assert {k: v for k, v in row.items() if v != ''} == {
+                        k: str(v) for k, v in record.items() if v is not None and v != ''
+                    }
+        # 도구_시점 열은 첫 레코드에 없어도 포함 (전체 열 합집합)
+        header = next(csv.reader(io.StringIO(b''.join(self.stream(self.study_ids[0], DataExportFormat.CSV)).decode('utf-8'))))
+        assert 'PHQ-9_final' in header and 'note' in header
+        # 일반화된 내보내기는 k-익명성 만족
+        exported = json.loads(self.expected(self.study_ids[0]))
+        quasi_identifiers = self.platform._EXPORT_QUASI_IDENTIFIERS
+        assert any(
+            record.get(qi) != participant.demographics.get(qi)
+            for record, participant in zip(exported, self.platform.participant_index.study(self.study_ids[0]))
+            for qi in quasi_identifiers
+        )
+        assert self.platform.anonymization.check_k_anonymity(exported, quasi_identifiers)
+
+    def test_quoting(self):
+        """쉼표 / 따옴표 / 줄바꿈 값도 CSV 로 그대로 복원"""
+        study_id = self.study_ids[0]
+        text = b''.join(self.stream(study_id, DataExportFormat.CSV)).decode('utf-8')
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert rows[0]['note'] == 'a,"b"\nc'
+        legacy = asyncio.run(self.platform.export_data(study_id, DataExportFormat.CSV))['data']
+        assert list(csv.DictReader(io.StringIO(legacy)))[0]['note'] == 'a,"b"\nc'
+
+    def test_chunks_and_gzip(self):
+        """청크당 레코드 수 제한 + gzip 스트림 해제 결과 동일"""
+        study_id = self.study_ids[1]
+        chunks = self.stream(study_id, DataExportFormat.NDJSON, chunk_size=7)
+        total = len(self.platform.participant_index.study(study_id))
+        assert len(chunks) == -(-total // 7)
+        assert all(chunk.count(b'\n') <= 7 for chunk in chunks)
+        for format in (DataExportFormat.CSV, DataExportFormat.NDJSON, DataExportFormat.JSON):
+            plain = b''.join(self.stream(study_id, format, chunk_size=50))
+            compressed = b''.join(self.stream(study_id, format, chunk_size=50, compress=True))
+            assert gzip.decompress(compressed) == plain and len(compressed) < len(plain)
+
+    def test_errors_and_empty(self):
+        """없는 연구 / 미지원 형식은 순회 전에 오류, 빈 연구는 빈 출력"""
+        with pytest.raises(ValueError):
+            self.platform.stream_export("missing", DataExportFormat.CSV)
+        with pytest.raises(ValueError):
+            self.platform.stream_export(self.study_ids[0], DataExportFormat.SPSS)
+        study = asyncio.run(self.platform.create_study(
+            title="빈 연구", study_type=StudyType.RCT, principal_investigator="PI", institution="기관", arms=[]
+        ))
+        assert self.stream(study.study_id, DataExportFormat.CSV) == []
+        assert json.loads(b''.join(self.stream(study.study_id, DataExportFormat.JSON))) == []
+        assert self.stream(study.study_id, DataExportFormat.NDJSON) == []
+
+    def test_bounded_memory(self):
+        """스트림 소비 중 최대 메모리가 전체 출력보다 훨씬 작음 (export_data 는 전체 이상)"""
+        platform = ResearchPlatformService()
+        study = asyncio.run(platform.create_study(
+            title="대규모", study_type=StudyType.RCT, principal_investigator="PI", institution="기관",
+            arms=[{'name': '중재군', 'intervention': 'ai'}]
+        ))
+        for i in range(20000):
+            platform._register_participant(Participant(
+                participant_id=f"P{i:06d}", study_id=study.study_id, status=ParticipantStatus.ACTIVE,
+                enrollment_date=datetime(2025, 1, 1), demographics={'age_group': '30-39', 'gender': 'female'},
+                arm_id=study.arms[0].arm_id,
+                assessments=[{'tool': 'PHQ-9', 'timepoint': t, 'score': i % 27} for t in ('baseline', 'week4', 'final')]
+            ))
+        tracemalloc.start()
+        try:
+            size = sum(len(chunk) for chunk in platform.stream_export(study.study_id, DataExportFormat.CSV, chunk_size=100))
+            _, stream_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            asyncio.run(platform.export_data(study.study_id, DataExportFormat.CSV))
+            _, export_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # 청크 버퍼 + 참여자 참조 목록 (참여자당 포인터 하나)
+        assert stream_peak < size / 3 and export_peak > size
+
+def column_records(columns):
+    """열 단위 내보내기 → 레코드 목록 (결측 키 제외)"""
+    records = [{} for _ in range(len(columns[0]))] if columns else []
+    for column in columns:
+        for i, record in enumerate(records):
+            if column.mask is not None and column.mask[i]:
+                continue
+            if column.kind == 'category':
+                record[column.name] = column.dictionary[column.values[i]]
+            elif column.kind == 'timestamp':
+                record[column.name] = column.values[i].astype(datetime).isoformat()
+            elif column.kind == 'int':
+                record[column.name] = int(column.values[i])
+            else:
+                record[column.name] = column.values[i] if column.kind == 'string' else float(column.values[i])
+    return records
+
+
+def present(records):
+    return [{k: v for k, v in record.items() if v is not None} for record in records]
+
+
+async def build_columnar_platform():
+    """추가 평가 플랫폼 + 인구통계가 같고 점수가 실수인 연구 (일반화 없음, float 열)"""
+    platform, study_ids = await build_followup_platform(3, 150, seed=11)
+    study = await platform.create_study(
+        title="균일", study_type=StudyType.RCT, principal_investigator="PI", institution="기관",
+        arms=[{'name': '중재군', 'intervention': 'ai'}]
+    )
+    for i in range(40):
+        platform._register_participant(Participant(
+            participant_id=f"U{i:03d}", study_id=study.study_id, status=ParticipantStatus.ACTIVE,
+            enrollment_date=datetime(2025, 3, 1, 9, i), demographics={'age_group': '30-39', 'gender': 'male'},
+            arm_id=study.arms[0].arm_id,
+            assessments=[{'tool': 'VAS', 'timepoint': 'baseline', 'score': i / 4}] if i % 3 else []
+        ))
+    return platform, study_ids + [study.study_id]
+
+
+COLUMNAR_PLATFORM, COLUMNAR_STUDY_IDS = asyncio.run(build_columnar_platform())
+
+
+class TestColumnarExport:
+    """열 단위 (Parquet / Arrow) 내보내기 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 플랫폼 준비"""
+        self.platform, self.study_ids = COLUMNAR_PLATFORM, COLUMNAR_STUDY_IDS
+
+    def test_columns_match_export(self):
+        """열 값 = export_data 레코드 (상태 변경 후 순서, 재기록 덮어쓰기, 일반화 포함)"""
+        for study_id in self.study_ids:
+            for options in ({}, {'include_demographics': False}, {'include_assessments': False}):
+                expected = asyncio.run(self.platform.export_data(study_id, DataExportFormat.JSON, **options))
+                columns = self.platform.export_columns(study_id, **options)
+                assert column_records(columns) == present(json.loads(expected['data']))
+                assert len({column.name for column in columns}) == len(columns)
+
+    def test_column_types(self):
+        """범주형 사전 코드 / 정수 점수 int32 / 실수 점수 float64"""
+        columns = {c.name: c for c in self.platform.export_columns(self.study_ids[0])}
+        assert columns['status'].kind == 'category' and columns['status'].values.dtype == np.int32
+        assert len(columns['status'].dictionary) <= len(ParticipantStatus)
+        assert columns['PHQ-9_baseline'].kind == 'int' and columns['PHQ-9_baseline'].values.dtype == np.int32
+        assert columns['PHQ-9_final'].mask.any()
+        assert columns['enrollment_date'].values.dtype == np.dtype('datetime64[us]')
+        uniform = {c.name: c for c in self.platform.export_columns(self.study_ids[-1])}
+        assert uniform['VAS_baseline'].kind == 'float'
+        assert uniform['age_group'].dictionary == ['30-39'] and 'region_group' not in uniform
+
+    @pytest.mark.skipif(pa is not None, reason="pyarrow 설치됨")
+    def test_requires_pyarrow(self, tmp_path):
+        """pyarrow 없이 Parquet / Arrow 요청 시 ImportError"""
+        with pytest.raises(ImportError):
+            self.platform.write_columnar_export(self.study_ids[0], str(tmp_path / "out.parquet"))
+
+    @pytest.mark.parametrize("format", [DataExportFormat.PARQUET, DataExportFormat.ARROW])
+    def test_roundtrip(self, tmp_path, format):
+        """파일 다시 읽기 = export_data 레코드, 행 그룹 분할, 사전 인코딩 유지"""
+        pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        study_id = self.study_ids[0]
+        path = str(tmp_path / f"out.{format.value}")
+        meta = self.platform.write_columnar_export(study_id, path, format, row_group_size=50)
+        if format == DataExportFormat.PARQUET:
+            table = pq.read_table(path)
+            assert pq.ParquetFile(path).num_row_groups == meta['row_groups'] == -(-meta['records'] // 50)
+        else:
+            table = pa.ipc.open_file(path).read_all()
+        assert pa.types.is_dictionary(table.schema.field('status').type)
+        assert table.schema.field('PHQ-9_baseline').type == pa.int32()
+        expected = present(json.loads(asyncio.run(self.platform.export_data(study_id, DataExportFormat.JSON))['data']))
+        actual = [
+            {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in row.items() if v is not None}
+            for row in table.to_pylist()
+        ]
+        assert actual == expected
+
+
+QUASI_IDENTIFIERS = ['age_group', 'gender', 'region_group']
+
+
+def random_demographics(rng, n):
+    """준식별자 일부가 빠진 레코드 포함"""
+    records = []
+    for _ in range(n):
+        record = {
+            'age_group': rng.choice(['under_20', '20-29', '30-39', '40-49', '50-59', '60+']),
+            'gender': rng.choice(['male', 'female', 'other']),
+            'region_group': rng.choice(['수도권', '영남권', '호남권', '기타']),
+            'note': rng.random()
+        }
+        for qi in QUASI_IDENTIFIERS:
+            if rng.random() < 0.05:
+                del record[qi]
+        records.append(record)
+    return records
+
+
+def legacy_k_anonymous(dataset, quasi_identifiers, k):
+    groups = defaultdict(list)
+    for record in dataset:
+        groups[tuple(record.get(qi, None) for qi in quasi_identifiers)].append(record)
+    return all(len(group) >= k for group in groups.values())
+
+
+def brute_force_levels(engine, dataset, quasi_identifiers):
+    """단계 합이 가장 작은 만족 조합들 (전체 격자 직접 일반화)"""
+    heights = [len(engine.GENERALIZATION_HIERARCHIES[qi]) for qi in quasi_identifiers]
+    lattice = sorted(itertools.product(*(range(h + 1) for h in heights)), key=sum)
+    satisfying = [
+        levels for levels in lattice
+        if legacy_k_anonymous(
+            [engine.generalize_record(record, dict(zip(quasi_identifiers, levels))) for record in dataset],
+            quasi_identifiers, engine.k_anonymity
+        )
+    ]
+    if not satisfying:
+        return [dict(zip(quasi_identifiers, heights))]
+    return [dict(zip(quasi_identifiers, levels)) for levels in satisfying if sum(levels) == sum(satisfying[0])]
+
+
+class TestKAnonymity:
+    """k-익명성 확인 / 최소 일반화 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 엔진 초기화"""
+        self.engine = AnonymizationEngine(k_anonymity=5)
+
+    def test_check_matches_legacy(self):
+        """동치류 집계 결과 = 레코드 묶음 방식 (빠진 키는 None, 청크 경계 포함)"""
+        rng = random.Random(21)
+        for n in (0, 3, 40, 400, 9000):
+            dataset = random_demographics(rng, n)
+            for k in (1, 2, 5, 30):
+                engine = AnonymizationEngine(k_anonymity=k)
+                for qis in (QUASI_IDENTIFIERS, ['gender'], ['region_group', 'age_group']):
+                    assert engine.check_k_anonymity(iter(dataset), qis) == legacy_k_anonymous(dataset, qis, k)
+            vocabularies, combos, counts = self.engine.quasi_identifier_groups(dataset, QUASI_IDENTIFIERS)
+            groups = defaultdict(int)
+            for record in dataset:
+                groups[tuple(record.get(qi) for qi in QUASI_IDENTIFIERS)] += 1
+            assert {
+                tuple(vocab[code] for vocab, code in zip(vocabularies, combo)): count
+                for combo, count in zip(combos.tolist(), counts.tolist())
+            } == groups
+
+    def test_minimal_levels_match_brute_force(self):
+        """선택한 단계 = 전체 격자 탐색의 최소 단계 합 조합 중 하나, 일반화 결과는 k-익명"""
+        rng = random.Random(22)
+        for n in (4, 12, 30, 80, 200, 2000):
+            dataset = random_demographics(rng, n)
+            levels = self.engine.find_generalization(dataset, QUASI_IDENTIFIERS)
+            assert levels in brute_force_levels(self.engine, dataset, QUASI_IDENTIFIERS)
+            generalized = self.engine.generalize_for_k_anonymity(dataset, QUASI_IDENTIFIERS)
+            if n >= self.engine.k_anonymity:
+                assert legacy_k_anonymous(generalized, QUASI_IDENTIFIERS, self.engine.k_anonymity)
+            else:
+                # 전체가 k 미만이면 최상위 단계
+                assert levels == {qi: len(self.engine.GENERALIZATION_HIERARCHIES[qi]) for qi in QUASI_IDENTIFIERS}
+
+    def test_no_copy_when_anonymous(self):
+        """이미 k-익명이면 레코드 그대로, 일반화해도 값이 같은 레코드는 복사하지 않음"""
+        dataset = [{'age_group': '30-39', 'gender': 'female', 'region_group': '수도권'} for _ in range(10)]
+        result = self.engine.generalize_for_k_anonymity(dataset, QUASI_IDENTIFIERS)
+        assert all(a is b for a, b in zip(result, dataset))
+        dataset.append({'age_group': '20-29', 'gender': 'female', 'region_group': '수도권'})
+        levels = self.engine.find_generalization(dataset, QUASI_IDENTIFIERS)
+        assert levels == {'age_group': 1, 'gender': 0, 'region_group': 0}
+        result = self.engine.generalize_for_k_anonymity(dataset, QUASI_IDENTIFIERS)
+        assert {r['age_group'] for r in result} == {'20-39'}
+        assert all(r is not d for r, d in zip(result, dataset))
+        assert dataset[-1]['age_group'] == '20-29'
+        # 바뀌는 값이 없으면 원본 그대로, 없는 키가 값으로 바뀌면 키 추가
+        unchanged = {'age_group': '60+', 'gender': 'male'}
+        assert self.engine.generalize_record(unchanged, {'age_group': 1}) is unchanged
+        assert self.engine.generalize_record(unchanged, {'region_group': 1}) == {**unchanged, 'region_group': '비수도권'}
+        assert self.engine.generalize_value('age_group', '40-49', 2) == '*'
+
+
+def legacy_anonymize_text(text):
+    text = re.sub(r'[가-힣]{2,4}(?=씨|님|선생|과장|부장|대리)', '[이름]', text)
+    text = re.sub(r'\d{2,3}-\d{3,4}-\d{4}', '[전화번호]', text)
+    text = re.sub(r'\d{10,11}', '[전화번호]', text)
+    text = re.sub(r'[\w\.-]+@[\w\.-]+\.\w+', '[이메일]', text)
+    text = re.sub(r'[가-힣]+(?:시|도)\s*[가-힣]+(?:구|군|시)', '[주소]', text)
+    text = re.sub(r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일', '[날짜]', text)
+    text = re.sub(r'\d{4}-\d{2}-\d{2}', '[날짜]', text)
+    return text
+
+
+def random_transcripts(n, seed=0):
+    """상담 발화 + PII (이름 / 전화번호 / 이메일 / 주소 / 날짜)"""
+    rng = random.Random(seed)
+    words = "요즘 너무 힘들어요 잠을 못 자고 회사에서 스트레스를 받아요 선생님 가족 불안 다시 시도해도 안돼요 ok 123 5.5".split()
+    pii = [
+        "김철수씨", "이영희님", "박민수 과장", "010-1234-5678", "01098765432", "kim.cs@example.com",
+        "서울시 강남구", "경기도 수원시", "2024년 3월 15일", "2024-03-15", "02-555-1234"
+    ]
+    return [
+        " ".join(rng.choice(pii) if rng.random() < 0.1 else rng.choice(words) for _ in range(rng.randint(0, 30)))
+        for _ in range(n)
+    ]
+
+
+class TestTextAnonymization:
+    """텍스트 PII 제거 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 엔진 초기화"""
+        self.engine = AnonymizationEngine()
+
+    def test_matches_sequential(self):
+        """단일 패스 치환 = 패턴 7개 순차 치환 (PII 가 겹치지 않는 발화)"""
+        for text in random_transcripts(3000, seed=31):
+            assert self.engine.anonymize_text(text) == legacy_anonymize_text(text)
+        assert self.engine.anonymize_text("김철수씨 연락처 010-1234-5678, 2024년 3월 15일 서울시 강남구") == (
+            "[이름]씨 연락처 [전화번호], [날짜] [주소]"
+        )
+
+    def test_overlapping_matches(self):
+        """겹치는 매치는 먼저 시작한 매치 전체 치환, PII 가 없으면 원래 객체"""
+        assert self.engine.anonymize_text("kim01012345678@naver.com") == "[이메일]"
+        assert legacy_anonymize_text("kim01012345678@naver.com") == "kim[전화번호]@naver.com"
+        text = "요즘 잠을 잘 못 자요"
+        assert self.engine.anonymize_text(text) is text
+
+    def test_batch(self):
+        """배치 / 프로세스 풀 결과 = 한 건씩 처리 (입력 순서 유지)"""
+        texts = random_transcripts(500, seed=32)
+        expected = [self.engine.anonymize_text(text) for text in texts]
+        assert self.engine.anonymize_texts(texts) == expected
+        assert self.engine.anonymize_texts(iter(texts), max_workers=2, chunk_size=37) == expected
+        assert self.engine.anonymize_texts([], max_workers=2) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
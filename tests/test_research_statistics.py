@@ -0,0 +1,268 @@
+"""
+연구 통계 분석 테스트
+파일명: tests/test_research_statistics.py
+
+테스트 원칙:
+- 분포 꼬리확률 / 임계값은 알려진 참조값과 같아야 함 (scipy 없이 연분수 계산 포함)
+- 벡터화 검정 결과는 도구 / 쌍별 직접 계산 (반복문, 최소제곱) 과 같아야 함
+- 재표본 결과는 배치 크기와 무관하고 seed 로 재현되어야 함
+- 서비스 분석은 기존 그룹 비교의 평균 변화 차와 같아야 함
+"""
+import asyncio
+import itertools
+import math
+import random
+import statistics
+from datetime import datetime
+
+import numpy as np
+import pytest
+from services import research_statistics
+from services.research_platform import ResearchPlatformService, StudyType
+from services.research_statistics import (
+    analyze_outcomes, betainc, bootstrap_mean_differences, f_upper_p, permutation_test,
+    t_critical, t_two_sided_p
+)
+
+
+def make_outcomes(n: int, n_tools: int = 3, n_arms: int = 3, seed: int = 0):
+    """정수 점수 결과 (그룹마다 효과가 다름)"""
+    rng = np.random.default_rng(seed)
+    tool_ids = rng.integers(0, n_tools, n)
+    arm_ids = rng.integers(0, n_arms, n)
+    baseline = rng.integers(5, 27, n).astype(float)
+    final = np.clip(baseline * 0.7 + rng.integers(-4, 6, n) - 1.5 * arm_ids, 0, 27).round()
+    return tool_ids, arm_ids, baseline, final
+
+
+class TestDistributions:
+    """분포 함수 테스트"""
+
+    @pytest.fixture(params=["default", "fallback"])
+    def backend(self, request, monkeypatch):
+        if request.param == "fallback":
+            monkeypatch.setattr(research_statistics, "scipy_special", None)
+
+    def test_reference_values(self, backend):
+        """t / F 꼬리확률, t 임계값 참조값"""
+        assert betainc(2, 3, 0.5) == pytest.approx(0.6875)
+        assert betainc([1, 1], [1, 1], [0.0, 1.0]).tolist() == [0.0, 1.0]
+        assert t_two_sided_p(2.0, 10) == pytest.approx(0.073388, abs=1e-6)
+        assert t_two_sided_p(0.0, 5) == pytest.approx(1.0)
+        assert f_upper_p(4.0, 2, 20) == pytest.approx(0.034572, abs=1e-6)
+        assert t_critical(10) == pytest.approx(2.228139, abs=1e-6)
+        assert t_critical(4, confidence=0.99) == pytest.approx(4.604095, abs=1e-6)
+        assert np.allclose(t_critical([1, 2]), [12.706205, 4.302653], atol=1e-5)
+        assert t_critical(1e7) == pytest.approx(1.959964, abs=1e-5)
+        assert np.isnan(t_critical(np.nan))
+
+    def test_matches_normal_limit(self, backend):
+        """자유도가 크면 정규분포 양측 p 값"""
+        t = np.array([0.5, 1.0, 2.5, 4.0])
+        expected = [2 * (1 - statistics.NormalDist().cdf(v)) for v in t]
+        assert np.allclose(t_two_sided_p(t, 1e8), expected, atol=1e-6)
+
+
+# 분석 / 플랫폼 생성 비용이 커서 모듈에서 한 번만 계산
+OUTCOMES = make_outcomes(1500)
+OUTCOME_RESULT = analyze_outcomes(
+    *OUTCOMES, n_tools=3, n_arms=3, reliability=[0.89, 0.92, np.nan], lower_is_better=[True, True, False]
+)
+
+
+class TestAnalyzeOutcomes:
+    """벡터화 검정 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 분석 결과 준비"""
+        self.outcomes, self.result = OUTCOMES, OUTCOME_RESULT
+
+    def groups(self, tool, arm):
+        tool_ids, arm_ids, baseline, final = self.outcomes
+        mask = (tool_ids == tool) & (arm_ids == arm)
+        return baseline[mask], final[mask]
+
+    def test_welch_and_hedges(self):
+        """쌍별 Welch t / Hedges g = 직접 계산"""
+        assert self.result.pairs == [(0, 1), (0, 2), (1, 2)]
+        for t in range(3):
+            for p, (a, b) in enumerate(self.result.pairs):
+                x = np.subtract(*self.groups(t, a)[::-1])
+                y = np.subtract(*self.groups(t, b)[::-1])
+                vx, vy = statistics.variance(x) / len(x), statistics.variance(y) / len(y)
+                t_value = (x.mean() - y.mean()) / math.sqrt(vx + vy)
+                df = (vx + vy) ** 2 / (vx ** 2 / (len(x) - 1) + vy ** 2 / (len(y) - 1))
+                assert self.result.welch['t'][t, p] == pytest.approx(t_value)
+                assert self.result.welch['df'][t, p] == pytest.approx(df)
+                assert self.result.welch['p'][t, p] == pytest.approx(float(t_two_sided_p(t_value, df)))
+                half = self.result.welch['ci_high'][t, p] - self.result.welch['difference'][t, p]
+                assert half == pytest.approx(float(t_critical(df)) * math.sqrt(vx + vy))
+
+                pooled = math.sqrt(((len(x) - 1) * statistics.variance(x) + (len(y) - 1) * statistics.variance(y))
+                                   / (len(x) + len(y) - 2))
+                g = (x.mean() - y.mean()) / pooled * (1 - 3 / (4 * (len(x) + len(y)) - 9))
+                assert self.result.effect_size['g'][t, p] == pytest.approx(g)
+                assert self.result.effect_size['ci_low'][t, p] < g < self.result.effect_size['ci_high'][t, p]
+
+    def test_ancova_matches_least_squares(self):
+        """ANCOVA 보정 차 / 표준오차 / F = 그룹 더미 + 기준선 최소제곱"""
+        tool_ids, arm_ids, baseline, final = self.outcomes
+        for t in range(3):
+            mask = tool_ids == t
+            x = np.column_stack([arm_ids[mask] == a for a in range(3)] + [baseline[mask]]).astype(float)
+            y = final[mask]
+            coef, sse, _, _ = np.linalg.lstsq(x, y, rcond=None)
+            df_error = len(y) - 4
+            mse = sse[0] / df_error
+            covariance = mse * np.linalg.inv(x.T @ x)
+            assert self.result.ancova_f['slope'][t] == pytest.approx(coef[3])
+            for p, (a, b) in enumerate(self.result.pairs):
+                contrast = np.zeros(4)
+                contrast[a], contrast[b] = 1, -1
+                assert self.result.ancova['adjusted_difference'][t, p] == pytest.approx(coef[a] - coef[b])
+                assert self.result.ancova['se'][t, p] == pytest.approx(math.sqrt(contrast @ covariance @ contrast))
+            reduced = np.column_stack([np.ones(len(y)), baseline[mask]])
+            sse_reduced = np.linalg.lstsq(reduced, y, rcond=None)[1][0]
+            f = ((sse_reduced - sse[0]) / 2) / mse
+            assert self.result.ancova_f['f'][t] == pytest.approx(f)
+            assert self.result.ancova_f['p'][t] == pytest.approx(float(f_upper_p(f, 2, df_error)))
+
+    def test_reliable_change_counts(self):
+        """신뢰 가능 변화 = 도구 기준선 SD 와 신뢰도로 만든 임계값 반복문 판정"""
+        tool_ids, arm_ids, baseline, final = self.outcomes
+        for t, reliability in enumerate([0.89, 0.92]):
+            sd = statistics.stdev(baseline[tool_ids == t])
+            threshold = 1.959964 * sd * math.sqrt(2 * (1 - reliability))
+            assert self.result.rci_threshold[t] == pytest.approx(threshold, rel=1e-6)
+            for a in range(3):
+                before, after = self.groups(t, a)
+                changes = before - after
+                assert self.result.reliably_improved[t, a] == sum(c > threshold for c in changes)
+                assert self.result.reliably_deteriorated[t, a] == sum(c < -threshold for c in changes)
+        assert np.isnan(self.result.reliably_improved[2]).all()
+
+    def test_empty_groups(self):
+        """관측이 없는 그룹은 NaN"""
+        result = analyze_outcomes([0, 0, 0, 0], [0, 0, 1, 1], [10, 12, 11, 14], [8, 9, 11, 13], n_tools=2, n_arms=3)
+        assert result.n.tolist() == [[2, 2, 0], [0, 0, 0]]
+        assert np.isfinite(result.welch['t'][0, 0])
+        assert np.isnan(result.welch['t'][0, 1]) and np.isnan(result.welch['p'][1]).all()
+
+
+class TestResampling:
+    """부트스트랩 / 순열 검정 테스트"""
+
+    def test_bootstrap(self):
+        """배치 크기 무관 + seed 재현 + 표준오차가 해석적 값에 근접"""
+        tool_ids, arm_ids, baseline, final = make_outcomes(1200, seed=1)
+        keys, change = tool_ids * 3 + arm_ids, final - baseline
+        pairs = [(0, 1), (0, 2), (1, 2)]
+        result = bootstrap_mean_differences(keys, change, 3, 3, pairs, 2000, seed=7)
+        batched = bootstrap_mean_differences(keys, change, 3, 3, pairs, 2000, seed=7, batch_size=37)
+        for key in ('ci_low', 'ci_high', 'se'):
+            assert np.allclose(result[key], batched[key])
+        analytic = analyze_outcomes(tool_ids, arm_ids, baseline, final, 3, 3)
+        assert np.allclose(result['se'], analytic.welch['se'], rtol=0.1)
+        difference = analytic.welch['difference']
+        assert ((result['ci_low'] < difference) & (difference < result['ci_high'])).all()
+
+    def test_permutation_matches_exact(self):
+        """작은 표본: 순열 p 값 ≈ 모든 배정을 나열한 정확 p 값"""
+        values = np.array([3.0, -1.0, 4.0, -6.0, -5.0, -9.0, 2.0, 0.0])
+        arms = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+        observed = abs(values[arms == 0].mean() - values[arms == 1].mean())
+        exact = []
+        for chosen in itertools.combinations(range(8), 4):
+            mask = np.isin(np.arange(8), chosen)
+            exact.append(abs(values[mask].mean() - values[~mask].mean()) >= observed - 1e-12)
+        result = permutation_test(arms, values, 1, 2, [(0, 1)], 20000, seed=3)
+        assert result['difference'][0, 0] == pytest.approx(values[:4].mean() - values[4:].mean())
+        assert result['p'][0, 0] == pytest.approx(np.mean(exact), abs=0.015)
+        batched = permutation_test(arms, values, 1, 2, [(0, 1)], 20000, seed=3, batch_size=999)
+        assert batched['p'][0, 0] == result['p'][0, 0]
+
+    def test_permutation_per_tool_pair(self):
+        """도구 / 쌍별로 그 두 그룹 안에서만 섞음 (효과 없는 도구는 큰 p)"""
+        rng = np.random.default_rng(4)
+        tool_ids = np.repeat([0, 1], 300)
+        arm_ids = np.tile([0, 1, 2], 200)
+        values = rng.normal(size=600) + np.where(tool_ids == 0, 2.0 * (arm_ids == 0), 0.0)
+        result = permutation_test(tool_ids * 3 + arm_ids, values, 2, 3, [(0, 1), (0, 2), (1, 2)], 2000, seed=5)
+        assert (result['p'][0, :2] < 0.01).all() and result['p'][0, 2] > 0.01
+        assert (result['p'][1] > 0.01).sum() >= 2
+
+
+async def build_study_platform():
+    """기준선 / 종료 PHQ-9, WAI-SR 을 기록한 2군 연구 (중재군 효과 있음)"""
+    rng = random.Random(0)
+    platform = ResearchPlatformService()
+    study = await platform.create_study(
+        title="연구", study_type=StudyType.RCT, principal_investigator="PI", institution="기관",
+        arms=[{'name': '중재군', 'intervention': 'ai'}, {'name': '대조군', 'intervention': 'info'}],
+        target_enrollment=400, randomization_enabled=True
+    )
+    await platform.submit_for_irb(study.study_id, "p.pdf", "c.pdf")
+    await platform.approve_irb(study.study_id, "IRB-1", datetime.now())
+    await platform.start_recruitment(study.study_id)
+    for i in range(300):
+        participant, _ = await platform.enroll_participant(
+            study.study_id, f"user_{i}", {'age': 30, 'gender': 'female'}, {'version': '1.0'}
+        )
+        effect = 1 if participant.arm_id == study.arms[0].arm_id else 0
+        for tool, items in (('PHQ-9', 9), ('WAI-SR', 12)):
+            baseline = [rng.randint(1, 3) for _ in range(items)]
+            await platform.record_assessment(participant.participant_id, tool, 'baseline', baseline)
+            if rng.random() < 0.9:
+                final = [max(0, min(5, s - effect * rng.randint(0, 1))) for s in baseline]
+                await platform.record_assessment(participant.participant_id, tool, 'final', final)
+    return platform, study
+
+
+STUDY_PLATFORM, STUDY = asyncio.run(build_study_platform())
+
+
+class TestStudyAnalysis:
+    """연구 플랫폼 연동 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 플랫폼 준비"""
+        self.platform, self.study = STUDY_PLATFORM, STUDY
+
+    def test_matches_comparison(self):
+        """평균 변화 차 = 기존 그룹 비교, 유의한 중재 효과 검출"""
+        analysis = asyncio.run(self.platform.analyze_study(self.study.study_id))
+        comparison = asyncio.run(self.platform._compare_arms(self.study.study_id, self.study.arms))
+        phq = analysis['tools']['PHQ-9']
+        assert list(analysis['tools']) == ['PHQ-9', 'WAI-SR']
+        assert phq['comparisons'][0]['arms'] == [arm.arm_id for arm in self.study.arms]
+        assert phq['comparisons'][0]['mean_change_difference'] == pytest.approx(
+            comparison['outcome_differences']['PHQ-9']['difference'], abs=0.005
+        )
+        assert phq['comparisons'][0]['ancova']['p_value'] < 0.001
+        assert phq['comparisons'][0]['hedges_g']['value'] < 0
+        arms = phq['arms'].values()
+        assert sum(arm['n'] for arm in arms) < 300
+        assert all(isinstance(arm['reliably_improved'], int) for arm in arms)
+        # 점수가 높을수록 좋은 도구: 감소는 악화
+        wai = analysis['tools']['WAI-SR']['arms'][self.study.arms[0].arm_id]
+        assert wai['reliably_deteriorated'] >= wai['reliably_improved']
+
+    def test_resampling_and_report(self):
+        """재표본 옵션 / 보고서 포함 / 없는 연구"""
+        analysis = asyncio.run(self.platform.analyze_study(
+            self.study.study_id, tools=['PHQ-9', 'K-10'], bootstrap=500, permutations=500, seed=1
+        ))
+        assert list(analysis['tools']) == ['PHQ-9']
+        comparison = analysis['tools']['PHQ-9']['comparisons'][0]
+        assert comparison['bootstrap']['ci'][1] < 0
+        assert comparison['permutation']['p_value'] == pytest.approx(1 / 501)
+        report = asyncio.run(self.platform.generate_study_report(self.study.study_id))
+        assert report['statistics'] == asyncio.run(self.platform.analyze_study(self.study.study_id))
+        with pytest.raises(ValueError):
+            asyncio.run(self.platform.analyze_study("missing"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
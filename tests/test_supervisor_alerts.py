@@ -0,0 +1,214 @@
+"""
+슈퍼바이저 알림 파이프라인 테스트
+"""
+import asyncio
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.supervisor.ai_supervisor import AISupervisor, InterventionLevel, SupervisorFeedback
+from services.supervisor_alerts import (
+    AlertPipeline, AlertRecord, AlertSink, AlertStore, FileAlertSink, WebhookAlertSink
+)
+
+T0 = datetime(2025, 1, 1, 9, 0, 0)
+
+
+class RecordingSink(AlertSink):
+    """전송 내용 기록용 sink"""
+
+    def __init__(self):
+        self.alerts = []
+        self.digests = []
+
+    def emit(self, alert):
+        self.alerts.append(alert)
+
+    def emit_digest(self, digest):
+        self.digests.append(digest)
+
+
+def make_feedback(session_id: str, level: InterventionLevel, turn: int = 0) -> SupervisorFeedback:
+    return SupervisorFeedback(
+        session_id=session_id,
+        turn_id=f"turn_{turn}",
+        quality_scores=[],
+        overall_score=0.5,
+        intervention_level=level,
+        intervention_reason=f"{level.value} reason",
+        suggested_response=None,
+        coaching_points=[]
+    )
+
+
+def make_record(i: int, severity: str, timestamp: datetime) -> AlertRecord:
+    return AlertRecord(
+        alert_id=f"A{i}", session_id=f"s{i}", turn_id="t", severity=severity, type="alert",
+        message=None, timestamp=timestamp, last_seen=timestamp
+    )
+
+
+class TestAlertStore:
+    """심각도/시각 인덱스 테스트"""
+
+    def test_query_matches_scan(self):
+        """인덱스 조회 결과가 전체 스캔과 동일"""
+        rng = random.Random(0)
+        store = AlertStore()
+        kept = []
+        for i in range(1000):
+            # 가끔 순서가 뒤바뀐 시각
+            ts = T0 + timedelta(seconds=i + rng.choice([0, 0, 0, -4.5]))
+            record = make_record(i, rng.choice(["low", "medium", "high", "critical"]), ts)
+            store.add(record)
+            kept.append(record)
+        assert len(store) == 1000
+
+        for severity in [None, "low", "high", "critical"]:
+            for since in [None, T0, T0 + timedelta(seconds=850), T0 + timedelta(seconds=2000)]:
+                expected = sorted(
+                    (r for r in kept
+                     if (severity is None or r.severity == severity)
+                     and (since is None or r.timestamp >= since)),
+                    key=lambda r: r.timestamp
+                )
+                actual = store.query(severity, since)
+                assert [r.alert_id for r in actual] == [r.alert_id for r in expected]
+        assert [r.alert_id for r in store.query(limit=3)] == \
+            [r.alert_id for r in sorted(kept, key=lambda r: r.timestamp)[-3:]]
+        assert store.query("unknown") == []
+
+    def test_eviction_compacts(self):
+        """오래된 알림 제거 후에도 조회가 올바른지"""
+        store = AlertStore(max_alerts=10)
+        severities = ["low", "high", "low", "critical"]
+        for i in range(5000):
+            store.add(make_record(i, severities[i % 4], T0 + timedelta(seconds=i)))
+        assert [r.alert_id for r in store.query()] == [f"A{i}" for i in range(4990, 5000)]
+        assert [r.alert_id for r in store.query("low", T0 + timedelta(seconds=4995))] == ["A4996", "A4998"]
+        assert sum(store.counts().values()) == 10
+
+
+class TestAlertPipeline:
+    """중복 제거 / 심각도 상승 / 요약 테스트"""
+
+    def test_dedup_within_window(self):
+        """같은 세션의 반복 알림은 병합"""
+        sink = RecordingSink()
+        pipeline = AlertPipeline(sink, dedup_window=timedelta(minutes=10), digest_interval=timedelta(hours=1))
+        first = pipeline.publish(make_feedback("s1", InterventionLevel.ALERT, 0), now=T0)
+        for turn in range(1, 20):
+            assert pipeline.publish(make_feedback("s1", InterventionLevel.ALERT, turn),
+                                    now=T0 + timedelta(minutes=turn * 0.5)) is None
+        alerts = pipeline.get_alerts()
+        assert len(alerts) == 1
+        assert alerts[0]["alert_id"] == first.alert_id
+        assert alerts[0]["occurrences"] == 20
+        assert pipeline.metrics["coalesced"] == 19
+
+        # 창이 지나면 새 알림
+        later = T0 + timedelta(minutes=9.5 + 11)
+        assert pipeline.publish(make_feedback("s1", InterventionLevel.ALERT, 99), now=later) is not None
+        # 다른 세션은 별도
+        assert pipeline.publish(make_feedback("s2", InterventionLevel.ALERT), now=later) is not None
+        assert len(pipeline.get_alerts()) == 3
+
+    def test_escalation_emits_immediately(self):
+        """창 안에서 심각도가 오르면 즉시 전송, 낮은 수준은 병합"""
+        sink = RecordingSink()
+        pipeline = AlertPipeline(sink, digest_interval=timedelta(hours=1))
+        pipeline.publish(make_feedback("s1", InterventionLevel.CORRECTION), now=T0)
+        assert sink.alerts == []
+        escalated = pipeline.publish(make_feedback("s1", InterventionLevel.ALERT, 1), now=T0 + timedelta(seconds=10))
+        assert escalated.escalated_from == "medium"
+        assert [a["alert_id"] for a in sink.alerts] == [escalated.alert_id]
+        assert pipeline.publish(make_feedback("s1", InterventionLevel.SUGGESTION, 2),
+                                now=T0 + timedelta(seconds=20)) is None
+
+        critical = pipeline.publish(make_feedback("s3", InterventionLevel.TAKEOVER), now=T0 + timedelta(seconds=30))
+        assert sink.alerts[-1]["alert_id"] == critical.alert_id
+        assert pipeline.metrics["escalated"] == 1
+
+    def test_periodic_digest(self):
+        """요약 주기마다 버퍼를 한 번에 전송"""
+        sink = RecordingSink()
+        pipeline = AlertPipeline(sink, digest_interval=timedelta(minutes=5))
+        pipeline._last_flush = T0
+        for i in range(30):
+            pipeline.publish(make_feedback(f"s{i % 10}", InterventionLevel.ALERT, i), now=T0 + timedelta(seconds=i))
+        assert sink.digests == []
+        assert pipeline.maybe_flush(T0 + timedelta(minutes=1)) is None
+
+        digest = pipeline.maybe_flush(T0 + timedelta(minutes=5))
+        assert len(digest["alerts"]) == 10
+        assert digest["counts"]["high"] == 10
+        assert digest["suppressed"] == 20
+        assert sink.digests == [digest]
+        assert pipeline.flush(T0 + timedelta(minutes=6)) is None
+
+    def test_buffer_full_flushes(self):
+        """버퍼가 가득 차면 주기 전에 요약 전송"""
+        sink = RecordingSink()
+        pipeline = AlertPipeline(sink, digest_interval=timedelta(hours=1), max_buffer=5)
+        pipeline._last_flush = T0
+        for i in range(12):
+            pipeline.publish(make_feedback(f"s{i}", InterventionLevel.ALERT), now=T0 + timedelta(seconds=i))
+        assert [len(d["alerts"]) for d in sink.digests] == [5, 5]
+        assert len(pipeline.get_alerts()) == 12
+
+    def test_file_and_webhook_sinks(self, tmp_path):
+        """파일 / 웹훅 대체 sink"""
+        path = tmp_path / "alerts.ndjson"
+        pipeline = AlertPipeline(FileAlertSink(str(path)))
+        pipeline.publish(make_feedback("s1", InterventionLevel.TAKEOVER), now=T0)
+        pipeline.publish(make_feedback("s2", InterventionLevel.ALERT), now=T0)
+        pipeline.flush(T0 + timedelta(minutes=1))
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["kind"] for line in lines] == ["alert", "digest"]
+        assert lines[1]["alerts"][0]["session_id"] == "s2"
+
+        webhook = WebhookAlertSink("https://example.invalid/hook")
+        AlertPipeline(webhook).publish(make_feedback("s1", InterventionLevel.TAKEOVER), now=T0)
+        assert webhook.outbox[0]["kind"] == "alert"
+
+        sent = []
+        failing = WebhookAlertSink("https://example.invalid/hook", transport=lambda url, payload: sent.append(1) or 1 / 0)
+        AlertPipeline(failing).publish(make_feedback("s1", InterventionLevel.TAKEOVER), now=T0)
+        assert sent == [1] and failing.failures == 1
+
+    def test_sink_must_implement_both_methods(self):
+        """emit / emit_digest 중 하나라도 빠진 sink 는 생성 시점에 TypeError"""
+        class ImmediateOnlySink(AlertSink):
+            def emit(self, alert):
+                pass
+
+        with pytest.raises(TypeError):
+            ImmediateOnlySink()
+        with pytest.raises(TypeError):
+            AlertSink()
+
+    def test_supervisor_routes_alerts(self):
+        """evaluate_turn 의 ALERT/TAKEOVER 알림이 파이프라인으로 전달"""
+        sink = RecordingSink()
+        supervisor = AISupervisor()
+        supervisor.alert_pipeline = AlertPipeline(sink)
+
+        async def run():
+            for turn in range(5):
+                await supervisor.evaluate_turn("s1", f"turn_{turn}", "죽고 싶어요.", "그냥 잊어버리세요.", {}, "ko")
+
+        asyncio.run(run())
+        alerts = supervisor.alert_pipeline.get_alerts()
+        assert len(alerts) == 1
+        assert alerts[0]["occurrences"] == 5
+        assert alerts[0]["severity"] in ("high", "critical")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
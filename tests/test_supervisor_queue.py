@@ -0,0 +1,214 @@
+"""
+슈퍼바이저 비동기 평가 큐 테스트
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.supervisor.ai_supervisor import AISupervisor
+from services.supervisor_alerts import AlertPipeline
+from services.supervisor_queue import SupervisorJob, SupervisorWorkerPool
+
+GOOD_RESPONSE = "많이 힘드시군요. 그런 감정을 느끼시는 것은 자연스러운 일이에요. 함께 이야기해 보면 어떠세요?"
+CRISIS_MESSAGE = "죽고 싶어요."
+BAD_CRISIS_RESPONSE = "그냥 잊어버리세요."
+
+# 생성 비용이 큰 슈퍼바이저는 모듈에서 한 번만 생성
+SUPERVISOR = AISupervisor()
+
+
+def make_job(session_id: str, turn: int, message: str = "요즘 힘들어요", response: str = GOOD_RESPONSE,
+             is_crisis: bool = False) -> SupervisorJob:
+    return SupervisorJob(
+        session_id=session_id,
+        turn_id=f"turn_{turn}",
+        user_message=message,
+        ai_response=response,
+        language="ko",
+        is_crisis=is_crisis
+    )
+
+
+class TestSupervisorWorkerPool:
+    """워커 풀 처리 / 저장 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 슈퍼바이저 준비"""
+        self.supervisor = SUPERVISOR
+
+    def test_processes_and_stores_feedback(self):
+        """등록된 턴이 평가되어 세션/턴별로 저장되는지"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor, num_workers=2)
+            for turn in range(5):
+                assert pool.submit(make_job("s1", turn))
+            await pool.stop(drain=True)
+            return pool
+
+        pool = asyncio.run(run())
+        feedbacks = pool.get_feedback("s1")
+        assert [f.turn_id for f in feedbacks] == [f"turn_{i}" for i in range(5)]
+        assert pool.get_feedback("s1", "turn_3")[0].turn_id == "turn_3"
+        assert pool.get_latest_feedback("s1").turn_id == "turn_4"
+
+        expected = asyncio.run(self.supervisor.evaluate_turn("other", "t", "요즘 힘들어요", GOOD_RESPONSE, {}, "ko"))
+        assert feedbacks[0].overall_score == pytest.approx(expected.overall_score)
+
+        metrics = pool.get_metrics()
+        assert metrics["processed"] == 5
+        assert metrics["queue_depth"] == 0
+        assert metrics["lag_ms"]["max"] >= metrics["lag_ms"]["mean"] >= 0
+
+    def test_session_review_summary(self):
+        """세션 요약이 턴 피드백을 집계하는지"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor)
+            pool.submit(make_job("s1", 0))
+            pool.submit(make_job("s1", 1, CRISIS_MESSAGE, BAD_CRISIS_RESPONSE, is_crisis=True))
+            await pool.stop()
+            return pool
+
+        pool = asyncio.run(run())
+        review = pool.get_session_review("s1")
+        feedbacks = pool.get_feedback("s1")
+        assert review["reviewed_turns"] == 2
+        assert review["overall_quality"] == pytest.approx(sum(f.overall_score for f in feedbacks) / 2)
+        assert review["intervention_level"] == feedbacks[1].intervention_level.value
+        assert "safety_compliance" in review["quality_scores"]
+        assert pool.get_session_review("missing") is None
+
+    def test_drop_oldest_on_overflow(self):
+        """큐가 가득 차면 가장 오래된 작업을 폐기하는지"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor, num_workers=1, max_queue_size=3)
+            # 워커가 실행되기 전에 연속 등록
+            for turn in range(5):
+                pool.submit(make_job("s1", turn))
+            await pool.stop()
+            return pool
+
+        pool = asyncio.run(run())
+        assert pool.metrics["dropped"] == 2
+        assert [f.turn_id for f in pool.get_feedback("s1")] == ["turn_2", "turn_3", "turn_4"]
+
+    def test_sampling(self):
+        """샘플링 비율과 위기 턴 별도 비율"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor, sampling_rate=0.25, crisis_sampling_rate=1.0)
+            accepted = [pool.submit(make_job(f"s{i}", i)) for i in range(400)]
+            crisis = [pool.submit(make_job(f"c{i}", i, CRISIS_MESSAGE, is_crisis=True)) for i in range(50)]
+            await pool.stop()
+            return pool, accepted, crisis
+
+        pool, accepted, crisis = asyncio.run(run())
+        assert 60 < sum(accepted) < 140
+        assert all(crisis)
+        assert pool.metrics["sampled_out"] == 400 - sum(accepted)
+
+        # 결정적 샘플링: 같은 턴은 같은 결과
+        again = SupervisorWorkerPool(self.supervisor, sampling_rate=0.25)
+        assert [again._should_sample(make_job(f"s{i}", i)) for i in range(400)] == accepted
+
+    def test_alerts_filter(self):
+        """개입이 필요한 턴만 알림으로 기록되고 필터링되는지"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor)
+            pool.submit(make_job("s1", 0))
+            pool.submit(make_job("s2", 0, CRISIS_MESSAGE, BAD_CRISIS_RESPONSE, is_crisis=True))
+            await pool.stop()
+            return pool
+
+        pool = asyncio.run(run())
+        alerts = pool.get_alerts()
+        assert alerts and all(a["session_id"] == "s2" for a in alerts)
+        severity = alerts[0]["severity"]
+        assert pool.get_alerts(severity=severity) == alerts
+        assert pool.get_alerts(since=datetime.now() + timedelta(minutes=1)) == []
+
+    def test_evicted_sessions_clear_supervisor_caches(self):
+        """피드백에서 밀려난 세션은 슈퍼바이저 턴 점수 캐시 / 세션 행렬에서도 제거"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor, num_workers=1, max_sessions=2)
+            for i in range(4):
+                pool.submit(make_job(f"evict{i}", 0))
+            await pool.stop()
+            return pool
+
+        asyncio.run(self.supervisor.review_session("evict0", [{"user_message": "안녕하세요", "ai_response": "반갑습니다."}]))
+        pool = asyncio.run(run())
+        assert list(pool.feedback) == ["evict2", "evict3"]
+        assert {"evict0", "evict1"}.isdisjoint(self.supervisor.turn_score_cache)
+        assert "evict0" not in self.supervisor.session_matrices
+        assert {"evict2", "evict3"} <= set(self.supervisor.turn_score_cache)
+
+    def test_scoring_does_not_block_event_loop(self):
+        """평가 스레드 사용 시 평가 중에도 같은 루프의 다른 코루틴이 실행되는지 (결과는 동일)"""
+        async def run(offload: bool):
+            pool = SupervisorWorkerPool(self.supervisor, offload=offload)
+            for turn in range(40):
+                pool.submit(make_job(f"loop_{offload}", turn, message=f"요즘 힘들어요 {turn}"))
+            ticks = 0
+            done = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    await asyncio.sleep(0.001)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await pool.join()
+            done.set()
+            await task
+            await pool.stop()
+            return pool, ticks
+
+        inline, inline_ticks = asyncio.run(run(False))
+        offloaded, offloaded_ticks = asyncio.run(run(True))
+        # 루프에서 직접 평가하면 큐가 빌 때까지 다른 코루틴이 실행되지 않음
+        assert inline_ticks <= 1
+        assert offloaded_ticks > inline_ticks
+        assert [f.overall_score for f in offloaded.get_feedback("loop_True")] == pytest.approx(
+            [f.overall_score for f in inline.get_feedback("loop_False")]
+        )
+        assert [f.turn_id for f in offloaded.get_feedback("loop_True")] == [f"turn_{i}" for i in range(40)]
+
+    def test_alert_pipeline_conflict(self):
+        """명시한 알림 파이프라인이 슈퍼바이저 파이프라인과 다르면 시작 시 ValueError"""
+        supervisor = AISupervisor()
+        supervisor.alert_pipeline = AlertPipeline()
+
+        async def run(pool):
+            pool.start()
+            await pool.stop()
+            return pool
+
+        with pytest.raises(ValueError):
+            asyncio.run(run(SupervisorWorkerPool(supervisor, alert_pipeline=AlertPipeline())))
+        # 같은 파이프라인이거나 명시하지 않으면 슈퍼바이저 파이프라인을 사용
+        same = asyncio.run(run(SupervisorWorkerPool(supervisor, alert_pipeline=supervisor.alert_pipeline)))
+        default = asyncio.run(run(SupervisorWorkerPool(supervisor)))
+        assert same.alert_pipeline is default.alert_pipeline is supervisor.alert_pipeline
+
+    def test_failed_job_does_not_stop_worker(self):
+        """평가 실패가 워커를 멈추지 않는지"""
+        async def run():
+            pool = SupervisorWorkerPool(self.supervisor, num_workers=1)
+            pool.submit(make_job("s1", 0, response=None))
+            pool.submit(make_job("s1", 1))
+            await pool.stop()
+            return pool
+
+        pool = asyncio.run(run())
+        assert pool.metrics["failed"] == 1
+        assert pool.metrics["processed"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
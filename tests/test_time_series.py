@@ -0,0 +1,216 @@
+"""
+증상 시계열 테스트
+파일명: tests/test_time_series.py
+
+테스트 원칙:
+- 배열 기반 시계열은 기존 {'date', 'level'} 목록과 같은 내용으로 순회/인덱싱/저장되어야 함
+- 벡터화 분석 결과는 직접 계산(np.polyfit, 반복문)과 같아야 함
+- 엔진의 mood_trend 는 증상 기록에 따라 갱신되어야 함
+- 연구 보고서의 그룹별 궤적은 주차가 있는 기록으로 직접 계산한 값과 같아야 함
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from models.personalization.adaptive_therapy import (
+    AdaptiveTherapyEngine, TherapeuticProgress, _document_from, _progress_from_document
+)
+from models.personalization.time_series import (
+    SymptomSeries, change_points, classify_trend, grouped_slopes, linear_slope, moving_average
+)
+from services.research_platform import ResearchPlatformService, StudyType
+
+
+def legacy_points(count: int, seed: int = 0):
+    """기존 목록 형식 기록 (하루 간격 + 임의 분)"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 1, 9, 30)
+    return [
+        {'date': (start + timedelta(days=i, minutes=int(rng.integers(0, 600)))).isoformat(),
+         'level': float(rng.integers(0, 28))}
+        for i in range(count)
+    ]
+
+
+class TestSymptomSeries:
+    """배열 기반 시계열 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """테스트 전 기존 형식 기록 생성"""
+        self.points = legacy_points(700)
+
+    def test_list_compatible(self):
+        """순회/인덱싱/슬라이스/비교가 기존 목록과 동일"""
+        series = SymptomSeries(self.points, chunk_size=64)
+        assert len(series) == 700 and series
+        assert list(series) == self.points
+        assert series == self.points and series == SymptomSeries(self.points)
+        assert series[0] == self.points[0] and series[-1] == self.points[-1]
+        assert series[-5:] == self.points[-5:]
+        with pytest.raises(IndexError):
+            series[700]
+        assert not SymptomSeries() and list(SymptomSeries()) == []
+
+    def test_tail_across_chunks(self):
+        """마지막 청크만 읽는 tail 이 전체 배열 끝부분과 동일"""
+        for size in (1, 63, 64, 65, 130, 700):
+            series = SymptomSeries(self.points[:size], chunk_size=64)
+            for count in (1, 8, 64, 65, 200, 1000):
+                times, values = series.tail(count)
+                assert np.array_equal(times, series.times[-count:])
+                assert np.array_equal(values, series.values[-count:])
+                # 전체 배열을 이미 만든 경우도 같은 결과
+                assert np.array_equal(series.tail(count)[1], values)
+
+    def test_document_roundtrip(self):
+        """저장 형식 / 기존 목록 형식 모두 복원"""
+        series = SymptomSeries(self.points)
+        document = series.to_document()
+        assert SymptomSeries.from_document(document) == series
+        assert SymptomSeries.from_document(self.points) == series
+        assert SymptomSeries.from_document(None) == SymptomSeries()
+        since = datetime.fromisoformat(self.points[500]['date'])
+        times, values = series.since(since)
+        assert values.tolist() == [p['level'] for p in self.points[500:]]
+        assert series.nbytes < 16 * 1024 + 16 * len(self.points)
+
+
+class TestAnalysis:
+    """벡터화 분석 함수 테스트"""
+
+    def test_slopes_match_polyfit(self):
+        """단일/행별/그룹별 기울기 = np.polyfit"""
+        rng = np.random.default_rng(0)
+        x = rng.uniform(0, 90, size=(50, 20))
+        y = 0.3 * x + rng.normal(size=x.shape)
+        expected = np.array([np.polyfit(xi, yi, 1)[0] for xi, yi in zip(x, y)])
+        assert np.allclose(linear_slope(x, y), expected)
+        assert linear_slope(x[0], y[0]) == pytest.approx(expected[0])
+
+        group_ids = rng.integers(0, 30, 2000)
+        gx = rng.uniform(0, 10, 2000)
+        gy = -0.5 * gx + rng.normal(size=2000)
+        slopes = grouped_slopes(group_ids, gx, gy, n_groups=32)
+        for g in range(30):
+            mask = group_ids == g
+            assert slopes[g] == pytest.approx(np.polyfit(gx[mask], gy[mask], 1)[0])
+        assert np.isnan(slopes[30:]).all()
+
+    def test_moving_average(self):
+        """후행 이동 평균 = 반복문 계산"""
+        values = np.random.default_rng(1).normal(size=100)
+        for window in (1, 3, 7, 200):
+            expected = [values[max(0, i - window + 1):i + 1].mean() for i in range(100)]
+            assert np.allclose(moving_average(values, window), expected)
+        with pytest.raises(ValueError):
+            moving_average(values, 0)
+
+    def test_change_points(self):
+        """평균이 바뀌는 위치 검출, 잡음만 있으면 없음"""
+        rng = np.random.default_rng(2)
+        values = np.concatenate([np.full(40, 15.0), np.full(30, 8.0), np.full(50, 12.0)]) + rng.normal(0, 1, 120)
+        found = change_points(values)
+        assert len(found) == 2
+        assert abs(found[0] - 40) <= 2 and abs(found[1] - 70) <= 2
+        assert change_points(rng.normal(0, 1, 200)) == []
+        assert change_points(values, max_points=1) in ([found[0]], [found[1]])
+        assert change_points(values[:4]) == []
+
+    def test_classify_trend(self):
+        """증상 감소 = improving, 잡음 = stable"""
+        x = np.arange(10.0)
+        assert classify_trend(x, 20 - 1.5 * x + np.random.default_rng(3).normal(0, 0.5, 10)) == "improving"
+        assert classify_trend(x, 5 + x) == "worsening"
+        assert classify_trend(x, 5 + x, higher_is_better=True) == "improving"
+        assert classify_trend(x, np.random.default_rng(4).normal(10, 3, 10)) == "stable"
+        assert classify_trend(x[:2], x[:2]) == "stable"
+        assert classify_trend(np.zeros(5), np.arange(5.0)) == "stable"
+
+
+class TestEngineTrajectory:
+    """엔진 연동 테스트"""
+
+    def test_mood_trend_updates(self):
+        """증상 기록에 따라 mood_trend 갱신"""
+        engine = AdaptiveTherapyEngine()
+        engine.create_user_profile("u", "ko")
+        progress = engine.progress_tracking["u"]
+        assert isinstance(progress.symptom_trajectory, SymptomSeries)
+        for level in (20, 18, 15, 13, 10, 8):
+            engine.update_progress("u", {"symptom_level": level})
+        assert progress.mood_trend == "improving"
+        for level in (12, 16, 19, 22, 25, 27, 27, 27):
+            engine.update_progress("u", {"symptom_level": level})
+        assert progress.mood_trend == "worsening"
+        assert [p['level'] for p in progress.symptom_trajectory][-3:] == [27, 27, 27]
+
+    def test_legacy_progress_document(self):
+        """이전 형식 진행 문서도 복원"""
+        progress = TherapeuticProgress("u", datetime(2025, 1, 1))
+        document = _document_from(progress)
+        document['symptom_trajectory'] = legacy_points(5)
+        restored = _progress_from_document(document)
+        assert restored.symptom_trajectory == legacy_points(5)
+        assert _progress_from_document(_document_from(restored)) == restored
+
+
+async def build_weekly_study(participants: int = 40, weeks: int = 12):
+    """매주 PHQ-9 를 기록한 2군 연구 (중재군은 6주차부터 점수 감소, 주차 없는 final 기록 포함)"""
+    platform = ResearchPlatformService()
+    study = await platform.create_study(
+        title="연구", study_type=StudyType.RCT, principal_investigator="PI", institution="기관",
+        arms=[{'name': '중재군', 'intervention': 'ai'}, {'name': '대조군', 'intervention': 'info'}],
+        target_enrollment=participants, randomization_enabled=True
+    )
+    await platform.submit_for_irb(study.study_id, "p.pdf", "c.pdf")
+    await platform.approve_irb(study.study_id, "IRB-1", datetime.now())
+    await platform.start_recruitment(study.study_id)
+    for i in range(participants):
+        participant, _ = await platform.enroll_participant(study.study_id, f"user_{i}", {'age': 30}, {})
+        treated = participant.arm_id == study.arms[0].arm_id
+        for week in range(weeks):
+            level = 1 if treated and week >= 6 else 2
+            timepoint = 'baseline' if week == 0 else f'week{week}'
+            await platform.record_assessment(participant.participant_id, 'PHQ-9', timepoint, [level] * 9)
+        await platform.record_assessment(participant.participant_id, 'PHQ-9', 'final', [0] * 9)
+    return platform, study
+
+
+class TestStudyTrajectories:
+    """연구 보고서 그룹별 궤적 테스트"""
+
+    def test_report_trajectories(self):
+        """기울기 / 주차별 평균 / 변화점 = 주차가 있는 기록으로 직접 계산 (final 제외)"""
+        platform, study = asyncio.run(build_weekly_study())
+        report = asyncio.run(platform.generate_study_report(study.study_id))
+        for arm in study.arms:
+            weeks, scores = [], []
+            for participant in platform.participant_index.arm(study.study_id, arm.arm_id):
+                for assessment in participant.assessments:
+                    if assessment['timepoint'] != 'final':
+                        weeks.append(0 if assessment['timepoint'] == 'baseline' else int(assessment['timepoint'][4:]))
+                        scores.append(assessment['score'])
+            weeks, scores = np.array(weeks), np.array(scores, dtype=float)
+            weekly_mean = [scores[weeks == week].mean() for week in range(12)]
+
+            trajectory = report['arms'][arm.arm_id]['trajectories']['PHQ-9']
+            assert trajectory['weeks'] == list(range(12))
+            assert trajectory['weekly_mean'] == pytest.approx(weekly_mean, abs=0.005)
+            assert trajectory['slope_per_week'] == pytest.approx(np.polyfit(weeks, scores, 1)[0], abs=5e-4)
+
+        treated, control = (report['arms'][arm.arm_id]['trajectories']['PHQ-9'] for arm in study.arms)
+        assert treated['slope_per_week'] < 0 and treated['change_points'] == [6]
+        assert control['slope_per_week'] == 0 and control['change_points'] == []
+
+        # 연구 일정에 있는 시점은 일정의 주차 사용
+        study.assessment_schedule = {'final': 12}
+        report = asyncio.run(platform.generate_study_report(study.study_id))
+        trajectory = report['arms'][study.arms[1].arm_id]['trajectories']['PHQ-9']
+        assert trajectory['weeks'] == list(range(13))
+        assert trajectory['weekly_mean'][-1] == 0 and trajectory['slope_per_week'] < 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])